@@ -33,6 +33,7 @@
 import os
 import sys
 import time
+import copy
 import shutil
 import platform
 from pathlib import Path
@@ -45,11 +46,16 @@ import yaml
 
 # Local Imports
 from navigate.tools.common_functions import build_ref_name
+from navigate.tools.multipos_table_tools import positions_to_array, validate_positions
 
 # Logger Setup
 p = __name__.split(".")[1]
 logger = logging.getLogger(p)
 
+#: tuple: Tables of the configuration that are only read, or replaced as a whole.
+#: Their rows are shared as plain lists, which can not be modified in place.
+READ_ONLY_TABLES = ("MultiPositions",)
+
 
 def get_navigate_path():
     """Establish a program home directory in AppData/Local/.navigate for Windows
@@ -127,8 +133,10 @@ def load_configs(manager, **kwargs):
 
     Parameters
     ----------
-    manager : multiprocessing.Manager
-        Shares objects (e.g., dict) between processes
+    manager : multiprocessing.Manager or None
+        Shares objects (e.g., dict) between processes. If None, the configurations
+        are loaded as plain python objects, which can be verified without a call to
+        the manager per access and then shared with publish_config().
     **kwargs
         List of configuration file paths
 
@@ -141,20 +149,65 @@ def load_configs(manager, **kwargs):
         print("No files provided to load_yaml_config()")
         sys.exit(1)
 
-    config_dict = manager.dict()
+    config_dict = {}
     for config_name, file_path in kwargs.items():
         file_path = Path(file_path)
         assert file_path.exists(), "Configuration File not found: {}".format(file_path)
         with open(file_path) as f:
             try:
-                config_data = yaml.load(f, Loader=yaml.FullLoader)
-                build_nested_dict(manager, config_dict, config_name, config_data)
+                config_dict[config_name] = yaml.load(f, Loader=yaml.FullLoader)
             except yaml.YAMLError as yaml_error:
                 print(f"Configuration - Yaml Error: {yaml_error}")
                 sys.exit(1)
 
     # return combined dictionary
-    return config_dict
+    return publish_config(manager, config_dict)
+
+
+def publish_config(manager, config_data, read_only=False):
+    """Share a plain configuration through the manager.
+
+    Each dictionary and list is created with all of its values at once, so the
+    cost is a few calls to the manager per container rather than one per value.
+
+    Parameters
+    ----------
+    manager : multiprocessing.Manager or None
+        Shares objects (e.g., dict) between processes. If None, a copy of the
+        configuration is returned.
+    config_data : dict or list or value
+        Plain configuration
+    read_only : bool
+        Share a table as a single list of plain rows. Tables in READ_ONLY_TABLES
+        are always shared this way.
+
+    Returns
+    -------
+    DictProxy or ListProxy or value
+        Shared configuration
+    """
+    if manager is None:
+        return copy.deepcopy(config_data)
+    if type(config_data) == dict:
+        nested = {
+            k: publish_config(manager, v, k in READ_ONLY_TABLES)
+            for k, v in config_data.items()
+            if type(v) == dict or type(v) == list
+        }
+        # keep the order of the keys, nested values are filled in afterwards
+        d = manager.dict(
+            {k: None if k in nested else v for k, v in config_data.items()}
+        )
+        if nested:
+            d.update(nested)
+        return d
+    if type(config_data) == list:
+        if read_only and is_table(config_data):
+            # Store table rows as plain lists, so the whole table is shared with a
+            # single call to the manager
+            return manager.list(config_data)
+        return manager.list([publish_config(manager, v) for v in config_data])
+    return config_data
 
 
 def build_nested_dict(manager, parent_dict, key_name, dict_data):
@@ -162,8 +215,9 @@ def build_nested_dict(manager, parent_dict, key_name, dict_data):
 
     Parameters
     ----------
-    manager : multiprocessing.Manager
-        Shares objects (e.g., dict) between processes
+    manager : multiprocessing.Manager or None
+        Shares objects (e.g., dict) between processes. If None, a copy of the
+        dictionary is inserted.
     parent_dict : dict
         Dictionary we are adding to
     key_name : str
@@ -171,19 +225,47 @@ def build_nested_dict(manager, parent_dict, key_name, dict_data):
     dict_data : dict
         Dictionary to insert
     """
-    if type(dict_data) != dict and type(dict_data) != list:
-        parent_dict[key_name] = dict_data
-        return
-    if type(dict_data) == dict:
-        d = manager.dict()
-        for k in dict_data:
-            build_nested_dict(manager, d, k, dict_data[k])
-    else:
-        d = manager.list()
-        for i, v in enumerate(dict_data):
-            d.append(None)
-            build_nested_dict(manager, d, i, v)
-    parent_dict[key_name] = d
+    parent_dict[key_name] = publish_config(
+        manager, dict_data, key_name in READ_ONLY_TABLES
+    )
+
+
+def is_dict(manager, config_data):
+    """Check if a configuration value is a dictionary of the expected kind.
+
+    Parameters
+    ----------
+    manager : multiprocessing.Manager or None
+        Shares objects (e.g., dict) between processes. If None, the configuration
+        is made of plain dictionaries.
+    config_data : object
+        Configuration value
+
+    Returns
+    -------
+    bool
+        True if config_data is a DictProxy, or a dict when manager is None.
+    """
+    return type(config_data) is (dict if manager is None else DictProxy)
+
+
+def is_table(list_data):
+    """Check if a list is a table, i.e. a non-empty list of flat lists.
+
+    Parameters
+    ----------
+    list_data : list
+        List to check
+
+    Returns
+    -------
+    bool
+        True if every element is a list of values that are neither dicts nor lists.
+    """
+    return len(list_data) > 0 and all(
+        type(row) == list and all(type(v) != dict and type(v) != list for v in row)
+        for row in list_data
+    )
 
 
 def update_config_dict(manager, parent_dict, config_name, new_config) -> bool:
@@ -230,7 +312,7 @@ def verify_experiment_config(manager, configuration):
     configuration: configuration object
         contains all the yaml files
     """
-    if type(configuration["experiment"]) is not DictProxy:
+    if not is_dict(manager, configuration["experiment"]):
         update_config_dict(manager, configuration, "experiment", {})
 
     # verify/build autofocus parameter setting
@@ -251,7 +333,7 @@ def verify_experiment_config(manager, configuration):
         if "stage" in microscope_config.keys():
             stages = microscope_config["stage"]["hardware"]
             device_dict[microscope_name]["stage"] = {}
-            if type(stages) != ListProxy:
+            if type(stages) not in (list, ListProxy):
                 stages = [stages]
             for stage in stages:
                 if not stage["type"].lower().startswith("synthetic"):
@@ -267,9 +349,8 @@ def verify_experiment_config(manager, configuration):
         "fine_selected": True,
         "robust_fit": False,
     }
-    if (
-        "AutoFocusParameters" not in configuration["experiment"]
-        or type(configuration["experiment"]["AutoFocusParameters"]) is not DictProxy
+    if "AutoFocusParameters" not in configuration["experiment"] or not is_dict(
+        manager, configuration["experiment"]["AutoFocusParameters"]
     ):
         update_config_dict(
             manager, configuration["experiment"], "AutoFocusParameters", {}
@@ -300,17 +381,17 @@ def verify_experiment_config(manager, configuration):
                     )
 
     # remove non-consistent autofocus parameter
-    for microscope_name in autofocus_setting_dict.keys():
+    for microscope_name in list(autofocus_setting_dict.keys()):
         if microscope_name not in device_dict:
             autofocus_setting_dict.pop(microscope_name)
         else:
-            for device in autofocus_setting_dict[microscope_name].keys():
+            for device in list(autofocus_setting_dict[microscope_name].keys()):
                 if device not in device_dict[microscope_name]:
                     autofocus_setting_dict[microscope_name].pop(device)
                 else:
-                    for device_ref in autofocus_setting_dict[microscope_name][
-                        device
-                    ].keys():
+                    for device_ref in list(
+                        autofocus_setting_dict[microscope_name][device].keys()
+                    ):
                         if (
                             device_ref
                             not in autofocus_setting_dict[microscope_name][device]
@@ -332,9 +413,8 @@ def verify_experiment_config(manager, configuration):
         "date": time.strftime("%Y-%m-%d"),
         "solvent": "BABB",
     }
-    if (
-        "Saving" not in configuration["experiment"]
-        or type(configuration["experiment"]["Saving"]) is not DictProxy
+    if "Saving" not in configuration["experiment"] or not is_dict(
+        manager, configuration["experiment"]["Saving"]
     ):
         update_config_dict(
             manager, configuration["experiment"], "Saving", saving_dict_sample
@@ -367,9 +447,8 @@ def verify_experiment_config(manager, configuration):
         "center_y": 1024,
         "readout_time": 0,
     }
-    if (
-        "CameraParameters" not in configuration["experiment"]
-        or type(configuration["experiment"]["CameraParameters"]) is not DictProxy
+    if "CameraParameters" not in configuration["experiment"] or not is_dict(
+        manager, configuration["experiment"]["CameraParameters"]
     ):
         update_config_dict(
             manager,
@@ -381,9 +460,8 @@ def verify_experiment_config(manager, configuration):
     for microscope_name in microscope_names:
         camera_setting_dict = configuration["experiment"]["CameraParameters"]
         if microscope_name:
-            if (
-                microscope_name not in camera_setting_dict
-                or type(camera_setting_dict[microscope_name]) is not DictProxy
+            if microscope_name not in camera_setting_dict or not is_dict(
+                manager, camera_setting_dict[microscope_name]
             ):
                 update_config_dict(
                     manager,
@@ -459,9 +537,8 @@ def verify_experiment_config(manager, configuration):
             device_config[microscope_name]["stage"].get("y_step", 500),
         )
 
-    if (
-        "StageParameters" not in configuration["experiment"]
-        or type(configuration["experiment"]["StageParameters"]) is not DictProxy
+    if "StageParameters" not in configuration["experiment"] or not is_dict(
+        manager, configuration["experiment"]["StageParameters"]
     ):
         update_config_dict(
             manager, configuration["experiment"], "StageParameters", stage_dict_sample
@@ -473,9 +550,8 @@ def verify_experiment_config(manager, configuration):
         stage_setting_dict["limits"] = True
 
     for microscope_name in stage_dict_sample:
-        if (
-            microscope_name not in stage_setting_dict.keys()
-            or type(stage_setting_dict[microscope_name]) is not DictProxy
+        if microscope_name not in stage_setting_dict.keys() or not is_dict(
+            manager, stage_setting_dict[microscope_name]
         ):
             update_config_dict(
                 manager,
@@ -500,10 +576,12 @@ def verify_experiment_config(manager, configuration):
                         ][k]
 
     # microscope state parameters
-    microscope_name = configuration["configuration"]["microscopes"].keys()[0]
-    zoom = configuration["configuration"]["microscopes"][microscope_name]["zoom"][
-        "position"
-    ].keys()[0]
+    microscope_name = list(configuration["configuration"]["microscopes"].keys())[0]
+    zoom = list(
+        configuration["configuration"]["microscopes"][microscope_name]["zoom"][
+            "position"
+        ].keys()
+    )[0]
     microscope_state_dict_sample = {
         "microscope_name": microscope_name,
         "image_mode": "live",
@@ -530,9 +608,8 @@ def verify_experiment_config(manager, configuration):
         "abs_z_end": 100.0,
         "waveform_template": "Default",
     }
-    if (
-        "MicroscopeState" not in configuration["experiment"]
-        or type(configuration["experiment"]["MicroscopeState"]) is not DictProxy
+    if "MicroscopeState" not in configuration["experiment"] or not is_dict(
+        manager, configuration["experiment"]["MicroscopeState"]
     ):
         update_config_dict(
             manager,
@@ -574,13 +651,14 @@ def verify_experiment_config(manager, configuration):
             "position"
         ].keys()
     ):
-        microscope_setting_dict["zoom"] = configuration["configuration"]["microscopes"][
-            microscope_name
-        ]["zoom"]["position"].keys()[0]
+        microscope_setting_dict["zoom"] = list(
+            configuration["configuration"]["microscopes"][microscope_name]["zoom"][
+                "position"
+            ].keys()
+        )[0]
     # channels
-    if (
-        "channels" not in microscope_setting_dict
-        or type(microscope_setting_dict["channels"]) is not DictProxy
+    if "channels" not in microscope_setting_dict or not is_dict(
+        manager, microscope_setting_dict["channels"]
     ):
         update_config_dict(manager, microscope_setting_dict, "channels", {})
     laser_list = [
@@ -602,7 +680,7 @@ def verify_experiment_config(manager, configuration):
     channel_nums = configuration["configuration"]["gui"]["channels"]["count"]
     channel_setting_dict = microscope_setting_dict["channels"]
     selected_channel_num = 0
-    for channel in channel_setting_dict.keys():
+    for channel in list(channel_setting_dict.keys()):
         if not channel.startswith(prefix):
             del channel_setting_dict[channel]
             continue
@@ -657,24 +735,19 @@ def verify_experiment_config(manager, configuration):
     microscope_setting_dict["selected_channels"] = selected_channel_num
 
     # MultiPositions
-    if (
-        "MultiPositions" not in configuration["experiment"]
-        or type(configuration["experiment"]["MultiPositions"]) is not ListProxy
-    ):
-        update_config_dict(manager, configuration["experiment"], "MultiPositions", [])
-    position_ids = []
-    multipositions = configuration["experiment"]["MultiPositions"]
-    for i, position in enumerate(multipositions):
-        try:
-            for j in range(5):
-                float(position[j])
-        except (ValueError, KeyError):
-            position_ids.append(i)
-
-    for idx in position_ids[::-1]:
-        del multipositions[idx]
-    if len(multipositions) < 1:
-        multipositions.append([10.0, 10.0, 10.0, 10.0, 10.0])
+    multipositions = configuration["experiment"].get("MultiPositions", None)
+    if type(multipositions) not in (list, ListProxy):
+        multipositions = []
+    positions = positions_to_array(multipositions)
+    positions = positions[validate_positions(positions)]
+    if len(positions) < 1:
+        positions = [[10.0, 10.0, 10.0, 10.0, 10.0]]
+    else:
+        positions = positions.tolist()
+    update_config_dict(
+        manager, configuration["experiment"], "MultiPositions", positions
+    )
+    multipositions = positions
 
     microscope_setting_dict["multiposition_count"] = len(multipositions)
 
@@ -707,23 +780,21 @@ def verify_waveform_constants(manager, configuration):
         from the configuration.
 
     """
-    if type(configuration["waveform_constants"]) is not DictProxy:
+    if not is_dict(manager, configuration["waveform_constants"]):
         update_config_dict(manager, configuration, "waveform_constants", {})
     waveform_dict = configuration["waveform_constants"]
 
     # remote_focus_constants
-    if (
-        "remote_focus_constants" not in waveform_dict.keys()
-        or type(waveform_dict["remote_focus_constants"]) is not DictProxy
+    if "remote_focus_constants" not in waveform_dict.keys() or not is_dict(
+        manager, waveform_dict["remote_focus_constants"]
     ):
         update_config_dict(manager, waveform_dict, "remote_focus_constants", {})
 
     waveform_dict = waveform_dict["remote_focus_constants"]
     for microscope_name in configuration["configuration"]["microscopes"].keys():
         config_dict = configuration["configuration"]["microscopes"][microscope_name]
-        if (
-            microscope_name not in waveform_dict.keys()
-            or type(waveform_dict[microscope_name]) is not DictProxy
+        if microscope_name not in waveform_dict.keys() or not is_dict(
+            manager, waveform_dict[microscope_name]
         ):
             update_config_dict(manager, waveform_dict, microscope_name, {})
 
@@ -734,17 +805,15 @@ def verify_waveform_constants(manager, configuration):
             lasers.append(laser_wavelength)
 
         for zoom in config_dict["zoom"]["position"].keys():
-            if (
-                zoom not in waveform_dict[microscope_name].keys()
-                or type(waveform_dict[microscope_name][zoom]) is not DictProxy
+            if zoom not in waveform_dict[microscope_name].keys() or not is_dict(
+                manager, waveform_dict[microscope_name][zoom]
             ):
                 update_config_dict(manager, waveform_dict[microscope_name], zoom, {})
 
             for laser in lasers:
-                if (
-                    laser not in waveform_dict[microscope_name][zoom].keys()
-                    or type(waveform_dict[microscope_name][zoom][laser])
-                    is not DictProxy
+                zoom_dict = waveform_dict[microscope_name][zoom]
+                if laser not in zoom_dict.keys() or not is_dict(
+                    manager, zoom_dict[laser]
                 ):
                     update_config_dict(
                         manager,
@@ -789,15 +858,14 @@ def verify_waveform_constants(manager, configuration):
                 waveform_dict[microscope_name].pop(k)
 
     # delete non-exist microscope
-    for k in waveform_dict.keys():
+    for k in list(waveform_dict.keys()):
         if k not in configuration["configuration"]["microscopes"].keys():
             waveform_dict.pop(k)
 
     # galvo_constants
     waveform_dict = configuration["waveform_constants"]
-    if (
-        "galvo_constants" not in waveform_dict.keys()
-        or type(waveform_dict["galvo_constants"]) is not DictProxy
+    if "galvo_constants" not in waveform_dict.keys() or not is_dict(
+        manager, waveform_dict["galvo_constants"]
     ):
         update_config_dict(manager, waveform_dict, "galvo_constants", {})
 
@@ -816,9 +884,8 @@ def verify_waveform_constants(manager, configuration):
     for i in range(galvo_num):
         waveform_dict = configuration["waveform_constants"]["galvo_constants"]
         galvo_ref = f"Galvo {i}"
-        if (
-            galvo_ref not in waveform_dict.keys()
-            or type(waveform_dict[galvo_ref]) is not DictProxy
+        if galvo_ref not in waveform_dict.keys() or not is_dict(
+            manager, waveform_dict[galvo_ref]
         ):
             update_config_dict(manager, waveform_dict, galvo_ref, {})
         waveform_dict = waveform_dict[galvo_ref]
@@ -833,16 +900,14 @@ def verify_waveform_constants(manager, configuration):
             ):
                 continue
             config_dict = configuration["configuration"]["microscopes"][microscope_name]
-            if (
-                microscope_name not in waveform_dict.keys()
-                or type(waveform_dict[microscope_name]) is not DictProxy
+            if microscope_name not in waveform_dict.keys() or not is_dict(
+                manager, waveform_dict[microscope_name]
             ):
                 update_config_dict(manager, waveform_dict, microscope_name, {})
 
             for zoom in config_dict["zoom"]["position"].keys():
-                if (
-                    zoom not in waveform_dict[microscope_name].keys()
-                    or type(waveform_dict[microscope_name][zoom]) is not DictProxy
+                if zoom not in waveform_dict[microscope_name].keys() or not is_dict(
+                    manager, waveform_dict[microscope_name][zoom]
                 ):
                     update_config_dict(
                         manager,
@@ -872,13 +937,13 @@ def verify_waveform_constants(manager, configuration):
                 if k not in config_dict["zoom"]["position"].keys():
                     waveform_dict[microscope_name].pop(k)
         # delete non-exist microscope
-        for k in waveform_dict.keys():
+        for k in list(waveform_dict.keys()):
             if k not in configuration["configuration"]["microscopes"].keys():
                 waveform_dict.pop(k)
 
     # other_constants
     waveform_dict = configuration["waveform_constants"]
-    microscope_name = configuration["configuration"]["microscopes"].keys()[0]
+    microscope_name = list(configuration["configuration"]["microscopes"].keys())[0]
     other_constants_dict = {
         "remote_focus_settle_duration": "0",
         "percent_smoothing": "0",
@@ -889,9 +954,8 @@ def verify_waveform_constants(manager, configuration):
             "camera"
         ]["delay"],
     }
-    if (
-        "other_constants" not in waveform_dict.keys()
-        or type(waveform_dict["other_constants"]) is not DictProxy
+    if "other_constants" not in waveform_dict.keys() or not is_dict(
+        manager, waveform_dict["other_constants"]
     ):
         update_config_dict(
             manager,
@@ -1047,7 +1111,7 @@ def verify_configuration(manager, configuration):
             filter_wheel_seq = []
 
         filter_wheel_config = device_config[microscope_name]["filter_wheel"]
-        if type(filter_wheel_config) == DictProxy:
+        if type(filter_wheel_config) in (dict, DictProxy):
             # support older version of configuration.yaml
             # filter_wheel_delay and available filters
             update_config_dict(
@@ -1073,7 +1137,7 @@ def verify_configuration(manager, configuration):
         if "stage" not in hardware_dict:
             hardware_dict["stage"] = []
         stages = device_config[microscope_name]["stage"]["hardware"]
-        if type(stages) != ListProxy:
+        if type(stages) not in (list, ListProxy):
             stages = [stages]
         for i, stage in enumerate(stages):
             stage_idx = build_ref_name("-", stage["type"], stage["serial_number"])
@@ -77,6 +77,7 @@ from navigate.model.concurrency.concurrency_tools import ObjectInSubprocess
 # Misc. Local Imports
 from navigate.config.config import (
     load_configs,
+    publish_config,
     update_config_dict,
     verify_experiment_config,
     verify_waveform_constants,
@@ -87,6 +88,7 @@ from navigate.tools.file_functions import create_save_path, save_yaml_file, get_
 from navigate.tools.common_dict_tools import update_stage_dict
 from navigate.tools.multipos_table_tools import update_table
 from navigate.tools.common_functions import combine_funcs
+from navigate.tools.tracing import tracer
 
 # Logger Setup
 import logging
@@ -174,6 +176,10 @@ class Controller:
         self.args = args
         logger.info(f"Variable Input Arguments: {self.args}")
 
+        # Record the timing of the acquisition pipeline
+        if getattr(args, "trace", None):
+            tracer.configure(enabled=True)
+
         #: Object: Thread pool for the controller.
         self.threads_pool = SynchronizedThreadPool()
 
@@ -183,9 +189,9 @@ class Controller:
         #: Manager: A shared memory manager
         self.manager = Manager()
 
-        #: dict: Configuration dictionary
-        self.configuration = load_configs(
-            self.manager,
+        # Load and verify the configuration as plain dictionaries, then share it
+        configuration = load_configs(
+            None,
             configuration=self.configuration_path,
             experiment=self.experiment_path,
             waveform_constants=self.waveform_constants_path,
@@ -194,9 +200,12 @@ class Controller:
             gui=self.gui_configuration_path,
         )
 
-        verify_configuration(self.manager, self.configuration)
-        verify_experiment_config(self.manager, self.configuration)
-        verify_waveform_constants(self.manager, self.configuration)
+        verify_configuration(None, configuration)
+        verify_experiment_config(None, configuration)
+        verify_waveform_constants(None, configuration)
+
+        #: dict: Configuration dictionary
+        self.configuration = publish_config(self.manager, configuration)
 
         total_ram, available_ram = get_ram_info()
         logger.info(
@@ -514,6 +523,10 @@ class Controller:
         self.configuration["experiment"]["MicroscopeState"][
             "multiposition_count"
         ] = len(positions)
+        # positions are in table order until a feature reorders them
+        self.configuration["experiment"]["MicroscopeState"].pop(
+            "multiposition_original_indices", None
+        )
 
         if (
             self.configuration["experiment"]["MicroscopeState"]["is_multiposition"]
@@ -955,6 +968,9 @@ class Controller:
             if hasattr(self, "waveform_popup_controller"):
                 self.waveform_popup_controller.save_waveform_constants()
 
+            if getattr(self.args, "trace", None):
+                self.dump_trace(self.args.trace)
+
             self.model.run_command("terminate")
             self.model = None
             self.event_queue.put(("stop", ""))
@@ -1076,7 +1092,6 @@ class Controller:
                 break
             # Receive the Image and log it.
             image_id = self.show_img_pipe.recv()
-            logger.info(f"Navigate Controller - Received Image: {image_id}")
 
             if image_id == "stop":
                 self.current_image_id = -1
@@ -1092,6 +1107,7 @@ class Controller:
                 self.execute("stop_acquire")
 
             # Display the image and update the histogram
+            start = tracer.begin()
             self.camera_view_controller.try_to_display_image(
                 image=self.data_buffer[image_id]
             )
@@ -1101,6 +1117,7 @@ class Controller:
             self.histogram_controller.populate_histogram(
                 image=self.data_buffer[image_id]
             )
+            tracer.end("display", start, image_id)
             images_received += 1
 
             # Update progress bar.
@@ -1149,6 +1166,24 @@ class Controller:
         )
         self.set_mode_of_sub("stop")
 
+    def dump_trace(self, filename):
+        """Write the acquisition pipeline trace of the model and the GUI.
+
+        The trace can be opened in chrome://tracing or Perfetto.
+
+        Parameters
+        ----------
+        filename : str
+            Path of the JSON file.
+        """
+        try:
+            events = self.model.get_trace_events() + tracer.events()
+            summary = {**self.model.get_trace_summary(), **tracer.summary()}
+            tracer.dump_chrome_trace(filename, events, summary)
+            logger.info(f"Acquisition pipeline trace saved to {filename}")
+        except Exception as e:
+            logger.debug(f"Unable to save the acquisition pipeline trace: {e}")
+
     def launch_additional_microscopes(self):
         """Launch additional microscopes."""
 
@@ -1342,6 +1377,10 @@ class Controller:
                 # Stop the software
                 break
 
+            elif event == "tracing":
+                # Timing percentiles of the acquisition pipeline
+                logger.info(f"Acquisition pipeline timing: {value}")
+
             elif event == "update_stage":
                 for _ in range(10):
                     try:
@@ -208,6 +208,9 @@ class BaseViewController(GUIController, ABaseViewController):
         #: list: The selected channels being acquired.
         self.selected_channels = None
 
+        #: list: The order of the channels on each plane, if not in table order.
+        self.channel_orders = None
+
         #: int: The index of the slice in the image volume.
         self.slice_index = 0
 
@@ -499,6 +502,16 @@ class BaseViewController(GUIController, ABaseViewController):
             # Every image that comes in will be the next channel.
             channel_idx = self.image_count % self.number_of_channels
             slice_idx = self.image_count // self.number_of_channels
+            if self.image_mode == "z-stack":
+                if self.image_count == 0:
+                    # the model may image the channels out of table order
+                    self.channel_orders = self.parent_controller.configuration[
+                        "experiment"
+                    ]["MicroscopeState"].get("channel_acquisition_order", None)
+                if self.channel_orders:
+                    order = self.channel_orders[slice_idx % len(self.channel_orders)]
+                    if len(order) == self.number_of_channels:
+                        channel_idx = order[channel_idx]
 
         elif self.image_mode != "customized" and self.stack_cycling_mode == "per_stack":
             channel_idx = self.image_count // self.number_of_slices
@@ -1422,6 +1435,9 @@ class MIPViewController(BaseViewController):
         #: np.ndarray: The maximum intensity projection in the XY plane.
         self.xy_mip = None
 
+        #: np.ndarray: The overview mosaic of a multi-position acquisition.
+        self.overview = None
+
         #: bool: The autoscale flag.
         self.autoscale = True
 
@@ -1463,7 +1479,12 @@ class MIPViewController(BaseViewController):
         self.image_palette["Autoscale"].widget.invoke()
         self.image_palette["SNR"].grid_remove()
 
-        self.render_widgets["perspective"].widget["values"] = ("XY", "ZY", "ZX")
+        self.render_widgets["perspective"].widget["values"] = (
+            "XY",
+            "ZY",
+            "ZX",
+            "Overview",
+        )
         self.render_widgets["perspective"].set("XY")
 
         self.get_selected_channels()
@@ -1538,14 +1559,20 @@ class MIPViewController(BaseViewController):
         else:
             return
 
-        if display_mode == "XY":
-            image = self.xy_mip[channel_idx]
-        elif display_mode == "ZY":
-            image = self.zy_mip[channel_idx, :].T
+        if display_mode == "Overview":
+            if self.overview is None:
+                return None
+            # The overview is assembled from images that are already flipped
+            image = self.overview
         else:
-            image = self.zx_mip[channel_idx, :]
+            if display_mode == "XY":
+                image = self.xy_mip[channel_idx]
+            elif display_mode == "ZY":
+                image = self.zy_mip[channel_idx, :].T
+            else:
+                image = self.zx_mip[channel_idx, :]
+            image = self.flip_image(image)
 
-        image = self.flip_image(image)
         # map the image to canvas size()
         image = self.down_sample_image(image, True)
         return image
@@ -1593,8 +1620,24 @@ class MIPViewController(BaseViewController):
             self.zx_mip[channel_idx, slice_idx], np.max(image, axis=1)
         )
 
+        # The model adds a tile to the overview at the end of each stack
+        if (
+            self.perspective == "Overview"
+            and self.image_count == self.total_images_per_volume
+        ):
+            self.update_overview()
+
         super().try_to_display_image(image)
 
+    def update_overview(self):
+        """Get the overview mosaic of the selected channel from the model."""
+        channel = self.render_widgets["channel"].get()
+        if channel not in self.selected_channels:
+            return
+        self.overview = self.parent_controller.model.get_overview_mosaic(
+            self.selected_channels.index(channel)
+        )
+
     def display_image(self, image):
         """Display an image using the LUT specified in the View.
 
@@ -1610,13 +1653,16 @@ class MIPViewController(BaseViewController):
             Image data.
         """
         self.image = self.get_mip_image()
-        self.process_image()
+        if self.image is not None:
+            self.process_image()
         with self.is_displaying_image as is_displaying_image:
             is_displaying_image.value = False
 
     def display_mip_image(self, *_):
         """Display MIP image in non-live view."""
 
+        if self.render_widgets["perspective"].get() == "Overview":
+            self.update_overview()
         if self.perspective != self.render_widgets["perspective"].get():
             self.update_perspective()
         if self.mode != "stop":
@@ -1649,6 +1695,11 @@ class MIPViewController(BaseViewController):
         elif display_mode == "ZX":
             self.original_image_width = self.Z_image_value
             self.original_image_height = self.XY_image_width
+        elif display_mode == "Overview" and self.overview is not None:
+            self.original_image_height, self.original_image_width = self.overview.shape
+        else:
+            self.original_image_width = self.XY_image_width
+            self.original_image_height = self.XY_image_height
 
         self.update_canvas_size()
         self.reset_display(False)
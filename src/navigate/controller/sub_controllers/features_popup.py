@@ -230,7 +230,10 @@ class FeatureListGraphController:
         self.feature_names = []
         temp = dir(feature_related_functions)
         for t in temp:
-            if inspect.isclass(getattr(feature_related_functions, t)):
+            # plugin features are listed without being imported
+            if t in feature_related_functions.lazy_features or inspect.isclass(
+                getattr(feature_related_functions, t)
+            ):
                 self.feature_names.append(t)
 
         # event
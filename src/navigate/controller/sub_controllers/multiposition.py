@@ -32,14 +32,20 @@
 
 # Standard Library Imports
 from tkinter import filedialog, messagebox
-import math
 import logging
 
 # Third Party Imports
+import numpy as np
 import pandas as pd
 
 # Local Imports
 from navigate.controller.sub_controllers.gui import GUIController
+from navigate.tools.multipos_table_tools import (
+    positions_to_array,
+    validate_positions,
+    load_positions_from_csv,
+    save_positions_to_csv,
+)
 
 
 # Logger Setup
@@ -95,15 +101,12 @@ class MultiPositionController(GUIController):
 
         Parameters
         ----------
-        positions : [[]]
-            positions to be set
+        positions : [[]] or np.array
+            positions to be set, in the format of [[x, y, z, theta, f], ]
         """
-        axis_dict = {"x": "X", "y": "Y", "z": "Z", "theta": "R", "f": "F"}
-        data = {}
-
-        for i, name in enumerate(axis_dict.keys()):
-            data[axis_dict[name]] = list(pos[i] for pos in positions)
-        self.table.model.df = pd.DataFrame(data)
+        self.table.model.df = pd.DataFrame(
+            positions_to_array(positions), columns=list("XYZRF")
+        )
         self.table.currentrow = 0
         self.table.redraw()
         self.table.tableChanged()
@@ -112,28 +115,37 @@ class MultiPositionController(GUIController):
     def get_positions(self):
         """Return all positions from the Multi-Position Acquisition Interface.
 
+        Rows with missing or non-numeric values are skipped. Positions outside of
+        the stage limits are kept, but reported.
+
         Returns
         -------
         list
             positions in the format of [[x, y, z, theta, f], ]
         """
-        positions = []
-        rows = self.table.model.df.shape[0]
-        for i in range(rows):
-            temp = list(self.table.model.df.iloc[i])
-            if (
-                len(
-                    list(
-                        filter(
-                            lambda v: type(v) in (float, int) and not math.isnan(v),
-                            temp,
-                        )
-                    )
+        positions = positions_to_array(self.table.model.df)
+        positions = positions[validate_positions(positions)]
+
+        configuration = getattr(self.parent_controller, "configuration", None)
+        try:
+            microscope_name = configuration["experiment"]["MicroscopeState"][
+                "microscope_name"
+            ]
+            limits = configuration["experiment"]["StageParameters"]["limits"]
+            stage_config = configuration["configuration"]["microscopes"][
+                microscope_name
+            ]["stage"]
+        except (KeyError, TypeError):
+            limits = False
+        if limits:
+            out_of_limits = (~validate_positions(positions, stage_config)).sum()
+            if out_of_limits > 0:
+                logger.warning(
+                    f"{out_of_limits} multi-position(s) are outside of the stage "
+                    f"limits of {microscope_name}"
                 )
-                == 5
-            ):
-                positions.append(temp)
-        return positions
+
+        return positions.tolist()
 
     def handle_double_click(self, event):
         """Move to a position within the Multi-Position Acquisition Interface.
@@ -194,18 +206,16 @@ class MultiPositionController(GUIController):
         )
         if not filename:
             return
-        df = pd.read_csv(filename[0])
-        # validate the csv file
-        df.columns = map(lambda v: v.upper(), df.columns)
-        cmp_header = df.columns == ["X", "Y", "Z", "R", "F"]
-        if not cmp_header.all():
+        try:
+            positions = load_positions_from_csv(filename[0])
+        except ValueError:
             messagebox.showwarning(
                 title="Warning",
                 message="The csv file isn't right, it should contain [X, Y, Z, R, F]",
             )
             logger.info("The csv file isn't right, it should contain [X, Y, Z, R, F]")
             return
-        self.table.model.df = df
+        self.table.model.df = pd.DataFrame(positions, columns=list("XYZRF"))
         self.table.currentrow = 0
         # reset index
         self.table.resetColors()
@@ -226,7 +236,7 @@ class MultiPositionController(GUIController):
         )
         if not filename:
             return
-        self.table.model.df.to_csv(filename, index=False)
+        save_positions_to_csv(filename, self.table.model.df)
         self.show_verbose_info("exporting csv file", filename)
 
     def move_to_position(self):
@@ -279,12 +289,11 @@ class MultiPositionController(GUIController):
             False: the position should be removed
             True: the position should be kept
         """
-        positions = self.get_positions()
-        l = len(position_flag_list)  # noqa
-        new_positions = [
-            p for i, p in enumerate(positions) if (i >= l or position_flag_list[i])
-        ]
-        self.set_positions(new_positions)
+        positions = positions_to_array(self.get_positions())
+        keep = np.ones(positions.shape[0], dtype=bool)
+        n = min(len(position_flag_list), positions.shape[0])
+        keep[:n] = np.array(position_flag_list[:n], dtype=bool)
+        self.set_positions(positions[keep])
 
     @property
     def custom_events(self):
@@ -32,6 +32,7 @@
 
 # Standard library imports
 from pathlib import Path
+import functools
 import os
 import tkinter as tk
 from tkinter import messagebox
@@ -43,10 +44,16 @@ from navigate.config.config import get_navigate_path
 from navigate.view.custom_widgets.popup import PopUp
 from navigate.tools.file_functions import load_yaml_file, save_yaml_file
 from navigate.tools.common_functions import combine_funcs
-from navigate.tools.decorators import AcquisitionMode
 from navigate.controller.sub_controllers.gui import GUIController
 from navigate.view.popups.plugins_popup import PluginsPopup
-from navigate.plugins.plugin_manager import PluginFileManager, PluginPackageManager
+from navigate.plugins.plugin_manager import (
+    PluginFileManager,
+    PluginPackageManager,
+    PluginManifest,
+    lazy_class,
+    register_plugin_features,
+    get_plugin_acquisition_modes,
+)
 
 
 class PluginsController:
@@ -88,35 +95,51 @@ class PluginsController:
         plugins_config_path = os.path.join(
             get_navigate_path(), "config", "plugins_config.yml"
         )
+        plugin_manifest = PluginManifest(
+            os.path.join(get_navigate_path(), "config", "plugins_manifest.yml")
+        )
         plugin_file_manager = PluginFileManager(plugins_path, plugins_config_path)
-        self.load_plugins_through_manager(plugin_file_manager)
-        self.load_plugins_through_manager(PluginPackageManager)
+        self.load_plugins_through_manager(plugin_file_manager, plugin_manifest)
+        self.load_plugins_through_manager(PluginPackageManager, plugin_manifest)
+        plugin_manifest.save()
 
-    def load_plugins_through_manager(self, plugin_manager):
+    def load_plugins_through_manager(self, plugin_manager, plugin_manifest):
         """Load plugins through plugin manager
 
         Parameters
         ----------
         plugin_manager : object
             PluginManager object
+        plugin_manifest : PluginManifest
+            Cache of what each plugin provides
         """
         plugins = plugin_manager.get_plugins()
 
         for plugin_name, plugin_ref in plugins.items():
 
-            # read "plugin_config.yml"
-            plugin_config = plugin_manager.load_config(plugin_ref)
-            if plugin_config is None:
-                continue
-            plugin_display_name = plugin_config.get("name", plugin_name)
-
-            plugin_frame = plugin_manager.load_view(plugin_ref, plugin_display_name)
-            plugin_controller = plugin_manager.load_controller(
-                plugin_ref, plugin_display_name
+            manifest = plugin_manifest.get_manifest(
+                plugin_manager, plugin_name, plugin_ref
             )
-
-            if plugin_frame and plugin_controller:
-                if plugin_config["view"] == "Popup":
+            if manifest is None:
+                continue
+            plugin_config = manifest["config"]
+            plugin_display_name = manifest["name"]
+
+            if manifest["gui"]:
+                if plugin_config.get("view", None) == "Popup":
+                    # the popup is imported when it is opened for the first time
+                    plugin_frame = lazy_class(
+                        functools.partial(
+                            plugin_manager.load_view, plugin_ref, plugin_display_name
+                        )
+                    )
+                    plugin_controller = lazy_class(
+                        functools.partial(
+                            plugin_manager.load_controller,
+                            plugin_ref,
+                            plugin_display_name,
+                        )
+                    )
                     # menu
                     self.parent_controller.view.menubar.menu_plugins.add_command(
                         label=plugin_name,
@@ -125,17 +148,25 @@ class PluginsController:
                         ),
                     )
                 else:
-                    self.build_tab_window(plugin_name, plugin_frame, plugin_controller)
+                    plugin_frame = plugin_manager.load_view(
+                        plugin_ref, plugin_display_name
+                    )
+                    plugin_controller = plugin_manager.load_controller(
+                        plugin_ref, plugin_display_name
+                    )
+                    if plugin_frame and plugin_controller:
+                        self.build_tab_window(
+                            plugin_name, plugin_frame, plugin_controller
+                        )
             # feature
-            plugin_manager.load_features(plugin_ref)
+            register_plugin_features(plugin_manager, plugin_ref, manifest)
 
             # acquisition mode
-            acquisition_modes = plugin_config.get("acquisition_modes", [])
-            plugin_manager.load_acquisition_modes(
-                plugin_ref,
-                acquisition_modes,
-                self.register_acquisition_mode,
+            acquisition_modes = get_plugin_acquisition_modes(
+                plugin_manager, plugin_ref, manifest
             )
+            for acquisition_mode_name, acquisition_mode in acquisition_modes.items():
+                self.register_acquisition_mode(acquisition_mode_name, acquisition_mode)
 
     def build_tab_window(self, plugin_name, frame, controller):
         """Build tab for a plugin
@@ -236,26 +267,20 @@ class PluginsController:
 
         return func_with_wrapper
 
-    def register_acquisition_mode(self, acquisition_mode_name, module):
+    def register_acquisition_mode(self, acquisition_mode_name, acquisition_mode):
         """Register acquisition mode
 
         Parameters
         ----------
         acquisition_mode_name : str
             The name of an acquisition mode
-        module : module
-            acquisition mode module
+        acquisition_mode : func
+            the function to create the acquisition mode object, which is imported
+            on first use
         """
-        if not module:
-            return
-        acquisition_mode = [
-            m for m in dir(module) if isinstance(getattr(module, m), AcquisitionMode)
-        ]
-        if acquisition_mode:
-            self.parent_controller.add_acquisition_mode(
-                acquisition_mode_name,
-                getattr(module, acquisition_mode[0]),
-            )
+        self.parent_controller.add_acquisition_mode(
+            acquisition_mode_name, acquisition_mode
+        )
 
 
 class UninstallPluginController(GUIController):
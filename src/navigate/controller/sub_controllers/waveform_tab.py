@@ -39,6 +39,7 @@ from tkinter import NSEW
 
 # Local Imports
 from navigate.controller.sub_controllers.gui import GUIController
+from navigate.model.shared_waveforms import read_waveforms
 from navigate.tools.waveform_template_funcs import get_waveform_template_parameters
 
 # Logger Setup
@@ -46,6 +47,36 @@ p = __name__.split(".")[1]
 logger = logging.getLogger(p)
 
 
+def min_max_envelope(waveform, bins):
+    """Decimate a waveform to the minimum and maximum of equally sized bins.
+
+    Drawn as a line, the envelope looks the same as the full waveform when there
+    is about one bin per pixel.
+
+    Parameters
+    ----------
+    waveform : np.ndarray
+        Waveform
+    bins : int
+        Number of bins
+
+    Returns
+    -------
+    index : np.ndarray
+        Sample index of each point
+    envelope : np.ndarray
+        Minimum and maximum of each bin, in turn
+    """
+    waveform = np.asarray(waveform)
+    if len(waveform) <= 2 * bins:
+        return np.arange(len(waveform)), waveform
+    edges = np.linspace(0, len(waveform), bins + 1).astype(int)[:-1]
+    envelope = np.empty(2 * bins, dtype=waveform.dtype)
+    envelope[0::2] = np.minimum.reduceat(waveform, edges)
+    envelope[1::2] = np.maximum.reduceat(waveform, edges)
+    return np.repeat(edges, 2), envelope
+
+
 class WaveformTabController(GUIController):
     """Controller for the waveform tab"""
 
@@ -67,6 +98,15 @@ class WaveformTabController(GUIController):
         #: dict: Dictionary of laser waveforms
         self.laser_ao_waveforms = 0
 
+        #: dict: Dictionary of waveforms
+        self.waveform_dict = None
+
+        #: int: Version of the waveforms in the shared buffer
+        self.waveform_version = None
+
+        #: tuple: Waveform version, repeats, sample rate and plot width last drawn
+        self.plotted_state = None
+
         self.initialize_plots()
 
         microscope_name = self.parent_controller.configuration["experiment"][
@@ -128,16 +168,27 @@ class WaveformTabController(GUIController):
         event = type("MyEvent", (object,), {})
         self.plot_waveforms(event)
 
-    def update_waveforms(self, waveform_dict):
+    def update_waveforms(self, notification):
         """Update the waveforms in the waveform tab
 
+        The model shares the waveforms through shared memory. They are copied and
+        plotted only when their version changes.
+
         Parameters
         ----------
-        waveform_dict : dict
-            Dictionary of waveforms
+        notification : dict
+            Shared buffer, layout and version of the waveforms, as sent by
+            Model.publish_waveforms()
         """
-        #: dict: Dictionary of waveforms
-        self.waveform_dict = waveform_dict
+        if notification["version"] == self.waveform_version:
+            return
+        try:
+            self.waveform_dict = read_waveforms(notification)
+        except FileNotFoundError:
+            # the buffer has been replaced, a newer notification follows
+            logger.debug("Waveform buffer is not available anymore.")
+            return
+        self.waveform_version = notification["version"]
         event = type("MyEvent", (object,), {})
         self.plot_waveforms(event)
 
@@ -169,8 +220,8 @@ class WaveformTabController(GUIController):
             and parent_notebook.tab(current_tab, "text") != "Waveforms"
         ):
             return
-        self.view.plot_etl.clear()
-        self.view.plot_galvo.clear()
+        if self.waveform_dict is None:
+            return
 
         waveform_template_name = self.parent_controller.configuration["experiment"][
             "MicroscopeState"
@@ -180,6 +231,22 @@ class WaveformTabController(GUIController):
             self.parent_controller.configuration["waveform_templates"],
             self.parent_controller.configuration["experiment"]["MicroscopeState"],
         )
+        waveform_repeat_total_num = repeat_num * expand_num
+
+        # redraw only if the waveforms or the way they are drawn changed
+        width = max(int(self.view.fig.bbox.width), 1)
+        plotted_state = (
+            self.waveform_version,
+            waveform_repeat_total_num,
+            self.sample_rate,
+            width,
+        )
+        if plotted_state == self.plotted_state:
+            return
+        self.plotted_state = plotted_state
+
+        self.view.plot_etl.clear()
+        self.view.plot_galvo.clear()
 
         last_etl = 0
         last_galvo = 0
@@ -224,65 +291,58 @@ class WaveformTabController(GUIController):
         else:
             scale = (true_max - true_min) / (max_camera_waveform - min_camera_waveform)
 
-        for k in sorted(self.waveform_dict["camera_waveform"].keys()):
-            if self.waveform_dict["remote_focus_waveform"][k] is None:
-                continue
+        channel_keys = [
+            k
+            for k in sorted(self.waveform_dict["camera_waveform"].keys())
+            if self.waveform_dict["remote_focus_waveform"][k] is not None
+        ]
+        # about one minimum and maximum per pixel across all the repeats
+        bins = max(width // max(len(channel_keys) * waveform_repeat_total_num, 1), 1)
+
+        for k in channel_keys:
             remote_focus_waveform = self.waveform_dict["remote_focus_waveform"][k]
 
             galvo_waveform_list = []
             for galvo_waveform in self.waveform_dict["galvo_waveform"]:
                 if galvo_waveform[k] is None:
                     continue
-                max_galvo_waveform = np.maximum(
-                    max_galvo_waveform, np.max(galvo_waveform[k])
-                )
-                min_galvo_waveform = np.minimum(
-                    min_galvo_waveform, np.min(galvo_waveform[k])
-                )
                 galvo_waveform_list += [galvo_waveform[k]]
 
             camera_waveform = (
                 scale * self.waveform_dict["camera_waveform"][k] + true_min
             )
 
-            waveform_repeat_total_num = repeat_num * expand_num
-
             channel_index = k[-1]
             label = "CH" + channel_index
 
-            self.view.plot_etl.plot(
-                np.arange(len(remote_focus_waveform) * waveform_repeat_total_num)
-                / self.sample_rate
-                + last_etl,
-                np.hstack([remote_focus_waveform] * waveform_repeat_total_num),
+            self.plot_waveform(
+                self.view.plot_etl,
+                remote_focus_waveform,
+                last_etl,
+                waveform_repeat_total_num,
+                bins,
                 label=label,
             )
-            # ax = self.view.plot_galvo.axis
             for i, galvo_waveform in enumerate(galvo_waveform_list):
                 label = label + " G" + str(i)
-                self.view.plot_galvo.plot(
-                    np.arange(len(galvo_waveform) * waveform_repeat_total_num)
-                    / self.sample_rate
-                    + last_galvo,
-                    np.hstack([galvo_waveform] * waveform_repeat_total_num),
+                self.plot_waveform(
+                    self.view.plot_galvo,
+                    galvo_waveform,
+                    last_galvo,
+                    waveform_repeat_total_num,
+                    bins,
                     label=label,
                 )
-            self.view.plot_etl.plot(
-                np.arange(len(camera_waveform) * waveform_repeat_total_num)
-                / self.sample_rate
-                + last_camera,
-                np.hstack([camera_waveform] * waveform_repeat_total_num),
-                c="k",
-                linestyle="--",
-            )
-            self.view.plot_galvo.plot(
-                np.arange(len(camera_waveform) * waveform_repeat_total_num)
-                / self.sample_rate
-                + last_camera,
-                np.hstack([camera_waveform] * waveform_repeat_total_num),
-                c="k",
-                linestyle="--",
-            )
+            for axis in (self.view.plot_etl, self.view.plot_galvo):
+                self.plot_waveform(
+                    axis,
+                    camera_waveform,
+                    last_camera,
+                    waveform_repeat_total_num,
+                    bins,
+                    c="k",
+                    linestyle="--",
+                )
             last_etl += (
                 len(remote_focus_waveform)
                 * waveform_repeat_total_num
@@ -311,6 +371,32 @@ class WaveformTabController(GUIController):
 
         self.view.canvas.draw_idle()
 
+    def plot_waveform(self, axis, waveform, start, repeat, bins, **kwargs):
+        """Plot the min/max envelope of a repeated waveform
+
+        The envelope of one period is drawn at the offset of each repeat, rather
+        than drawing copies of the waveform.
+
+        Parameters
+        ----------
+        axis : matplotlib.axes.Axes
+            Axis to plot in
+        waveform : np.ndarray
+            One period of the waveform
+        start : float
+            Start time of the first repeat (s)
+        repeat : int
+            Number of repeats
+        bins : int
+            Number of envelope bins per repeat
+        **kwargs
+            Keyword arguments of matplotlib.axes.Axes.plot
+        """
+        index, envelope = min_max_envelope(waveform, bins)
+        offsets = start + np.arange(repeat) * len(waveform) / self.sample_rate
+        time = index[np.newaxis, :] / self.sample_rate + offsets[:, np.newaxis]
+        axis.plot(time.ravel(), np.tile(envelope, repeat), **kwargs)
+
     def set_mode(self, mode):
         """Set the mode of the waveform tab
 
@@ -0,0 +1,520 @@
+# Copyright (c) 2021-2024  The University of Texas Southwestern Medical Center.
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted for academic and research use only
+# (subject to the limitations in the disclaimer below)
+# provided that the following conditions are met:
+
+#      * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#      * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+
+#      * Neither the name of the copyright holders nor the names of its
+#      contributors may be used to endorse or promote products derived from this
+#      software without specific prior written permission.
+
+# NO EXPRESS OR IMPLIED LICENSES TO ANY PARTY'S PATENT RIGHTS ARE GRANTED BY
+# THIS LICENSE. THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+# PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+# Standard Library Imports
+import sys
+import json
+import time
+import logging
+import threading
+import multiprocessing as mp
+from multiprocessing import Manager
+from pathlib import Path
+from queue import Empty
+from types import SimpleNamespace
+
+# Third Party Imports
+
+# Local Imports
+from navigate.config.config import (
+    load_configs,
+    publish_config,
+    verify_configuration,
+    verify_experiment_config,
+    verify_waveform_constants,
+)
+from navigate.log_files.log_functions import log_setup
+from navigate.model.concurrency.concurrency_tools import ObjectInSubprocess
+from navigate.model.model import Model
+from navigate.tools.file_functions import create_save_path, save_yaml_file
+from navigate.tools.tracing import tracer
+from navigate.tools.main_functions import (
+    create_headless_parser,
+    evaluate_headless_parser_input_arguments,
+)
+
+# Logger Setup
+p = __name__.split(".")[1]
+logger = logging.getLogger(p)
+
+
+def expected_frame_count(experiment):
+    """Calculate the number of frames an acquisition will deliver.
+
+    Parameters
+    ----------
+    experiment : dict
+        The experiment configuration.
+
+    Returns
+    -------
+    int or None
+        The number of frames, or None if it is not known in advance (e.g. live or
+        customized acquisitions).
+    """
+    microscope_state = experiment["MicroscopeState"]
+    mode = microscope_state["image_mode"]
+    if mode not in ["single", "z-stack"]:
+        return None
+
+    number_of_channels = sum(
+        [v["is_selected"] is True for v in microscope_state["channels"].values()]
+    )
+    number_of_positions = (
+        len(experiment["MultiPositions"])
+        if microscope_state["is_multiposition"]
+        else 1
+    )
+    number_of_slices = (
+        int(microscope_state["number_z_steps"]) if mode == "z-stack" else 1
+    )
+    return (
+        number_of_channels
+        * number_of_slices
+        * int(microscope_state["timepoints"])
+        * number_of_positions
+    )
+
+
+class HeadlessRunner:
+    """Run acquisitions without the graphical user interface.
+
+    The runner constructs the Model from configuration and experiment files, runs
+    acquisitions (optionally with a feature list) and reports progress, throughput
+    and warnings to stdout and/or a JSON Lines log. Data is saved exactly as in the
+    GUI: the experiment and waveform constants are written to a new save directory
+    created from the experiment's Saving settings.
+    """
+
+    def __init__(
+        self,
+        configuration_path,
+        experiment_path,
+        waveform_constants_path,
+        rest_api_path=None,
+        waveform_templates_path=None,
+        synthetic_hardware=False,
+        in_subprocess=False,
+        log_file=None,
+        progress_interval=1.0,
+        verbose=True,
+        trace_file=None,
+    ):
+        """Initialize the headless runner.
+
+        Parameters
+        ----------
+        configuration_path : str
+            Path to the configuration.yaml file.
+        experiment_path : str
+            Path to the experiment.yml file.
+        waveform_constants_path : str
+            Path to the waveform_constants.yml file.
+        rest_api_path : str, optional
+            Path to the rest_api_config.yml file.
+        waveform_templates_path : str, optional
+            Path to the waveform_templates.yml file.
+        synthetic_hardware : bool
+            Use synthetic devices instead of the hardware in the configuration.
+        in_subprocess : bool
+            Run the model in a child process, as the GUI does.
+        log_file : str, optional
+            Path of a JSON Lines file that receives one record per report.
+        progress_interval : float
+            Minimum time between progress reports, in seconds.
+        verbose : bool
+            Print reports to stdout.
+        trace_file : str, optional
+            Record the timing of the acquisition pipeline, report its percentiles
+            and save it to this Chrome trace file when the runner is closed.
+        """
+        #: Manager: A shared memory manager
+        self.manager = Manager()
+
+        # Load and verify the configuration as plain dictionaries, then share it
+        configuration = load_configs(
+            None,
+            configuration=configuration_path,
+            experiment=experiment_path,
+            waveform_constants=waveform_constants_path,
+            rest_api_config=rest_api_path,
+            waveform_templates=waveform_templates_path,
+        )
+        verify_configuration(None, configuration)
+        verify_experiment_config(None, configuration)
+        verify_waveform_constants(None, configuration)
+
+        #: dict: Configuration dictionary
+        self.configuration = publish_config(self.manager, configuration)
+
+        #: float: Minimum time between progress reports, in seconds.
+        self.progress_interval = progress_interval
+
+        #: bool: Print reports to stdout.
+        self.verbose = verbose
+
+        #: file: JSON Lines log file.
+        self.log_file = open(log_file, "a") if log_file else None
+
+        #: str: Chrome trace file of the acquisition pipeline.
+        self.trace_file = trace_file
+
+        #: list: Warnings received from the model.
+        self.warnings = []
+
+        #: mp.Queue: Queue for retrieving events ('event_name', value) from model
+        self.event_queue = mp.Queue(100)
+
+        args = SimpleNamespace(
+            synthetic_hardware=synthetic_hardware, trace=trace_file
+        )
+        if in_subprocess:
+            #: Model: Model object, in this process or in a child process.
+            self.model = ObjectInSubprocess(
+                Model, args, self.configuration, event_queue=self.event_queue
+            )
+        else:
+            self.model = Model(args, self.configuration, event_queue=self.event_queue)
+
+        #: mp.Pipe: Pipe for receiving frame ids from the model.
+        self.show_img_pipe = self.model.create_pipe("show_img_pipe")
+
+        self._stop_event_thread = threading.Event()
+        #: threading.Thread: Thread that drains the model's event queue.
+        self.event_thread = threading.Thread(
+            target=self.receive_events, name="headless events", daemon=True
+        )
+        self.event_thread.start()
+
+    def report(self, event, **kwargs):
+        """Report an event to stdout and the JSON log.
+
+        Parameters
+        ----------
+        event : str
+            Name of the event, e.g. 'start', 'progress', 'warning' or 'finished'.
+        **kwargs
+            JSON serializable values describing the event.
+        """
+        record = {"event": event, "time": time.time(), **kwargs}
+        if self.log_file:
+            self.log_file.write(json.dumps(record, default=str) + "\n")
+            self.log_file.flush()
+        if self.verbose:
+            values = ", ".join(f"{k}: {v}" for k, v in kwargs.items())
+            print(f"[navigate] {event} - {values}", flush=True)
+
+    def receive_events(self):
+        """Drain the model's event queue so the model never blocks on it."""
+        while not self._stop_event_thread.is_set():
+            try:
+                event, value = self.event_queue.get(timeout=0.1)
+            except Empty:
+                continue
+            except (EOFError, OSError, ValueError):
+                break
+            if event == "warning":
+                self.warnings.append(str(value))
+                self.report("warning", message=str(value))
+            elif event == "tracing":
+                self.report("tracing", stages=value)
+            else:
+                logger.debug(f"Headless runner ignored model event: {event}")
+
+    def load_feature_list(self, filename, feature_names):
+        """Load feature lists from a python file and select the last one.
+
+        Parameters
+        ----------
+        filename : str
+            Path to a python file with functions that return feature lists.
+        feature_names : list
+            Names of the functions to load.
+
+        Returns
+        -------
+        int
+            The id of the selected feature list.
+        """
+        feature_id = self.model.load_feature_list_from_file(
+            Path(filename).resolve().as_posix(), list(feature_names)
+        )
+        self.select_feature_list(feature_id)
+        return feature_id
+
+    def select_feature_list(self, feature_id):
+        """Select the feature list of the next acquisition.
+
+        The model unloads the feature list at the end of each acquisition, so it has
+        to be selected again before every run.
+
+        Parameters
+        ----------
+        feature_id : int
+            The id of the feature list, starting from 1.
+        """
+        self.model.run_command("load_feature", feature_id)
+        self.configuration["experiment"]["MicroscopeState"]["image_mode"] = "customized"
+
+    def prepare_acquisition(self, mode=None, save=None, save_directory=None):
+        """Update the experiment before an acquisition, as the GUI does.
+
+        Parameters
+        ----------
+        mode : str, optional
+            Acquisition mode, e.g. 'single', 'z-stack' or 'customized'.
+        save : bool, optional
+            Save the acquired data.
+        save_directory : str, optional
+            Root directory for saving data.
+
+        Returns
+        -------
+        str or None
+            The directory data is saved to, None if data is not saved.
+        """
+        experiment = self.configuration["experiment"]
+        microscope_state = experiment["MicroscopeState"]
+        if mode is not None:
+            microscope_state["image_mode"] = mode
+        if save is not None:
+            microscope_state["is_save"] = bool(save)
+        if save_directory is not None:
+            experiment["Saving"]["root_directory"] = str(save_directory)
+
+        # set waveform template
+        mode = microscope_state["image_mode"]
+        if mode in ["live", "single", "z-stack"]:
+            camera_setting = experiment["CameraParameters"][
+                microscope_state["microscope_name"]
+            ]
+            if camera_setting["sensor_mode"] == "Light-Sheet" and camera_setting[
+                "readout_direction"
+            ] in ["Bidirectional", "Rev. Bidirectional"]:
+                microscope_state["waveform_template"] = "Bidirectional"
+            else:
+                microscope_state["waveform_template"] = "Default"
+
+        microscope_state["multiposition_count"] = len(experiment["MultiPositions"])
+        # positions are in table order until a feature reorders them
+        microscope_state.pop("multiposition_original_indices", None)
+
+        if not microscope_state["is_save"]:
+            return None
+
+        file_directory = create_save_path(experiment["Saving"])
+        save_yaml_file(
+            file_directory=file_directory,
+            content_dict=experiment,
+            filename="experiment.yml",
+        )
+        save_yaml_file(
+            file_directory=file_directory,
+            content_dict=self.configuration["waveform_constants"],
+            filename="waveform_constants.yml",
+        )
+        return file_directory
+
+    def run(self, mode=None, save=None, save_directory=None, timeout=None):
+        """Run one acquisition and wait until it finishes.
+
+        Parameters
+        ----------
+        mode : str, optional
+            Acquisition mode, e.g. 'single', 'z-stack' or 'customized'. Defaults to
+            the mode of the experiment.
+        save : bool, optional
+            Save the acquired data. Defaults to the experiment setting.
+        save_directory : str, optional
+            Root directory for saving data. Defaults to the experiment setting.
+        timeout : float, optional
+            Stop the acquisition if no frame arrives for this many seconds.
+
+        Returns
+        -------
+        dict
+            Summary of the acquisition: status, frames, elapsed time, frames per
+            second, save directory and warnings.
+        """
+        experiment = self.configuration["experiment"]
+        file_directory = self.prepare_acquisition(mode, save, save_directory)
+        mode = experiment["MicroscopeState"]["image_mode"]
+        expected_frames = expected_frame_count(experiment)
+        warning_count = len(self.warnings)
+        self.report(
+            "start",
+            mode=mode,
+            expected_frames=expected_frames,
+            save_directory=file_directory,
+        )
+
+        # The model sends the id of the last frame of each batch of frames it
+        # receives. Ids index the circular data buffer, starting at 0.
+        buffer_size = self.model.number_of_frames
+        last_image_id = -1
+        frames = 0
+        status = "completed"
+        start_time = time.perf_counter()
+        last_report_time = start_time
+        try:
+            self.model.run_command("acquire")
+            while True:
+                if timeout is not None and not self.show_img_pipe.poll(timeout):
+                    status = "timeout"
+                    break
+                image_id = self.show_img_pipe.recv()
+                if image_id == "stop":
+                    break
+                if not isinstance(image_id, int):
+                    status = "error"
+                    self.report("error", message=f"Unexpected frame id {image_id}")
+                    break
+                frames += (image_id - last_image_id) % buffer_size
+                last_image_id = image_id
+                current_time = time.perf_counter()
+                if current_time - last_report_time >= self.progress_interval:
+                    last_report_time = current_time
+                    elapsed = current_time - start_time
+                    self.report(
+                        "progress",
+                        frames=frames,
+                        expected_frames=expected_frames,
+                        elapsed=round(elapsed, 3),
+                        frames_per_second=round(frames / elapsed, 3),
+                    )
+        except Exception as e:
+            status = "error"
+            logger.exception("Headless acquisition failed")
+            self.report("error", message=repr(e))
+        finally:
+            # Waits for the signal and data threads, i.e. until the data is closed
+            self.model.run_command("stop")
+            while self.show_img_pipe.poll():
+                self.show_img_pipe.recv()
+
+        elapsed = time.perf_counter() - start_time
+        if status == "completed" and expected_frames not in (None, frames):
+            status = "incomplete"
+        summary = {
+            "status": status,
+            "mode": mode,
+            "frames": frames,
+            "expected_frames": expected_frames,
+            "elapsed": round(elapsed, 3),
+            "frames_per_second": round(frames / elapsed, 3) if elapsed > 0 else 0,
+            "save_directory": file_directory,
+            "warnings": self.warnings[warning_count:],
+        }
+        self.report("finished", **summary)
+        return summary
+
+    def close(self):
+        """Shut down the model, the event thread and the shared memory manager."""
+        self._stop_event_thread.set()
+        self.event_thread.join()
+        if self.trace_file:
+            tracer.dump_chrome_trace(
+                self.trace_file,
+                self.model.get_trace_events(),
+                self.model.get_trace_summary(),
+            )
+            self.report("trace", file=str(self.trace_file))
+        self.model.run_command("terminate")
+        self.model.release_pipe("show_img_pipe")
+        if isinstance(self.model, ObjectInSubprocess):
+            self.model.terminate()
+        self.model = None
+        if self.log_file:
+            self.log_file.close()
+            self.log_file = None
+        self.manager.shutdown()
+
+
+def main():
+    """Run a headless (GUI-free) navigate acquisition.
+
+    Loads the configuration and experiment files, optionally a feature list, runs
+    the acquisition and reports progress to stdout and/or a JSON Lines log. The exit
+    code is 0 if all acquisitions completed.
+    """
+    parser = create_headless_parser()
+    args = parser.parse_args()
+
+    (
+        configuration_path,
+        experiment_path,
+        waveform_constants_path,
+        rest_api_path,
+        waveform_templates_path,
+        logging_path,
+    ) = evaluate_headless_parser_input_arguments(args)
+
+    log_setup("logging.yml", logging_path)
+
+    runner = HeadlessRunner(
+        configuration_path,
+        experiment_path,
+        waveform_constants_path,
+        rest_api_path,
+        waveform_templates_path,
+        synthetic_hardware=args.synthetic_hardware,
+        in_subprocess=args.subprocess,
+        log_file=args.json_log,
+        progress_interval=args.progress_interval,
+        verbose=not args.quiet,
+        trace_file=args.trace,
+    )
+    status = []
+    try:
+        feature_id = None
+        if args.feature_list_file:
+            feature_id = runner.load_feature_list(
+                args.feature_list_file, args.feature_names
+            )
+        for i in range(args.repeat):
+            if feature_id is not None and i > 0:
+                runner.select_feature_list(feature_id)
+            summary = runner.run(
+                mode=args.mode,
+                save=args.save,
+                save_directory=args.save_directory,
+                timeout=args.timeout,
+            )
+            status.append(summary["status"])
+    finally:
+        runner.close()
+
+    sys.exit(0 if all(s == "completed" for s in status) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -31,6 +31,7 @@
 # POSSIBILITY OF SUCH DAMAGE.
 
 # Standard library imports
+from typing import Optional
 
 # Third-party imports
 import numpy as np
@@ -85,7 +86,29 @@ def compute_flatfield_map(
     flatfield_map : npt.ArrayLike
         XY image of flatfield map.
     """
-    offset_image = np.mean(image, axis=0) - offset_map
+    return compute_flatfield_map_from_mean(np.mean(image, axis=0), offset_map, local)
+
+
+def compute_flatfield_map_from_mean(
+    mean_image: npt.ArrayLike, offset_map: npt.ArrayLike, local: bool = False
+) -> npt.ArrayLike:
+    """Compute the flatfield map from the mean of evenly-illuminated frames.
+
+    Parameters
+    ----------
+    mean_image : npt.ArrayLike
+        XY image of the mean of multiple camera frames with defocused, even signal.
+    offset_map : np.ArrayLike
+        XY image of camera offset in the absence of signal.
+    local : bool
+        Compute the local flatfield map (as opposed to global).
+
+    Returns
+    -------
+    flatfield_map : npt.ArrayLike
+        XY image of flatfield map.
+    """
+    offset_image = mean_image - offset_map
     if local:
         from scipy.ndimage import gaussian_filter
 
@@ -95,6 +118,205 @@ def compute_flatfield_map(
         return offset_image / (np.max(np.abs(offset_image)) + 1)
 
 
+class StreamingCameraStatistics:
+    """Accumulate the per-pixel mean and variance of camera frames one at a time.
+
+    Uses Welford's online algorithm, so the maps of an sCMOS camera can be
+    calibrated from frames streaming through the data buffer without keeping the
+    ZYX stack in memory.
+    """
+
+    def __init__(self, shape: tuple) -> None:
+        """Initialize the statistics.
+
+        Parameters
+        ----------
+        shape : tuple
+            Shape (YX) of the camera frames.
+        """
+        #: int: Number of accumulated frames.
+        self.count = 0
+
+        #: np.ndarray: Running mean of the frames.
+        self._mean = np.zeros(shape, dtype=np.float64)
+
+        #: np.ndarray: Running sum of squared differences from the mean.
+        self._m2 = np.zeros(shape, dtype=np.float64)
+
+        # Scratch buffers, so updates do not allocate memory.
+        self._delta = np.zeros(shape, dtype=np.float64)
+        self._delta2 = np.zeros(shape, dtype=np.float64)
+
+    def update(self, frame: npt.ArrayLike) -> None:
+        """Add a frame to the statistics.
+
+        Parameters
+        ----------
+        frame : npt.ArrayLike
+            YX camera frame.
+        """
+        self.count += 1
+        np.subtract(frame, self._mean, out=self._delta)
+        np.multiply(self._delta, 1.0 / self.count, out=self._delta2)
+        self._mean += self._delta2
+        np.subtract(frame, self._mean, out=self._delta2)
+        self._delta *= self._delta2
+        self._m2 += self._delta
+
+    @property
+    def mean(self) -> npt.ArrayLike:
+        """Per-pixel mean of the accumulated frames."""
+        return self._mean
+
+    @property
+    def variance(self) -> npt.ArrayLike:
+        """Per-pixel (population) variance of the accumulated frames."""
+        if self.count == 0:
+            return np.zeros_like(self._m2)
+        return self._m2 / self.count
+
+    def offset_and_variance_map(
+        self, dtype: npt.DTypeLike = np.uint16
+    ) -> tuple[npt.ArrayLike, npt.ArrayLike]:
+        """Return the offset and variance map of dark frames.
+
+        Equivalent to `compute_scmos_offset_and_variance_map` on the stack of all the
+        accumulated frames.
+
+        Parameters
+        ----------
+        dtype : npt.DTypeLike
+            Data type of the camera frames.
+
+        Returns
+        -------
+        offset_map : npt.ArrayLike
+            XY image of camera offset in the absence of signal.
+        variance_map : npt.ArrayLike
+            XY image of camera variance in the absence of signal.
+        """
+        return self.mean.astype(dtype), self.variance.astype(dtype)
+
+    def flatfield_map(
+        self, offset_map: npt.ArrayLike, local: bool = False
+    ) -> npt.ArrayLike:
+        """Return the flatfield map of evenly-illuminated frames.
+
+        Parameters
+        ----------
+        offset_map : np.ArrayLike
+            XY image of camera offset in the absence of signal.
+        local : bool
+            Compute the local flatfield map (as opposed to global).
+
+        Returns
+        -------
+        flatfield_map : npt.ArrayLike
+            XY image of flatfield map.
+        """
+        return compute_flatfield_map_from_mean(self.mean, offset_map, local)
+
+
+class CameraImageCorrection:
+    """Correct camera frames in place for the offset and flatfield of the camera.
+
+    The offset is subtracted and the result divided by the flatfield, saturating at
+    the limits of the integer data type of the frames. All buffers are allocated
+    once, so correcting a frame does not allocate memory.
+    """
+
+    def __init__(
+        self,
+        offset_map: npt.ArrayLike,
+        flatfield_map: npt.ArrayLike = None,
+        dtype: npt.DTypeLike = np.uint16,
+    ) -> None:
+        """Initialize the correction.
+
+        Parameters
+        ----------
+        offset_map : npt.ArrayLike
+            XY image of camera offset in the absence of signal.
+        flatfield_map : npt.ArrayLike
+            XY image of flatfield map. No flatfield correction if None.
+        dtype : npt.DTypeLike
+            Integer data type of the camera frames.
+        """
+        #: int: Maximum value of the data type.
+        self.max_value = np.iinfo(dtype).max
+
+        #: np.ndarray: Offset map, clipped to the data type.
+        self.offset = np.clip(np.rint(offset_map), 0, self.max_value).astype(dtype)
+
+        #: np.ndarray: Inverse of the flatfield map.
+        self.gain = None
+
+        #: np.ndarray: Scratch buffer for the flatfield correction.
+        self.scratch = None
+
+        if flatfield_map is not None:
+            flatfield_map = np.asarray(flatfield_map, dtype=np.float32)
+            self.gain = np.ones(flatfield_map.shape, dtype=np.float32)
+            np.divide(1, flatfield_map, out=self.gain, where=flatfield_map > 0)
+            self.scratch = np.zeros(flatfield_map.shape, dtype=np.float32)
+
+    @property
+    def shape(self) -> tuple:
+        """Shape (YX) of the frames that can be corrected."""
+        return self.offset.shape
+
+    def __call__(self, image: npt.ArrayLike) -> npt.ArrayLike:
+        """Correct a frame in place.
+
+        Parameters
+        ----------
+        image : npt.ArrayLike
+            YX camera frame of the integer data type of the correction.
+
+        Returns
+        -------
+        image : npt.ArrayLike
+            The corrected frame.
+        """
+        # saturating subtraction
+        np.maximum(image, self.offset, out=image)
+        np.subtract(image, self.offset, out=image)
+        if self.gain is not None:
+            np.multiply(image, self.gain, out=self.scratch)
+            np.minimum(self.scratch, self.max_value, out=self.scratch)
+            np.rint(self.scratch, out=self.scratch)
+            np.copyto(image, self.scratch, casting="unsafe")
+        return image
+
+
+def crop_camera_map(
+    camera_map: npt.ArrayLike, shape: tuple
+) -> Optional[npt.ArrayLike]:
+    """Crop a full-sensor camera map to the centered region of interest.
+
+    Parameters
+    ----------
+    camera_map : npt.ArrayLike
+        XY image of the full sensor.
+    shape : tuple
+        Shape (YX) of the centered region of interest.
+
+    Returns
+    -------
+    camera_map : npt.ArrayLike or None
+        XY image of the region of interest, None if the region of interest is larger
+        than the map.
+    """
+    if camera_map is None:
+        return None
+    height, width = camera_map.shape
+    if shape[0] > height or shape[1] > width:
+        return None
+    top = (height - shape[0]) // 2
+    left = (width - shape[1]) // 2
+    return camera_map[top : top + shape[0], left : left + shape[1]]
+
+
 def compute_noise_sigma(Fn=1.0, qe=0.82, S=0.0, Ib=0.0, Nr=1.4, M=1.0):
     """Compute the noise model for an sCMOS camera.
 
@@ -0,0 +1,330 @@
+# Copyright (c) 2021-2024  The University of Texas Southwestern Medical Center.
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted for academic and research use only
+# (subject to the limitations in the disclaimer below)
+# provided that the following conditions are met:
+
+#      * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#      * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+
+#      * Neither the name of the copyright holders nor the names of its
+#      contributors may be used to endorse or promote products derived from this
+#      software without specific prior written permission.
+
+# NO EXPRESS OR IMPLIED LICENSES TO ANY PARTY'S PATENT RIGHTS ARE GRANTED BY
+# THIS LICENSE. THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+# PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+#  Standard Imports
+import logging
+import threading
+from math import ceil
+
+# Third Party Imports
+import cv2
+import numpy as np
+import numpy.typing as npt
+import tifffile
+
+# Local Imports
+
+# Logger Setup
+p = __name__.split(".")[1]
+logger = logging.getLogger(p)
+
+
+class OverviewMosaic:
+    """Low-resolution overview of a multi-position acquisition.
+
+    The canvas spans the stage positions of all tiles, with a pixel size chosen so
+    that its longest side is at most max_size pixels. Each tile, e.g., the XY MIP
+    of a stack, is down-sampled to its footprint on the canvas and blended into the
+    canvas at its stage position. Tile edges are feathered, so that overlapping tiles
+    blend smoothly, and a tile that is added again replaces its previous version.
+
+    Memory is bounded by the canvas size, and the cost of adding a tile does not
+    depend on the number of tiles.
+    """
+
+    def __init__(
+        self,
+        positions: npt.ArrayLike,
+        tile_shape: tuple,
+        pixel_size: tuple,
+        number_of_channels: int = 1,
+        max_size: int = 2048,
+        feather: float = 0.1,
+    ) -> None:
+        """Initialize the overview mosaic.
+
+        Parameters
+        ----------
+        positions : npt.ArrayLike
+            (N, 2) array of the x and y stage positions of the tile centers, in
+            microns.
+        tile_shape : tuple
+            Height and width of a tile in camera pixels.
+        pixel_size : tuple
+            Size of a camera pixel at the sample in x and y, in microns.
+        number_of_channels : int
+            Number of channels.
+        max_size : int
+            Maximum size of the longest side of the canvas in pixels.
+        feather : float
+            Fraction of the tile width and height over which tile edges are blended.
+        """
+        positions = np.asarray(positions, dtype=float)[:, :2]
+        tile_height, tile_width = tile_shape
+        dx, dy = pixel_size
+
+        #: tuple: Shape of a tile in camera pixels, (height, width).
+        self.tile_shape = (int(tile_height), int(tile_width))
+        #: tuple: Size of a tile at the sample in microns, (width, height).
+        self.tile_size = (tile_width * dx, tile_height * dy)
+        #: tuple: Extent of the canvas in microns, (x_min, x_max, y_min, y_max).
+        self.extent = (
+            np.min(positions[:, 0]) - self.tile_size[0] / 2,
+            np.max(positions[:, 0]) + self.tile_size[0] / 2,
+            np.min(positions[:, 1]) - self.tile_size[1] / 2,
+            np.max(positions[:, 1]) + self.tile_size[1] / 2,
+        )
+        width_um = self.extent[1] - self.extent[0]
+        height_um = self.extent[3] - self.extent[2]
+
+        #: float: Size of a canvas pixel in microns. Tiles are never up-sampled.
+        self.pixel_size = max(dx, dy, width_um / max_size, height_um / max_size)
+        #: tuple: Shape of the canvas, (channels, height, width).
+        self.shape = (
+            int(number_of_channels),
+            min(max(ceil(height_um / self.pixel_size), 1), max_size),
+            min(max(ceil(width_um / self.pixel_size), 1), max_size),
+        )
+        #: tuple: Shape of the footprint of a tile on the canvas, (height, width).
+        self.footprint = (
+            max(round(self.tile_size[1] / self.pixel_size), 1),
+            max(round(self.tile_size[0] / self.pixel_size), 1),
+        )
+
+        #: int: Number of tiles added.
+        self.tile_count = 0
+
+        # Blending weight, 1 in the interior and ramping down towards tile edges
+        ramps = []
+        for n in self.footprint:
+            distance = np.minimum(np.arange(n), np.arange(n)[::-1]) + 1
+            ramps.append(np.minimum(distance / max(feather * n, 1), 1))
+        self._weight = np.outer(*ramps).astype(np.float32)
+
+        self._canvas = np.zeros(self.shape, dtype=np.float32)
+        self._covered = np.zeros(self.shape, dtype=bool)
+        self._lock = threading.Lock()
+
+    def _footprint_slices(self, x: float, y: float):
+        """Find the footprint of a tile on the canvas, cropped to the canvas.
+
+        Parameters
+        ----------
+        x : float
+            Stage position of the tile center in x, in microns.
+        y : float
+            Stage position of the tile center in y, in microns.
+
+        Returns
+        -------
+        canvas_slices : tuple or None
+            Slices of the canvas covered by the tile, or None if it is outside.
+        tile_slices : tuple
+            Slices of the down-sampled tile that fall on the canvas.
+        """
+        x0 = round((x - self.tile_size[0] / 2 - self.extent[0]) / self.pixel_size)
+        y0 = round((y - self.tile_size[1] / 2 - self.extent[2]) / self.pixel_size)
+        height, width = self.footprint
+        cx0, cx1 = max(x0, 0), min(x0 + width, self.shape[2])
+        cy0, cy1 = max(y0, 0), min(y0 + height, self.shape[1])
+        if cx0 >= cx1 or cy0 >= cy1:
+            return None, None
+        return (
+            (slice(cy0, cy1), slice(cx0, cx1)),
+            (slice(cy0 - y0, cy1 - y0), slice(cx0 - x0, cx1 - x0)),
+        )
+
+    def add_tile(self, image: npt.ArrayLike, x: float, y: float, channel: int = 0):
+        """Blend a tile into the canvas at its stage position.
+
+        Parameters
+        ----------
+        image : npt.ArrayLike
+            Tile image, e.g., the XY MIP of a stack.
+        x : float
+            Stage position of the tile center in x, in microns.
+        y : float
+            Stage position of the tile center in y, in microns.
+        channel : int
+            Channel index.
+
+        Returns
+        -------
+        bool
+            True if the tile overlaps the canvas.
+        """
+        canvas_slices, tile_slices = self._footprint_slices(x, y)
+        if canvas_slices is None:
+            logger.debug(f"Tile at ({x}, {y}) is outside of the overview mosaic.")
+            return False
+
+        height, width = self.footprint
+        tile = cv2.resize(
+            np.asarray(image, dtype=np.float32),
+            (width, height),
+            interpolation=cv2.INTER_AREA,
+        )[tile_slices]
+        weight = self._weight[tile_slices]
+
+        with self._lock:
+            canvas = self._canvas[channel][canvas_slices]
+            covered = self._covered[channel][canvas_slices]
+            # Blend into tiles already on the canvas, fill empty canvas
+            alpha = np.where(covered, weight, 1)
+            canvas += alpha * (tile - canvas)
+            covered[...] = True
+            self.tile_count += 1
+        return True
+
+    def get_image(
+        self, channel: int = 0, region: tuple = None, max_size: int = None
+    ) -> np.ndarray:
+        """Get the canvas, or a region of it.
+
+        Parameters
+        ----------
+        channel : int
+            Channel index.
+        region : tuple
+            (x_min, x_max, y_min, y_max) region in stage coordinates, in microns.
+            The whole canvas if None.
+        max_size : int
+            Maximum size of the longest side of the returned image in pixels.
+
+        Returns
+        -------
+        np.ndarray
+            The canvas, as a 16-bit image.
+        """
+        if region is None:
+            slices = (slice(None), slice(None))
+        else:
+            x_min, x_max, y_min, y_max = (
+                round((value - self.extent[2 * (i // 2)]) / self.pixel_size)
+                for i, value in enumerate(region)
+            )
+            slices = (slice(max(y_min, 0), y_max), slice(max(x_min, 0), x_max))
+
+        with self._lock:
+            image = self._canvas[channel][slices].copy()
+        if image.size == 0:
+            return image.astype(np.uint16)
+
+        if max_size is not None and max(image.shape) > max_size:
+            scale = max_size / max(image.shape)
+            image = cv2.resize(
+                image,
+                (
+                    max(round(image.shape[1] * scale), 1),
+                    max(round(image.shape[0] * scale), 1),
+                ),
+                interpolation=cv2.INTER_AREA,
+            )
+        return np.clip(image, 0, 2**16 - 1).astype(np.uint16)
+
+    def get_tile(self, x: float, y: float, channel: int = 0) -> np.ndarray:
+        """Get the canvas under a tile, e.g., to decide if it contains tissue.
+
+        Parameters
+        ----------
+        x : float
+            Stage position of the tile center in x, in microns.
+        y : float
+            Stage position of the tile center in y, in microns.
+        channel : int
+            Channel index.
+
+        Returns
+        -------
+        np.ndarray or None
+            The canvas under the tile, as a 16-bit image, or None if tiles cover
+            less than half of it, e.g., if only the overlap of its neighbours was
+            added.
+        """
+        canvas_slices, _ = self._footprint_slices(x, y)
+        if canvas_slices is None:
+            return None
+        with self._lock:
+            if self._covered[channel][canvas_slices].mean() < 0.5:
+                return None
+            image = self._canvas[channel][canvas_slices].copy()
+        return np.clip(image, 0, 2**16 - 1).astype(np.uint16)
+
+    def get_pyramid(self, min_size: int = 256) -> list:
+        """Get the canvas at successively halved resolutions.
+
+        Parameters
+        ----------
+        min_size : int
+            The last level is the first one whose longest side is at most min_size.
+
+        Returns
+        -------
+        list
+            (channels, height, width) 16-bit images, from full to lowest resolution.
+        """
+        level = np.stack([self.get_image(c) for c in range(self.shape[0])])
+        levels = [level]
+        while max(level.shape[1:]) > min_size:
+            height, width = max(level.shape[1] // 2, 1), max(level.shape[2] // 2, 1)
+            level = np.stack(
+                [
+                    cv2.resize(image, (width, height), interpolation=cv2.INTER_AREA)
+                    for image in level
+                ]
+            )
+            levels.append(level)
+        return levels
+
+    def save(self, file_name: str, min_size: int = 256) -> None:
+        """Save the canvas as a pyramidal OME-TIFF file.
+
+        The full resolution canvas is the main image, and the lower resolutions are
+        stored as its sub-IFDs.
+
+        Parameters
+        ----------
+        file_name : str
+            Path to file.
+        min_size : int
+            Size of the longest side of the lowest resolution, at most.
+        """
+        levels = self.get_pyramid(min_size)
+        with tifffile.TiffWriter(file_name, ome=True) as tif:
+            tif.write(
+                levels[0],
+                subifds=len(levels) - 1,
+                resolution=(1e4 / self.pixel_size, 1e4 / self.pixel_size, "CENTIMETER"),
+                metadata={"axes": "CYX"},
+            )
+            for level in levels[1:]:
+                tif.write(level, subfiletype=1)
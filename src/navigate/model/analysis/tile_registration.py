@@ -0,0 +1,542 @@
+# Copyright (c) 2021-2024  The University of Texas Southwestern Medical Center.
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted for academic and research use only
+# (subject to the limitations in the disclaimer below)
+# provided that the following conditions are met:
+
+#      * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#      * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+
+#      * Neither the name of the copyright holders nor the names of its
+#      contributors may be used to endorse or promote products derived from this
+#      software without specific prior written permission.
+
+# NO EXPRESS OR IMPLIED LICENSES TO ANY PARTY'S PATENT RIGHTS ARE GRANTED BY
+# THIS LICENSE. THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+# PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+#  Standard Imports
+import logging
+import threading
+import multiprocessing as mp
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from functools import partial
+from time import perf_counter
+
+# Third Party Imports
+import cv2
+import numpy as np
+import numpy.typing as npt
+
+# Local Imports
+
+# Logger Setup
+p = __name__.split(".")[1]
+logger = logging.getLogger(p)
+
+
+def phase_correlation(reference: npt.ArrayLike, moving: npt.ArrayLike) -> tuple:
+    """Find the translation between two images by FFT phase correlation.
+
+    Parameters
+    ----------
+    reference : npt.ArrayLike
+        Reference image.
+    moving : npt.ArrayLike
+        Moving image, of the same shape as the reference image.
+
+    Returns
+    -------
+    shift : tuple
+        Sub-pixel shift (y, x) such that reference(r) = moving(r - shift).
+    peak : float
+        Height of the correlation peak, between 0 and 1. Low values mean that the
+        images do not share features.
+    """
+    reference = np.asarray(reference, dtype=np.float32)
+    moving = np.asarray(moving, dtype=np.float32)
+    height, width = reference.shape
+
+    # Taper the edges, which otherwise correlate at zero shift
+    window = np.outer(np.hanning(height), np.hanning(width)).astype(np.float32)
+    cross_power = np.fft.rfft2((reference - reference.mean()) * window) * np.conj(
+        np.fft.rfft2((moving - moving.mean()) * window)
+    )
+    cross_power /= np.abs(cross_power) + 1e-12
+    correlation = np.fft.irfft2(cross_power, s=(height, width))
+
+    iy, ix = np.unravel_index(np.argmax(correlation), correlation.shape)
+    peak = float(correlation[iy, ix])
+
+    # Refine the peak with a parabola along each axis
+    shift = []
+    for index, n, values in (
+        (iy, height, correlation[:, ix]),
+        (ix, width, correlation[iy, :]),
+    ):
+        left, center, right = values[index - 1], values[index], values[(index + 1) % n]
+        denominator = left - 2 * center + right
+        offset = 0.5 * (left - right) / denominator if denominator < 0 else 0.0
+        index = index + offset
+        shift.append(index - n if index > n / 2 else index)
+
+    return tuple(shift), peak
+
+
+def overlap_slices(offset: tuple, tile_shape: tuple) -> tuple:
+    """Find the overlap of two tiles of the same shape.
+
+    Parameters
+    ----------
+    offset : tuple
+        Integer offset (y, x) of the second tile relative to the first, in pixels.
+    tile_shape : tuple
+        Shape (height, width) of the tiles.
+
+    Returns
+    -------
+    tuple
+        Slices of the first and of the second tile covering the overlap, or None if
+        the tiles do not overlap.
+    """
+    first, second = [], []
+    for o, n in zip(offset, tile_shape):
+        start, stop = max(o, 0), min(n + o, n)
+        if start >= stop:
+            return None
+        first.append(slice(start, stop))
+        second.append(slice(start - o, stop - o))
+    return tuple(first), tuple(second)
+
+
+def find_neighbours(
+    positions: npt.ArrayLike, tile_size: tuple, min_overlap: float = 0.05
+) -> list:
+    """Find the pairs of tiles that overlap.
+
+    Parameters
+    ----------
+    positions : npt.ArrayLike
+        (N, 2) array of the x and y stage positions of the tile centers, in microns.
+        Positions that are NaN have no neighbours.
+    tile_size : tuple
+        Width and height of a tile at the sample, in microns.
+    min_overlap : float
+        Minimum fraction of the tile area that two tiles share to be neighbours.
+
+    Returns
+    -------
+    list
+        Pairs (i, j), with i < j, of the indices of neighbouring tiles.
+    """
+    positions = np.asarray(positions, dtype=float)[:, :2]
+    distance = np.abs(positions[None, :, :] - positions[:, None, :])
+    fraction = np.clip(1 - distance / np.asarray(tile_size, dtype=float), 0, None)
+    overlap = np.nan_to_num(fraction.prod(axis=-1))
+    i, j = np.nonzero(np.triu(overlap >= max(min_overlap, 1e-6), k=1))
+    return list(zip(i.tolist(), j.tolist()))
+
+
+def solve_translations(
+    number_of_tiles: int,
+    pairs: list,
+    shifts: npt.ArrayLike,
+    weights: npt.ArrayLike = None,
+    max_residual: float = None,
+) -> npt.NDArray:
+    """Find the translation of each tile that agrees best with the pairwise shifts.
+
+    Solves the weighted least squares problem t[j] - t[i] = shift for each pair
+    (i, j). Tiles connected by pairs move together, and the mean translation of each
+    group of connected tiles is zero, so that the tiles stay centered on their stage
+    positions. Tiles without pairs are not translated.
+
+    Parameters
+    ----------
+    number_of_tiles : int
+        Number of tiles.
+    pairs : list
+        Pairs (i, j) of tile indices.
+    shifts : npt.ArrayLike
+        (len(pairs), D) array of the shift of tile j relative to tile i.
+    weights : npt.ArrayLike
+        Confidence of each pairwise shift. Defaults to equal weights.
+    max_residual : float
+        Pairs that disagree with the solution by more than max_residual are dropped,
+        the worst one first, and the solution is recomputed.
+
+    Returns
+    -------
+    npt.NDArray
+        (number_of_tiles, D) array of translations.
+    """
+    shifts = np.asarray(shifts, dtype=float)
+    if len(pairs) == 0:
+        return np.zeros((number_of_tiles, shifts.shape[-1] if shifts.ndim > 1 else 1))
+    shifts = shifts.reshape(len(pairs), -1)
+    weights = np.ones(len(pairs)) if weights is None else np.asarray(weights, float)
+    weights = np.sqrt(np.clip(weights, 0, None))[:, None]
+
+    design = np.zeros((len(pairs), number_of_tiles))
+    rows = np.arange(len(pairs))
+    first, second = np.asarray(pairs, dtype=int).T
+    design[rows, first] = -1
+    design[rows, second] = 1
+
+    keep = np.ones(len(pairs), dtype=bool)
+    while True:
+        # The minimum norm solution has zero mean for each group of connected tiles
+        translations = np.linalg.lstsq(
+            design[keep] * weights[keep], shifts[keep] * weights[keep], rcond=None
+        )[0]
+        if max_residual is None or not keep.any():
+            return translations
+        residuals = np.linalg.norm(design @ translations - shifts, axis=1)
+        worst = np.argmax(np.where(keep, residuals, -1))
+        if residuals[worst] <= max_residual:
+            return translations
+        logger.debug(
+            f"Tile registration. Dropping pair {pairs[worst]}, "
+            f"residual {residuals[worst]:.2f}."
+        )
+        keep[worst] = False
+
+
+def register_overlap(reference: npt.ArrayLike, moving: npt.ArrayLike) -> tuple:
+    """Register the overlap regions of two tiles. Runs in a worker process.
+
+    Parameters
+    ----------
+    reference : npt.ArrayLike
+        Overlap region of the first tile.
+    moving : npt.ArrayLike
+        Overlap region of the second tile.
+
+    Returns
+    -------
+    tuple
+        Shift (y, x) of the second tile relative to the first, in pixels, and the
+        height of the correlation peak.
+    """
+    return phase_correlation(reference, moving)
+
+
+class TileRegistration:
+    """Register neighbouring tiles of a multi-position acquisition in the background.
+
+    Tiles, e.g., the XY MIPs of the stacks, are down-sampled as they are added. As
+    soon as both tiles of a neighbouring pair are available, the overlap regions are
+    sent to a pool of worker processes, which find the shift between them by phase
+    correlation. Once the acquisition is over, the pairwise shifts are combined into
+    a translation of each tile relative to its stage position.
+
+    A down-sampled tile is released once all of its pairs are sent to the pool, and
+    at most max_pending pairs are in the pool at any time, which bounds the memory
+    used.
+
+    The stage axes that run along the columns and the rows of the tiles are given by
+    the writer, e.g., BigDataViewer places the stage y axis along the columns.
+    """
+
+    def __init__(
+        self,
+        positions: npt.ArrayLike,
+        tile_shape: tuple,
+        pixel_size: tuple,
+        downsample: int = 4,
+        min_overlap: float = 0.05,
+        min_peak: float = 0.05,
+        max_residual: float = 5.0,
+        max_workers: int = 1,
+        max_pending: int = None,
+        image_axes: tuple = ("x", "y"),
+    ) -> None:
+        """Initialize the tile registration.
+
+        Parameters
+        ----------
+        positions : npt.ArrayLike
+            (N, 2) array of the x and y stage positions of the tile centers, in
+            microns, indexed by position.
+        tile_shape : tuple
+            Height and width of a tile in camera pixels.
+        pixel_size : tuple
+            Size of a camera pixel at the sample in x and y, in microns.
+        downsample : int
+            Down-sampling factor of the tiles before registration.
+        min_overlap : float
+            Minimum fraction of the tile area that two tiles share to be registered.
+        min_peak : float
+            Minimum height of the correlation peak for a shift to be used.
+        max_residual : float
+            Shifts that disagree with the global solution by more than max_residual
+            camera pixels are dropped.
+        max_workers : int
+            Number of worker processes.
+        max_pending : int
+            Maximum number of pairs in the pool. Defaults to twice max_workers.
+        image_axes : tuple
+            Stage axes along the columns and along the rows of a tile, e.g.,
+            ("x", "y").
+        """
+        #: npt.NDArray: Stage positions of the tile centers, (x, y) in microns.
+        self.positions = np.asarray(positions, dtype=float)[:, :2]
+        #: tuple: Shape of a tile in camera pixels, (height, width).
+        self.tile_shape = (int(tile_shape[0]), int(tile_shape[1]))
+        #: tuple: Size of a camera pixel at the sample, (x, y) in microns.
+        self.pixel_size = (float(pixel_size[0]), float(pixel_size[1]))
+        #: tuple: Indices of the stage axes along the columns and the rows of a tile.
+        self.image_axes = tuple("xy".index(axis.lower()) for axis in image_axes)
+        #: npt.NDArray: Positions of the tile centers along the columns and the rows
+        #: of the tiles, in microns.
+        self.image_positions = self.positions[:, self.image_axes]
+        #: tuple: Size of a camera pixel along the columns and the rows, in microns.
+        self.image_pixel_size = tuple(self.pixel_size[i] for i in self.image_axes)
+        #: int: Down-sampling factor of the tiles.
+        self.downsample = max(int(downsample), 1)
+        #: tuple: Shape of a down-sampled tile, (height, width).
+        self.small_shape = (
+            max(self.tile_shape[0] // self.downsample, 1),
+            max(self.tile_shape[1] // self.downsample, 1),
+        )
+        #: float: Minimum height of the correlation peak for a shift to be used.
+        self.min_peak = min_peak
+        #: float: Maximum residual of a shift in the global solution, in pixels.
+        self.max_residual = max_residual
+        #: int: Number of worker processes.
+        self.max_workers = max(int(max_workers), 1)
+        #: int: Maximum number of pairs in the pool.
+        self.max_pending = max_pending or 2 * self.max_workers
+
+        tile_size = (
+            self.tile_shape[1] * self.image_pixel_size[0],
+            self.tile_shape[0] * self.image_pixel_size[1],
+        )
+        #: list: Pairs (i, j) of neighbouring tiles.
+        self.pairs = find_neighbours(self.image_positions, tile_size, min_overlap)
+        #: dict: Shift (y, x) in camera pixels and peak height of registered pairs.
+        self.results = {}
+
+        self._pairs_of = {}
+        for pair in self.pairs:
+            for index in pair:
+                self._pairs_of.setdefault(index, []).append(pair)
+        self._tiles = {}
+        self._queue = deque()
+        self._scheduled = set()
+        self._submitted = set()
+        self._futures = {}
+        self._executor = None
+        # Reentrant, done callbacks may run in the thread that submits
+        self._lock = threading.RLock()
+
+    @property
+    def progress(self) -> tuple:
+        """Number of registered pairs and total number of pairs.
+
+        Returns
+        -------
+        tuple
+            (registered, total)
+        """
+        return len(self.results), len(self.pairs)
+
+    def add_tile(self, index: int, image: npt.ArrayLike) -> bool:
+        """Add a tile and register it with the neighbours that are available.
+
+        Adding a tile again, e.g., at the next time point, has no effect.
+
+        Parameters
+        ----------
+        index : int
+            Position index of the tile.
+        image : npt.ArrayLike
+            Tile image, e.g., the XY MIP of a stack.
+
+        Returns
+        -------
+        bool
+            True if new pairs are registered with this tile.
+        """
+        pairs = self._pairs_of.get(index, [])
+        with self._lock:
+            if all(pair in self._scheduled for pair in pairs):
+                return False
+        tile = cv2.resize(
+            np.asarray(image, dtype=np.float32),
+            self.small_shape[::-1],
+            interpolation=cv2.INTER_AREA,
+        )
+        with self._lock:
+            self._tiles[index] = tile
+            for pair in pairs:
+                if pair in self._scheduled:
+                    continue
+                if all(i in self._tiles for i in pair):
+                    self._scheduled.add(pair)
+                    self._queue.append(pair)
+            self._submit()
+        return True
+
+    def _submit(self) -> None:
+        """Send queued pairs to the pool while there is room. Holds the lock."""
+        while self._queue and len(self._futures) < self.max_pending:
+            pair = self._queue.popleft()
+            i, j = pair
+            offset, _ = self._nominal_offset(i, j)
+            slices = overlap_slices(offset, self.small_shape)
+            self._submitted.add(pair)
+            if slices is not None:
+                reference = self._tiles[i][slices[0]]
+                moving = self._tiles[j][slices[1]]
+                if min(reference.shape) >= 8:
+                    if self._executor is None:
+                        self._executor = ProcessPoolExecutor(
+                            max_workers=self.max_workers,
+                            mp_context=mp.get_context("spawn"),
+                        )
+                    future = self._executor.submit(
+                        register_overlap, reference.copy(), moving.copy()
+                    )
+                    self._futures[pair] = future
+                    future.add_done_callback(partial(self._collect, pair))
+            # Release the tiles that have no pairs left to submit
+            for index in pair:
+                if all(q in self._submitted for q in self._pairs_of[index]):
+                    self._tiles.pop(index, None)
+
+    def _nominal_offset(self, i: int, j: int) -> tuple:
+        """Offset of tile j relative to tile i from the stage positions.
+
+        Parameters
+        ----------
+        i : int
+            Index of the first tile.
+        j : int
+            Index of the second tile.
+
+        Returns
+        -------
+        offset : tuple
+            Offset (y, x) in down-sampled pixels, rounded to integers.
+        remainder : tuple
+            Fraction of a down-sampled pixel lost by rounding, (y, x).
+        """
+        # columns, rows in microns to rows, columns in down-sampled pixels
+        delta = self.image_positions[j] - self.image_positions[i]
+        width, height = self.image_pixel_size
+        offset = (
+            delta[1] / height * self.small_shape[0] / self.tile_shape[0],
+            delta[0] / width * self.small_shape[1] / self.tile_shape[1],
+        )
+        rounded = tuple(int(round(o)) for o in offset)
+        return rounded, (offset[0] - rounded[0], offset[1] - rounded[1])
+
+    def _collect(self, pair: tuple, future) -> None:
+        """Store the shift of a registered pair. Runs when the future is done.
+
+        Parameters
+        ----------
+        pair : tuple
+            Pair (i, j) of tile indices.
+        future : concurrent.futures.Future
+            Future of the registration.
+        """
+        result = None
+        if not future.cancelled():
+            error = future.exception()
+            if error is not None:
+                logger.error(f"Tile registration of {pair} failed: {error}")
+            else:
+                (shift_y, shift_x), peak = future.result()
+                _, (remainder_y, remainder_x) = self._nominal_offset(*pair)
+                result = (
+                    (shift_y - remainder_y) * self.tile_shape[0] / self.small_shape[0],
+                    (shift_x - remainder_x) * self.tile_shape[1] / self.small_shape[1],
+                    peak,
+                )
+        with self._lock:
+            if result is not None:
+                self.results[pair] = result
+            self._futures.pop(pair, None)
+
+    def wait(self, timeout: float = None) -> bool:
+        """Wait for the pairs that are queued or in the pool to be registered.
+
+        Parameters
+        ----------
+        timeout : float
+            Maximum time to wait, in seconds. Waits indefinitely if None.
+
+        Returns
+        -------
+        bool
+            True if all of the pairs are registered.
+        """
+        deadline = None if timeout is None else perf_counter() + timeout
+        while True:
+            with self._lock:
+                self._submit()
+                futures = list(self._futures.values())
+            if not futures:
+                return True
+            remaining = None if deadline is None else deadline - perf_counter()
+            if remaining is not None and remaining <= 0:
+                return False
+            wait(futures, timeout=remaining, return_when=FIRST_COMPLETED)
+
+    def solve(self) -> npt.NDArray:
+        """Combine the pairwise shifts into a translation of each tile.
+
+        Returns
+        -------
+        npt.NDArray
+            (N, 2) array of the translation (x, y) of each tile relative to its stage
+            position, in microns.
+        """
+        with self._lock:
+            results = dict(self.results)
+        pairs = [pair for pair, r in results.items() if r[2] >= self.min_peak]
+        shifts = np.array([results[pair][:2] for pair in pairs]).reshape(-1, 2)
+        weights = np.array([results[pair][2] for pair in pairs])
+        translations = solve_translations(
+            len(self.positions), pairs, shifts, weights, self.max_residual
+        )
+        logger.info(
+            f"Tile registration. {len(pairs)} of {len(self.pairs)} pairs used, "
+            f"largest translation {np.abs(translations).max(initial=0):.1f} pixels."
+        )
+        # (row, column) pixels to (x, y) stage microns
+        stage_translations = np.zeros((len(self.positions), 2))
+        stage_translations[:, self.image_axes] = translations[:, ::-1] * np.array(
+            self.image_pixel_size
+        )
+        return stage_translations
+
+    def shutdown(self) -> None:
+        """Stop the worker processes and release the tiles."""
+        with self._lock:
+            self._queue.clear()
+            self._tiles.clear()
+            futures = list(self._futures.values())
+        for future in futures:
+            future.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
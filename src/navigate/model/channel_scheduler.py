@@ -0,0 +1,262 @@
+# Copyright (c) 2021-2024  The University of Texas Southwestern Medical Center.
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted for academic and research use only
+# (subject to the limitations in the disclaimer below)
+# provided that the following conditions are met:
+
+#      * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#      * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+
+#      * Neither the name of the copyright holders nor the names of its
+#      contributors may be used to endorse or promote products derived from this
+#      software without specific prior written permission.
+
+# NO EXPRESS OR IMPLIED LICENSES TO ANY PARTY'S PATENT RIGHTS ARE GRANTED BY
+# THIS LICENSE. THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+# PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+# Standard Imports
+import itertools
+import logging
+
+# Third Party Imports
+
+# Local Imports
+
+# Logger Setup
+p = __name__.split(".")[1]
+logger = logging.getLogger(p)
+
+
+class ChannelScheduler:
+    """Plan the order in which the channels of an acquisition are imaged.
+
+    The time to switch between two channels is estimated from the delay model of
+    each filter wheel and the time needed to change the laser power. In per-z stack
+    cycling, the channels can be imaged in a fixed order or in alternating
+    directions on consecutive planes, so the last channel of a plane is also the
+    first channel of the next one.
+    """
+
+    def __init__(
+        self, channels, filter_wheels=None, lasers=None, laser_wavelength=None
+    ):
+        """Initialize the channel scheduler.
+
+        Parameters
+        ----------
+        channels : dict
+            Settings of each channel, by channel number, e.g.
+            {1: configuration["experiment"]["MicroscopeState"]["channels"]
+            ["channel_1"]}
+        filter_wheels : dict, optional
+            Filter wheel devices, by filter wheel name.
+        lasers : dict, optional
+            Laser devices, by wavelength.
+        laser_wavelength : list, optional
+            Wavelength of each laser index.
+        """
+        #: dict: Settings of each channel, by channel number.
+        self.channels = channels
+
+        #: dict: Filter wheel devices, by filter wheel name.
+        self.filter_wheels = filter_wheels if filter_wheels is not None else {}
+
+        #: dict: Laser devices, by wavelength.
+        self.lasers = lasers if lasers is not None else {}
+
+        #: list: Wavelength of each laser index.
+        self.laser_wavelength = laser_wavelength if laser_wavelength else []
+
+        #: int: Largest number of channels whose orders are all evaluated.
+        self.exhaustive_limit = 7
+
+        #: dict: Switch times already estimated, by pair of channels.
+        self._switch_times = {}
+
+    def laser_switch_time(self, channel):
+        """Estimate the time needed to set up the laser of a channel.
+
+        Parameters
+        ----------
+        channel : int
+            Channel number.
+
+        Returns
+        -------
+        float
+            Estimated duration in seconds.
+        """
+        try:
+            wavelength = self.laser_wavelength[
+                int(self.channels[channel]["laser_index"])
+            ]
+            laser = self.lasers[str(wavelength)]
+        except (IndexError, KeyError):
+            return 0.0
+        return float(getattr(laser, "switch_time", 0))
+
+    def switch_time(self, from_channel, to_channel):
+        """Estimate the time needed to switch from one channel to another.
+
+        Filter wheels are moved one after the other, so their delays add up. The
+        laser only needs to be set up if the laser or its power changes.
+
+        Parameters
+        ----------
+        from_channel : int
+            Channel number to switch from.
+        to_channel : int
+            Channel number to switch to.
+
+        Returns
+        -------
+        float
+            Estimated duration in seconds.
+        """
+        if from_channel == to_channel:
+            return 0.0
+        key = (from_channel, to_channel)
+        if key not in self._switch_times:
+            current = self.channels[from_channel]
+            target = self.channels[to_channel]
+            duration = 0.0
+            for name, filter_wheel in self.filter_wheels.items():
+                if name in current and name in target:
+                    duration += filter_wheel.switch_time(current[name], target[name])
+            if current["laser_index"] != target["laser_index"] or float(
+                current["laser_power"]
+            ) != float(target["laser_power"]):
+                duration += self.laser_switch_time(to_channel)
+            self._switch_times[key] = duration
+        return self._switch_times[key]
+
+    def path_time(self, order):
+        """Estimate the time spent switching channels while imaging one plane.
+
+        Parameters
+        ----------
+        order : list
+            Channel numbers in the order they are imaged.
+
+        Returns
+        -------
+        float
+            Estimated duration in seconds.
+        """
+        return sum(self.switch_time(a, b) for a, b in zip(order[:-1], order[1:]))
+
+    def schedule_time(self, orders, number_of_planes=1):
+        """Estimate the time spent switching channels while imaging one stack.
+
+        Plane z is imaged in the order orders[z % len(orders)]. The switch back to
+        the first channel of the next stack is included.
+
+        Parameters
+        ----------
+        orders : list
+            Lists of channel numbers.
+        number_of_planes : int
+            Number of planes in a stack.
+
+        Returns
+        -------
+        float
+            Estimated duration in seconds.
+        """
+        number_of_planes = max(int(number_of_planes), 1)
+        total_time = 0.0
+        for i, order in enumerate(orders):
+            # number of planes imaged in this order, and followed by another plane
+            planes = len(range(i, number_of_planes, len(orders)))
+            transitions = len(range(i, number_of_planes - 1, len(orders)))
+            next_order = orders[(i + 1) % len(orders)]
+            total_time += planes * self.path_time(order)
+            total_time += transitions * self.switch_time(order[-1], next_order[0])
+        last_order = orders[(number_of_planes - 1) % len(orders)]
+        return total_time + self.switch_time(last_order[-1], orders[0][0])
+
+    def nearest_neighbor_order(self, channels):
+        """Order the channels by always switching to the closest one.
+
+        Parameters
+        ----------
+        channels : list
+            Channel numbers, starting with the first channel to image.
+
+        Returns
+        -------
+        list
+            Channel numbers in the order they are imaged.
+        """
+        order = [channels[0]]
+        remaining = list(channels[1:])
+        while remaining:
+            channel = min(remaining, key=lambda c: self.switch_time(order[-1], c))
+            remaining.remove(channel)
+            order.append(channel)
+        return order
+
+    def optimize(self, channels, number_of_planes=1, allow_reverse=True):
+        """Choose the channel orders that minimize the switching time of a stack.
+
+        All orders are evaluated for up to self.exhaustive_limit channels, and a
+        nearest-neighbour order is used otherwise. The table order is kept unless
+        another order is faster.
+
+        Parameters
+        ----------
+        channels : list
+            Channel numbers in table order.
+        number_of_planes : int
+            Number of planes in a stack.
+        allow_reverse : bool
+            Allow imaging the channels in the reverse order on every other plane.
+
+        Returns
+        -------
+        orders : list
+            Lists of channel numbers, plane z is imaged in the order
+            orders[z % len(orders)].
+        table_time : float
+            Estimated switching time of a stack in table order, in seconds.
+        optimized_time : float
+            Estimated switching time of a stack in the chosen orders, in seconds.
+        """
+        channels = list(channels)
+        best_orders = [channels]
+        table_time = self.schedule_time(best_orders, number_of_planes)
+        best_time = table_time
+        if len(channels) < 2:
+            return best_orders, table_time, best_time
+
+        if len(channels) <= self.exhaustive_limit:
+            candidates = itertools.permutations(channels)
+        else:
+            candidates = [self.nearest_neighbor_order(channels)]
+
+        for order in candidates:
+            order = list(order)
+            schedules = [[order]]
+            if allow_reverse:
+                schedules.append([order, order[::-1]])
+            for orders in schedules:
+                schedule_time = self.schedule_time(orders, number_of_planes)
+                if schedule_time < best_time - 1e-9:
+                    best_orders, best_time = orders, schedule_time
+        return best_orders, table_time, best_time
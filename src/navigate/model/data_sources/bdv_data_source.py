@@ -118,6 +118,32 @@ class BigDataViewerDataSource(PyramidalDataSource):
         setup = self.ds_name(t, c, p).replace("???", str(subdiv))
         return self.image[setup][z, y, x]
 
+    def get_chunk_shape(self, c=0, t=0, p=0, subdiv=0) -> tuple:
+        """Get the shape of a chunk as stored on disk for a single c, t, p, subdiv.
+
+        Parameters
+        ----------
+        c : int
+            Single channel
+        t : int
+            Single timepoint
+        p : int
+            Single position
+        subdiv : int
+            Subdivision of the dataset
+
+        Returns
+        -------
+        tuple
+            Chunk shape in ZYX format.
+        """
+        setup = self.ds_name(t, c, p).replace("???", str(subdiv))
+        chunks = self.image[setup].chunks
+        if chunks is None:
+            # Contiguous HDF5 dataset
+            return tuple(self.image[setup].shape)
+        return tuple(chunks)
+
     def set_metadata_from_configuration_experiment(
         self, configuration: Dict[str, Any], microscope_name: str = None
     ) -> None:
@@ -152,7 +178,7 @@ class BigDataViewerDataSource(PyramidalDataSource):
             self._current_frame, self.metadata.per_stack
         )  # find current channel
 
-        if not (z or c or t or p):
+        if self._current_frame == 0:
             self.setup()
 
         ds_name = self.ds_name(t, c, p)
@@ -171,7 +197,9 @@ class BigDataViewerDataSource(PyramidalDataSource):
 
         # Check if this was the last frame to write
         c, z, t, p = self._cztp_indices(self._current_frame, self.metadata.per_stack)
-        if (z == 0) and (c == 0) and ((t >= self.shape_t) or (p >= self.positions)):
+        if self._is_first_frame_of_stack(self._current_frame) and (
+            (t >= self.shape_t) or (p >= self.positions)
+        ):
             self.setup(
                 self.shape_c * self.positions, self.shape_c * (p + 1), create_flag=False
             )
@@ -227,7 +255,8 @@ class BigDataViewerDataSource(PyramidalDataSource):
         if self.__file_type == "h5":
             self.image = h5py.File(self.file_name, "r")
         elif self.__file_type == "n5":
-            self.image = zarr.N5Store(self.file_name)
+            self.__store = zarr.N5Store(self.file_name)
+            self.image = zarr.open(self.__store, mode="r")
         xml_fn = os.path.splitext(self.file_name)[0] + ".xml"
         self.metadata.parse_xml(xml_fn)
         self.get_shape_from_metadata()
@@ -214,6 +214,29 @@ class DataSource:
         """
         return self.shape_x, self.shape_y, self.shape_c, self.shape_z, self.shape_t
 
+    def get_chunk_shape(self, c=0, t=0, p=0, subdiv=0) -> tuple:
+        """Get the shape of a chunk as stored on disk for a single c, t, p, subdiv.
+
+        Data sources that do not chunk their data store one image per chunk.
+
+        Parameters
+        ----------
+        c : int
+            Single channel
+        t : int
+            Single timepoint
+        p : int
+            Single position
+        subdiv : int
+            Subdivision of the dataset
+
+        Returns
+        -------
+        tuple
+            Chunk shape in ZYX format.
+        """
+        return 1, self.shape_y, self.shape_x
+
     def setup(self):
         """Additional steps for establishing the initial file setup."""
         pass
@@ -292,6 +315,9 @@ class DataSource:
             else:
                 c = frame_id % self.shape_c
                 z = (frame_id // self.shape_c) % self.shape_z
+                if self.metadata is not None:
+                    # channels may be acquired in a different order on each plane
+                    c = self.metadata.channel_index(c, z)
 
             t = (frame_id // (self.shape_c * self.shape_z)) % self.shape_t
             p = frame_id // (self.shape_c * self.shape_z * self.shape_t)
@@ -309,6 +335,25 @@ class DataSource:
 
         return c, z, t, p
 
+    def _is_first_frame_of_stack(self, frame_id: int) -> bool:
+        """Check if a frame is the first frame of a stack.
+
+        A stack holds all channels and z positions of one time point and position.
+        Channels may be acquired out of table order, so the first frame of a stack
+        is not necessarily the first channel.
+
+        Parameters
+        ----------
+        frame_id : int
+            Frame number in the stack.
+
+        Returns
+        -------
+        bool
+            True if the frame starts a new stack.
+        """
+        return frame_id % (self.shape_c * self.shape_z) == 0
+
     def _check_shape(self, max_frame: int = 0, per_stack: bool = True):
         """Check if we've closed this prior to completion.
 
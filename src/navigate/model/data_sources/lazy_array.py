@@ -0,0 +1,488 @@
+# Copyright (c) 2021-2024  The University of Texas Southwestern Medical Center.
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted for academic and research use only
+# (subject to the limitations in the disclaimer below)
+# provided that the following conditions are met:
+
+#      * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#      * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+
+#      * Neither the name of the copyright holders nor the names of its
+#      contributors may be used to endorse or promote products derived from this
+#      software without specific prior written permission.
+
+# NO EXPRESS OR IMPLIED LICENSES TO ANY PARTY'S PATENT RIGHTS ARE GRANTED BY
+# THIS LICENSE. THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+# PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+# Standard Imports
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby
+
+# Third Party Imports
+import numpy as np
+import numpy.typing as npt
+
+# Local Imports
+from .pyramidal_data_source import PyramidalDataSource
+
+# Logger Setup
+p = __name__.split(".")[1]
+logger = logging.getLogger(p)
+
+
+class ChunkCache:
+    """Least recently used cache of chunks, bounded by size in bytes."""
+
+    def __init__(self, max_bytes: int = 512 * 2**20) -> None:
+        """Initialize the chunk cache.
+
+        Parameters
+        ----------
+        max_bytes : int
+            Maximum number of bytes held by the cache.
+        """
+        #: int: Maximum number of bytes held by the cache.
+        self.max_bytes = max_bytes
+        #: int: Number of bytes held by the cache.
+        self.nbytes = 0
+        #: int: Number of chunks found in the cache.
+        self.hits = 0
+        #: int: Number of chunks not found in the cache.
+        self.misses = 0
+        self._chunks = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, key) -> bool:
+        """Is the chunk in the cache?"""
+        with self._lock:
+            return key in self._chunks
+
+    def __len__(self) -> int:
+        """Number of chunks in the cache."""
+        return len(self._chunks)
+
+    def get(self, key):
+        """Get a chunk and mark it as most recently used.
+
+        Parameters
+        ----------
+        key : tuple
+            Chunk key.
+
+        Returns
+        -------
+        chunk : npt.ArrayLike or None
+            The chunk, or None if it is not in the cache.
+        """
+        with self._lock:
+            chunk = self._chunks.get(key)
+            if chunk is None:
+                self.misses += 1
+                return None
+            self._chunks.move_to_end(key)
+            self.hits += 1
+            return chunk
+
+    def put(self, key, chunk: npt.ArrayLike) -> None:
+        """Add a chunk, evicting the least recently used chunks to make room.
+
+        Chunks larger than the cache are not kept.
+
+        Parameters
+        ----------
+        key : tuple
+            Chunk key.
+        chunk : npt.ArrayLike
+            The chunk.
+        """
+        if chunk.nbytes > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._chunks:
+                return
+            self._chunks[key] = chunk
+            self.nbytes += chunk.nbytes
+            while self.nbytes > self.max_bytes:
+                _, evicted = self._chunks.popitem(last=False)
+                self.nbytes -= evicted.nbytes
+
+    def clear(self) -> None:
+        """Remove all chunks from the cache."""
+        with self._lock:
+            self._chunks.clear()
+            self.nbytes = 0
+
+
+class LazyArray:
+    """Lazy (p, t, z, c, y, x) array view of a data source opened for reading.
+
+    Data are read from the data source in whole on-disk chunks, which span full
+    images in y and x and the chunk depth in z, and are kept in a bounded least
+    recently used cache. When consecutive chunk reads step along a single axis, the
+    next chunks along that axis are read ahead on a background thread.
+
+    The view has shape, dtype and ndim attributes and numpy-style integer and slice
+    indexing, so it can be passed to dask.array.from_array.
+    """
+
+    def __init__(
+        self,
+        data_source,
+        subdiv: int = 0,
+        cache_size: int = 512 * 2**20,
+        prefetch: int = 1,
+    ) -> None:
+        """Initialize the lazy array.
+
+        Parameters
+        ----------
+        data_source : DataSource
+            Data source opened for reading.
+        subdiv : int
+            Subdivision of a pyramidal data source to read.
+        cache_size : int
+            Maximum number of bytes held by the chunk cache.
+        prefetch : int
+            Number of chunks to read ahead. 0 disables reading ahead.
+        """
+        #: DataSource: The data source.
+        self.data_source = data_source
+        #: int: Subdivision of the data source.
+        self.subdiv = subdiv
+
+        if isinstance(data_source, PyramidalDataSource):
+            shape_z, shape_y, shape_x = data_source.shapes[subdiv]
+        else:
+            shape_z, shape_y, shape_x = (
+                data_source.shape_z,
+                data_source.shape_y,
+                data_source.shape_x,
+            )
+
+        #: tuple: Shape of the array as (p, t, z, c, y, x).
+        self.shape = tuple(
+            int(n)
+            for n in (
+                data_source.positions,
+                data_source.shape_t,
+                shape_z,
+                data_source.shape_c,
+                shape_y,
+                shape_x,
+            )
+        )
+        #: np.dtype: Data type of the array.
+        self.dtype = np.dtype(data_source.dtype)
+        #: int: Number of z planes in a chunk.
+        self.chunk_depth = max(int(data_source.get_chunk_shape(subdiv=subdiv)[0]), 1)
+        #: ChunkCache: Cache of the chunks read.
+        self.cache = ChunkCache(cache_size)
+        #: int: Number of chunks to read ahead.
+        self.prefetch = prefetch
+
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._last_key = None
+        self._executor = (
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix="LazyArray")
+            if prefetch > 0
+            else None
+        )
+
+    @property
+    def ndim(self) -> int:
+        """Number of dimensions."""
+        return len(self.shape)
+
+    @property
+    def size(self) -> int:
+        """Number of elements."""
+        return int(np.prod(self.shape))
+
+    @property
+    def nbytes(self) -> int:
+        """Size in bytes once read."""
+        return self.size * self.dtype.itemsize
+
+    def __len__(self) -> int:
+        """Number of positions."""
+        return self.shape[0]
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        """Read the whole array."""
+        return np.asarray(self[...], dtype=dtype)
+
+    def __getitem__(self, keys) -> np.ndarray:
+        """Read a (p, t, z, c, y, x) selection of integers and slices.
+
+        Parameters
+        ----------
+        keys : int, slice or tuple
+            Indices into the array.
+
+        Returns
+        -------
+        np.ndarray
+            The selection. Integer-indexed axes are dropped, as in numpy.
+        """
+        keys = self._expand_keys(keys)
+        ranges = [
+            range(k, k + 1) if isinstance(k, int) else range(n)[k]
+            for k, n in zip(keys[:4], self.shape[:4])
+        ]
+        ys, xs = (slice(k, k + 1) if isinstance(k, int) else k for k in keys[4:])
+        out = np.empty(
+            tuple(len(r) for r in ranges)
+            + (len(range(self.shape[4])[ys]), len(range(self.shape[5])[xs])),
+            dtype=self.dtype,
+        )
+
+        for i, p in enumerate(ranges[0]):
+            for j, t in enumerate(ranges[1]):
+                for k, c in enumerate(ranges[3]):
+                    start = 0
+                    for z_block, zs in groupby(
+                        ranges[2], key=lambda z: z // self.chunk_depth
+                    ):
+                        zs = [z - z_block * self.chunk_depth for z in zs]
+                        chunk = self.get_chunk((p, t, c, z_block))
+                        out[i, j, start : start + len(zs), k] = chunk[zs, ys, xs]
+                        start += len(zs)
+
+        squeeze = tuple(i for i, k in enumerate(keys) if isinstance(k, int))
+        return out.squeeze(axis=squeeze) if squeeze else out
+
+    def _expand_keys(self, keys) -> tuple:
+        """Expand indices to one integer or slice per axis.
+
+        Parameters
+        ----------
+        keys : int, slice or tuple
+            Indices into the array.
+
+        Returns
+        -------
+        tuple
+            One integer or slice for each of the six axes.
+
+        Raises
+        ------
+        IndexError
+            If there are too many indices, or an index is out of range or not an
+            integer or a slice.
+        """
+        if not isinstance(keys, tuple):
+            keys = (keys,)
+        if Ellipsis in keys:
+            i = keys.index(Ellipsis)
+            fill = (slice(None),) * (self.ndim - len(keys) + 1)
+            keys = keys[:i] + fill + keys[i + 1 :]
+        keys = keys + (slice(None),) * (self.ndim - len(keys))
+        if len(keys) > self.ndim:
+            error_statement = f"Too many indices. LazyArray has {self.ndim} axes."
+            logger.error(error_statement)
+            raise IndexError(error_statement)
+
+        expanded = []
+        for key, n in zip(keys, self.shape):
+            if isinstance(key, (int, np.integer)):
+                key = int(key)
+                if not -n <= key < n:
+                    error_statement = f"Index {key} is out of range for axis of {n}."
+                    logger.error(error_statement)
+                    raise IndexError(error_statement)
+                key = key % n
+            elif not isinstance(key, slice):
+                error_statement = "LazyArray only supports integer and slice indices."
+                logger.error(error_statement)
+                raise IndexError(error_statement)
+            expanded.append(key)
+        return tuple(expanded)
+
+    def get_chunk(self, key: tuple) -> np.ndarray:
+        """Get a chunk, reading it from the data source if it is not cached.
+
+        Parameters
+        ----------
+        key : tuple
+            Chunk key (p, t, c, z_block).
+
+        Returns
+        -------
+        np.ndarray
+            The chunk, of shape (z, y, x).
+        """
+        chunk = self.cache.get(key)
+        if chunk is None:
+            with self._lock:
+                future = self._pending.get(key)
+            if future is not None:
+                chunk = future.result()
+            else:
+                chunk = self._read_chunk(key)
+                self.cache.put(key, chunk)
+        self._read_ahead(key)
+        return chunk
+
+    def _read_chunk(self, key: tuple) -> np.ndarray:
+        """Read a chunk from the data source.
+
+        Parameters
+        ----------
+        key : tuple
+            Chunk key (p, t, c, z_block).
+
+        Returns
+        -------
+        np.ndarray
+            The chunk, of shape (z, y, x).
+        """
+        p, t, c, z_block = key
+        z_start = z_block * self.chunk_depth
+        z_stop = min(z_start + self.chunk_depth, self.shape[2])
+        data = self.data_source.get_slice(
+            slice(None), slice(None), c, slice(z_start, z_stop), t, p, self.subdiv
+        )
+        # Copy, so memory-mapped data are read once and held by the cache
+        return np.array(data, dtype=self.dtype).reshape(
+            (z_stop - z_start,) + self.shape[4:]
+        )
+
+    def _read_ahead(self, key: tuple) -> None:
+        """Read the next chunks in the direction of the last step between chunks.
+
+        Parameters
+        ----------
+        key : tuple
+            Chunk key (p, t, c, z_block) just accessed.
+        """
+        last_key, self._last_key = self._last_key, key
+        if self._executor is None or last_key is None:
+            return
+        step = tuple(k - k0 for k, k0 in zip(key, last_key))
+        if sum(s != 0 for s in step) != 1:
+            return
+
+        limits = (
+            self.shape[0],
+            self.shape[1],
+            self.shape[3],
+            -(-self.shape[2] // self.chunk_depth),
+        )
+        for i in range(1, self.prefetch + 1):
+            next_key = tuple(k + i * s for k, s in zip(key, step))
+            if not all(0 <= k < n for k, n in zip(next_key, limits)):
+                break
+            with self._lock:
+                if next_key in self._pending or next_key in self.cache:
+                    continue
+                self._pending[next_key] = self._executor.submit(
+                    self._prefetch_chunk, next_key
+                )
+
+    def _prefetch_chunk(self, key: tuple) -> np.ndarray:
+        """Read a chunk into the cache on the background thread.
+
+        Parameters
+        ----------
+        key : tuple
+            Chunk key (p, t, c, z_block).
+
+        Returns
+        -------
+        np.ndarray
+            The chunk, of shape (z, y, x).
+        """
+        try:
+            chunk = self._read_chunk(key)
+            self.cache.put(key, chunk)
+            return chunk
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+    def stacks(self):
+        """Iterate over the (z, y, x) stacks in position, timepoint, channel order.
+
+        Yields
+        ------
+        LazyStack
+            Lazy view of a stack.
+        """
+        for p in range(self.shape[0]):
+            for t in range(self.shape[1]):
+                for c in range(self.shape[3]):
+                    yield LazyStack(self, p, t, c)
+
+    def close(self) -> None:
+        """Stop reading ahead and empty the cache."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        self.cache.clear()
+
+
+class LazyStack:
+    """Lazy (z, y, x) view of a single position, timepoint and channel."""
+
+    def __init__(self, lazy_array: LazyArray, p: int, t: int, c: int) -> None:
+        """Initialize the lazy stack.
+
+        Parameters
+        ----------
+        lazy_array : LazyArray
+            Lazy array to read from.
+        p : int
+            Position.
+        t : int
+            Timepoint.
+        c : int
+            Channel.
+        """
+        #: LazyArray: Lazy array to read from.
+        self.lazy_array = lazy_array
+        #: tuple: Position, timepoint and channel of the stack.
+        self.index = (p, t, c)
+        #: tuple: Shape of the stack as (z, y, x).
+        self.shape = (lazy_array.shape[2],) + lazy_array.shape[4:]
+        #: np.dtype: Data type of the stack.
+        self.dtype = lazy_array.dtype
+
+    def __len__(self) -> int:
+        """Number of z planes."""
+        return self.shape[0]
+
+    def __getitem__(self, z) -> np.ndarray:
+        """Read z planes of the stack.
+
+        Parameters
+        ----------
+        z : int or slice
+            z indices to read.
+
+        Returns
+        -------
+        np.ndarray
+            The selected planes.
+        """
+        p, t, c = self.index
+        return self.lazy_array[p, t, z, c]
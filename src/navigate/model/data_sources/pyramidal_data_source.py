@@ -243,10 +243,10 @@ class PyramidalDataSource(DataSource):
             dtype=self.dtype,
         )
 
-        for c in cs:
-            for t in ts:
-                for p in ps:
-                    sliced_ds[p, t, :, c, :, :] = self.get_slice(
+        for ci, c in enumerate(cs):
+            for ti, t in enumerate(ts):
+                for pi, p in enumerate(ps):
+                    sliced_ds[pi, ti, :, ci, :, :] = self.get_slice(
                         xs, ys, c, zs, t, p, subdiv
                     )
 
@@ -37,6 +37,8 @@ from pathlib import Path
 
 # Third Party Imports
 import tifffile
+import numpy as np
+import zarr
 import numpy.typing as npt
 
 # Local imports
@@ -64,6 +66,10 @@ class TiffDataSource(DataSource):
         """
         #: np.ndarray: Image data
         self.image = None
+        #: npt.ArrayLike: Memory map, or lazily read zarr array, of the image data.
+        self._array = None
+        #: str: Axes of the image data.
+        self._axes = ""
         self._write_mode = None
         self._views = []
 
@@ -92,6 +98,12 @@ class TiffDataSource(DataSource):
         self._current_time = 0
         self._current_position = 0
 
+        #: WriterPool: Workers that open, write and close the files, if any.
+        self.writer_pool = None
+
+        #: list: Writer pool shard of each channel file being written.
+        self._shards = []
+
     @property
     def data(self) -> npt.ArrayLike:
         """Return the image data as a numpy array.
@@ -142,16 +154,174 @@ class TiffDataSource(DataSource):
         else:
             return self.image.is_ome
 
+    def set_writer_pool(self, writer_pool) -> None:
+        """Write the files through a pool of writer workers.
+
+        Each channel file of each position is owned by one worker, which opens,
+        writes and closes it in order.
+
+        Parameters
+        ----------
+        writer_pool : WriterPool
+            Writer workers. None writes the files on the calling thread.
+        """
+        self.writer_pool = writer_pool
+
+    def _submit(self, c: int, func, *args) -> None:
+        """Run a file operation on the worker that owns the file of a channel.
+
+        Parameters
+        ----------
+        c : int
+            Channel index.
+        func : callable
+            File operation.
+        *args : list
+            Arguments of the file operation.
+        """
+        if self.writer_pool is None:
+            func(*args)
+        else:
+            self.writer_pool.submit(self._shards[c], func, *args)
+
+    @staticmethod
+    def _open_image(images: list, c: int, file_name: str, bigtiff: bool) -> None:
+        """Open the file of a channel for writing.
+
+        Parameters
+        ----------
+        images : list
+            TiffWriter of each channel.
+        c : int
+            Channel index.
+        file_name : str
+            Path to file.
+        bigtiff : bool
+            Is this a bigtiff file?
+        """
+        os.makedirs(os.path.dirname(file_name), exist_ok=True)
+        images[c] = tifffile.TiffWriter(
+            file_name, bigtiff=bigtiff, ome=False, byteorder="<"
+        )
+
+    @staticmethod
+    def _write_image(images: list, c: int, data: npt.ArrayLike, kw: dict) -> None:
+        """Write an image to the file of a channel.
+
+        Parameters
+        ----------
+        images : list
+            TiffWriter of each channel.
+        c : int
+            Channel index.
+        data : npt.ArrayLike
+            Image to write.
+        kw : dict
+            Keyword arguments to pass to TiffWriter.write.
+        """
+        images[c].write(data, **kw)
+
+    @staticmethod
+    def _close_image(images: list, c: int, file_name: str, ome_xml: bytes) -> None:
+        """Close the file of a channel.
+
+        Parameters
+        ----------
+        images : list
+            TiffWriter of each channel.
+        c : int
+            Channel index.
+        file_name : str
+            Path to file.
+        ome_xml : bytes
+            OME metadata to attach to the file, if any.
+        """
+        images[c].close()
+        if ome_xml is not None:
+            # Attach OME metadata at the end of the write
+            tifffile.tiffcomment(file_name, ome_xml)
+
     def read(self) -> None:
-        """Read a tiff file."""
+        """Read a tiff file.
+
+        Uncompressed, contiguous images are memory mapped. Other images are read
+        page by page through tifffile's zarr interface.
+        """
         self.image = tifffile.TiffFile(self.file_name)
+        series = self.image.series[0]
+
+        if series.dataoffset is not None:
+            self._array = tifffile.memmap(self.file_name, series=0, mode="r")
+        else:
+            self._array = zarr.open(series.aszarr(), mode="r")
+        self.dtype = self._array.dtype
 
         # TODO: Parse metadata
-        for i, ax in enumerate(list(self.image.series[0].axes)):
+        self._axes = ""
+        for i, ax in enumerate(list(series.axes)):
             if ax == "Q":
                 # TODO: This is a hack for tifffile. Find a way to remove this.
                 ax = "Z"
-            setattr(self, f"shape_{ax.lower()}", self.data.shape[i])
+            self._axes += ax
+            setattr(self, f"shape_{ax.lower()}", series.shape[i])
+
+    def get_slice(self, x, y, c=0, z=0, t=0, p=0, subdiv=0) -> npt.ArrayLike:
+        """Get a 3D slice of the dataset for a single c, t, p.
+
+        Each position is stored in its own file, so p and subdiv are ignored.
+
+        Parameters
+        ----------
+        x : int or slice
+            x indices to grab
+        y : int or slice
+            y indices to grab
+        c : int
+            Single channel
+        z : int or slice
+            z indices to grab
+        t : int
+            Single timepoint
+        p : int
+            Single position
+        subdiv : int
+            Subdivision of the dataset to index along
+
+        Returns
+        -------
+        npt.ArrayLike
+            3D (z, y, x) slice of data set
+        """
+        keys = {"X": x, "Y": y, "Z": z, "C": c, "T": t}
+        data = self._array[tuple(keys.get(ax, 0) for ax in self._axes)]
+        if "Z" not in self._axes and isinstance(z, slice):
+            data = data[None, ...]
+        return data
+
+    def get_chunk_shape(self, c=0, t=0, p=0, subdiv=0) -> tuple:
+        """Get the shape of a chunk as stored on disk for a single c, t, p, subdiv.
+
+        Parameters
+        ----------
+        c : int
+            Single channel
+        t : int
+            Single timepoint
+        p : int
+            Single position
+        subdiv : int
+            Subdivision of the dataset
+
+        Returns
+        -------
+        tuple
+            Chunk shape in ZYX format.
+        """
+        if isinstance(self._array, np.memmap):
+            # One page is the smallest unit worth reading
+            return 1, self.shape_y, self.shape_x
+        chunks = dict(zip(self._axes, self._array.chunks))
+        return chunks.get("Z", 1), chunks.get("Y", 1), chunks.get("X", 1)
 
     def write(self, data: npt.ArrayLike, **kw) -> None:
         """Writes 2D image to the data source.
@@ -173,7 +343,7 @@ class TiffDataSource(DataSource):
             self._current_frame, self.metadata.per_stack
         )  # find current channel
         if z == 0:
-            if c == 0:
+            if self._is_first_frame_of_stack(self._current_frame):
                 # Make sure we're set up for writing
                 self._setup_write_image()
             if self.is_ome:
@@ -186,24 +356,40 @@ class TiffDataSource(DataSource):
         if len(kw) > 0:
             self._views.append(kw)
 
+        if self.writer_pool is not None:
+            # the caller may reuse its buffer before the worker writes the image
+            data = np.array(data, copy=True)
+
         if self.is_ome:
-            self.image[c].write(data, description=ome_xml, contiguous=True)
+            self._submit(
+                c,
+                self._write_image,
+                self.image,
+                c,
+                data,
+                {"description": ome_xml, "contiguous": True},
+            )
         else:
             dx, dy, dz = self.metadata.voxel_size
             md = {"spacing": dz, "unit": "um", "axes": "ZYX"}
-            self.image[c].write(
+            self._submit(
+                c,
+                self._write_image,
+                self.image,
+                c,
                 data,
-                resolution=(1e4 / dx, 1e4 / dy, "CENTIMETER"),
-                metadata=md,
-                contiguous=True,
+                {
+                    "resolution": (1e4 / dx, 1e4 / dy, "CENTIMETER"),
+                    "metadata": md,
+                    "contiguous": True,
+                },
             )
 
         self._current_frame += 1
 
         # Check if this was the last frame to write
         # print("Switch")
-        c, z, _, _ = self._cztp_indices(self._current_frame, self.metadata.per_stack)
-        if (z == 0) and (c == 0):
+        if self._is_first_frame_of_stack(self._current_frame):
             self.close(True)
 
     def generate_image_name(self, current_channel, current_time_point):
@@ -243,10 +429,11 @@ class TiffDataSource(DataSource):
         self.dc, self.dt = self.metadata.dc, self.metadata.dt
 
         # Initialize one TIFF per channel per time point
-        self.image = []
+        self.image = [None] * self.shape_c
         self.file_name = []
         self.uid = []
         self._views = []
+        self._shards = []
 
         if self.metadata._multiposition:
             position_directory = os.path.join(
@@ -254,19 +441,20 @@ class TiffDataSource(DataSource):
             )
         else:
             position_directory = self.save_directory
-        if not os.path.exists(position_directory):
-            os.mkdir(position_directory)
         for ch in range(self.shape_c):
             file_name = os.path.join(
                 position_directory, self.generate_image_name(ch, self._current_time)
             )
-            self.image.append(
-                tifffile.TiffWriter(
-                    file_name, bigtiff=self.is_bigtiff, ome=False, byteorder="<"
-                )
-            )
+            # shard the files by position and channel
+            shard = self._current_position * self.shape_c + ch
+            if self.writer_pool is not None:
+                file_name = self.writer_pool.get_path(shard, file_name)
+            self._shards.append(shard)
             self.file_name.append(file_name)
             self.uid.append(str(uuid.uuid4()))
+            self._submit(
+                ch, self._open_image, self.image, ch, file_name, self.is_bigtiff
+            )
 
     def close(self, internal=False) -> None:
         """Close the file.
@@ -285,20 +473,22 @@ class TiffDataSource(DataSource):
             if not internal:
                 self._check_shape(self._current_frame - 1, self.metadata.per_stack)
             for ch in range(len(self.image)):
-                self.image[ch].close()
+                ome_xml = None
                 if self.is_ome and len(self._views) > 0:
-                    # Attach OME metadata at the end of the write
-                    tifffile.tiffcomment(
-                        self.file_name[ch],
-                        self.metadata.to_xml(
-                            c=ch,
-                            t=self._current_time,
-                            file_name=self.file_name,
-                            uid=self.uid,
-                            views=self._views,
-                        ).encode(),
-                    )
+                    ome_xml = self.metadata.to_xml(
+                        c=ch,
+                        t=self._current_time,
+                        file_name=self.file_name,
+                        uid=self.uid,
+                        views=self._views,
+                    ).encode()
+                self._submit(
+                    ch, self._close_image, self.image, ch, self.file_name[ch], ome_xml
+                )
+            if not internal and self.writer_pool is not None:
+                self.writer_pool.wait()
         else:
+            self._array = None
             self.image.close()
         if not internal:
             self._closed = True
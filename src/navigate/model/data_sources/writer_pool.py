@@ -0,0 +1,243 @@
+# Copyright (c) 2021-2024  The University of Texas Southwestern Medical Center.
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted for academic and research use only
+# (subject to the limitations in the disclaimer below)
+# provided that the following conditions are met:
+
+#      * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#      * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+
+#      * Neither the name of the copyright holders nor the names of its
+#      contributors may be used to endorse or promote products derived from this
+#      software without specific prior written permission.
+
+# NO EXPRESS OR IMPLIED LICENSES TO ANY PARTY'S PATENT RIGHTS ARE GRANTED BY
+# THIS LICENSE. THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+# PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+# Standard Imports
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Third Party Imports
+
+# Local Imports
+
+# Logger Setup
+p = __name__.split(".")[1]
+logger = logging.getLogger(p)
+
+
+class WriterPool:
+    """Pool of independent writer workers.
+
+    Each worker is a single thread that runs its tasks in the order they are
+    submitted. Files are sharded across the workers, and every task touching a
+    file is submitted with the same shard, so each worker owns its own file
+    handles and writes to them in order. Progress and errors of all the workers are
+    aggregated for the caller.
+    """
+
+    def __init__(
+        self,
+        number_of_workers: int = 1,
+        directories: list = None,
+        base_directory: str = None,
+        max_pending: int = 8,
+    ) -> None:
+        """Initialize the writer pool.
+
+        Parameters
+        ----------
+        number_of_workers : int
+            Number of writer threads.
+        directories : list, optional
+            Target directory of each worker, e.g. one per disk. Worker i writes the
+            files of its shards under directories[i % len(directories)], with the
+            same layout relative to base_directory.
+        base_directory : str, optional
+            Directory the files would be written to without target directories.
+        max_pending : int
+            Maximum number of tasks waiting per worker. Submitting blocks when the
+            limit is reached, which bounds the memory used by queued images.
+        """
+        #: int: Number of writer threads.
+        self.number_of_workers = max(int(number_of_workers), 1)
+
+        #: list: Target directory of each worker.
+        self.directories = list(directories) if directories else []
+
+        #: str: Directory the files would be written to without target directories.
+        self.base_directory = base_directory
+
+        #: list: Single thread executor of each worker.
+        self.workers = [
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"Writer {i}")
+            for i in range(self.number_of_workers)
+        ]
+
+        #: list: Limits the number of tasks waiting on each worker.
+        self._pending = [
+            threading.BoundedSemaphore(max(int(max_pending), 1))
+            for _ in range(self.number_of_workers)
+        ]
+
+        #: threading.Lock: Protects the progress counters and errors.
+        self._lock = threading.Lock()
+
+        #: threading.Condition: Notified when a task is finished.
+        self._finished = threading.Condition(self._lock)
+
+        #: int: Number of tasks submitted.
+        self.submitted = 0
+
+        #: int: Number of tasks finished, successfully or not.
+        self.completed = 0
+
+        #: list: Exceptions raised by the tasks and not yet collected.
+        self._errors = []
+
+    def worker_index(self, shard: int) -> int:
+        """Get the worker that owns a shard.
+
+        Parameters
+        ----------
+        shard : int
+            Shard number, e.g. the position and channel of a file.
+
+        Returns
+        -------
+        int
+            Worker index.
+        """
+        return int(shard) % self.number_of_workers
+
+    def get_path(self, shard: int, file_name: str) -> str:
+        """Get the path of a file in the target directory of its worker.
+
+        Parameters
+        ----------
+        shard : int
+            Shard number.
+        file_name : str
+            Path of the file in the base directory.
+
+        Returns
+        -------
+        str
+            Path of the file in the target directory of the worker.
+        """
+        if not self.directories or self.base_directory is None:
+            return file_name
+        directory = self.directories[self.worker_index(shard) % len(self.directories)]
+        relative_path = os.path.relpath(file_name, self.base_directory)
+        if relative_path.startswith(os.pardir):
+            return file_name
+        return os.path.join(directory, relative_path)
+
+    def submit(self, shard: int, func, *args, **kwargs) -> None:
+        """Run a task on the worker that owns a shard.
+
+        Parameters
+        ----------
+        shard : int
+            Shard number.
+        func : callable
+            The task.
+        *args : list
+            Positional arguments of the task.
+        **kwargs : dict
+            Keyword arguments of the task.
+        """
+        index = self.worker_index(shard)
+        self._pending[index].acquire()
+        with self._lock:
+            self.submitted += 1
+        try:
+            future = self.workers[index].submit(func, *args, **kwargs)
+        except RuntimeError as e:
+            self._task_done(index, e)
+            return
+        future.add_done_callback(lambda f: self._task_done(index, f.exception()))
+
+    def _task_done(self, index: int, error: Exception = None) -> None:
+        """Record a finished task.
+
+        Parameters
+        ----------
+        index : int
+            Worker index.
+        error : Exception, optional
+            Exception raised by the task.
+        """
+        self._pending[index].release()
+        with self._finished:
+            self.completed += 1
+            if error is not None:
+                logger.error(f"WriterPool. Worker {index} failed: {error}")
+                self._errors.append(error)
+            self._finished.notify_all()
+
+    @property
+    def progress(self) -> tuple:
+        """Get the number of finished and submitted tasks.
+
+        Returns
+        -------
+        tuple
+            Number of finished tasks and number of submitted tasks.
+        """
+        with self._lock:
+            return self.completed, self.submitted
+
+    def get_errors(self) -> list:
+        """Collect the exceptions raised by the tasks since the last call.
+
+        Returns
+        -------
+        list
+            Exceptions raised by the tasks.
+        """
+        with self._lock:
+            errors, self._errors = self._errors, []
+        return errors
+
+    def wait(self, timeout: float = None) -> bool:
+        """Wait until all the submitted tasks are finished.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            Maximum time to wait in seconds.
+
+        Returns
+        -------
+        bool
+            True if all the tasks are finished.
+        """
+        with self._finished:
+            return self._finished.wait_for(
+                lambda: self.completed >= self.submitted, timeout
+            )
+
+    def shutdown(self) -> None:
+        """Finish the submitted tasks and stop the workers."""
+        for worker in self.workers:
+            worker.shutdown(wait=True)
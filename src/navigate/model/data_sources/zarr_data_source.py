@@ -87,6 +87,28 @@ class OMEZarrDataSource(PyramidalDataSource):
         dataset_name = f"{GROUP_PREFIX}{p}_{subdiv}"
         return self.image[dataset_name][t, c, z, y, x]
 
+    def get_chunk_shape(self, c=0, t=0, p=0, subdiv=0) -> tuple:
+        """Get the shape of a chunk as stored on disk for a single c, t, p, subdiv.
+
+        Parameters
+        ----------
+        c : int
+            Single channel
+        t : int
+            Single timepoint
+        p : int
+            Single position
+        subdiv : int
+            Subdivision of the dataset
+
+        Returns
+        -------
+        tuple
+            Chunk shape in ZYX format.
+        """
+        dataset_name = f"{GROUP_PREFIX}{p}_{subdiv}"
+        return tuple(self.image[dataset_name].chunks[2:])
+
     def setup(self):
         """Set up the Zarr writer."""
         # Use FSStore as a universal backend
@@ -181,6 +203,10 @@ class OMEZarrDataSource(PyramidalDataSource):
                 self.__store = None
             return
         self._check_shape(self._current_frame - 1, self.metadata.per_stack)
+        if self.metadata.stitching_translations is not None:
+            self.image.attrs["multiscales"] = self.metadata.stitch_multiscales(
+                self.image.attrs.get("multiscales", [])
+            )
         self.__store.close()
         self._closed = True
         self.__store = None
@@ -191,8 +191,10 @@ class MS2000Controller:
         self.serial_port.write_timeout = write_timeout
         self.serial_port.timeout = read_timeout
 
-        # set the size of the rx and tx buffers before calling open
-        self.serial_port.set_buffer_size(rx_size, tx_size)
+        # set the size of the rx and tx buffers before calling open, which is only
+        # supported on Windows
+        if hasattr(self.serial_port, "set_buffer_size"):
+            self.serial_port.set_buffer_size(rx_size, tx_size)
         try:
             self.serial_port.open()
         except SerialException:
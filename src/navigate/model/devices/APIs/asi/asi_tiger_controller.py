@@ -131,6 +131,9 @@ class TigerController:
         #: list[float]: Maximum speeds of the Tiger Controller
         self._max_speeds = None
 
+        #: dict: Speed of each axis set through this controller, in mm/s
+        self.speeds = {}
+
         #: threading.Event: Event to indicate if it is safe to write to the serial port
         self.safe_to_write = threading.Event()
 
@@ -140,6 +143,17 @@ class TigerController:
         #: float: Last time a command was sent to the Tiger Controller
         self._last_cmd_send_time = time.perf_counter()
 
+        #: float: Minimum time between two status requests, in seconds
+        self.poll_interval = 0.005
+
+        #: float: Time before the predicted end of a move to start polling, in
+        #: seconds
+        self.poll_lead_time = 0.005
+
+        #: float: Fraction of the predicted move time spent polling, so that a
+        #: move shorter than predicted is still detected early
+        self.poll_lead_fraction = 0.1
+
     @staticmethod
     def scan_ports() -> list[str]:
         """Scans for available COM ports
@@ -187,8 +201,10 @@ class TigerController:
         self.serial_port.write_timeout = write_timeout
         self.serial_port.timeout = read_timeout
 
-        # set the size of the rx and tx buffers before calling open
-        self.serial_port.set_buffer_size(rx_size, tx_size)
+        # set the size of the rx and tx buffers before calling open, which is only
+        # supported on Windows
+        if hasattr(self.serial_port, "set_buffer_size"):
+            self.serial_port.set_buffer_size(rx_size, tx_size)
 
         # try to open the serial port
         try:
@@ -392,6 +408,7 @@ class TigerController:
         # send the serial command to the controller
         self.report_to_console(cmd)
         command = bytes(f"{cmd}\r", encoding="ascii")
+        self._last_cmd_send_time = time.perf_counter()
         try:
             self.serial_port.write(command)
         except SerialTimeoutException as e:
@@ -493,6 +510,7 @@ class TigerController:
         """
         self.send_command(f"SPEED {axis}={speed}\r")
         self.read_response()
+        self.speeds[axis] = speed
 
     def get_axis_position(self, axis: str) -> int:
         """Return the position of the stage in ASI units (tenths of microns).
@@ -612,26 +630,60 @@ class TigerController:
         res = self.read_response()
         return "B" in res
 
-    def wait_for_device(self, timeout: float = 1.75) -> None:
+    def wait_for_device(
+        self, timeout: float = 1.75, predicted_time: float = 0.0
+    ) -> tuple:
         """Waits for the all motors to stop moving.
 
+        Sleeps until shortly before the predicted end of the move, then polls the
+        controller at most every poll_interval seconds.
+
+        Parameters
+        ----------
         timeout : float
-            Timeout in seconds. Default is 1.75 seconds.
+            Timeout in seconds. Default is 1.75 seconds. It is extended to twice
+            the predicted time for long moves.
+        predicted_time : float
+            Predicted duration of the move, in seconds.
+
+        Returns
+        -------
+        waiting_time : float
+            Time waited, in seconds.
+        measured : bool
+            True if the waiting time is the duration of the move. It is False if
+            the wait timed out, or if the move was already done at the first poll
+            after sleeping, in which case it ended at an unknown time.
         """
         if self.verbose:
             print("Waiting for device...")
-        busy = self.is_device_busy()
-        waiting_time = 0.0
+        start_time = time.perf_counter()
+        timeout = max(timeout, 2 * predicted_time)
+        sleep_time = (
+            predicted_time * (1 - self.poll_lead_fraction) - self.poll_lead_time
+        )
+        slept = sleep_time > 0
+        if slept:
+            time.sleep(sleep_time)
 
-        while busy:
-            waiting_time += 0.005
+        measured = True
+        first_poll = True
+        while self.is_device_busy():
+            first_poll = False
+            waiting_time = time.perf_counter() - start_time
             if waiting_time >= timeout:
+                logger.debug(f"Timed out after {waiting_time:.3f} s")
+                measured = False
                 break
-            time.sleep(0.001)
-            busy = self.is_device_busy()
+            sleep_time = self._last_cmd_send_time + self.poll_interval
+            time.sleep(max(sleep_time - time.perf_counter(), 0))
+        if first_poll and slept:
+            measured = False
+        waiting_time = time.perf_counter() - start_time
 
         if self.verbose:
             print(f"Waited {waiting_time:.2f} s")
+        return waiting_time, measured
 
     def stop(self):
         """Stop all stage movement immediately"""
@@ -652,6 +704,7 @@ class TigerController:
         axes = " ".join([f"{x}={round(v, 6)}" for x, v in speed_dict.items()])
         self.send_command(f"S {axes}")
         self.read_response()
+        self.speeds.update(speed_dict)
 
     def set_speed_as_percent_max(self, pct):
         """Set speed as a percentage of the maximum speed
@@ -686,6 +739,12 @@ class TigerController:
             f"SPEED {' '.join([f'{ax}={pct*speed:.7f}' for ax, speed in zip(self.default_axes_sequence, self._max_speeds)])}\r"  # noqa
         )
         self.read_response()
+        self.speeds.update(
+            {
+                ax: pct * speed
+                for ax, speed in zip(self.default_axes_sequence, self._max_speeds)
+            }
+        )
 
     def get_speed(self, axis: str):
         """Get speed
@@ -823,8 +882,8 @@ class TigerController:
         # Calculate duration of time since last command.
         time_since_last_cmd = time.perf_counter() - self._last_cmd_send_time
 
-        # Wait 50 milliseconds before pinging controller again.
-        sleep_time = 0.050 - time_since_last_cmd
+        # Wait poll_interval seconds before pinging controller again.
+        sleep_time = self.poll_interval - time_since_last_cmd
         if sleep_time > 0:
             time.sleep(sleep_time)
 
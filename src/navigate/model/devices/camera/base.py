@@ -33,7 +33,8 @@
 # Standard Library Imports
 import logging
 import os
-from typing import Any, Dict
+import threading
+from typing import Any, Callable, Dict
 
 # Third Party Imports
 import tifffile
@@ -141,6 +142,25 @@ class CameraBase:
         self._offset, self._variance = None, None
         self.get_offset_variance_maps()
 
+        #: np.ndarray: Flatfield map
+        self._flatfield = None
+
+        #: threading.Condition: Notified by producers when new frames are in the
+        #: data buffer or the image series is closed.
+        self.frame_ready = threading.Condition()
+
+        #: float: Longest single wait for a frame (s), so callers can check their
+        #: stop flags in between.
+        self.frame_wait_timeout = 0.5
+
+        #: float: Number of frame periods (exposure plus readout time) to wait for a
+        #: frame, e.g. for stage moves, features or external triggers.
+        self.frame_timeout_factor = 10.0
+
+        #: float: Shortest time to wait for a frame (s). Long stage moves pause the
+        #: data thread, which restarts the wait.
+        self.frame_timeout_floor = 2.0
+
     def __str__(self):
         """Return string representation of CameraBase."""
         return "CameraBase"
@@ -201,6 +221,25 @@ class CameraBase:
             self.get_offset_variance_maps()
         return self._variance
 
+    def get_flatfield_map(self):
+        """Get flatfield map from file.
+
+        Returns
+        -------
+        flatfield : np.ndarray
+            Flatfield map. None if it is not found.
+        """
+        serial_number = self.camera_parameters["hardware"]["serial_number"]
+        map_path = os.path.join(get_navigate_path(), "camera_maps")
+        try:
+            self._flatfield = tifffile.imread(
+                os.path.join(map_path, f"{serial_number}_flat.tiff")
+            )
+        except FileNotFoundError:
+            logger.info(f"{str(self)}, Flatfield map not found in {map_path}")
+            self._flatfield = None
+        return self._flatfield
+
     def set_readout_direction(self, mode) -> None:
         """Set HamamatsuOrca readout direction.
 
@@ -247,6 +286,55 @@ class CameraBase:
         """Close camera."""
         pass
 
+    def notify_frame_ready(self) -> None:
+        """Wake up the threads waiting for a frame.
+
+        Called by frame producers after writing to the data buffer and when the
+        image series is closed.
+        """
+        with self.frame_ready:
+            self.frame_ready.notify_all()
+
+    def wait_for_frame(self, has_frame: Callable[[], bool], timeout: float) -> bool:
+        """Wait until a frame is available, without polling.
+
+        Parameters
+        ----------
+        has_frame : Callable[[], bool]
+            Returns True when a frame is available or waiting should stop.
+        timeout : float
+            Longest time to wait (s).
+
+        Returns
+        -------
+        bool
+            The last value returned by has_frame.
+        """
+        with self.frame_ready:
+            return self.frame_ready.wait_for(has_frame, timeout)
+
+    def get_frame_timeout(self, exposure_time: float) -> float:
+        """Longest time to wait for the next frame before giving up.
+
+        Parameters
+        ----------
+        exposure_time : float
+            Exposure time of the current acquisition (s).
+
+        Returns
+        -------
+        timeout : float
+            frame_timeout_factor frame periods, at least frame_timeout_floor (s).
+        """
+        try:
+            readout_time = float(self.calculate_readout_time())
+        except Exception:
+            readout_time = 0
+        return max(
+            self.frame_timeout_factor * (exposure_time + readout_time),
+            self.frame_timeout_floor,
+        )
+
     def get_line_interval(self) -> float:
         """Return stored camera line interval.
 
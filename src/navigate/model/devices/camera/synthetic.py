@@ -34,14 +34,16 @@
 import logging
 import time
 import ctypes
+from collections import OrderedDict
 
 # Third Party Imports
 import numpy as np
-from tifffile import TiffFile, TiffFileError
+from tifffile import TiffFile, TiffFileError, memmap
 
 # Local Imports
 from navigate.model.analysis import camera
 from navigate.model.devices.camera.base import CameraBase
+from navigate.tools import sdf
 from navigate.tools.decorators import log_initialization
 
 # Logger Setup
@@ -142,6 +144,35 @@ class SyntheticCamera(CameraBase):
         #: float: exposure time
         self.camera_exposure_time = 0.2
 
+        #: float: Earliest time the next frames can be read out
+        self.next_readout_time = 0
+
+        #: float: Readout time of a frame (s)
+        self.readout_time = float(self.camera_parameters.get("readout_time", 10)) / 1000
+
+        #: int: Number of frames of noise precomputed in the noise bank
+        self.noise_bank_size = int(self.camera_parameters.get("noise_bank_size", 8))
+
+        #: np.ndarray: Flat bank of noise that frames are cut from
+        self._noise_bank = None
+
+        #: dict: Phantom rendered into the frames, None for noise only
+        self.phantom = self.camera_parameters.get("phantom", None)
+
+        #: callable: Returns the stage position dictionary used to render the phantom
+        self.stage_position_source = None
+
+        #: np.ndarray: Scratch frame the phantom is added to the noise in
+        self._frame = None
+
+        #: OrderedDict: Least recently used cache of rendered phantom slices
+        self._phantom_slices = OrderedDict()
+
+        #: int: Number of phantom slices kept in the cache
+        self.phantom_cache_size = int(
+            self.camera_parameters.get("phantom_cache_size", 32)
+        )
+
         #: int: width
         self.x_pixels = self.camera_parameters["x_pixels"]
 
@@ -218,6 +249,114 @@ class SyntheticCamera(CameraBase):
         self.x_pixels = int(self.x_pixels / self.x_binning)
         self.y_pixels = int(self.y_pixels / self.y_binning)
 
+    def build_noise_bank(self):
+        """Precompute the noise that frames are cut from.
+
+        The bank holds noise_bank_size + 1 frames of Gaussian read noise on top of
+        the mean background. Each frame is a contiguous window starting at a random
+        offset, which costs a single copy instead of drawing a new image.
+        """
+        frame_size = self.x_pixels * self.y_pixels
+        self._noise_bank = np.empty(
+            (max(self.noise_bank_size, 1) + 1) * frame_size, dtype=np.uint16
+        )
+        # draw one frame at a time to bound the float64 temporaries
+        for start in range(0, self._noise_bank.size, frame_size):
+            self._noise_bank[start : start + frame_size] = np.clip(
+                np.random.normal(
+                    self._mean_background_count,
+                    self._noise_sigma / 0.47,  # TODO: Don't hardcode 0.47 e-/count
+                    size=frame_size,
+                ),
+                0,
+                np.iinfo(np.uint16).max,
+            )
+        self._phantom_slices.clear()
+
+    def get_noise_frame(self):
+        """Cut a noise frame out of the noise bank.
+
+        Returns
+        -------
+        np.ndarray
+            Flat uint16 view of x_pixels * y_pixels noise values.
+        """
+        frame_size = self.x_pixels * self.y_pixels
+        if self._noise_bank is None or self._noise_bank.size <= frame_size:
+            self.build_noise_bank()
+        offset = np.random.randint(0, self._noise_bank.size - frame_size + 1)
+        return self._noise_bank[offset : offset + frame_size]
+
+    def get_phantom_slice(self):
+        """Render the phantom at the current stage position.
+
+        The phantom is defined by an SDF from navigate.tools.sdf and sliced at the
+        stage z position. Its edges soften as the focus position moves away from
+        the in-focus position, so defocus lowers the image sharpness. Slices are
+        cached by position, rounded to a pixel in x and y and to the depth of field
+        in z and f.
+
+        Returns
+        -------
+        np.ndarray
+            Flat uint16 array of x_pixels * y_pixels phantom intensities.
+        """
+        pixel_size = float(
+            self.phantom.get(
+                "pixel_size", self.camera_parameters.get("pixel_size_in_microns", 1)
+            )
+        )
+        depth_of_field = float(self.phantom.get("depth_of_field", 5))
+        position = {}
+        if self.stage_position_source is not None:
+            position = self.stage_position_source()
+        x, y, z, f = (float(position.get(f"{axis}_pos", 0) or 0) for axis in "xyzf")
+        key = (
+            round(x / pixel_size),
+            round(y / pixel_size),
+            round(z / depth_of_field),
+            round(f / depth_of_field),
+            self.x_pixels,
+            self.y_pixels,
+        )
+        image = self._phantom_slices.get(key, None)
+        if image is not None:
+            self._phantom_slices.move_to_end(key)
+            return image
+
+        center = np.broadcast_to(
+            np.asarray(self.phantom.get("center", 0), dtype=float), (3,)
+        )
+        size = self.phantom.get("size", 100)
+        shape = self.phantom.get("type", "sphere")
+        if shape == "sphere":
+            distance = lambda points: sdf.sphere(points, float(size))  # noqa: E731
+        elif shape in ("box", "ellipsoid"):
+            size = np.broadcast_to(np.asarray(size, dtype=float), (3,))
+            distance = lambda points: getattr(sdf, shape)(points, size)  # noqa: E731
+        else:
+            raise ValueError(f"Unknown phantom type: {shape}")
+
+        cols = (np.arange(self.x_pixels) - self.x_pixels / 2 + 0.5) * pixel_size
+        rows = (np.arange(self.y_pixels) - self.y_pixels / 2 + 0.5) * pixel_size
+        X, Y = np.meshgrid(cols + x - center[0], rows + y - center[1])
+        points = np.vstack([X.ravel(), Y.ravel(), np.full(X.size, z - center[2])])
+
+        # the edge of the object blurs over the defocus distance
+        defocus = abs(f - float(self.phantom.get("focus", 0)))
+        edge_width = pixel_size * max(1.0, defocus / depth_of_field)
+        noise_max = 0 if self._noise_bank is None else int(self._noise_bank.max())
+        max_intensity = np.iinfo(np.uint16).max - noise_max
+        intensity = min(float(self.phantom.get("intensity", 1000)), max_intensity)
+        image = (intensity * np.clip(0.5 - distance(points) / edge_width, 0, 1)).astype(
+            np.uint16
+        )
+
+        self._phantom_slices[key] = image
+        while len(self._phantom_slices) > self.phantom_cache_size:
+            self._phantom_slices.popitem(last=False)
+        return image
+
     def initialize_image_series(self, data_buffer=None, number_of_frames=100):
         """Initialize SyntheticCamera image series.
 
@@ -232,6 +371,10 @@ class SyntheticCamera(CameraBase):
         self.num_of_frame = number_of_frames
         self.current_frame_idx = 0
         self.pre_frame_idx = 0
+        if self.random_image and data_buffer is not None:
+            # build the noise bank before the first frame is triggered
+            self.get_noise_frame()
+        self.next_readout_time = time.perf_counter() + self.camera_exposure_time
         self.is_acquiring = True
 
     def close_image_series(self):
@@ -242,10 +385,22 @@ class SyntheticCamera(CameraBase):
         self.pre_frame_idx = 0
         self.current_frame_idx = 0
         self.is_acquiring = False
+        self.notify_frame_ready()
 
     def load_images(self, filenames=None, ds=None):
         """Pre-populate the buffer with images. Can either come from TIFF files or
-        Numpy stacks."""
+        Numpy stacks.
+
+        TIFF files are memory mapped where possible, and stacks may be lazy, e.g.
+        from LazyArray.stacks(), so images are only read when they are generated.
+
+        Parameters
+        ----------
+        filenames : list
+            TIFF files to load.
+        ds : iterable
+            Stacks of images, each in ZYX order.
+        """
         self.random_image = False
         #: int: current image id
         self.img_id = 0
@@ -258,12 +413,20 @@ class SyntheticCamera(CameraBase):
             # Load TIFF file into buffer as slices
             for image_file in filenames:
                 try:
-                    tif = TiffFile(image_file)
-                    if len(tif.pages) == 1:
-                        self.tif_images.append([tif.asarray()])
+                    with TiffFile(image_file) as tif:
+                        try:
+                            images = memmap(image_file, mode="r")
+                        except ValueError:
+                            # Compressed or non-contiguous image data
+                            images = tif.asarray()
+                        number_of_pages = len(tif.pages)
+                    if number_of_pages == 1:
+                        self.tif_images.append([images])
                     else:
-                        self.tif_images.append(tif.asarray())
-                    idx += len(tif.pages)
+                        self.tif_images.append(
+                            images.reshape((-1,) + images.shape[-2:])
+                        )
+                    idx += number_of_pages
                     if idx >= self.num_of_frame:
                         return
                 except TiffFileError:
@@ -284,12 +447,12 @@ class SyntheticCamera(CameraBase):
         if not self.is_acquiring:
             return
         if self.random_image:
-            image = np.random.normal(
-                0,
-                self._noise_sigma
-                / 0.47,  # TODO: Don't hardcode 0.47 electrons per count
-                size=(self.x_pixels, self.y_pixels),
-            ).astype(np.uint16) + int(self._mean_background_count)
+            image = self.get_noise_frame()
+            if self.phantom:
+                phantom = self.get_phantom_slice()
+                if self._frame is None or self._frame.size != image.size:
+                    self._frame = np.empty_like(image)
+                image = np.add(image, phantom, out=self._frame)
         else:
             image = self.tif_images[self.current_tif_id][self.img_id]
             self.img_id += 1
@@ -304,17 +467,38 @@ class SyntheticCamera(CameraBase):
         )
 
         self.current_frame_idx = (self.current_frame_idx + 1) % self.num_of_frame
+        self.notify_frame_ready()
 
     def get_new_frame(self):
-        """Get frame from SyntheticCamera camera."""
-
-        time.sleep(self.camera_exposure_time)
-        timeout = 500
-        while self.pre_frame_idx == self.current_frame_idx and timeout:
-            time.sleep(0.001)
-            timeout -= 1
-        if timeout <= 0:
+        """Get frame from SyntheticCamera camera.
+
+        Frames are read out at most once per frame period. As in the overlapped
+        readout mode of an sCMOS, the frame period is the longer of the exposure
+        time and the readout time. Waits until the next readout and for up to
+        frame_wait_timeout for generate_new_frame() to signal a frame.
+
+        Returns
+        -------
+        frames : list
+            Ids of the new frames in the data buffer, empty if there are none.
+        """
+        with self.frame_ready:
+            # an unsatisfiable predicate turns wait_for() into an interruptible sleep
+            self.frame_ready.wait_for(
+                lambda: not self.is_acquiring,
+                self.next_readout_time - time.perf_counter(),
+            )
+        if not self.wait_for_frame(
+            lambda: self.pre_frame_idx != self.current_frame_idx
+            or not self.is_acquiring,
+            self.frame_wait_timeout,
+        ):
             return []
+        if self.pre_frame_idx == self.current_frame_idx:
+            return []
+        self.next_readout_time = time.perf_counter() + max(
+            self.camera_exposure_time, self.readout_time
+        )
         if self.pre_frame_idx < self.current_frame_idx:
             frames = list(range(self.pre_frame_idx, self.current_frame_idx))
         else:
@@ -352,5 +536,4 @@ class SyntheticCamera(CameraBase):
             Duration of time needed to readout an image.
 
         """
-        readout_time = 0.01  # 10 milliseconds.
-        return readout_time
+        return self.readout_time
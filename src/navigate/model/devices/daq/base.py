@@ -100,6 +100,13 @@ class DAQBase:
         #: int: Number of times to expand the waveform
         self.waveform_expand_num = 1
 
+        #: int: Number of frames run as one hardware-timed sequence. With 1, each
+        #: frame is started and stopped by software.
+        self.sequence_length = 1
+
+        #: int: Number of frames of the current sequence that have been run.
+        self.sequence_frame_count = 0
+
     def __str__(self) -> str:
         """Returns the string representation of the DAQBase class"""
         return "DAQBase"
@@ -168,3 +175,73 @@ class DAQBase:
         self.sample_rate = self.configuration["configuration"]["microscopes"][
             microscope_name
         ]["daq"]["sample_rate"]
+
+    def stop_tasks(self) -> None:
+        """Stop the tasks before they are prepared for the next channel.
+
+        DAQs that can reuse their tasks across channels only stop them here.
+        """
+        self.stop_acquisition()
+
+    def set_sequence_length(self, number_of_frames: int = 1) -> None:
+        """Run the next frames as one hardware-timed sequence.
+
+        The tasks are started once for the whole sequence, with the waveforms of a
+        frame repeated for every frame, and each call to run_acquisition() waits for
+        the next frame of the sequence instead of starting and stopping the tasks.
+
+        Parameters
+        ----------
+        number_of_frames : int
+            Number of frames in a sequence. 1 disables the sequence mode.
+        """
+        self.sequence_length = max(1, int(number_of_frames))
+        self.sequence_frame_count = 0
+        logger.info(f"DAQ sequence length: {self.sequence_length}")
+
+    def is_sequence_running(self) -> bool:
+        """Whether a hardware-timed sequence has been started and is not finished.
+
+        Returns
+        -------
+        bool
+            True if there are frames of the current sequence left to run.
+        """
+        return 0 < self.sequence_frame_count < self.sequence_length
+
+    def get_frame_period(self, channel_key: str) -> float:
+        """Duration of a frame in a hardware-timed sequence.
+
+        Parameters
+        ----------
+        channel_key : str
+            Channel key for current channel.
+
+        Returns
+        -------
+        float
+            Frame duration in seconds.
+        """
+        try:
+            sweep_time = self.sweep_times[channel_key]
+        except (KeyError, TypeError):
+            return 0
+        return sweep_time * self.waveform_repeat_num * self.waveform_expand_num
+
+    def get_trigger_period(self, channel_key: str) -> float:
+        """Shortest interval between two external triggers.
+
+        A triggered frame is generated completely, including the camera delay, before
+        the next trigger is accepted. Triggers that arrive earlier are lost.
+
+        Parameters
+        ----------
+        channel_key : str
+            Channel key for current channel.
+
+        Returns
+        -------
+        float
+            Shortest trigger interval in seconds.
+        """
+        return self.get_frame_period(channel_key) + self.camera_delay
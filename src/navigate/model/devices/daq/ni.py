@@ -85,6 +85,9 @@ class NIDAQ(DAQBase):
         #: str: NI DAQmx port for laser switching
         self.external_trigger = None
 
+        #: bool: Whether the tasks stay armed for every external trigger.
+        self.retriggerable = False
+
         # keep track of analog outputs and their waveforms
         #: dict: Analog outputs.
         self.analog_outputs = {}
@@ -104,6 +107,33 @@ class NIDAQ(DAQBase):
         #: bool: Flag for waiting to run.
         self.wait_to_run_lock = Lock()
 
+        #: str: Output line of the camera trigger task.
+        self.camera_task_line = None
+
+        #: tuple: High time, low time and initial delay of the camera trigger pulse.
+        self.camera_task_pulse = None
+
+        #: int: Number of pulses of the camera trigger task.
+        self.camera_task_samples = None
+
+        #: dict: Channels and buffer length of the analog output task of each board.
+        self.analog_task_settings = {}
+
+        #: dict: Number of samples of the analog output task of each board.
+        self.analog_task_samples = {}
+
+        #: dict: Waveforms in the buffer of the analog output task of each board.
+        self.analog_task_buffers = {}
+
+        #: dict: Expanded waveforms of each board and channel.
+        self.expanded_waveforms = {}
+
+        #: dict: Number of tasks created, waveforms written and writes skipped.
+        self.task_counts = {"created": 0, "written": 0, "reused": 0}
+
+        #: float: Time spent preparing the tasks for the last channel (s).
+        self.prepare_time = 0
+
     def __str__(self) -> str:
         """String representation of the class."""
         return "NIDAQ"
@@ -113,22 +143,31 @@ class NIDAQ(DAQBase):
         if self.camera_trigger_task is not None:
             self.stop_acquisition()
 
-    def set_external_trigger(self, external_trigger=None) -> None:
+    def set_external_trigger(self, external_trigger=None, retriggerable=False) -> None:
         """Set trigger mode.
 
+        Retriggerable tasks are started once and then run a frame for every external
+        trigger, e.g. the encoder pulses of a scanning stage, without being re-armed
+        in between. Triggers that arrive while a frame is generated are lost, see
+        `get_trigger_period`.
+
         Parameters
         ----------
         external_trigger : nidaqmx.Task
             Task for external triggering
+        retriggerable : bool, optional
+            Keep the tasks armed for every external trigger. Default is False.
         """
         self.trigger_mode = (
             "self-trigger" if external_trigger is None else "external-trigger"
         )
         self.external_trigger = external_trigger
+        self.retriggerable = retriggerable and external_trigger is not None
 
         # change trigger mode during acquisition in a feature
         if self.trigger_mode == "self-trigger":
-            self.create_master_trigger_task()
+            if self.master_trigger_task is None:
+                self.create_master_trigger_task()
             trigger_source = self.configuration["configuration"]["microscopes"][
                 self.microscope_name
             ]["daq"]["trigger_source"]
@@ -157,6 +196,9 @@ class NIDAQ(DAQBase):
                 self.analog_output_tasks[
                     board_name
                 ].triggers.start_trigger.cfg_dig_edge_start_trig(trigger_source)
+                self.analog_output_tasks[
+                    board_name
+                ].triggers.start_trigger.retriggerable = False
                 try:
                     self.analog_output_tasks[board_name].register_done_event(None)
                 except Exception:
@@ -175,13 +217,29 @@ class NIDAQ(DAQBase):
                         f"{traceback.format_exc()}"
                     )
             self.master_trigger_task = None
+            # sequences are started by the master trigger, each external trigger
+            # runs a single frame
+            if self.sequence_length > 1:
+                super().set_sequence_length(1)
+                self.update_task_timing()
+            if self.retriggerable:
+                # the tasks are armed once for all the triggers
+                for task in [self.camera_trigger_task] + list(
+                    self.analog_output_tasks.values()
+                ):
+                    try:
+                        task.stop()
+                    except Exception:
+                        logger.debug(f"Error stopping task: {traceback.format_exc()}")
             # camera task trigger source
             self.camera_trigger_task.triggers.start_trigger.cfg_dig_edge_start_trig(
                 self.external_trigger
             )
 
             # change camera task to so that it can be triggered again.
-            self.camera_trigger_task.triggers.start_trigger.retriggerable = False
+            self.camera_trigger_task.triggers.start_trigger.retriggerable = (
+                self.retriggerable
+            )
 
             # add callback function to analog tasks
             for board_name in self.analog_output_tasks.keys():
@@ -189,8 +247,12 @@ class NIDAQ(DAQBase):
                 task.triggers.start_trigger.cfg_dig_edge_start_trig(
                     self.external_trigger
                 )
+                task.triggers.start_trigger.retriggerable = self.retriggerable
                 task.register_done_event(None)
-                task.register_done_event(self.restart_analog_task_callback_func(task))
+                if not self.retriggerable:
+                    task.register_done_event(
+                        self.restart_analog_task_callback_func(task)
+                    )
 
     @staticmethod
     def wait_for_external_trigger(
@@ -272,12 +334,14 @@ class NIDAQ(DAQBase):
         Channel that the TTL is delivered from, and its delay (typically ~10 ms), are
         specified in the configuration.yaml file.
 
+        The task is created once and only reconfigured when its pulse timing or
+        number of pulses changes.
+
         Parameters
         ----------
         channel_key : str
             Channel key for current channel.
         """
-        self.camera_trigger_task = nidaqmx.Task()
         camera_trigger_out_line = self.configuration["configuration"]["microscopes"][
             self.microscope_name
         ]["daq"]["camera_trigger_out_line"]
@@ -296,19 +360,39 @@ class NIDAQ(DAQBase):
             camera_high_time = self.sweep_times[channel_key] - 0.004
             camera_low_time = 0.004
 
-        self.camera_trigger_task.co_channels.add_co_pulse_chan_time(
-            camera_trigger_out_line,
-            high_time=camera_high_time,
-            low_time=camera_low_time,
-            initial_delay=self.camera_delay,
-        )
+        pulse = (camera_high_time, camera_low_time, self.camera_delay)
+        samples = camera_waveform_repeat_num * self.sequence_length
+
+        if (
+            self.camera_trigger_task is None
+            or self.camera_task_line != camera_trigger_out_line
+        ):
+            self.close_task(self.camera_trigger_task)
+            self.camera_trigger_task = nidaqmx.Task()
+            self.camera_trigger_task.co_channels.add_co_pulse_chan_time(
+                camera_trigger_out_line,
+                high_time=camera_high_time,
+                low_time=camera_low_time,
+                initial_delay=self.camera_delay,
+            )
+            self.camera_task_line = camera_trigger_out_line
+            self.camera_task_pulse = pulse
+            self.camera_task_samples = None
+            self.task_counts["created"] += 1
+        elif self.camera_task_pulse != pulse:
+            camera_channel = self.camera_trigger_task.co_channels.all
+            camera_channel.co_pulse_high_time = camera_high_time
+            camera_channel.co_pulse_low_time = camera_low_time
+            camera_channel.co_pulse_time_initial_delay = self.camera_delay
+            self.camera_task_pulse = pulse
 
         # apply waveform templates
-        camera_waveform_repeat_num = self.waveform_repeat_num * self.waveform_expand_num
-        self.camera_trigger_task.timing.cfg_implicit_timing(
-            sample_mode=nidaqmx.constants.AcquisitionType.FINITE,
-            samps_per_chan=camera_waveform_repeat_num,
-        )
+        if self.camera_task_samples != samples:
+            self.camera_trigger_task.timing.cfg_implicit_timing(
+                sample_mode=nidaqmx.constants.AcquisitionType.FINITE,
+                samps_per_chan=samples,
+            )
+            self.camera_task_samples = samples
 
     def create_master_trigger_task(self) -> None:
         """Set up the DO master trigger task."""
@@ -320,6 +404,79 @@ class NIDAQ(DAQBase):
             master_trigger_out_line,
             line_grouping=nidaqmx.constants.LineGrouping.CHAN_FOR_ALL_LINES,
         )
+        self.task_counts["created"] += 1
+
+    def get_analog_waveforms(self, board: str, channel_key: str) -> np.ndarray:
+        """Get the expanded waveforms of the analog outputs of a board.
+
+        The expanded waveforms are cached per channel and recalculated only when the
+        waveforms of the analog outputs are replaced.
+
+        Parameters
+        ----------
+        board : str
+            Name of the board.
+        channel_key : str
+            Channel key for analog output.
+
+        Returns
+        -------
+        np.ndarray
+            Waveforms to write to the analog output task of the board.
+        """
+        max_sample = self.n_sample * self.waveform_expand_num
+        sources = [
+            v["waveform"][channel_key]
+            for k, v in self.analog_outputs.items()
+            if k.split("/")[0] == board
+        ]
+        key = (board, channel_key)
+        cached = self.expanded_waveforms.get(key, None)
+        if (
+            cached is not None
+            and cached[1] == max_sample
+            and len(cached[0]) == len(sources)
+            and all(a is b for a, b in zip(cached[0], sources))
+        ):
+            return cached[2]
+
+        # TODO: may change this later to automatically expand the waveform to the
+        #  longest
+        waveforms = np.vstack(
+            [
+                (
+                    waveform
+                    if len(waveform) >= max_sample
+                    else np.tile(waveform, self.waveform_expand_num)
+                )[:max_sample]
+                for waveform in sources
+            ]
+        ).squeeze()
+        self.expanded_waveforms[key] = (sources, max_sample, waveforms)
+        return waveforms
+
+    def write_analog_waveforms(self, board: str, waveforms: np.ndarray) -> None:
+        """Write waveforms to the analog output task of a board.
+
+        The waveforms are only written if they differ from the ones in the buffer of
+        the task.
+
+        Parameters
+        ----------
+        board : str
+            Name of the board.
+        waveforms : np.ndarray
+            Waveforms to write.
+        """
+        written = self.analog_task_buffers.get(board, None)
+        if written is not None and (
+            written is waveforms or np.array_equal(written, waveforms)
+        ):
+            self.task_counts["reused"] += 1
+            return
+        self.analog_output_tasks[board].write(waveforms)
+        self.analog_task_buffers[board] = waveforms
+        self.task_counts["written"] += 1
 
     def create_analog_output_tasks(self, channel_key: str) -> None:
         """Create analog output tasks for each board.
@@ -328,6 +485,9 @@ class NIDAQ(DAQBase):
         have only one clock for analog output sample timing, and as such all channels
         must be grouped here.
 
+        The tasks are reused as long as their channels and buffer length stay the
+        same, and the waveforms are only rewritten if they changed.
+
         Parameters
         ----------
         channel_key : str
@@ -335,6 +495,7 @@ class NIDAQ(DAQBase):
         """
         self.n_sample = int(self.sample_rate * self.sweep_times[channel_key])
         max_sample = self.n_sample * self.waveform_expand_num
+        samples = max_sample * self.waveform_repeat_num * self.sequence_length
         # TODO: GalvoStage and remote_focus waveform are not calculated based on a
         #  same sweep time. There needs some fix.
 
@@ -346,15 +507,26 @@ class NIDAQ(DAQBase):
                     [x for x in self.analog_outputs.keys() if x.split("/")[0] == board]
                 )
             )
-            self.analog_output_tasks[board] = nidaqmx.Task()
-            self.analog_output_tasks[board].ao_channels.add_ao_voltage_chan(channel)
+            # a buffer of a different length needs a new task
+            if self.analog_task_settings.get(board, None) != (channel, max_sample):
+                self.close_task(self.analog_output_tasks.get(board, None))
+                self.analog_output_tasks[board] = nidaqmx.Task()
+                self.analog_output_tasks[board].ao_channels.add_ao_voltage_chan(
+                    channel
+                )
+                self.analog_task_settings[board] = (channel, max_sample)
+                self.analog_task_samples.pop(board, None)
+                self.analog_task_buffers.pop(board, None)
+                self.task_counts["created"] += 1
 
             # apply templates to analog tasks
-            self.analog_output_tasks[board].timing.cfg_samp_clk_timing(
-                rate=self.sample_rate,
-                sample_mode=nidaqmx.constants.AcquisitionType.FINITE,
-                samps_per_chan=max_sample * self.waveform_repeat_num,
-            )
+            if self.analog_task_samples.get(board, None) != samples:
+                self.analog_output_tasks[board].timing.cfg_samp_clk_timing(
+                    rate=self.sample_rate,
+                    sample_mode=nidaqmx.constants.AcquisitionType.FINITE,
+                    samps_per_chan=samples,
+                )
+                self.analog_task_samples[board] = samples
 
             # triggers = list(
             #     set([v["trigger_source"] for v in self.analog_outputs.values()])
@@ -367,25 +539,10 @@ class NIDAQ(DAQBase):
             # self.analog_output_tasks[board].triggers.start_trigger.cfg_dig_edge_start_trig(
             #     triggers[0]
             # )
-            # TODO: may change this later to automatically expand the waveform to the
-            #  longest
-            for k, v in self.analog_outputs.items():
-                if (
-                    k.split("/")[0] == board
-                    and len(v["waveform"][channel_key]) < max_sample
-                ):
-                    v["waveform"][channel_key] = np.hstack(
-                        [v["waveform"][channel_key]] * self.waveform_expand_num
-                    )
             # Write values to board
-            waveforms = np.vstack(
-                [
-                    v["waveform"][channel_key][:max_sample]
-                    for k, v in self.analog_outputs.items()
-                    if k.split("/")[0] == board
-                ]
-            ).squeeze()
-            self.analog_output_tasks[board].write(waveforms)
+            self.write_analog_waveforms(
+                board, self.get_analog_waveforms(board, channel_key)
+            )
 
     def prepare_acquisition(self, channel_key: str) -> None:
         """Prepare the acquisition.
@@ -398,6 +555,7 @@ class NIDAQ(DAQBase):
         channel_key : str
             Channel key for current channel.
         """
+        start_time = time.perf_counter()
         waveform_template_name = self.configuration["experiment"]["MicroscopeState"][
             "waveform_template"
         ]
@@ -417,11 +575,18 @@ class NIDAQ(DAQBase):
         self.create_camera_task(channel_key)
         self.create_analog_output_tasks(channel_key)
         self.current_channel_key = channel_key
+        self.sequence_frame_count = 0
         self.is_updating_analog_task = False
         if self.wait_to_run_lock.locked():
             self.wait_to_run_lock.release()
         # Specify ports, timing, and triggering
-        self.set_external_trigger(self.external_trigger)
+        self.set_external_trigger(self.external_trigger, self.retriggerable)
+
+        self.prepare_time = time.perf_counter() - start_time
+        logger.info(
+            f"Prepared the DAQ for {channel_key} in {self.prepare_time * 1000:.2f} ms "
+            f"({self.task_counts})"
+        )
 
     def run_acquisition(self) -> None:
         """Run DAQ Acquisition.
@@ -430,21 +595,42 @@ class NIDAQ(DAQBase):
         The master trigger initiates all other tasks via a shared trigger
         For this to work, all analog output and counter tasks have to be started so that
         they are waiting for the trigger signal.
+
+        In sequence mode, the tasks are started for the first frame of the sequence and
+        stopped after the last one. The frames in between are timed by the sample clock
+        of the DAQ, so this method returns right away for them, and only waits for the
+        tasks to be done after the last frame.
+
+        Retriggerable tasks are started for the first frame and keep running until the
+        trigger mode is changed or the tasks are stopped.
         """
         # wait if writing analog tasks
         if self.is_updating_analog_task:
             self.wait_to_run_lock.acquire()
             self.wait_to_run_lock.release()
 
-        if self.camera_trigger_task.is_task_done():
-            self.camera_trigger_task.start()
-            for task in self.analog_output_tasks.values():
-                task.start()
+        if self.retriggerable:
+            if self.camera_trigger_task.is_task_done():
+                self.camera_trigger_task.start()
+                for task in self.analog_output_tasks.values():
+                    task.start()
+            return
 
-        if self.trigger_mode == "self-trigger":
-            self.master_trigger_task.write(
-                [False, True, True, True, False], auto_start=True
-            )
+        if self.sequence_frame_count == 0:
+            if self.camera_trigger_task.is_task_done():
+                self.camera_trigger_task.start()
+                for task in self.analog_output_tasks.values():
+                    task.start()
+
+            if self.trigger_mode == "self-trigger":
+                self.master_trigger_task.write(
+                    [False, True, True, True, False], auto_start=True
+                )
+
+        self.sequence_frame_count += 1
+        if self.sequence_frame_count < self.sequence_length:
+            return
+        self.sequence_frame_count = 0
 
         try:
             self.camera_trigger_task.wait_until_done(timeout=10000)
@@ -464,30 +650,105 @@ class NIDAQ(DAQBase):
         except nidaqmx.DaqError:
             pass
 
-    def stop_acquisition(self) -> None:
-        """Stop Acquisition.
+    @staticmethod
+    def close_task(task: nidaqmx.Task) -> None:
+        """Stop and close a task.
 
-        Stop all tasks and close them.
+        Parameters
+        ----------
+        task : nidaqmx.Task
+            Task to close. Nothing happens if it is None.
         """
+        if task is None:
+            return
         try:
-            self.camera_trigger_task.stop()
-            self.camera_trigger_task.close()
+            task.stop()
+            task.close()
+        except nidaqmx.errors.DaqError:
+            logger.debug(f"Error closing task: {traceback.format_exc()}")
 
-            if self.trigger_mode == "self-trigger":
-                self.master_trigger_task.stop()
-                self.master_trigger_task.close()
+    def stop_tasks(self) -> None:
+        """Stop all tasks without closing them.
 
-            for k, task in self.analog_output_tasks.items():
+        The tasks are kept, so they can be reused for the next channel.
+        """
+        self.sequence_frame_count = 0
+        tasks = [self.camera_trigger_task, self.master_trigger_task]
+        for task in tasks + list(self.analog_output_tasks.values()):
+            if task is None:
+                continue
+            try:
                 task.stop()
-                task.close()
+            except nidaqmx.errors.DaqError:
+                logger.debug(f"Error stopping task: {traceback.format_exc()}")
 
-        except (AttributeError, nidaqmx.errors.DaqError):
-            pass
+        if self.wait_to_run_lock.locked():
+            self.wait_to_run_lock.release()
+
+    def stop_acquisition(self) -> None:
+        """Stop Acquisition.
+
+        Stop all tasks and close them.
+        """
+        self.sequence_frame_count = 0
+        self.close_task(self.camera_trigger_task)
+        self.close_task(self.master_trigger_task)
+        for task in self.analog_output_tasks.values():
+            self.close_task(task)
 
         if self.wait_to_run_lock.locked():
             self.wait_to_run_lock.release()
 
+        self.camera_trigger_task = None
+        self.master_trigger_task = None
         self.analog_output_tasks = {}
+        self.analog_task_settings = {}
+        self.analog_task_samples = {}
+        self.analog_task_buffers = {}
+        self.expanded_waveforms = {}
+
+    def set_sequence_length(self, number_of_frames: int = 1) -> None:
+        """Run the next frames as one hardware-timed sequence.
+
+        Sequences are started by the master trigger. With an external trigger, each
+        trigger runs a single frame.
+
+        Parameters
+        ----------
+        number_of_frames : int
+            Number of frames in a sequence. 1 disables the sequence mode.
+        """
+        if number_of_frames > 1 and self.trigger_mode == "external-trigger":
+            logger.info(
+                "NI DAQ - Sequences are not supported with an external trigger."
+            )
+            number_of_frames = 1
+        super().set_sequence_length(number_of_frames)
+        self.update_task_timing()
+
+    def update_task_timing(self) -> None:
+        """Update the number of samples of the prepared tasks to the sequence length."""
+        if self.camera_trigger_task is None or self.n_sample is None:
+            return
+        camera_waveform_repeat_num = self.waveform_repeat_num * self.waveform_expand_num
+        samples = camera_waveform_repeat_num * self.sequence_length
+        try:
+            self.camera_trigger_task.stop()
+            self.camera_trigger_task.timing.cfg_implicit_timing(
+                sample_mode=nidaqmx.constants.AcquisitionType.FINITE,
+                samps_per_chan=samples,
+            )
+            self.camera_task_samples = samples
+            for board, task in self.analog_output_tasks.items():
+                task.stop()
+                task.timing.cfg_samp_clk_timing(
+                    rate=self.sample_rate,
+                    sample_mode=nidaqmx.constants.AcquisitionType.FINITE,
+                    samps_per_chan=self.n_sample * samples,
+                )
+                self.analog_task_samples[board] = self.n_sample * samples
+        except Exception:
+            logger.debug(f"Could not update task timing: {traceback.format_exc()}")
 
     def enable_microscope(self, microscope_name: str) -> None:
         """Enable microscope.
@@ -498,9 +759,9 @@ class NIDAQ(DAQBase):
             Name of microscope to enable.
         """
         if microscope_name != self.microscope_name:
+            self.stop_acquisition()
             self.microscope_name = microscope_name
             self.analog_outputs = {}
-            self.analog_output_tasks = {}
 
         self.camera_delay = (
             float(self.waveform_constants["other_constants"].get("camera_delay", 5))
@@ -563,24 +824,18 @@ class NIDAQ(DAQBase):
             self.analog_output_tasks[board_name].stop()
 
             # Write values to board
-            waveforms = np.vstack(
-                [
-                    v["waveform"][self.current_channel_key][: self.n_sample]
-                    for k, v in self.analog_outputs.items()
-                    if k.split("/")[0] == board_name
-                ]
-            ).squeeze()
-            self.analog_output_tasks[board_name].write(waveforms)
+            self.write_analog_waveforms(
+                board_name,
+                self.get_analog_waveforms(board_name, self.current_channel_key),
+            )
         except Exception:
             logger.debug(f"Could not update analog task: {traceback.format_exc()}")
             for board in self.analog_output_tasks.keys():
-                try:
-                    self.analog_output_tasks[board].stop()
-                    self.analog_output_tasks[board].close()
-                except Exception:
-                    logger.debug(
-                        f"Could not stop analog tasks: {traceback.format_exc()}"
-                    )
+                self.close_task(self.analog_output_tasks[board])
+            self.analog_output_tasks = {}
+            self.analog_task_settings = {}
+            self.analog_task_samples = {}
+            self.analog_task_buffers = {}
 
             self.create_analog_output_tasks(self.current_channel_key)
 
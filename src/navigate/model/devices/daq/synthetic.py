@@ -79,6 +79,18 @@ class SyntheticDAQ(DAQBase):
         #: str: Trigger mode. Self-trigger or external-trigger.
         self.trigger_mode = "self-trigger"
 
+        #: str: Name of the external trigger.
+        self.external_trigger = None
+
+        #: bool: Whether the tasks stay armed for every external trigger.
+        self.retriggerable = False
+
+        #: float: Emulated time to start and stop the tasks (s).
+        self.task_overhead = 0.01
+
+        #: str: Channel key of the prepared acquisition.
+        self.current_channel_key = ""
+
     def __str__(self) -> str:
         """String representation of the class."""
         return "SyntheticDAQ"
@@ -119,6 +131,7 @@ class SyntheticDAQ(DAQBase):
             Channel key for current channel.
         """
         self.current_channel_key = channel_key
+        self.sequence_frame_count = 0
         self.is_updating_analog_task = False
         if self.wait_to_run_lock.locked():
             self.wait_to_run_lock.release()
@@ -129,19 +142,37 @@ class SyntheticDAQ(DAQBase):
         Run the tasks for triggering, analog and counter outputs.
         The master trigger initiates all other tasks via a shared trigger
         For this to work, all analog output and counter tasks have to be started so that
-        they are waiting for the trigger signal."""
+        they are waiting for the trigger signal.
+
+        In sequence mode, only the first frame of a sequence pays for starting the
+        tasks."""
         # wait if writing analog tasks
         if self.is_updating_analog_task:
             self.wait_to_run_lock.acquire()
             self.wait_to_run_lock.release()
-        time.sleep(0.01)
-        if self.trigger_mode == "self-trigger":
+        if self.sequence_frame_count == 0:
+            time.sleep(self.task_overhead)
+        self.sequence_frame_count += 1
+        self.sequence_frame_count %= self.sequence_length
+        # the synthetic stage always emits encoder pulses when it is scanning
+        scan_trigger_source = self.configuration["configuration"]["microscopes"][
+            self.microscope_name
+        ]["daq"].get("scan_trigger_source", None)
+        if self.trigger_mode == "self-trigger" or (
+            self.external_trigger is not None
+            and self.external_trigger == scan_trigger_source
+        ):
             for microscope_name in self.camera:
                 self.camera[microscope_name].generate_new_frame()
 
+        # like waiting until the NI tasks are done, block for the frame duration
+        frame_period = self.get_frame_period(self.current_channel_key)
+        if frame_period > 0:
+            time.sleep(frame_period)
+
     def stop_acquisition(self):
         """Stop Acquisition."""
-        pass
+        self.sequence_frame_count = 0
 
     def write_waveforms_to_tasks(self):
         """Write the galvo, remote focus, and laser waveforms to each task."""
@@ -177,15 +208,34 @@ class SyntheticDAQ(DAQBase):
         self.is_updating_analog_task = False
         self.wait_to_run_lock.release()
 
-    def set_external_trigger(self, external_trigger=None):
+    def set_external_trigger(self, external_trigger=None, retriggerable=False):
         """Set the external trigger.
 
         Parameters
         ----------
         external_trigger : str, optional
             Name of external trigger.
+        retriggerable : bool, optional
+            Keep the tasks armed for every external trigger. Default is False.
         """
 
         self.trigger_mode = (
             "self-trigger" if external_trigger is None else "external-trigger"
         )
+        self.external_trigger = external_trigger
+        self.retriggerable = retriggerable and external_trigger is not None
+        # sequences are started by the master trigger
+        if external_trigger is not None and self.sequence_length > 1:
+            self.set_sequence_length(1)
+
+    def set_sequence_length(self, number_of_frames=1):
+        """Run the next frames as one hardware-timed sequence.
+
+        Parameters
+        ----------
+        number_of_frames : int
+            Number of frames in a sequence. 1 disables the sequence mode.
+        """
+        if self.trigger_mode == "external-trigger":
+            number_of_frames = 1
+        super().set_sequence_length(number_of_frames)
@@ -0,0 +1,3 @@
+"""
+Serial protocol emulators, to run the device drivers without hardware.
+"""
@@ -0,0 +1,473 @@
+# Copyright (c) 2021-2024  The University of Texas Southwestern Medical Center.
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted for academic and research use only
+# (subject to the limitations in the disclaimer below)
+# provided that the following conditions are met:
+
+#      * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#      * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+
+#      * Neither the name of the copyright holders nor the names of its
+#      contributors may be used to endorse or promote products derived from this
+#      software without specific prior written permission.
+
+# NO EXPRESS OR IMPLIED LICENSES TO ANY PARTY'S PATENT RIGHTS ARE GRANTED BY
+# THIS LICENSE. THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+# PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+# Standard Imports
+import logging
+import math
+import time
+
+# Third Party Imports
+
+# Local Imports
+from navigate.model.devices.emulators.serial_port import SerialEmulator
+
+# Logger Setup
+p = __name__.split(".")[1]
+logger = logging.getLogger(p)
+
+
+class EmulatedAxis:
+    """Stage axis moving with a trapezoidal velocity profile."""
+
+    def __init__(self, axis_type="x", speed=1.0, max_speed=7.5, ramp_time=70):
+        """Initialize the axis.
+
+        Parameters
+        ----------
+        axis_type : str
+            ASI axis type: x (XY motor), z (Z motor) or t (theta).
+        speed : float
+            Speed, in mm/s.
+        max_speed : float
+            Maximum speed, in mm/s.
+        ramp_time : float
+            Time to reach the speed, in ms.
+        """
+        #: str: ASI axis type.
+        self.axis_type = axis_type
+
+        #: float: Speed, in mm/s.
+        self.speed = speed
+
+        #: float: Maximum speed, in mm/s.
+        self.max_speed = max_speed
+
+        #: float: Time to reach the speed, in ms.
+        self.ramp_time = ramp_time
+
+        #: float: Encoder counts per mm.
+        self.counts_per_mm = 10000.0
+
+        self.start_position = 0.0
+        self.target_position = 0.0
+        self.start_time = 0.0
+        self.duration = 0.0
+
+    def move_time(self, distance):
+        """Duration of a move.
+
+        Parameters
+        ----------
+        distance : float
+            Distance, in 1/10 microns.
+
+        Returns
+        -------
+        float
+            Duration, in seconds.
+        """
+        distance = abs(distance) / 10000.0
+        ramp_time = self.ramp_time / 1000.0
+        if distance == 0:
+            return 0.0
+        if distance >= self.speed * ramp_time:
+            return distance / self.speed + ramp_time
+        return 2 * math.sqrt(distance * ramp_time / self.speed)
+
+    def position(self, now):
+        """Position of the axis.
+
+        Parameters
+        ----------
+        now : float
+            Time, from time.perf_counter().
+
+        Returns
+        -------
+        float
+            Position, in 1/10 microns.
+        """
+        if now >= self.start_time + self.duration:
+            return self.target_position
+        fraction = (now - self.start_time) / self.duration
+        return self.start_position + fraction * (
+            self.target_position - self.start_position
+        )
+
+    def is_busy(self, now):
+        """Is the axis moving?"""
+        return now < self.start_time + self.duration
+
+    def move(self, position, now):
+        """Start a move.
+
+        Parameters
+        ----------
+        position : float
+            Target position, in 1/10 microns.
+        now : float
+            Time, from time.perf_counter().
+        """
+        self.start_position = self.position(now)
+        self.target_position = position
+        self.start_time = now
+        self.duration = self.move_time(position - self.start_position)
+
+    def halt(self, now):
+        """Stop the axis where it is."""
+        self.move(self.position(now), now)
+
+
+class EmulatedFilterWheel:
+    """Filter wheel moving by one position every switch_time seconds."""
+
+    def __init__(self, switch_time=0.04, positions=8):
+        """Initialize the filter wheel.
+
+        Parameters
+        ----------
+        switch_time : float
+            Time to move by one position, in seconds.
+        positions : int
+            Number of positions.
+        """
+        #: float: Time to move by one position, in seconds.
+        self.switch_time = switch_time
+
+        #: int: Number of positions.
+        self.positions = positions
+
+        #: int: Current or target position.
+        self.position = 0
+
+        #: float: Time the current move ends, from time.perf_counter().
+        self.busy_until = 0.0
+
+    def move_time(self, position):
+        """Duration of a move to position, going the shortest way around."""
+        distance = abs(position - self.position) % self.positions
+        return min(distance, self.positions - distance) * self.switch_time
+
+    def move(self, position, now):
+        """Start a move to position, after the current one."""
+        start_time = max(now, self.busy_until)
+        self.busy_until = start_time + self.move_time(position)
+        self.position = position
+
+
+class TigerEmulator(SerialEmulator):
+    """Emulator of the ASI Tiger controller serial protocol.
+
+    The stage axes move with a trapezoidal velocity profile and report busy until
+    the move is done, so the timing of the driver can be tested without hardware.
+    """
+
+    def __init__(
+        self,
+        axes=None,
+        speed=1.0,
+        ramp_time=70,
+        filter_wheels=2,
+        switch_time=0.04,
+        latency=0.0,
+        command_latency=None,
+        baud_rate=None,
+    ):
+        """Initialize the emulator.
+
+        Parameters
+        ----------
+        axes : dict
+            ASI axis type of each axis, e.g. {"X": "x", "Z": "z", "T": "t"}.
+            Axes of other types are reported but do not move.
+        speed : float
+            Speed of the axes, in mm/s.
+        ramp_time : float
+            Time for the axes to reach their speed, in ms.
+        filter_wheels : int
+            Number of filter wheels.
+        switch_time : float
+            Time for a filter wheel to move by one position, in seconds.
+        latency : float
+            Time to answer a command, in seconds.
+        command_latency : dict
+            Time to answer specific commands, in seconds.
+        baud_rate : int
+            Baud rate used to add the transfer time to the latency.
+        """
+        super().__init__(latency, command_latency, baud_rate)
+        if axes is None:
+            axes = {"X": "x", "Y": "x", "Z": "z", "M": "z", "N": "z"}
+
+        #: dict: Emulated axes, by ASI axis name.
+        self.axes = {
+            name: EmulatedAxis(axis_type, speed=speed, ramp_time=ramp_time)
+            for name, axis_type in axes.items()
+        }
+
+        #: list[EmulatedFilterWheel]: Emulated filter wheels.
+        self.filter_wheels = [
+            EmulatedFilterWheel(switch_time) for _ in range(filter_wheels)
+        ]
+
+        #: int: Index of the filter wheel that receives the commands.
+        self.filter_wheel_number = 0
+
+        #: list[str]: Commands received, in order.
+        self.history = []
+
+        #: dict: Handlers of the commands, by command name.
+        self.handlers = {
+            "MOVE": self.move,
+            "M": self.move,
+            "MOVREL": self.move_relative,
+            "R": self.move_relative,
+            "WHERE": self.where,
+            "W": self.where,
+            "/": self.status,
+            "STATUS": self.status,
+            "RS": self.axis_status,
+            "RDSTAT": self.axis_status,
+            "HALT": self.halt,
+            "\\": self.halt,
+            "SPEED": self.speed,
+            "S": self.speed,
+            "AC": self.ramp_time,
+            "ACCEL": self.ramp_time,
+            "CNTS": self.counts,
+            "BU": self.build,
+            "BUILD": self.build,
+            "FW": self.select_filter_wheel,
+            "MP": self.move_filter_wheel,
+            "HO": self.home_filter_wheel,
+            "SV": self.filter_wheel_speed,
+            "HA": self.halt_filter_wheel,
+        }
+
+    @staticmethod
+    def parse_arguments(arguments):
+        """Split the arguments of a command into settings and queries.
+
+        Parameters
+        ----------
+        arguments : list[str]
+            Arguments, e.g. ["X=100", "Y?"]
+
+        Returns
+        -------
+        settings : dict
+            Value of the set axes, e.g. {"X": 100.0}
+        queries : list[str]
+            Queried axes, e.g. ["Y"]
+        """
+        settings, queries = {}, []
+        for argument in arguments:
+            if argument.endswith("?"):
+                queries.append(argument[:-1])
+            elif "=" in argument:
+                axis, value = argument.split("=", 1)
+                settings[axis] = float(value)
+        return settings, queries
+
+    def handle(self, command):
+        """Answer a command.
+
+        Parameters
+        ----------
+        command : bytes
+            Command, without its terminator.
+
+        Returns
+        -------
+        response : bytes
+            Response
+        delay : float
+            Time until the response is sent, in seconds.
+        """
+        command_str = command.decode(encoding="ascii").strip()
+        if not command_str:
+            return b"", 0.0
+        self.history.append(command_str)
+        if command_str.startswith("/"):
+            name, arguments = "/", []
+        else:
+            name, *arguments = command_str.split()
+            name = name.upper()
+        self.count(name)
+        handler = self.handlers.get(name, self.acknowledge)
+        try:
+            response = handler(arguments, time.perf_counter())
+        except (KeyError, ValueError, IndexError):
+            response = ":N-1"
+        response = bytes(f"{response}\r\n", encoding="ascii")
+        return response, self.get_latency(name, command, response)
+
+    def acknowledge(self, arguments, now):
+        """Accept a command without emulating it."""
+        return ":A"
+
+    def move(self, arguments, now):
+        """MOVE X=position ..."""
+        settings, _ = self.parse_arguments(arguments)
+        for axis, position in settings.items():
+            self.axes[axis].move(position, now)
+        return ":A"
+
+    def move_relative(self, arguments, now):
+        """MOVREL X=distance ..."""
+        settings, _ = self.parse_arguments(arguments)
+        for axis, distance in settings.items():
+            self.axes[axis].move(self.axes[axis].target_position + distance, now)
+        return ":A"
+
+    def where(self, arguments, now):
+        """WHERE X Y ..., answered in the order of the controller axes."""
+        axes = [axis for axis in self.axes if axis in arguments]
+        positions = [f"{self.axes[axis].position(now):.1f}" for axis in axes]
+        return " ".join([":A"] + positions)
+
+    def is_busy(self, now):
+        """Is any axis moving?"""
+        return any(axis.is_busy(now) for axis in self.axes.values())
+
+    def status(self, arguments, now):
+        """/ answers B if any axis is moving, N otherwise."""
+        return "B" if self.is_busy(now) else "N"
+
+    def axis_status(self, arguments, now):
+        """RS X? answers B if the axis is moving, N otherwise."""
+        _, queries = self.parse_arguments(arguments)
+        busy = any(self.axes[axis].is_busy(now) for axis in queries)
+        return ":A B" if busy else ":A N"
+
+    def halt(self, arguments, now):
+        """HALT stops all the axes."""
+        for axis in self.axes.values():
+            axis.halt(now)
+        return ":A"
+
+    def speed(self, arguments, now):
+        """SPEED X=speed ... or SPEED X? ..."""
+        settings, queries = self.parse_arguments(arguments)
+        for axis, speed in settings.items():
+            self.axes[axis].speed = min(speed, self.axes[axis].max_speed)
+        if queries:
+            values = [f"{axis}={self.axes[axis].speed:.6f}" for axis in queries]
+            return " ".join([":A"] + values)
+        return ":A"
+
+    def ramp_time(self, arguments, now):
+        """AC X=ramp time ... or AC X? ..."""
+        settings, queries = self.parse_arguments(arguments)
+        for axis, ramp_time in settings.items():
+            self.axes[axis].ramp_time = ramp_time
+        if queries:
+            values = [f"{axis}={self.axes[axis].ramp_time:.0f}" for axis in queries]
+            return " ".join([":A"] + values)
+        return ":A"
+
+    def counts(self, arguments, now):
+        """CNTS X? answers the encoder counts per mm."""
+        _, queries = self.parse_arguments(arguments)
+        return f":A {queries[0]}={self.axes[queries[0]].counts_per_mm:.0f} counts/mm"
+
+    def build(self, arguments, now):
+        """BU X answers the axes of the controller."""
+        return "\r".join(
+            [
+                "TIGER_COMM",
+                "Motor Axes: " + " ".join(self.axes),
+                "Axis Types: "
+                + " ".join(axis.axis_type for axis in self.axes.values()),
+            ]
+        )
+
+    def select_filter_wheel(self, arguments, now):
+        """FW n selects the filter wheel that receives the commands."""
+        number = int(arguments[0])
+        if number not in range(len(self.filter_wheels)):
+            raise ValueError(number)
+        self.filter_wheel_number = number
+        return f"{number}"
+
+    def move_filter_wheel(self, arguments, now):
+        """MP n moves the selected filter wheel to position n."""
+        wheel = self.filter_wheels[self.filter_wheel_number]
+        position = int(arguments[0])
+        if position not in range(wheel.positions):
+            raise ValueError(position)
+        wheel.move(position, now)
+        return f"{position}"
+
+    def home_filter_wheel(self, arguments, now):
+        """HO moves the selected filter wheel to its home position."""
+        self.filter_wheels[self.filter_wheel_number].move(0, now)
+        return "0"
+
+    def filter_wheel_speed(self, arguments, now):
+        """SV n selects a preset speed of the filter wheels."""
+        return f"{int(arguments[0])}"
+
+    def halt_filter_wheel(self, arguments, now):
+        """HA stops the selected filter wheel."""
+        self.filter_wheels[self.filter_wheel_number].busy_until = now
+        return "0"
+
+    def is_filter_wheel_busy(self, now):
+        """Is any filter wheel moving?"""
+        return any(wheel.busy_until > now for wheel in self.filter_wheels)
+
+
+class MS2000Emulator(TigerEmulator):
+    """Emulator of the ASI MS2000 controller serial protocol.
+
+    The MS2000 speaks the Tiger protocol, for up to three axes.
+    """
+
+    def __init__(self, axes=None, **kwargs):
+        """Initialize the emulator.
+
+        Parameters
+        ----------
+        axes : dict
+            ASI axis type of each axis, by default X, Y and Z.
+        **kwargs
+            Keyword arguments of TigerEmulator.
+        """
+        if axes is None:
+            axes = {"X": "x", "Y": "x", "Z": "z"}
+        kwargs.setdefault("filter_wheels", 0)
+        super().__init__(axes=axes, **kwargs)
+
+    def build(self, arguments, now):
+        """BU X answers the axes, followed by two unused fields."""
+        return "\r".join(["MS2000", "Motor Axes: " + " ".join(self.axes) + " 0 1"])
@@ -0,0 +1,471 @@
+# Copyright (c) 2021-2024  The University of Texas Southwestern Medical Center.
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted for academic and research use only
+# (subject to the limitations in the disclaimer below)
+# provided that the following conditions are met:
+
+#      * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#      * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+
+#      * Neither the name of the copyright holders nor the names of its
+#      contributors may be used to endorse or promote products derived from this
+#      software without specific prior written permission.
+
+# NO EXPRESS OR IMPLIED LICENSES TO ANY PARTY'S PATENT RIGHTS ARE GRANTED BY
+# THIS LICENSE. THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+# PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+# Standard Imports
+import logging
+import os
+import select
+import threading
+import time
+from collections import deque
+
+# Third Party Imports
+
+# Local Imports
+
+# Logger Setup
+p = __name__.split(".")[1]
+logger = logging.getLogger(p)
+
+
+class SerialEmulator:
+    """Base class of the serial protocol emulators.
+
+    A subclass implements handle(), which receives one command and returns the
+    response and the time the device takes to send it. The responses are queued
+    until they are due, and read by a transport: EmulatedSerial in the same
+    process, or PtyTransport through a pseudo-terminal.
+    """
+
+    #: bytes: End of a command.
+    terminator = b"\r"
+
+    def __init__(self, latency=0.0, command_latency=None, baud_rate=None):
+        """Initialize the emulator.
+
+        Parameters
+        ----------
+        latency : float
+            Time to answer a command, in seconds.
+        command_latency : dict
+            Time to answer specific commands, in seconds, e.g. {"WHERE": 0.002}.
+        baud_rate : int
+            If given, the time to transfer the command and the response at this
+            baud rate is added to the latency.
+        """
+        #: float: Time to answer a command, in seconds.
+        self.latency = latency
+
+        #: dict: Time to answer specific commands, in seconds.
+        self.command_latency = command_latency or {}
+
+        #: int: Baud rate of the emulated link.
+        self.baud_rate = baud_rate
+
+        #: dict: Number of commands received, by command name.
+        self.command_counts = {}
+
+        self._input = bytearray()
+        self._output = deque()
+
+    def get_latency(self, name, command, response):
+        """Return the time to answer a command.
+
+        Parameters
+        ----------
+        name : str
+            Command name
+        command : bytes
+            Command
+        response : bytes
+            Response
+
+        Returns
+        -------
+        float
+            Latency, in seconds.
+        """
+        latency = self.command_latency.get(name, self.latency)
+        if self.baud_rate:
+            # 10 bits per byte, with the start and stop bits
+            latency += 10 * (len(command) + len(response)) / self.baud_rate
+        return latency
+
+    def count(self, name):
+        """Count a command.
+
+        Parameters
+        ----------
+        name : str
+            Command name
+        """
+        self.command_counts[name] = self.command_counts.get(name, 0) + 1
+
+    def split(self, data):
+        """Split the received bytes into commands.
+
+        Parameters
+        ----------
+        data : bytearray
+            Received bytes. The commands are removed from it.
+
+        Returns
+        -------
+        list[bytes]
+            Complete commands, without their terminator.
+        """
+        commands = []
+        while True:
+            index = data.find(self.terminator)
+            if index < 0:
+                return commands
+            commands.append(bytes(data[:index]))
+            del data[: index + len(self.terminator)]
+
+    def handle(self, command):
+        """Answer a command.
+
+        Parameters
+        ----------
+        command : bytes
+            Command, without its terminator.
+
+        Returns
+        -------
+        response : bytes
+            Response, empty if the device does not answer.
+        delay : float
+            Time until the response is sent, in seconds.
+        """
+        raise NotImplementedError
+
+    def receive(self, data):
+        """Receive bytes from the host and answer the complete commands.
+
+        Parameters
+        ----------
+        data : bytes
+            Bytes sent by the host.
+        """
+        self._input += data
+        for command in self.split(self._input):
+            response, delay = self.handle(command)
+            self.send(response, delay)
+
+    def send(self, response, delay=0.0):
+        """Queue bytes to send to the host.
+
+        The device sends its responses in order, so bytes are never sent before the
+        ones queued earlier.
+
+        Parameters
+        ----------
+        response : bytes
+            Bytes to send.
+        delay : float
+            Time until they are sent, in seconds.
+        """
+        if response:
+            ready_time = time.perf_counter() + delay
+            if self._output:
+                ready_time = max(ready_time, self._output[-1][0])
+            self._output.append((ready_time, response))
+
+    def cancel_output(self):
+        """Drop the bytes that have not been sent yet."""
+        self._output.clear()
+
+    def next_output_time(self):
+        """Return when the next bytes are sent.
+
+        Returns
+        -------
+        float or None
+            Time, from time.perf_counter(), None if nothing is queued.
+        """
+        return self._output[0][0] if self._output else None
+
+    def read_output(self):
+        """Return the bytes that are due to the host.
+
+        Returns
+        -------
+        bytes
+            Bytes sent, in order.
+        """
+        now = time.perf_counter()
+        data = bytearray()
+        while self._output and self._output[0][0] <= now:
+            data += self._output.popleft()[1]
+        return bytes(data)
+
+
+class EmulatedSerial:
+    """In-process stand-in for serial.Serial connected to a SerialEmulator.
+
+    Reads block until the emulated device sends the bytes, or the timeout expires,
+    as they would with the device.
+    """
+
+    def __init__(self, emulator, timeout=1.0):
+        """Initialize the emulated serial port.
+
+        Parameters
+        ----------
+        emulator : SerialEmulator
+            Emulated device.
+        timeout : float
+            Read timeout, in seconds.
+        """
+        #: SerialEmulator: Emulated device.
+        self.emulator = emulator
+
+        #: float: Read timeout, in seconds.
+        self.timeout = timeout
+
+        #: float: Write timeout, in seconds.
+        self.write_timeout = None
+
+        #: str: Port name.
+        self.port = "emulated"
+
+        #: int: Baud rate.
+        self.baudrate = 115200
+
+        #: bool: Is the port open?
+        self.is_open = False
+
+        self._received = bytearray()
+
+    def open(self):
+        """Open the port."""
+        self.is_open = True
+
+    def close(self):
+        """Close the port."""
+        self.is_open = False
+
+    def set_buffer_size(self, rx_size=None, tx_size=None):
+        """Accept the buffer sizes of serial.Serial."""
+        pass
+
+    def flush(self):
+        """Accept flushing the output."""
+        pass
+
+    def write(self, data):
+        """Send bytes to the emulated device.
+
+        Parameters
+        ----------
+        data : bytes
+            Bytes to send
+
+        Returns
+        -------
+        int
+            Number of bytes written
+        """
+        self.emulator.receive(bytes(data))
+        return len(data)
+
+    def _wait_for(self, is_done):
+        """Receive bytes until is_done() or the timeout expires."""
+        deadline = time.perf_counter() + (self.timeout or 0)
+        while True:
+            self._received += self.emulator.read_output()
+            if is_done():
+                return
+            next_time = self.emulator.next_output_time()
+            if next_time is None or next_time > deadline:
+                time.sleep(max(deadline - time.perf_counter(), 0))
+                self._received += self.emulator.read_output()
+                return
+            time.sleep(max(next_time - time.perf_counter(), 0))
+
+    @property
+    def in_waiting(self):
+        """Number of bytes that can be read without blocking."""
+        self._received += self.emulator.read_output()
+        return len(self._received)
+
+    def inWaiting(self):
+        """Number of bytes that can be read without blocking."""
+        return self.in_waiting
+
+    def read(self, size=1):
+        """Read up to size bytes, waiting at most timeout seconds.
+
+        Parameters
+        ----------
+        size : int
+            Number of bytes
+
+        Returns
+        -------
+        bytes
+            Bytes read
+        """
+        self._wait_for(lambda: len(self._received) >= size)
+        data = bytes(self._received[:size])
+        del self._received[:size]
+        return data
+
+    def read_until(self, expected=b"\n", size=None):
+        """Read until expected is found, waiting at most timeout seconds.
+
+        Parameters
+        ----------
+        expected : bytes
+            End of the data
+        size : int
+            Maximum number of bytes
+
+        Returns
+        -------
+        bytes
+            Bytes read, including expected
+        """
+        self._wait_for(lambda: expected in self._received)
+        index = self._received.find(expected)
+        end = len(self._received) if index < 0 else index + len(expected)
+        if size is not None:
+            end = min(end, size)
+        data = bytes(self._received[:end])
+        del self._received[:end]
+        return data
+
+    def readline(self):
+        """Read a line, waiting at most timeout seconds.
+
+        Returns
+        -------
+        bytes
+            Line read, including the newline
+        """
+        return self.read_until(b"\n")
+
+    def read_all(self):
+        """Read the bytes that are available without blocking.
+
+        Returns
+        -------
+        bytes
+            Bytes read
+        """
+        self._received += self.emulator.read_output()
+        data = bytes(self._received)
+        self._received.clear()
+        return data
+
+    def reset_input_buffer(self):
+        """Discard the bytes received from the device."""
+        self.read_all()
+
+    def reset_output_buffer(self):
+        """Discard the bytes not yet sent, which the emulator receives at once."""
+        pass
+
+
+class PtyTransport:
+    """Serve a SerialEmulator on a pseudo-terminal.
+
+    The drivers open the port name with pyserial, as they would the device. Only
+    available on POSIX systems.
+    """
+
+    def __init__(self, emulator):
+        """Initialize the transport.
+
+        Parameters
+        ----------
+        emulator : SerialEmulator
+            Emulated device.
+        """
+        #: SerialEmulator: Emulated device.
+        self.emulator = emulator
+
+        #: str: Name of the port to open, e.g. /dev/pts/3
+        self.port = None
+
+        self._master = None
+        self._slave = None
+        self._thread = None
+        self._stop_event = threading.Event()
+
+    def __enter__(self):
+        """Start serving the emulator."""
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        """Stop serving the emulator."""
+        self.stop()
+
+    def start(self):
+        """Open the pseudo-terminal and serve the emulator in a thread.
+
+        Returns
+        -------
+        str
+            Name of the port to open.
+        """
+        import tty
+
+        self._master, self._slave = os.openpty()
+        tty.setraw(self._slave)
+        self.port = os.ttyname(self._slave)
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._serve, name="PtyTransport", daemon=True
+        )
+        self._thread.start()
+        return self.port
+
+    def _serve(self):
+        """Pass the bytes between the pseudo-terminal and the emulator."""
+        while not self._stop_event.is_set():
+            data = self.emulator.read_output()
+            if data:
+                os.write(self._master, data)
+            next_time = self.emulator.next_output_time()
+            timeout = 0.01
+            if next_time is not None:
+                timeout = min(max(next_time - time.perf_counter(), 0), timeout)
+            readable, _, _ = select.select([self._master], [], [], timeout)
+            if readable:
+                try:
+                    data = os.read(self._master, 4096)
+                except OSError:
+                    break
+                self.emulator.receive(data)
+
+    def stop(self):
+        """Stop the thread and close the pseudo-terminal."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        for fd in (self._master, self._slave):
+            if fd is not None:
+                os.close(fd)
+        self._master = self._slave = None
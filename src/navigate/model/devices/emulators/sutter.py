@@ -0,0 +1,291 @@
+# Copyright (c) 2021-2024  The University of Texas Southwestern Medical Center.
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted for academic and research use only
+# (subject to the limitations in the disclaimer below)
+# provided that the following conditions are met:
+
+#      * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#      * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+
+#      * Neither the name of the copyright holders nor the names of its
+#      contributors may be used to endorse or promote products derived from this
+#      software without specific prior written permission.
+
+# NO EXPRESS OR IMPLIED LICENSES TO ANY PARTY'S PATENT RIGHTS ARE GRANTED BY
+# THIS LICENSE. THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+# PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+# Standard Imports
+import logging
+import time
+
+# Third Party Imports
+
+# Local Imports
+from navigate.model.devices.emulators.serial_port import SerialEmulator
+
+# Logger Setup
+p = __name__.split(".")[1]
+logger = logging.getLogger(p)
+
+
+class MP285Emulator(SerialEmulator):
+    """Emulator of the Sutter MP-285 serial protocol.
+
+    Commands are a command byte followed by binary arguments and, for most of
+    them, a carriage return. The controller answers once the task is done, so
+    commands sent during a move are answered after it.
+    """
+
+    #: dict: Length of each command, by command byte.
+    command_lengths = {
+        b"c": 2,
+        b"m": 14,
+        b"V": 4,
+        b"a": 2,
+        b"b": 2,
+        b"n": 2,
+        b"r": 2,
+        b"s": 2,
+        b"\x03": 1,
+    }
+
+    def __init__(self, speed=1000, latency=0.0, command_latency=None, baud_rate=None):
+        """Initialize the emulator.
+
+        Parameters
+        ----------
+        speed : int
+            Speed of the axes, in microns per second.
+        latency : float
+            Time to answer a command, in seconds.
+        command_latency : dict
+            Time to answer specific commands, in seconds, by command byte.
+        baud_rate : int
+            Baud rate used to add the transfer time to the latency.
+        """
+        super().__init__(latency, command_latency, baud_rate)
+
+        #: int: Speed of the axes, in microns per second.
+        self.speed = speed
+
+        #: str: Resolution, high (0.04 um/microstep) or low (0.2 um/microstep).
+        self.resolution = "high"
+
+        self.start_position = [0, 0, 0]
+        self.target_position = [0, 0, 0]
+        self.start_time = 0.0
+        self.move_end_time = 0.0
+
+    def split(self, data):
+        """Split the received bytes into commands of known length.
+
+        Parameters
+        ----------
+        data : bytearray
+            Received bytes. The commands are removed from it.
+
+        Returns
+        -------
+        list[bytes]
+            Complete commands.
+        """
+        commands = []
+        while data:
+            length = self.command_lengths.get(bytes(data[:1]), 1)
+            if len(data) < length:
+                break
+            commands.append(bytes(data[:length]))
+            del data[:length]
+        return commands
+
+    def position(self, now):
+        """Position of the axes, in microsteps."""
+        if now >= self.move_end_time:
+            return list(self.target_position)
+        fraction = (now - self.start_time) / (self.move_end_time - self.start_time)
+        return [
+            int(start + fraction * (target - start))
+            for start, target in zip(self.start_position, self.target_position)
+        ]
+
+    def is_busy(self, now):
+        """Is the stage moving?"""
+        return now < self.move_end_time
+
+    def handle(self, command):
+        """Answer a command.
+
+        Parameters
+        ----------
+        command : bytes
+            Command
+
+        Returns
+        -------
+        response : bytes
+            Response
+        delay : float
+            Time until the response is sent, in seconds.
+        """
+        now = time.perf_counter()
+        name = command[:1]
+        self.count(name)
+        if name == b"\x03":
+            # interrupt, answered at once
+            if self.is_busy(now):
+                self.target_position = self.position(now)
+                self.move_end_time = now
+                self.cancel_output()
+                response = b"="
+            else:
+                response = b"\r"
+            return response, self.get_latency(name, command, response)
+
+        # the controller handles the command once the current move is done
+        start_time = max(now, self.move_end_time)
+        if name == b"c":
+            response = b"".join(
+                p.to_bytes(4, byteorder="little", signed=True)
+                for p in self.target_position
+            )
+            response += b"\r"
+        elif name == b"m":
+            self.start_position = self.target_position
+            self.target_position = [
+                int.from_bytes(command[i : i + 4], byteorder="little", signed=True)
+                for i in (1, 5, 9)
+            ]
+            step = 0.04 if self.resolution == "high" else 0.2
+            distance = max(
+                abs(target - start)
+                for start, target in zip(self.start_position, self.target_position)
+            )
+            self.start_time = start_time
+            self.move_end_time = start_time + distance * step / self.speed
+            start_time = self.move_end_time
+            response = b"\r"
+        elif name == b"V":
+            value = int.from_bytes(command[1:3], byteorder="little", signed=False)
+            self.resolution = "high" if value & 0x8000 else "low"
+            self.speed = value & 0x7FFF
+            response = b"\r"
+        elif name == b"s":
+            response = bytes(32) + b"\r"
+        else:
+            response = b"\r"
+        delay = start_time - now + self.get_latency(name, command, response)
+        return response, delay
+
+
+class SutterFilterWheelEmulator(SerialEmulator):
+    """Emulator of the Sutter Lambda 10 filter wheel serial protocol.
+
+    Each command is one byte. A move is echoed at once, and followed by a carriage
+    return once the wheel has reached its position.
+    """
+
+    #: list[float]: Time to move by one position, at each speed.
+    switch_times = [0.031, 0.040, 0.044, 0.050, 0.060, 0.068, 0.124, 0.230]
+
+    def __init__(self, positions=10, latency=0.0, command_latency=None, baud_rate=None):
+        """Initialize the emulator.
+
+        Parameters
+        ----------
+        positions : int
+            Number of positions of the wheels.
+        latency : float
+            Time to answer a command, in seconds.
+        command_latency : dict
+            Time to answer specific commands, in seconds, by command byte.
+        baud_rate : int
+            Baud rate used to add the transfer time to the latency.
+        """
+        super().__init__(latency, command_latency, baud_rate)
+
+        #: int: Number of positions of the wheels.
+        self.positions = positions
+
+        #: list[int]: Position of wheels A and B.
+        self.wheel_positions = [0, 0]
+
+        #: list[float]: Time the move of each wheel ends.
+        self.busy_until = [0.0, 0.0]
+
+    def split(self, data):
+        """Split the received bytes into one-byte commands."""
+        commands = [bytes([b]) for b in data]
+        data.clear()
+        return commands
+
+    def move_time(self, wheel, position, speed):
+        """Duration of a move, going the shortest way around.
+
+        Parameters
+        ----------
+        wheel : int
+            Wheel, 0 for A, 1 for B.
+        position : int
+            Target position.
+        speed : int
+            Speed, from 0 (fastest) to 7.
+
+        Returns
+        -------
+        float
+            Duration, in seconds.
+        """
+        distance = abs(position - self.wheel_positions[wheel]) % self.positions
+        distance = min(distance, self.positions - distance)
+        if distance == 0:
+            return 0.0
+        # the following positions take about 65% of the time of the first one
+        return self.switch_times[speed] * (1 + 0.65 * (distance - 1))
+
+    def handle(self, command):
+        """Answer a command.
+
+        Parameters
+        ----------
+        command : bytes
+            Command byte
+
+        Returns
+        -------
+        response : bytes
+            Response
+        delay : float
+            Time until the response is sent, in seconds.
+        """
+        now = time.perf_counter()
+        self.count(command)
+        latency = self.get_latency(command, command, command)
+        value = command[0]
+        if value == 0xEE:
+            # go online
+            return b"\xee\r", latency
+        if value >= 0xC0 or value & 0x0F >= self.positions:
+            # other commands are echoed
+            return command, latency
+        wheel, speed, position = value >> 7, (value >> 4) & 0x07, value & 0x0F
+        start_time = max(now, self.busy_until[wheel])
+        self.busy_until[wheel] = start_time + self.move_time(wheel, position, speed)
+        self.wheel_positions[wheel] = position
+        self.send(command, latency)
+        return b"\r", self.busy_until[wheel] - now + latency
@@ -135,6 +135,28 @@ class ASIFilterWheel(FilterWheelBase):
         delta_position = int(abs(old_position - new_position))
         self.wait_until_done_delay = delta_position * 0.04
 
+    def switch_time(self, from_filter, to_filter):
+        """Estimate the time necessary to change between two filters.
+
+        Assumes that it is ~40ms per adjacent position.
+
+        Parameters
+        ----------
+        from_filter : str
+            Name of the filter the wheel starts at.
+        to_filter : str
+            Name of the filter to move to.
+
+        Returns
+        -------
+        float
+            Estimated duration of the change in seconds.
+        """
+        return (
+            abs(self.filter_dictionary[from_filter] - self.filter_dictionary[to_filter])
+            * 0.04
+        )
+
     def set_filter(self, filter_name, wait_until_done=True):
         """Change the filter wheel to the filter designated by the filter
         position argument.
@@ -155,6 +177,7 @@ class ASIFilterWheel(FilterWheelBase):
                 filter_wheel_number=self.filter_wheel_number
             )
             self.filter_wheel.move_filter_wheel(self.filter_dictionary[filter_name])
+            self.filter_wheel_position = self.filter_dictionary[filter_name]
 
             #  Wheel Position Change Delay
             if wait_until_done:
@@ -228,6 +251,28 @@ class ASICubeSlider(FilterWheelBase):
         delta_position = int(abs(old_position - new_position))
         self.wait_until_done_delay = delta_position * 0.25
 
+    def switch_time(self, from_filter, to_filter):
+        """Estimate the time necessary to change between two dichroics.
+
+        Assumes that it is <250 ms per adjacent position.
+
+        Parameters
+        ----------
+        from_filter : str
+            Name of the dichroic the slider starts at.
+        to_filter : str
+            Name of the dichroic to move to.
+
+        Returns
+        -------
+        float
+            Estimated duration of the change in seconds.
+        """
+        return (
+            abs(self.filter_dictionary[from_filter] - self.filter_dictionary[to_filter])
+            * 0.25
+        )
+
     def set_filter(self, filter_name, wait_until_done=True):
         """Change the dichroic position.
 
@@ -102,3 +102,25 @@ class FilterWheelBase:
             logger.error(f"Unknown filter name: {filter_name}")
             raise ValueError(f"Unknown filter name: {filter_name}")
         return filter_exists
+
+    def switch_time(self, from_filter: str, to_filter: str) -> float:
+        """Estimate the time necessary to change between two filters.
+
+        Does not move the filter wheel. Filter wheels with a fixed delay wait the
+        same time for every move.
+
+        Parameters
+        ----------
+        from_filter : str
+            Name of the filter the wheel starts at.
+        to_filter : str
+            Name of the filter to move to.
+
+        Returns
+        -------
+        float
+            Estimated duration of the change in seconds.
+        """
+        if self.filter_dictionary[from_filter] == self.filter_dictionary[to_filter]:
+            return 0.0
+        return float(getattr(self, "wait_until_done_delay", None) or 0)
@@ -190,10 +190,45 @@ class SutterFilterWheel(FilterWheelBase):
         old_position = self.wheel_position
         self.wheel_position = self.filter_dictionary[filter_name]
         delta_position = int(abs(old_position - self.wheel_position))
+        self.wait_until_done_delay = self.position_change_delay(delta_position)
+
+    def position_change_delay(self, delta_position):
+        """Look up the time necessary to move by a number of positions.
+
+        Parameters
+        ----------
+        delta_position : int
+            Number of positions to move.
+
+        Returns
+        -------
+        float
+            Duration of the move in seconds, from self.delay_matrix.
+        """
         try:
-            self.wait_until_done_delay = self.delay_matrix[self.speed, delta_position]
+            return self.delay_matrix[self.speed, delta_position]
         except IndexError:
-            self.wait_until_done_delay = 0.01
+            return 0.01
+
+    def switch_time(self, from_filter, to_filter):
+        """Estimate the time necessary to change between two filters.
+
+        Parameters
+        ----------
+        from_filter : str
+            Name of the filter the wheel starts at.
+        to_filter : str
+            Name of the filter to move to.
+
+        Returns
+        -------
+        float
+            Estimated duration of the change in seconds.
+        """
+        delta_position = int(
+            abs(self.filter_dictionary[from_filter] - self.filter_dictionary[to_filter])
+        )
+        return float(self.position_change_delay(delta_position))
 
     def set_filter(self, filter_name, wait_until_done=True):
         """Change the filter wheel to the filter designated by the filter
@@ -82,6 +82,9 @@ class LaserBase:
             microscope_name
         ]["lasers"][laser_id]
 
+        #: float: Time needed to change the laser power, in seconds.
+        self.switch_time = float(self.device_config.get("switch_time", 0))
+
     def __str__(self) -> str:
         """Return string representation of the class"""
         return "LaserBase"
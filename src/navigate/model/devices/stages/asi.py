@@ -32,12 +32,17 @@
 # Standard Imports
 import logging
 import time
+from multiprocessing.managers import ListProxy
 from typing import Any, Dict
 
 # Third Party Imports
 
 # Local Imports
 from navigate.model.devices.stages.base import StageBase
+from navigate.model.devices.stages.motion_model import (
+    AxisMotionModel,
+    MotionTimeModel,
+)
 from navigate.model.devices.APIs.asi.asi_tiger_controller import (
     TigerController,
     TigerException,
@@ -179,6 +184,11 @@ class ASIStage(StageBase):
             # Speed optimizations - Set speed to 90% of maximum on each axis
             self.set_speed(percent=0.9)
 
+        #: dict: Last commanded position of each axis, until the next report.
+        self.target_positions = {}
+
+        self.motion_model = self.build_motion_model()
+
     def __del__(self):
         """Delete the ASI Stage connection."""
         try:
@@ -189,6 +199,84 @@ class ASIStage(StageBase):
             logger.error("ASI Stage Exception", e)
             raise
 
+    def build_motion_model(self):
+        """Build the model of the move durations of the stage axes.
+
+        The speed of an axis is the one set on the controller. Otherwise, the speed
+        (mm/s) and acceleration_time (ms) of the axes are read from the stage
+        hardware configuration, either as one value or as a list in the order of the
+        axes. The model is then calibrated with the observed move durations.
+
+        Returns
+        -------
+        MotionTimeModel
+            Motion time model of the stage axes.
+        """
+
+        def axis_values(name, default):
+            values = self.hardware_configuration.get(name, None)
+            if values is None:
+                values = default
+            if type(values) not in (list, ListProxy):
+                values = [values] * len(self.axes)
+            return dict(zip(self.axes, values))
+
+        speeds = axis_values("speed", None)
+        acceleration_times = axis_values("acceleration_time", 70)
+        axis_models = {}
+        for axis, asi_axis in self.axes_mapping.items():
+            speed = None
+            if self.tiger_controller is not None:
+                speed = self.tiger_controller.speeds.get(asi_axis, None)
+            if speed is None:
+                speed = speeds.get(axis, None) or 1.0
+            # 1 mm of the controller is 1000 microns, or 10 degrees for theta
+            axis_models[axis] = AxisMotionModel(
+                speed * (10 if axis == "theta" else 1000),
+                acceleration_times.get(axis, 70) / 1000,
+            )
+        return MotionTimeModel(axis_models)
+
+    def get_move_distances(self, abs_pos_dict):
+        """Return the distance of a move on each axis.
+
+        Moves start from the last commanded position, or the last reported one.
+
+        Parameters
+        ----------
+        abs_pos_dict : dict
+            Absolute position of each axis, e.g. {"x": 100}
+
+        Returns
+        -------
+        dict
+            Distance of the move on each axis, e.g. {"x": 20}
+        """
+        return {
+            axis: abs(
+                pos - self.target_positions.get(axis, getattr(self, f"{axis}_pos"))
+            )
+            for axis, pos in abs_pos_dict.items()
+        }
+
+    def wait_for_move(self, distances):
+        """Wait until a move is done and calibrate the motion model with it.
+
+        Parameters
+        ----------
+        distances : dict
+            Distance of the move on each axis.
+        """
+        predicted_time = 0.0
+        if self.motion_model.is_calibrated(distances):
+            predicted_time = self.motion_model.predict(distances)
+        duration, measured = self.tiger_controller.wait_for_device(
+            predicted_time=predicted_time
+        )
+        # Moves that timed out, or ended while sleeping, have no known duration
+        if measured:
+            self.motion_model.observe(distances, duration)
+
     def get_axis_position(self, axis):
         """Get position of specific axis
 
@@ -223,6 +311,7 @@ class ASIStage(StageBase):
                     setattr(self, f"{ax}_pos", float(pos) / 1000.0)
                 else:
                     setattr(self, f"{ax}_pos", float(pos) / 10.0)
+            self.target_positions.clear()
         except TigerException as e:
             logger.exception("ASI Stage Exception", e)
 
@@ -256,6 +345,8 @@ class ASIStage(StageBase):
             print("axis abs false")
             return False
 
+        distances = self.get_move_distances({axis: axis_abs})
+
         # Move stage
         try:
             if axis == "theta":
@@ -274,13 +365,15 @@ class ASIStage(StageBase):
             logger.exception("ASI Stage Exception", e)
             return False
 
+        self.target_positions[axis] = axis_abs
         if wait_until_done:
-            self.tiger_controller.wait_for_device()
+            self.wait_for_move(distances)
         return True
 
     def verify_move(self, move_dictionary):
         """Don't submit a move command for axes that aren't moving.
-        The Tiger controller wait time for each axis is additive.
+        The Tiger controller wait time for each axis is additive. An axis is compared
+        to its last commanded position, or its last reported one.
 
         Parameters
         ----------
@@ -298,7 +391,9 @@ class ASIStage(StageBase):
         """
         res_dict = {}
         for axis, val in move_dictionary.items():
-            curr_pos = getattr(self, f"{axis}_pos", None)
+            curr_pos = self.target_positions.get(
+                axis, getattr(self, f"{axis}_pos", None)
+            )
             if curr_pos != val:
                 res_dict[axis] = val
         return res_dict
@@ -329,6 +424,8 @@ class ASIStage(StageBase):
         if len(abs_pos_dict) == 0:
             return
 
+        distances = self.get_move_distances(abs_pos_dict)
+
         # This is to account for the asi 1/10 of a micron units
         pos_dict = {
             self.axes_mapping[axis]: pos * 1000 if axis == "theta" else pos * 10
@@ -343,8 +440,9 @@ class ASIStage(StageBase):
             )
             logger.exception("ASI Stage Exception", e)
             return False
+        self.target_positions.update(abs_pos_dict)
         if wait_until_done:
-            self.tiger_controller.wait_for_device()
+            self.wait_for_move(distances)
 
         return True
 
@@ -521,7 +619,7 @@ class ASIStage(StageBase):
     def wait_until_complete(self, axis):
         try:
             while self.tiger_controller.is_axis_busy(axis):
-                time.sleep(0.1)
+                time.sleep(self.tiger_controller.poll_interval)
         except TigerException as e:
             print(f"ASI Stage Exception {e}")
             logger.exception(f"ASI Stage Exception {e}")
@@ -78,6 +78,9 @@ class StageBase:
         ]["stage"]
         if type(stage_configuration["hardware"]) == ListProxy:
 
+            #: dict: Hardware configuration of the stage.
+            self.hardware_configuration = stage_configuration["hardware"][device_id]
+
             #: list: List of stage axes available.
             self.axes = list(stage_configuration["hardware"][device_id]["axes"])
 
@@ -90,6 +93,7 @@ class StageBase:
                 "feedback_alignment", None
             )
         else:
+            self.hardware_configuration = stage_configuration["hardware"]
             self.axes = list(stage_configuration["hardware"]["axes"])
             device_axes = stage_configuration["hardware"].get("axes_mapping", [])
             self.stage_feedback = stage_configuration["hardware"].get(
@@ -121,6 +125,9 @@ class StageBase:
         #: bool: Whether the stage has limits enabled or not. Default is True.
         self.stage_limits = True
 
+        #: MotionTimeModel: Predicts the duration of moves, None if not supported.
+        self.motion_model = None
+
     def __str__(self):
         """Return a string representation of the stage."""
         return "StageBase"
@@ -224,6 +231,59 @@ class StageBase:
             return {}
         return abs_pos_dict
 
+    def get_move_distances(self, abs_pos_dict):
+        """Return the distance of a move on each axis.
+
+        Parameters
+        ----------
+        abs_pos_dict : dict
+            Absolute position of each axis, e.g. {"x": 100}
+
+        Returns
+        -------
+        dict
+            Distance of the move on each axis, e.g. {"x": 20}
+        """
+        return {
+            axis: abs(pos - getattr(self, f"{axis}_pos"))
+            for axis, pos in abs_pos_dict.items()
+        }
+
+    def predict_move_time(self, move_dictionary):
+        """Predict how long a move takes, e.g. to plan z-stacks and tiles.
+
+        Parameters
+        ----------
+        move_dictionary : dict
+            A dictionary of values required for movement. Includes 'x_abs', etc. for
+            one or more axes.
+
+        Returns
+        -------
+        float or None
+            Predicted duration in seconds, None if the stage has no motion model.
+        """
+        if self.motion_model is None:
+            return None
+        abs_pos_dict = {
+            axis: move_dictionary[f"{axis}_abs"]
+            for axis in self.axes
+            if f"{axis}_abs" in move_dictionary
+        }
+        return self.motion_model.predict(self.get_move_distances(abs_pos_dict))
+
+    def get_motion_statistics(self):
+        """Return the move time statistics of each axis.
+
+        Returns
+        -------
+        dict
+            Statistics of each axis, empty if the stage has no motion model.
+        """
+        if self.motion_model is None:
+            return {}
+        return self.motion_model.get_statistics()
+
     def stop(self):
         """Stop all stage movement abruptly."""
         pass
@@ -0,0 +1,301 @@
+# Copyright (c) 2021-2024  The University of Texas Southwestern Medical Center.
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted for academic and research use only
+# (subject to the limitations in the disclaimer below)
+# provided that the following conditions are met:
+
+#      * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#      * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+
+#      * Neither the name of the copyright holders nor the names of its
+#      contributors may be used to endorse or promote products derived from this
+#      software without specific prior written permission.
+
+# NO EXPRESS OR IMPLIED LICENSES TO ANY PARTY'S PATENT RIGHTS ARE GRANTED BY
+# THIS LICENSE. THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+# PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+# Standard Imports
+import logging
+import math
+from collections import deque
+
+# Third Party Imports
+import numpy as np
+
+# Local Imports
+
+# Logger Setup
+p = __name__.split(".")[1]
+logger = logging.getLogger(p)
+
+
+class AxisMotionModel:
+    """Predict how long a move takes on one stage axis.
+
+    The move follows a trapezoidal velocity profile: the axis accelerates to its
+    speed, cruises, then decelerates. Short moves never reach full speed. The
+    observed move durations are fit as a constant overhead plus a scaled profile
+    time, so the prediction includes the serial latency and settling of the real
+    stage.
+    """
+
+    def __init__(self, speed, acceleration_time, overhead=0.0, window=32):
+        """Initialize the axis motion model.
+
+        Parameters
+        ----------
+        speed : float
+            Maximum speed, in stage units per second.
+        acceleration_time : float
+            Time to reach the maximum speed, in seconds.
+        overhead : float
+            Initial estimate of the time added to each move, in seconds.
+        window : int
+            Number of recent moves used to calibrate the model.
+        """
+        #: float: Maximum speed, in stage units per second.
+        self.speed = float(speed)
+
+        #: float: Time to reach the maximum speed, in seconds.
+        self.acceleration_time = float(acceleration_time)
+
+        #: float: Time added to each move, in seconds.
+        self.overhead = float(overhead)
+
+        #: float: Ratio of the observed to the profile move time.
+        self.scale = 1.0
+
+        #: deque: Profile and observed durations of the recent moves.
+        self.observations = deque(maxlen=window)
+
+        #: int: Number of moves observed.
+        self.count = 0
+
+        #: float: Sum of the observed move durations.
+        self.total_duration = 0.0
+
+        #: float: Longest observed move duration.
+        self.max_duration = 0.0
+
+        #: float: Sum of the absolute prediction errors.
+        self.total_error = 0.0
+
+    def profile_time(self, distance):
+        """Duration of a move following the velocity profile.
+
+        Parameters
+        ----------
+        distance : float
+            Distance of the move, in stage units.
+
+        Returns
+        -------
+        float
+            Duration, in seconds.
+        """
+        distance = abs(distance)
+        if distance == 0 or self.speed <= 0:
+            return 0.0
+        if self.acceleration_time <= 0:
+            return distance / self.speed
+        # distance covered while accelerating and decelerating to full speed
+        ramp_distance = self.speed * self.acceleration_time
+        if distance >= ramp_distance:
+            return distance / self.speed + self.acceleration_time
+        return 2 * math.sqrt(distance * self.acceleration_time / self.speed)
+
+    def predict(self, distance):
+        """Predict the duration of a move.
+
+        Parameters
+        ----------
+        distance : float
+            Distance of the move, in stage units.
+
+        Returns
+        -------
+        float
+            Predicted duration, in seconds.
+        """
+        if distance == 0:
+            return 0.0
+        return self.overhead + self.scale * self.profile_time(distance)
+
+    def observe(self, distance, duration):
+        """Record the duration of a move and calibrate the model.
+
+        Parameters
+        ----------
+        distance : float
+            Distance of the move, in stage units.
+        duration : float
+            Observed duration, in seconds.
+        """
+        if distance == 0:
+            return
+        self.count += 1
+        self.total_duration += duration
+        self.max_duration = max(self.max_duration, duration)
+        self.total_error += abs(duration - self.predict(distance))
+        self.observations.append((self.profile_time(distance), duration))
+        self.calibrate()
+
+    def calibrate(self):
+        """Fit the overhead and the scale to the recent moves.
+
+        With moves of different lengths, duration = overhead + scale * profile time
+        is fit by least squares. Otherwise, only the overhead is updated.
+        """
+        profile, duration = np.array(self.observations).T
+        if len(profile) > 1 and np.ptp(profile) > 1e-3 * max(profile.max(), 1e-9):
+            scale, overhead = np.polyfit(profile, duration, 1)
+            if scale > 0 and overhead >= 0:
+                self.scale, self.overhead = float(scale), float(overhead)
+                return
+        self.overhead = max(float(np.mean(duration - self.scale * profile)), 0.0)
+
+    def get_statistics(self):
+        """Return the move time statistics of the axis.
+
+        Returns
+        -------
+        dict
+            Number of moves, mean and maximum durations, mean absolute prediction
+            error, and the calibrated overhead and scale.
+        """
+        return {
+            "count": self.count,
+            "mean_duration": self.total_duration / self.count if self.count else 0.0,
+            "max_duration": self.max_duration,
+            "mean_error": self.total_error / self.count if self.count else 0.0,
+            "overhead": self.overhead,
+            "scale": self.scale,
+        }
+
+
+class MotionTimeModel:
+    """Predict how long a move takes on a stage with several axes.
+
+    The axes of a stage move simultaneously, so a move lasts as long as its slowest
+    axis.
+    """
+
+    def __init__(self, axis_models, min_observations=3):
+        """Initialize the motion time model.
+
+        Parameters
+        ----------
+        axis_models : dict
+            AxisMotionModel of each axis, e.g. {"x": AxisMotionModel(...)}
+        min_observations : int
+            Number of moves of an axis before its predictions are trusted.
+        """
+        #: dict: AxisMotionModel of each axis.
+        self.axis_models = axis_models
+
+        #: int: Number of moves of an axis before its predictions are trusted.
+        self.min_observations = min_observations
+
+    def dominant_axis(self, distances):
+        """Return the axis with the longest predicted move.
+
+        Parameters
+        ----------
+        distances : dict
+            Distance of the move on each axis.
+
+        Returns
+        -------
+        str or None
+            Axis setting the duration of the move, None if no modelled axis moves.
+        """
+        distances = {
+            axis: distance
+            for axis, distance in distances.items()
+            if axis in self.axis_models and distance != 0
+        }
+        if not distances:
+            return None
+        return max(distances, key=lambda a: self.axis_models[a].predict(distances[a]))
+
+    def is_calibrated(self, distances):
+        """Check if the axis setting the duration of a move has been observed enough.
+
+        Parameters
+        ----------
+        distances : dict
+            Distance of the move on each axis.
+
+        Returns
+        -------
+        bool
+            True if the prediction of the move can be trusted.
+        """
+        axis = self.dominant_axis(distances)
+        return axis is None or self.axis_models[axis].count >= self.min_observations
+
+    def predict(self, distances):
+        """Predict the duration of a move.
+
+        Parameters
+        ----------
+        distances : dict
+            Distance of the move on each axis, e.g. {"x": 100, "z": 5}
+
+        Returns
+        -------
+        float
+            Predicted duration, in seconds.
+        """
+        return max(
+            [
+                self.axis_models[axis].predict(distance)
+                for axis, distance in distances.items()
+                if axis in self.axis_models
+            ],
+            default=0.0,
+        )
+
+    def observe(self, distances, duration):
+        """Record the duration of a move.
+
+        The duration is attributed to the axis with the longest predicted move.
+
+        Parameters
+        ----------
+        distances : dict
+            Distance of the move on each axis.
+        duration : float
+            Observed duration, in seconds.
+        """
+        axis = self.dominant_axis(distances)
+        if axis is not None:
+            self.axis_models[axis].observe(distances[axis], duration)
+
+    def get_statistics(self):
+        """Return the move time statistics of each axis.
+
+        Returns
+        -------
+        dict
+            Statistics of each axis, see AxisMotionModel.get_statistics().
+        """
+        return {
+            axis: model.get_statistics() for axis, model in self.axis_models.items()
+        }
@@ -79,6 +79,12 @@ class SyntheticStage(StageBase):
         self.volts_per_micron = "0.1 * x"
         self.camera_delay = 0.01
 
+        #: dict: Scan range of the constant velocity mode.
+        self.scan_range = None
+
+        #: bool: Is the stage scanning?
+        self.is_scanning = False
+
     def report_position(self):
         """Report the current position of the stage.
 
@@ -219,8 +225,12 @@ class SyntheticStage(StageBase):
             An axis. For example, 'x', 'y', 'z', 'f', 'theta'.
 
         """
-
-        pass
+        self.scan_range = {
+            "axis": axis,
+            "start": start_position_mm * 1000,
+            "end": end_position_mm * 1000,
+            "enc_divide": enc_divide,
+        }
 
     def start_scan(self, axis):
         """Start a scan along a single axis.
@@ -231,11 +241,18 @@ class SyntheticStage(StageBase):
             An axis. For example, 'x', 'y', 'z', 'f', 'theta'.
 
         """
-        pass
+        if self.scan_range is None or self.scan_range["axis"] != axis:
+            return
+        setattr(self, f"{axis}_pos", self.scan_range["start"])
+        self.is_scanning = True
 
     def stop_scan(self):
         """Stop a scan."""
-        pass
+        if not self.is_scanning:
+            return
+        self.is_scanning = False
+        axis = self.scan_range["axis"]
+        setattr(self, f"{axis}_pos", self.scan_range["end"])
 
     def update_waveform(self, waveform_dict):
         print("*** update waveform:", waveform_dict.keys())
@@ -34,11 +34,14 @@
 # Standard Library Imports
 from queue import Queue
 import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from copy import deepcopy
+from functools import lru_cache
 import time
 
 # Third Party Imports
 import numpy as np
+from scipy import fft
 from scipy.optimize import curve_fit
 
 # Local imports
@@ -95,6 +98,34 @@ def gauss(x, a, b, c, d):
     return a * y + d
 
 
+def fit_poly2(x, y):
+    """Least-squares fit of a second order polynomial with a non-positive x**2 term
+
+    Closed-form equivalent of fitting `poly2` with `curve_fit` bounded by a <= 0. For
+    three points, this is the parabola through the points.
+
+    Parameters
+    ----------
+    x : array
+        x values
+    y : array
+        y values
+
+    Returns
+    -------
+    array
+        a, b, c values
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    A = np.vander(x, 3)
+    p = np.linalg.lstsq(A, y, rcond=None)[0]
+    if p[0] > 0:
+        # the constrained optimum lies on the bound, fit a line instead
+        p = np.concatenate(([0.0], np.linalg.lstsq(A[:, 1:], y, rcond=None)[0]))
+    return p
+
+
 def r_squared(y, y_fit):
     """Calculate the R^2 value
 
@@ -137,15 +168,9 @@ def fourier_annulus(im, radius_1=0, radius_2=64):
         Fourier transform of the annulus
     """
 
-    x_, y_ = np.meshgrid(range(im.shape[1]), range(im.shape[0]))
+    mask = annulus_mask(im.shape, radius_1, radius_2)
 
-    x_ = x_.astype(float) - x_.mean()
-    y_ = y_.astype(float) - y_.mean()
-
-    mask = x_**2 + y_**2 > radius_1**2
-    mask *= x_**2 + y_**2 <= radius_2**2
-
-    IM = np.fft.fftshift(np.fft.fft2(im))
+    IM = np.fft.fftshift(fft.fft2(im, workers=-1))
     IM_abs = np.abs(IM)
 
     IM_mask = IM_abs * mask
@@ -153,6 +178,97 @@ def fourier_annulus(im, radius_1=0, radius_2=64):
     return np.mean(IM_mask), IM_mask
 
 
+@lru_cache(maxsize=16)
+def annulus_mask(shape, radius_1=0, radius_2=64):
+    """Annulus mask of the centered (fftshift-ed) Fourier transform of an image
+
+    Parameters
+    ----------
+    shape : tuple
+        Image shape
+    radius_1 : int, optional
+        Inner radius of the annulus, by default 0
+    radius_2 : int, optional
+        Outer radius of the annulus, by default 64
+
+    Returns
+    -------
+    array
+        Read-only boolean mask
+    """
+    y_ = np.arange(shape[0], dtype=float) - (shape[0] - 1) / 2
+    x_ = np.arange(shape[1], dtype=float) - (shape[1] - 1) / 2
+    r2 = x_[np.newaxis, :] ** 2 + y_[:, np.newaxis] ** 2
+
+    mask = (r2 > radius_1**2) & (r2 <= radius_2**2)
+    mask.flags.writeable = False
+    return mask
+
+
+@lru_cache(maxsize=16)
+def annulus_rfft_weights(shape, radius_1=0, radius_2=64):
+    """Weights of the annulus mask for the half spectrum of a real-valued image
+
+    The magnitude of the Fourier transform of a real image is symmetric, so the sum
+    of the masked full spectrum equals the weighted sum of the half spectrum returned
+    by `rfft2`.
+
+    Parameters
+    ----------
+    shape : tuple
+        Image shape
+    radius_1 : int, optional
+        Inner radius of the annulus, by default 0
+    radius_2 : int, optional
+        Outer radius of the annulus, by default 64
+
+    Returns
+    -------
+    array
+        Read-only float32 weights of shape (shape[0], shape[1] // 2 + 1)
+    """
+    # mask in the unshifted layout of fft2
+    mask = np.fft.ifftshift(annulus_mask(shape, radius_1, radius_2)).astype(np.float32)
+    # mask at the negative frequencies -k
+    mask_neg = np.roll(mask[::-1, ::-1], 1, axis=(0, 1))
+
+    n_cols = shape[1] // 2 + 1
+    weights = mask[:, :n_cols] + mask_neg[:, :n_cols]
+    # frequencies with kx == 0 (and kx == Nyquist) are not mirrored
+    weights[:, 0] = mask[:, 0]
+    if shape[1] % 2 == 0:
+        weights[:, -1] = mask[:, n_cols - 1]
+    weights.flags.writeable = False
+    return weights
+
+
+def fourier_annulus_metric(im, radius_1=0, radius_2=64, workers=-1):
+    """Calculate the mean of the fourier transform of an annulus
+
+    Same value as the first output of `fourier_annulus`, computed with a single
+    precision real-valued FFT and cached masks.
+
+    Parameters
+    ----------
+    im : array
+        Image array
+    radius_1 : int, optional
+        Inner radius of the annulus, by default 0
+    radius_2 : int, optional
+        Outer radius of the annulus, by default 64
+    workers : int, optional
+        Number of FFT threads, by default -1 (all CPUs)
+
+    Returns
+    -------
+    float
+        Mean of the fourier transform of the annulus
+    """
+    weights = annulus_rfft_weights(im.shape, radius_1, radius_2)
+    IM_abs = np.abs(fft.rfft2(im.astype(np.float32, copy=False), workers=workers))
+    return float(np.vdot(IM_abs.ravel(), weights.ravel())) / im.size
+
+
 class TonyWilson:
     """Tony Wilson iterative AO routine"""
 
@@ -254,6 +370,9 @@ class TonyWilson:
         # target channel
         self.target_channel = 1
 
+        #: ThreadPoolExecutor: Evaluates the image metrics off the data thread
+        self.metric_executor = None
+
         self.config_table = {
             "signal": {
                 "init": self.pre_func_signal,
@@ -264,6 +383,7 @@ class TonyWilson:
                 "init": self.pre_func_data,
                 "main": self.in_func_data,
                 "end": self.end_func_data,
+                "cleanup": self.cleanup_func_data,
             },
             "node": {"node_type": "multi-step", "device_related": True},
         }
@@ -490,6 +610,71 @@ class TonyWilson:
 
         self.frames_done = 0
 
+        if self.metric_executor is None:
+            self.metric_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="TonyWilson Metric"
+            )
+
+    def cleanup_func_data(self):
+        """Stop evaluating the image metrics"""
+        if self.metric_executor is not None:
+            self.metric_executor.shutdown(wait=False)
+            self.metric_executor = None
+
+    def compute_metric(self, img):
+        """Calculate the image metric
+
+        Parameters
+        ----------
+        img : array
+            Image array
+
+        Returns
+        -------
+        float
+            Image metric
+        """
+        if self.metric == "Pixel Max":
+            return img.max()
+        elif self.metric == "Pixel Average":
+            return img.mean()
+        elif self.metric == "DCT Shannon Entropy":
+            return img_contrast.fast_normalized_dct_shannon_entropy(img, 3)[0]
+        elif self.metric == "Fourier Annulus":
+            return fourier_annulus_metric(img)
+
+    def submit_metric(self, img):
+        """Calculate the image metric in the background
+
+        The frame is copied, so the data buffer can be reused while the metric is
+        evaluated.
+
+        Parameters
+        ----------
+        img : array
+            Image array
+
+        Returns
+        -------
+        Future
+            Future of the image metric
+        """
+        if self.metric_executor is None:
+            future = Future()
+            future.set_result(self.compute_metric(img))
+            return future
+        return self.metric_executor.submit(self.compute_metric, np.array(img))
+
+    def get_plot_data(self):
+        """Get the image metrics of the current coefficient sweep
+
+        Returns
+        -------
+        list
+            Image metrics, None for the ones still being evaluated
+        """
+        return [f.result() if f.done() else None for f in self.plot_data]
+
     def process_data(self, coef, mode="poly"):
         """Process the data
 
@@ -500,20 +685,10 @@ class TonyWilson:
         mode : str, optional
             Fitting mode, by default "poly"
         """
-        self.y = self.plot_data
+        self.y = [f.result() for f in self.plot_data]
 
         if mode == "poly":
-            c = np.min(self.y)  # offset guess
-            b = (np.max(self.y) - c) / self.coef_amp  # slope guess
-            a = -b / 2
-
-            p, _ = curve_fit(
-                poly2,
-                self.x,
-                self.y,
-                p0=[a, b, c],
-                bounds=([-np.inf, -np.inf, -np.inf], [0.0, np.inf, np.inf]),
-            )
+            p = fit_poly2(self.x, self.y)
             self.y_fit = poly2(self.x_fit, p[0], p[1], p[2])
             r_2 = r_squared(self.y, poly2(self.x, p[0], p[1], p[2]))
 
@@ -538,7 +713,7 @@ class TonyWilson:
         )  # weight by R^2 goodness of fit
         self.mirror_img = self.mirror_controller.get_wavefront_pix()
 
-        new_metric = self.plot_data[int(self.n_steps / 2)]
+        new_metric = self.y[int(self.n_steps / 2)]
         self.best_peaks.append(new_metric)
         if new_metric > self.best_metric:
             self.best_metric = new_metric
@@ -590,12 +765,7 @@ class TonyWilson:
             img = self.model.data_buffer[self.f_frame_id]
 
             """ IMAGE METRICS """
-            if self.metric == "Pixel Max":
-                new_data = img.max()
-            elif self.metric == "Pixel Average":
-                new_data = img.mean()
-            elif self.metric == "DCT Shannon Entropy":
-                new_data = img_contrast.fast_normalized_dct_shannon_entropy(img, 3)[0]
+            new_data = self.submit_metric(img)
 
             if len(self.plot_data) == self.n_steps:
                 self.process_data(coef, mode=self.fit_func)
@@ -608,7 +778,7 @@ class TonyWilson:
                 out_str += "\tFITTING DATA...\n"
 
             self.plot_data.append(new_data)
-            out_str += f"\tTrace:\t{np.flip(self.plot_data)}\n"
+            out_str += f"\tTrace:\t{np.flip(self.get_plot_data())}\n"
 
             self.frames_done += 1
             out_str += f"\tDone:\t{self.frames_done}\n"
@@ -616,7 +786,8 @@ class TonyWilson:
             self.f_frame_id = -1
 
             self.model.logger.debug(
-                f"*** TonyWilson > in_func_data :: plot_data: {np.flip(self.plot_data)}"
+                "*** TonyWilson > in_func_data :: plot_data: "
+                f"{np.flip(self.get_plot_data())}"
             )
 
             out_str += f"\tFrame Num:\t{self.frame_num}\n"
@@ -705,4 +876,7 @@ class TonyWilson:
         if self.done_all and self.save_report:
             self.model.event_queue.put(("ao_save_report", self.report))
 
+        if self.done_all:
+            self.cleanup_func_data()
+
         return self.frames_done >= self.total_frame_num or self.done_all
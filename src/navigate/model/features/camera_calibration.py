@@ -0,0 +1,217 @@
+# Copyright (c) 2021-2024  The University of Texas Southwestern Medical Center.
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted for academic and research use only
+# (subject to the limitations in the disclaimer below)
+# provided that the following conditions are met:
+
+#      * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#      * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+
+#      * Neither the name of the copyright holders nor the names of its
+#      contributors may be used to endorse or promote products derived from this
+#      software without specific prior written permission.
+
+# NO EXPRESS OR IMPLIED LICENSES TO ANY PARTY'S PATENT RIGHTS ARE GRANTED BY
+# THIS LICENSE. THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+# PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+# Standard Library Imports
+import os
+import logging
+
+# Third Party Imports
+import numpy as np
+import tifffile
+
+# Local Imports
+from navigate.config import get_navigate_path
+from navigate.model.analysis.camera import (
+    StreamingCameraStatistics,
+    crop_camera_map,
+)
+
+# Logger Setup
+p = __name__.split(".")[1]
+logger = logging.getLogger(p)
+
+
+class CameraCalibration:
+    """CameraCalibration class for computing the offset, variance and flatfield maps
+    of the camera.
+
+    Notes:
+    ------
+    - The statistics are accumulated online from the frames streaming through the
+      data buffer, so the stack of calibration frames is never held in memory.
+
+    - With `map_type` "offset", dark frames are acquired and the offset and variance
+      maps are saved. With `map_type` "flatfield", frames with defocused, even signal
+      are acquired and the flatfield map is computed with the saved offset map.
+
+    - The maps are saved in the `camera_maps` folder of the navigate directory and
+      are used to correct the frames if `correct_images` is enabled in the camera
+      configuration. They should be acquired with the full sensor and no binning.
+    """
+
+    def __init__(self, model, map_type="offset", number_of_frames=100, local=False):
+        """Initialize the CameraCalibration class.
+
+        Parameters:
+        ----------
+        model : MicroscopeModel
+            The microscope model object.
+        map_type : str
+            "offset" to compute the offset and variance maps from dark frames, or
+            "flatfield" to compute the flatfield map.
+        number_of_frames : int
+            The number of frames to acquire.
+        local : bool
+            Compute the local flatfield map (as opposed to global).
+        """
+        if map_type not in ["offset", "flatfield"]:
+            raise ValueError(f"Unknown camera map type: {map_type}")
+
+        #: MicroscopeModel: The microscope model.
+        self.model = model
+
+        #: str: The type of the camera maps to compute.
+        self.map_type = map_type
+
+        #: int: The number of frames to acquire.
+        self.number_of_frames = int(number_of_frames)
+
+        #: bool: Compute the local flatfield map.
+        self.local = local
+
+        #: int: The number of acquired frames.
+        self.signal_count = 0
+
+        #: int: The number of received frames.
+        self.received_frames = 0
+
+        #: StreamingCameraStatistics: The accumulated statistics of the frames.
+        self.statistics = None
+
+        #: dict: A dictionary defining the configuration for the camera calibration
+        self.config_table = {
+            "signal": {
+                "init": self.pre_signal_func,
+                "main": self.signal_func,
+                "end": self.signal_end,
+            },
+            "data": {
+                "init": self.pre_data_func,
+                "main": self.in_data_func,
+                "end": self.end_data_func,
+            },
+            "node": {"node_type": "multi-step", "device_related": True},
+        }
+
+    def pre_signal_func(self):
+        """Prepare the acquisition of uncorrected frames."""
+        self.signal_count = 0
+        # the calibration needs the raw frames
+        self.model.image_correction = None
+
+    def signal_func(self):
+        """Acquire a frame.
+
+        Returns:
+        -------
+        bool
+            A boolean value indicating whether to continue the calibration.
+        """
+        return not self.model.stop_acquisition
+
+    def signal_end(self):
+        """Check if all the frames are acquired.
+
+        Returns:
+        -------
+        bool
+            A boolean value indicating whether to end the current node.
+        """
+        self.signal_count += 1
+        return self.model.stop_acquisition or self.signal_count >= self.number_of_frames
+
+    def pre_data_func(self):
+        """Reset the statistics."""
+        self.received_frames = 0
+        self.statistics = StreamingCameraStatistics(self.model.data_buffer[0].shape)
+
+    def in_data_func(self, frame_ids):
+        """Add the received frames to the statistics.
+
+        Parameters:
+        ----------
+        frame_ids : list
+            A list of frame IDs received during data acquisition.
+        """
+        for idx in frame_ids:
+            self.statistics.update(self.model.data_buffer[idx])
+        self.received_frames += len(frame_ids)
+
+    def end_data_func(self):
+        """Save the camera maps once all the frames are received.
+
+        Returns:
+        -------
+        bool
+            A boolean value indicating whether all the frames are received.
+        """
+        if self.received_frames < self.number_of_frames:
+            return False
+        self.save_maps()
+        return True
+
+    def save_maps(self):
+        """Compute the camera maps and save them to the camera_maps folder."""
+        camera = self.model.active_microscope.camera
+        serial_number = camera.camera_parameters["hardware"]["serial_number"]
+        map_path = os.path.join(get_navigate_path(), "camera_maps")
+        if not os.path.exists(map_path):
+            os.makedirs(map_path)
+
+        if self.map_type == "offset":
+            offset_map, variance_map = self.statistics.offset_and_variance_map(
+                self.model.data_buffer[0].dtype
+            )
+            tifffile.imsave(
+                os.path.join(map_path, f"{serial_number}_off.tiff"), offset_map
+            )
+            tifffile.imsave(
+                os.path.join(map_path, f"{serial_number}_var.tiff"), variance_map
+            )
+            camera.get_offset_variance_maps()
+        else:
+            offset_map, _ = camera.get_offset_variance_maps()
+            offset_map = crop_camera_map(offset_map, self.statistics.mean.shape)
+            if offset_map is None:
+                logger.info("CameraCalibration. No offset map, assuming zero offset.")
+                offset_map = np.zeros(self.statistics.mean.shape)
+            flatfield_map = self.statistics.flatfield_map(offset_map, self.local)
+            tifffile.imsave(
+                os.path.join(map_path, f"{serial_number}_flat.tiff"),
+                flatfield_map.astype(np.float32),
+            )
+            camera.get_flatfield_map()
+
+        logger.info(
+            f"CameraCalibration. Saved {self.map_type} maps of camera "
+            f"{serial_number} from {self.statistics.count} frames to {map_path}."
+        )
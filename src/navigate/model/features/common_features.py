@@ -41,7 +41,14 @@ import logging
 
 # Local application imports
 from .image_writer import ImageWriter
+from .motion_scheduler import MotionScheduler
 from navigate.tools.common_functions import VariableWithLock
+from navigate.tools.file_functions import save_yaml_file
+from navigate.tools.multipos_table_tools import (
+    get_axis_speeds,
+    optimize_position_order,
+    positions_to_array,
+)
 
 # Logger Setup
 p = __name__.split(".")[1]
@@ -132,7 +139,7 @@ class ChangeResolution:
         )
         # prepare active microscope
         waveform_dict = self.model.active_microscope.prepare_acquisition()
-        self.model.event_queue.put(("waveform", waveform_dict))
+        self.model.publish_waveforms(waveform_dict)
         # resume data thread
         self.model.resume_data_thread()
         return True
@@ -637,10 +644,10 @@ class MoveToNextPositionInMultiPositionTable:
         #: int: The current index of the position being acquired in the multi-position
         self.current_idx = 0
 
-        #: dict: A dictionary defining the configuration for the position control
-        self.multiposition_table = self.model.configuration["experiment"][
-            "MultiPositions"
-        ]
+        #: list: Local copy of the multi-position table, [[x, y, z, theta, f], ]
+        self.multiposition_table = positions_to_array(
+            self.model.configuration["experiment"]["MultiPositions"]
+        ).tolist()
 
         #: int: The total number of positions in the multi-position table.
         self.position_count = self.model.configuration["experiment"]["MicroscopeState"][
@@ -659,11 +666,22 @@ class MoveToNextPositionInMultiPositionTable:
         #: bool: The flag inidicates whether this node is initialized
         self.initialized = False
 
+        #: MotionScheduler: Moves the stage in the background.
+        self.motion_scheduler = MotionScheduler(model)
+
+        #: bool: Pause the data thread while waiting for the current move?
+        self.should_pause_data_thread = False
+
     def pre_signal_func(self):
         """Calculate stage offset if applicable."""
         if self.initialized:
             return
         self.initialized = True
+        # the table may have been reordered after this feature was created. Copy
+        # it once, rather than indexing the shared table at every position
+        self.multiposition_table = positions_to_array(
+            self.model.configuration["experiment"]["MultiPositions"]
+        ).tolist()
         if type(self.offset) is str:
             try:
                 self.offset = ast.literal_eval(self.offset)
@@ -722,12 +740,12 @@ class MoveToNextPositionInMultiPositionTable:
         logger.debug(f"Using stage offset {self.offset}")
 
     def signal_func(self):
-        """Move to the next position in the multi-position table and control the data
-        thread.
+        """Start moving to the next position in the multi-position table.
 
-        This method advances to the next position in the multi-position table,
-        controls the data thread based on stage distance thresholds, and updates
-        position-related information.
+        This method advances to the next position in the multi-position table and
+        updates position-related information. The model waits for the move, and
+        controls the data thread based on stage distance thresholds, right before the
+        next frame is triggered.
 
         Returns:
         -------
@@ -777,8 +795,6 @@ class MoveToNextPositionInMultiPositionTable:
             distance > self.stage_distance_threshold
             for distance in [delta_x, delta_y, delta_z, delta_f]
         )
-        if should_pause_data_thread:
-            self.model.pause_data_thread()
 
         self.current_idx += 1
         # Make sure to go back to the beginning if using LoopByCount
@@ -787,26 +803,154 @@ class MoveToNextPositionInMultiPositionTable:
 
         abs_pos_dict = dict(map(lambda k: (f"{k}_abs", pos_dict[k]), pos_dict.keys()))
         logger.debug(f"MoveToNextPositionInMultiPosition: " f"{pos_dict}")
-        self.model.move_stage(abs_pos_dict, wait_until_done=True)
+        self.motion_scheduler.move(abs_pos_dict)
 
-        logger.debug("MoveToNextPositionInMultiPosition: move done")
+        # the following nodes run while the stage is moving, only block right
+        # before the next frame is triggered.
+        self.should_pause_data_thread = should_pause_data_thread
+        self.model.before_next_trigger.append(self.wait_for_move)
 
-        # resume data thread
-        if should_pause_data_thread:
-            self.model.resume_data_thread()
         self.model.active_microscope.central_focus = None
         if self.pre_z != pos_dict["z"]:
             self.pre_z = pos_dict["z"]
             return True
 
+    def wait_for_move(self):
+        """Wait for the move to the current position and control the data thread.
+
+        The data thread is paused while waiting for long moves.
+        """
+        if self.should_pause_data_thread:
+            self.model.pause_data_thread()
+        self.motion_scheduler.wait()
+
+        logger.debug("MoveToNextPositionInMultiPosition: move done")
+
+        # resume data thread
+        if self.should_pause_data_thread:
+            self.model.resume_data_thread()
+            self.should_pause_data_thread = False
+
     def cleanup(self):
         """Cleanup method to resume the data thread.
 
         This method is responsible for resuming the data thread after position control.
         """
+        self.motion_scheduler.wait()
+        self.should_pause_data_thread = False
         self.model.resume_data_thread()
 
 
+class OptimizeMultiPositionOrder:
+    """OptimizeMultiPositionOrder class for reordering the multi-position table.
+
+    This class reorders the positions in the multi-position table to minimize the
+    time spent moving the stage between them, starting from the current stage
+    position.
+
+    Notes:
+    ------
+    - The travel time of each move is estimated from the per-axis speeds
+      (`x_speed`, `y_speed`, `z_speed`, `theta_speed`, `f_speed`) of the stage
+      configuration. Theta and focus changes can be penalized further with weights.
+
+    - The order is built with a nearest-neighbour search and refined with 2-opt and
+      Or-opt moves.
+
+    - The original index of each position is kept in
+      `experiment.MicroscopeState.multiposition_original_indices`, and written to
+      `multiposition_order.yml` in the save directory if data is saved, so the
+      position numbering of saved data remains traceable.
+    """
+
+    def __init__(self, model, theta_weight=1.0, focus_weight=1.0, update_table=True):
+        """Initialize the OptimizeMultiPositionOrder class.
+
+        Parameters:
+        ----------
+        model : MicroscopeModel
+            The microscope model object used for position control.
+        theta_weight : float
+            Penalty applied to the travel time of theta moves.
+        focus_weight : float
+            Penalty applied to the travel time of focus moves.
+        update_table : bool
+            Show the reordered positions in the multi-position table.
+        """
+        #: MicroscopeModel: The microscope model associated with position control.
+        self.model = model
+
+        #: list: Penalty applied to the travel time of each axis.
+        self.weights = [1.0, 1.0, 1.0, float(theta_weight), float(focus_weight)]
+
+        #: bool: Show the reordered positions in the multi-position table.
+        self.update_table = update_table
+
+        #: dict: A dictionary defining the configuration for the position ordering
+        self.config_table = {
+            "signal": {"main": self.signal_func},
+            "node": {"device_related": True},
+        }
+
+    def signal_func(self):
+        """Reorder the positions in the multi-position table.
+
+        Returns:
+        -------
+        bool
+            True indicating the successful execution of the signal function.
+        """
+        experiment = self.model.configuration["experiment"]
+        positions = positions_to_array(experiment["MultiPositions"])
+        if len(positions) < 2:
+            return True
+
+        stage_config = self.model.configuration["configuration"]["microscopes"][
+            self.model.active_microscope_name
+        ]["stage"]
+        speeds = get_axis_speeds(stage_config)
+        pos_dict = self.model.get_stage_position()
+        start_position = [
+            pos_dict[f"{axis}_pos"] for axis in ["x", "y", "z", "theta", "f"]
+        ]
+
+        order, original_time, optimized_time = optimize_position_order(
+            positions, speeds, start_position, self.weights
+        )
+        new_positions = positions[order].tolist()
+        order = order.tolist()
+        # the table may already be reordered, keep indices into the original table
+        previous_order = experiment["MicroscopeState"].get(
+            "multiposition_original_indices", None
+        )
+        if previous_order is not None and len(previous_order) == len(order):
+            order = [previous_order[i] for i in order]
+        experiment["MultiPositions"] = new_positions
+        experiment["MicroscopeState"]["multiposition_original_indices"] = order
+
+        time_saved = original_time - optimized_time
+        logger.info(
+            f"OptimizeMultiPositionOrder: estimated travel time "
+            f"{original_time:.2f}s -> {optimized_time:.2f}s, "
+            f"saved {time_saved:.2f}s"
+        )
+
+        if self.model.is_save:
+            save_yaml_file(
+                file_directory=experiment["Saving"]["save_directory"],
+                content_dict={
+                    "original_indices": order,
+                    "estimated_travel_time": optimized_time,
+                    "estimated_time_saved": time_saved,
+                },
+                filename="multiposition_order.yml",
+            )
+
+        if self.update_table:
+            self.model.event_queue.put(("multiposition", new_positions))
+        return True
+
+
 class StackPause:
     """StackPause class for pausing stack acquisition.
 
@@ -892,6 +1036,147 @@ class StackPause:
             self.model.resume_data_thread()
 
 
+class HardwareTimedSequence:
+    """HardwareTimedSequence class for acquiring frames as one DAQ sequence.
+
+    This class acquires a number of frames of the current channel as one
+    hardware-timed DAQ sequence. The DAQ tasks are started once for the whole
+    sequence instead of being started and stopped for every frame.
+
+    Notes:
+    ------
+    - The stage, channel and waveforms must not change during the sequence.
+
+    - Sequences are started by the master trigger. With an external trigger, the
+    frames are acquired one at a time.
+    """
+
+    def __init__(self, model, number_of_frames=1, saving_flag=False):
+        """Initialize the HardwareTimedSequence class.
+
+        Parameters:
+        ----------
+        model : MicroscopeModel
+            The microscope model object used for the acquisition.
+        number_of_frames : int or str, optional
+            The number of frames in the sequence or a configuration reference to
+            determine it. Default is 1.
+        saving_flag : bool, optional
+            Save the frames. Default is False.
+        """
+        #: MicroscopeModel: The microscope model associated with the acquisition.
+        self.model = model
+
+        #: int: The number of frames in the sequence.
+        self.number_of_frames = number_of_frames
+        if type(number_of_frames) is str:
+            try:
+                parameters = number_of_frames.split(".")
+                config_ref = reduce((lambda pre, n: f"{pre}['{n}']"), parameters, "")
+                exec(
+                    f"self.number_of_frames = int(self.model.configuration{config_ref})"
+                )
+            except:  # noqa
+                self.number_of_frames = 1
+
+        #: bool: Save the frames.
+        self.saving_flag = saving_flag
+
+        #: int: The number of frames triggered.
+        self.signal_frames = 0
+
+        #: int: The number of frames received.
+        self.received_frames = 0
+
+        #: dict: A dictionary defining the configuration for the sequence.
+        self.config_table = {
+            "signal": {
+                "init": self.pre_signal_func,
+                "main": self.signal_func,
+                "main-response": self.signal_response_func,
+                "end": self.signal_end,
+                "cleanup": self.cleanup,
+            },
+            "data": {
+                "init": self.pre_data_func,
+                "main": self.in_data_func,
+                "end": self.end_data_func,
+            },
+            "node": {"node_type": "multi-step", "device_related": True},
+        }
+
+    def pre_signal_func(self):
+        """Set the DAQ sequence length."""
+        self.signal_frames = 0
+        self.model.active_microscope.daq.set_sequence_length(self.number_of_frames)
+
+    def signal_func(self):
+        """Acquire the next frame of the sequence.
+
+        Returns:
+        -------
+        bool
+            True
+        """
+        return True
+
+    def signal_response_func(self):
+        """Count the frame that has just been run by the DAQ.
+
+        The sequence length is reset only after the last frame of the sequence has
+        been run, so that the DAQ does not stop the sequence early.
+
+        Returns:
+        -------
+        bool
+            True
+        """
+        self.signal_frames += 1
+        if self.signal_frames >= self.number_of_frames:
+            self.model.active_microscope.daq.set_sequence_length(1)
+        return True
+
+    def signal_end(self):
+        """Check whether all the frames of the sequence are triggered.
+
+        Returns:
+        -------
+        bool
+            True if the sequence is finished.
+        """
+        return self.signal_frames >= self.number_of_frames
+
+    def cleanup(self):
+        """Run the following frames one at a time."""
+        self.model.active_microscope.daq.set_sequence_length(1)
+
+    def pre_data_func(self):
+        """Reset the number of received frames."""
+        self.received_frames = 0
+
+    def in_data_func(self, frame_ids):
+        """Count the received frames.
+
+        Parameters:
+        ----------
+        frame_ids : list
+            A list of frame IDs received.
+        """
+        self.received_frames += len(frame_ids)
+        if self.saving_flag:
+            self.model.mark_saving_flags(frame_ids)
+
+    def end_data_func(self):
+        """Check whether all the frames of the sequence are received.
+
+        Returns:
+        -------
+        bool
+            True if all the frames are received.
+        """
+        return self.received_frames >= self.number_of_frames
+
+
 class ZStackAcquisition:
     """ZStackAcquisition class for controlling z-stack acquisition in microscopy.
 
@@ -974,6 +1259,9 @@ class ZStackAcquisition:
         #: dict: A dictionary defining the defocus values between channels
         self.defocus = None
 
+        #: bool: Flag to determine whether to pause the data thread.
+        self.should_pause_data_thread = False
+
         #: str: The stack cycling mode for z-stack acquisition.
         self.stack_cycling_mode = "per_stack"
 
@@ -987,12 +1275,17 @@ class ZStackAcquisition:
 
         self.prepare_next_channel = PrepareNextChannel(model)
 
+        #: MotionScheduler: Moves the stage to the next stack in the background.
+        self.motion_scheduler = MotionScheduler(model)
+
         #: dict: A dictionary defining the configuration for the z-stack acquisition
         self.config_table = {
             "signal": {
                 "init": self.pre_signal_func,
                 "main": self.signal_func,
+                "main-response": self.signal_response_func,
                 "end": self.signal_end,
+                "cleanup": self.cleanup,
             },
             "data": {
                 "init": self.pre_data_func,
@@ -1017,6 +1310,12 @@ class ZStackAcquisition:
         self.channels = microscope_state["selected_channels"]
         #: int: The current channel being acquired in the z-stack
         self.current_channel_in_list = 0
+        #: list: Channel orders of the microscope, as indices into the channels
+        self.channel_orders = microscope_state.get(
+            "channel_acquisition_order", None
+        ) or [list(range(self.channels))]
+        #: int: Number of times the channels have been cycled through
+        self.channel_cycle = 0
 
         self.number_z_steps = int(microscope_state["number_z_steps"])
         self.start_z_position = float(microscope_state["start_position"])
@@ -1044,7 +1343,9 @@ class ZStackAcquisition:
 
         # position: x, y, z, theta, f
         if bool(microscope_state["is_multiposition"]):
-            self.positions = self.model.configuration["experiment"]["MultiPositions"]
+            self.positions = positions_to_array(
+                self.model.configuration["experiment"]["MultiPositions"]
+            ).tolist()
         else:
             self.positions = [
                 [
@@ -1080,7 +1381,7 @@ class ZStackAcquisition:
         self.prepare_next_channel.signal_func()
 
         logger.info(
-            f"ZStackAcquisition. Positions {self.positions}, "
+            f"ZStackAcquisition. {len(self.positions)} position(s), "
             f"Starting Focus {self.start_focus}, "
             f"Starting Z-Position {self.start_z_position}"
         )
@@ -1093,6 +1394,8 @@ class ZStackAcquisition:
         self.need_to_move_z_position = True
         #: bool: Flag to determine whether to pause the data thread.
         self.should_pause_data_thread = False
+        #: bool: Flag to determine whether all the stacks have been acquired.
+        self.all_stacks_finished = False
         # TODO: distance > 1000 should not be hardcoded and somehow related to
         #  different kinds of stage devices.
         self.stage_distance_threshold = 1000
@@ -1118,118 +1421,152 @@ class ZStackAcquisition:
         """
         if self.model.stop_acquisition:
             return False
-        data_thread_is_paused = False
 
+        # the move to the start of this stack was issued after the last frame of the
+        # previous stack was triggered, only block until it is finished.
+        # the data thread is already paused if the stage moved in the background
+        moved_in_background = self.motion_scheduler.is_moving()
+        reached_position = {}
+        if moved_in_background and self.motion_scheduler.wait():
+            reached_position = self.motion_scheduler.timings[-1]["target"]
+
+        pos_dict = {}
         # move stage X, Y, Theta
         if self.need_to_move_new_position:
             self.need_to_move_new_position = False
+            pos_dict = self.update_current_position()
 
-            self.pre_position = self.current_position
-            self.current_position = dict(
-                zip(
-                    ["x", "y", "z", "theta", "f"],
-                    self.positions[self.current_position_idx],
-                )
+        if self.need_to_move_z_position:
+            # move z, f together with X, Y, Theta
+            pos_dict["z_abs"] = self.current_z_position
+            pos_dict["f_abs"] = self.current_focus_position
+
+        # skip the move if the stage is already there
+        if any(reached_position.get(axis) != pos_dict[axis] for axis in pos_dict):
+            if self.should_pause_data_thread and not moved_in_background:
+                self.model.pause_data_thread()
+                logger.info("Data thread paused.")
+
+            self.model.move_stage(pos_dict, wait_until_done=True)
+
+        if self.should_pause_data_thread:
+            self.model.resume_data_thread()
+            self.should_pause_data_thread = False
+
+        return True
+
+    def update_current_position(self):
+        """Update the current position to the next position in the position list.
+
+        This method calculates the first z and focus positions of the stack and decides
+        whether the data thread should be paused while moving.
+
+        Returns:
+        -------
+        dict
+            The X, Y, Theta positions to move to.
+        """
+        self.pre_position = self.current_position
+        self.current_position = dict(
+            zip(
+                ["x", "y", "z", "theta", "f"],
+                self.positions[self.current_position_idx],
             )
+        )
 
-            # calculate first z, f position
-            self.current_z_position = self.start_z_position + self.current_position["z"]
-            self.current_focus_position = self.start_focus + self.current_position["f"]
-            if self.defocus is not None:
-                self.current_focus_position += self.defocus[
-                    self.current_channel_in_list
-                ]
+        # calculate first z, f position
+        self.current_z_position = self.start_z_position + self.current_position["z"]
+        self.current_focus_position = self.start_focus + self.current_position["f"]
+        if self.defocus is not None:
+            self.current_focus_position += self.defocus[self.current_channel_index()]
 
-            # calculate delta_x, delta_y
-            # TODO: Here.
-            pos_dict = dict(
-                map(
-                    lambda ax: (
-                        f"{ax}_abs",
-                        self.current_position[ax],
-                    ),
-                    ["x", "y", "theta"],
-                )
+        # calculate delta_x, delta_y
+        pos_dict = dict(
+            map(
+                lambda ax: (
+                    f"{ax}_abs",
+                    self.current_position[ax],
+                ),
+                ["x", "y", "theta"],
             )
+        )
 
-            if self.current_position_idx > 0:
-                delta_x = self.current_position["x"] - self.pre_position["x"]
-                delta_y = self.current_position["y"] - self.pre_position["y"]
-                delta_z = (
-                    self.current_position["z"]
-                    - self.pre_position["z"]
-                    + self.z_stack_distance
-                )
-                delta_f = (
-                    self.current_position["f"]
-                    - self.pre_position["f"]
-                    + self.f_stack_distance
-                )
-            else:
-                delta_x = 0
-                delta_y = 0
-                delta_z = 0
-                delta_f = 0
-
-            # displacement = [delta_z, delta_f, delta_x, delta_y]
-            # Check the distance between current position and previous position,
-            # if it is too far, then we can call self.model.pause_data_thread() and
-            # self.model.resume_data_thread() after the stage has completed the move
-            # to the next position.
-
-            self.should_pause_data_thread = any(
-                distance > self.stage_distance_threshold
-                for distance in [delta_x, delta_y, delta_z, delta_f]
+        if self.current_position_idx > 0:
+            delta_x = self.current_position["x"] - self.pre_position["x"]
+            delta_y = self.current_position["y"] - self.pre_position["y"]
+            delta_z = (
+                self.current_position["z"]
+                - self.pre_position["z"]
+                + self.z_stack_distance
             )
-            if self.should_pause_data_thread:
-                self.model.pause_data_thread()
-                data_thread_is_paused = True
+            delta_f = (
+                self.current_position["f"]
+                - self.pre_position["f"]
+                + self.f_stack_distance
+            )
+        else:
+            delta_x = 0
+            delta_y = 0
+            delta_z = 0
+            delta_f = 0
+
+        # Check the distance between current position and previous position,
+        # if it is too far, then we can call self.model.pause_data_thread() and
+        # self.model.resume_data_thread() after the stage has completed the move
+        # to the next position.
+        self.should_pause_data_thread = any(
+            distance > self.stage_distance_threshold
+            for distance in [delta_x, delta_y, delta_z, delta_f]
+        )
 
-            self.model.move_stage(pos_dict, wait_until_done=True)
+        return pos_dict
 
-        if self.need_to_move_z_position:
-            # move z, f
-            # self.model.pause_data_thread()
+    def move_to_next_stack(self):
+        """Start moving to the beginning of the next stack.
 
-            if self.should_pause_data_thread and not data_thread_is_paused:
-                self.model.pause_data_thread()
-                logger.info("Data thread paused.")
+        This method is called from `signal_response_func`, once the last frame of a
+        stack has been triggered. The move runs in the background, concurrently with
+        the readout and saving of the last frame, and `signal_func` blocks until it is
+        finished before the next trigger.
+        """
+        pos_dict = {}
+        if self.need_to_move_new_position:
+            self.need_to_move_new_position = False
+            pos_dict = self.update_current_position()
 
-            self.model.move_stage(
-                {
-                    "z_abs": self.current_z_position,
-                    "f_abs": self.current_focus_position,
-                },
-                wait_until_done=True,
-            )
+        # includes the defocus of the next channel
+        pos_dict["z_abs"] = self.current_z_position
+        pos_dict["f_abs"] = self.current_focus_position
+        self.motion_scheduler.move(pos_dict)
 
+        # wait for the data thread while the stage is already moving
         if self.should_pause_data_thread:
-            self.model.resume_data_thread()
-            self.should_pause_data_thread = False
+            self.model.pause_data_thread()
+            logger.info("Data thread paused.")
 
-        return True
+    def signal_response_func(self):
+        """Handle position cycling and channel updates after a frame is triggered.
 
-    def signal_end(self):
-        """Handle the end of the signal stage and position cycling.
-
-        This method handles the end of the signal stage, including position cycling and
-        channel updates for multi-channel acquisitions.
+        This method runs after the DAQ has triggered the current frame. It updates the
+        channel, the z and focus positions and the stage position for the next frame,
+        and starts moving to the next stack once the last frame of a stack has been
+        triggered.
 
         Returns:
         -------
         bool
-            A boolean value indicating whether to end the current node.
+            A boolean value indicating whether to continue the z-stack acquisition
+            process.
         """
-
-        # end this node
         if self.model.stop_acquisition:
             return True
 
+        stack_finished = False
         if self.stack_cycling_mode != "per_stack":
             # update channel for each z position in 'per_slice'
             if self.defocus is not None:
                 self.current_focus_position -= self.defocus[
-                    self.current_channel_in_list
+                    self.current_channel_index()
                 ]
             self.update_channel()
             self.need_to_move_z_position = self.current_channel_in_list == 0
@@ -1246,6 +1583,11 @@ class ZStackAcquisition:
         # decide whether to move X,Y,Theta
         if self.z_position_moved_time >= self.number_z_steps:
             self.z_position_moved_time = 0
+            stack_finished = True
+            logger.info(
+                f"ZStackAcquisition. Stack finished with "
+                f"{self.model.active_microscope.get_channel_switch_summary()}"
+            )
             # calculate first z, f position
             self.current_z_position = self.start_z_position + self.current_position["z"]
             self.current_focus_position = self.start_focus + self.current_position["f"]
@@ -1270,14 +1612,36 @@ class ZStackAcquisition:
 
         if self.current_position_idx >= len(self.positions):
             self.current_position_idx = 0
+            self.all_stacks_finished = True
             # restore z
             self.model.move_stage(
                 {"z_abs": self.restore_z, "f_abs": self.restore_f},
                 wait_until_done=False,
             )  # Update position
-            return True
+            logger.info(
+                f"ZStackAcquisition. Stage moves: {self.motion_scheduler.summary()}"
+            )
+        elif stack_finished:
+            self.move_to_next_stack()
+
+        return True
 
-        return False
+    def signal_end(self):
+        """Decide whether all the stacks have been acquired.
+
+        Returns:
+        -------
+        bool
+            A boolean value indicating whether to end the current node.
+        """
+        return self.model.stop_acquisition or self.all_stacks_finished
+
+    def cleanup(self):
+        """Wait for the pending stage move if the acquisition ends early."""
+        self.motion_scheduler.wait()
+        if self.should_pause_data_thread:
+            self.model.resume_data_thread()
+            self.should_pause_data_thread = False
 
     def update_channel(self):
         """Update the active channel during multi-channel acquisition.
@@ -1288,10 +1652,28 @@ class ZStackAcquisition:
         self.current_channel_in_list = (
             self.current_channel_in_list + 1
         ) % self.channels
+        if self.current_channel_in_list == 0:
+            self.channel_cycle += 1
         # not update DAQ tasks if there is a NI Galvo stage
         self.prepare_next_channel.signal_func()
         if self.defocus is not None:
-            self.current_focus_position += self.defocus[self.current_channel_in_list]
+            self.current_focus_position += self.defocus[self.current_channel_index()]
+
+    def current_channel_index(self):
+        """Get the index of the current channel among the selected channels.
+
+        In per-z stack cycling, the microscope may image the channels in a
+        different order on every plane, as given by
+        `experiment.MicroscopeState.channel_acquisition_order`.
+
+        Returns:
+        -------
+        int
+            Index of the current channel in table order.
+        """
+        plane = self.channel_cycle % self.number_z_steps
+        order = self.channel_orders[plane % len(self.channel_orders)]
+        return order[self.current_channel_in_list]
 
     def pre_data_func(self):
         """Initialize data-related parameters before data acquisition.
@@ -1345,6 +1727,232 @@ class ZStackAcquisition:
             self.image_writer.cleanup()
 
 
+class ScannedZStackAcquisition(ZStackAcquisition):
+    """ScannedZStackAcquisition class for constant-velocity z-stack acquisition.
+
+    Instead of stepping and settling the stage for every plane, the z stage sweeps
+    through the stack at constant velocity and the camera is triggered by the stage
+    encoder pulses routed to the DAQ.
+
+    Notes:
+    ------
+    - The scan is only used if the z stage implements `scanr`, `start_scan` and
+      `stop_scan`, a scan trigger source is available, the focus does not change
+      over the stack, and each stack is acquired with a single channel. Otherwise,
+      the acquisition falls back to step-and-settle `ZStackAcquisition`.
+
+    - The stage velocity is chosen so that the stage moves one step per frame
+      (step size / sweep time of the current channel).
+
+    - The z position of every frame is reconstructed from the stack start position
+      and the step size and written into `data_buffer_positions`, since the stage
+      cannot be queried reliably while it is scanning.
+
+    - The scan trigger source is read from the `scan_trigger_source` entry of the DAQ
+      configuration if it is not given explicitly.
+    """
+
+    def __init__(
+        self,
+        model,
+        get_origin=False,
+        saving_flag=False,
+        saving_dir="z-stack",
+        trigger_channel=None,
+    ):
+        """Initialize the ScannedZStackAcquisition class.
+
+        Parameters:
+        ----------
+        model : MicroscopeModel
+            The microscope model object used for z-stack acquisition control.
+        get_origin : bool, optional
+            Flag to determine whether to get the z and focus origin positions.
+            Default is False.
+        saving_flag : bool, optional
+            Flag to enable image saving during z-stack acquisition. Default is False.
+        saving_dir : str, optional
+            The sub-directory for saving z-stack images. Default is "z-stack".
+        trigger_channel : str, optional
+            The DAQ terminal that receives the stage encoder pulses. Default is None,
+            which uses the `scan_trigger_source` of the DAQ configuration.
+        """
+        super().__init__(model, get_origin, saving_flag, saving_dir)
+
+        #: str: The DAQ terminal that receives the stage encoder pulses.
+        self.trigger_channel = trigger_channel
+
+        #: bool: Flag to determine whether the z stage is scanned.
+        self.scan_mode = False
+
+        #: bool: Flag to determine whether the z stage is scanning.
+        self.is_scanning = False
+
+        #: StageBase: The stage device moving the z axis.
+        self.scan_stage = None
+
+        #: float: The speed of the z stage before scanning.
+        self.restore_speed = None
+
+    def pre_signal_func(self):
+        """Initialize z-stack parameters and decide whether to scan the z stage.
+
+        This method initializes the z-stack acquisition parameters and checks whether
+        the z stage and the DAQ support a constant-velocity scan.
+        """
+        super().pre_signal_func()
+
+        microscope = self.model.active_microscope
+        daq_config = self.model.configuration["configuration"]["microscopes"][
+            self.model.active_microscope_name
+        ]["daq"]
+        if self.trigger_channel is None:
+            self.trigger_channel = daq_config.get("scan_trigger_source", None)
+
+        self.scan_stage = microscope.stages.get("z", None)
+        self.is_scanning = False
+        reason = None
+        if self.scan_stage is None or not all(
+            hasattr(self.scan_stage, func)
+            for func in ["scanr", "start_scan", "stop_scan"]
+        ):
+            reason = "the z stage does not support scanning"
+        elif not self.trigger_channel:
+            reason = "no scan trigger source is configured"
+        elif self.stack_cycling_mode != "per_stack" and self.channels > 1:
+            reason = "channels are switched at every z position"
+        elif self.focus_step_size != 0:
+            reason = "the focus changes over the stack"
+        elif self.number_z_steps < 2:
+            reason = "the stack has less than two positions"
+        self.scan_mode = reason is None
+
+        if self.scan_mode:
+            logger.info(
+                f"ScannedZStackAcquisition. Scanning z with trigger "
+                f"{self.trigger_channel}."
+            )
+        else:
+            logger.info(
+                f"ScannedZStackAcquisition. Falling back to step-and-settle: "
+                f"{reason}."
+            )
+
+    def signal_func(self):
+        """Move to the start of the stack and start the constant-velocity scan.
+
+        Returns:
+        -------
+        bool
+            A boolean value indicating whether to continue the z-stack acquisition
+            process.
+        """
+        if not self.scan_mode:
+            return super().signal_func()
+
+        if self.model.stop_acquisition:
+            return False
+
+        if self.is_scanning:
+            return True
+
+        # move stage X, Y, Theta and Z, F to the start of the stack
+        result = super().signal_func()
+        if result:
+            self.start_scan()
+        return result
+
+    def signal_response_func(self):
+        """Record the z and focus positions of the acquired frame.
+
+        The scan is stopped after the last frame of each stack, before switching
+        channels or moving to the next stack.
+
+        Returns:
+        -------
+        bool
+            A boolean value indicating whether to continue the z-stack acquisition
+            process.
+        """
+        if self.scan_mode:
+            self.model.data_buffer_positions[self.model.frame_id][
+                2
+            ] = self.current_z_position
+            self.model.data_buffer_positions[self.model.frame_id][
+                4
+            ] = self.current_focus_position
+
+            # stop the scan before switching channels at the end of a stack
+            if self.z_position_moved_time + 1 >= self.number_z_steps:
+                self.stop_scan()
+
+        return super().signal_response_func()
+
+    def signal_end(self):
+        """Stop the scan if the acquisition is stopped.
+
+        Returns:
+        -------
+        bool
+            A boolean value indicating whether to end the current node.
+        """
+        if self.scan_mode and self.model.stop_acquisition:
+            self.stop_scan()
+
+        return super().signal_end()
+
+    def cleanup(self):
+        """Stop the scan if the acquisition ends in the middle of a stack."""
+        self.stop_scan()
+        super().cleanup()
+
+    def start_scan(self):
+        """Configure the stage, the DAQ trigger and start scanning the stack."""
+        microscope = self.model.active_microscope
+        channel_key = f"channel_{microscope.current_channel}"
+        _, sweep_times = microscope.get_exposure_sweep_times()
+        # the DAQ loses the encoder pulses that arrive while it runs a frame
+        frame_period = max(
+            sweep_times[channel_key], microscope.daq.get_trigger_period(channel_key)
+        )
+
+        # stage speed in mm/s: one step per frame
+        step_size_mm = abs(self.z_step_size) / 1000
+        speed = step_size_mm / frame_period
+        hardware_axis = self.scan_stage.axes_mapping.get("z", "z")
+        self.restore_speed = self.scan_stage.get_speed("z")
+        self.scan_stage.set_speed({hardware_axis: speed})
+
+        start_position_mm = self.current_z_position / 1000
+        end_position_mm = (
+            self.current_z_position + self.z_step_size * (self.number_z_steps - 1)
+        ) / 1000
+        self.scan_stage.scanr(
+            start_position_mm, end_position_mm, step_size_mm, axis="z"
+        )
+        microscope.daq.set_external_trigger(self.trigger_channel, retriggerable=True)
+        self.scan_stage.start_scan("z")
+        self.is_scanning = True
+        logger.info(
+            f"ScannedZStackAcquisition. Scanning from {start_position_mm} mm to "
+            f"{end_position_mm} mm at {speed} mm/s."
+        )
+
+    def stop_scan(self):
+        """Stop scanning and restore the stage speed and DAQ trigger."""
+        if not self.is_scanning:
+            return
+        self.is_scanning = False
+        microscope = self.model.active_microscope
+        self.scan_stage.stop_scan()
+        microscope.daq.set_external_trigger(None)
+        if self.restore_speed:
+            hardware_axis = self.scan_stage.axes_mapping.get("z", "z")
+            self.scan_stage.set_speed({hardware_axis: self.restore_speed})
+        # the stage position is unknown after scanning
+        microscope.ask_stage_for_position = True
+
+
 class FindTissueSimple2D:
     """FindTissueSimple2D class for detecting tissue and gridding out the imaging
     space in  2D.
@@ -1697,7 +2305,7 @@ class SetCameraParameters:
         self.model.active_microscope.end_acquisition()
         # set parameters and prepare active microscope
         waveform_dict = self.model.active_microscope.prepare_acquisition()
-        self.model.event_queue.put(("waveform", waveform_dict))
+        self.model.publish_waveforms(waveform_dict)
         self.model.event_queue.put(("display_camera_parameters", updated_value))
         # prepare channel
         self.model.active_microscope.prepare_next_channel()
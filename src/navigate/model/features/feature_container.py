@@ -38,6 +38,7 @@ import inspect
 # Third Party Imports
 
 # Local Imports
+from navigate.tools.tracing import tracer
 
 p = __name__.split(".")[1]
 
@@ -642,6 +643,7 @@ class DataContainer(Container):
         if not self.curr_node:
             self.curr_node = self.root
         while self.curr_node:
+            start = tracer.begin()
             try:
                 result, is_end = self.curr_node.run(*args)
             except Exception:
@@ -671,6 +673,7 @@ class DataContainer(Container):
                     self.end_flag = True
                     self.cleanup()
                     return
+            tracer.end(self.curr_node.node_name, start)
             if not is_end:
                 return
             if result and self.curr_node.child:
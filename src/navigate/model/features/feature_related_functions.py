@@ -41,6 +41,7 @@ import importlib
 from navigate.model.features.auto_tile_scan import CalculateFocusRange  # noqa
 from navigate.model.features.autofocus import Autofocus  # noqa
 from navigate.model.features.adaptive_optics import TonyWilson  # noqa
+from navigate.model.features.camera_calibration import CameraCalibration  # noqa
 from navigate.model.features.common_features import (
     ChangeResolution,  # noqa
     Snap,  # noqa
@@ -49,8 +50,11 @@ from navigate.model.features.common_features import (
     LoopByCount,  # noqa
     PrepareNextChannel,  # noqa
     MoveToNextPositionInMultiPositionTable,  # noqa
+    OptimizeMultiPositionOrder,  # noqa
     StackPause,  # noqa
+    HardwareTimedSequence,  # noqa
     ZStackAcquisition,  # noqa
+    ScannedZStackAcquisition,  # noqa
     FindTissueSimple2D,  # noqa
     SetCameraParameters,  # noqa
 )
@@ -62,10 +66,54 @@ from navigate.model.features.remove_empty_tiles import (
     DetectTissueInStackAndReturn,  # noqa
     DetectTissueInStackAndRecord,  # noqa
     RemoveEmptyPositions,  # noqa
+    RemoveEmptyPositionsInOverview,  # noqa
 )
 from navigate.tools.file_functions import load_yaml_file
 from navigate.tools.common_functions import load_module_from_file
 
+#: dict: Plugin features that are imported on first use, by feature name.
+lazy_features = {}
+
+
+def __getattr__(name):
+    """Import a plugin feature on first use.
+
+    Parameters
+    ----------
+    name : str
+        The feature name.
+
+    Returns
+    -------
+    feature : class
+        The feature class.
+    """
+    if name not in lazy_features:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    feature = lazy_features.pop(name)()
+    globals()[name] = feature
+    return feature
+
+
+def __dir__():
+    """List the features, including the plugin features that are not imported yet.
+
+    Returns
+    -------
+    list
+        The names defined in this module.
+    """
+    return sorted(set(globals()) | set(lazy_features))
+
+
+class FeatureNamespace(dict):
+    """Namespace of a feature list, which imports plugin features on first use."""
+
+    def __missing__(self, key):
+        if key not in lazy_features:
+            raise KeyError(key)
+        return __getattr__(key)
+
 
 class SharedList(list):
     """Custom list class with a name attribute for sharing data.
@@ -173,7 +221,7 @@ def convert_str_to_feature_list(content: str):
     if content in ["continue", '"continue"', "'continue'"]:
         return "continue"
     try:
-        exec_result = {}
+        exec_result = FeatureNamespace()
         exec(f"result={content}", globals(), exec_result)
         if type(exec_result["result"]) is not list:
             print("Please make sure the feature list is a list!")
@@ -35,7 +35,6 @@
 import os
 import logging
 import shutil
-import time
 
 # Third Party Imports
 import numpy as np
@@ -43,6 +42,11 @@ from tifffile import imsave
 
 # Local imports
 from navigate.model import data_sources
+from navigate.model.analysis.overview_mosaic import OverviewMosaic
+from navigate.model.analysis.tile_registration import TileRegistration
+from navigate.model.data_sources.writer_pool import WriterPool
+from navigate.tools.multipos_table_tools import positions_to_array
+from navigate.tools.tracing import tracer
 
 # Logger Setup
 p = __name__.split(".")[1]
@@ -141,6 +145,9 @@ class ImageWriter:
         #: np.ndarray : Maximum intensity projection image.
         self.mip = None
 
+        #: np.ndarray : Frames of the current stack added to the MIP, (c, z).
+        self.mip_frames = None
+
         #: str : Directory for saving maximum intensity projection images.
         self.mip_directory = os.path.join(self.save_directory, "MIP")
         try:
@@ -185,6 +192,68 @@ class ImageWriter:
 
         self.data_source.set_metadata(saving_config)
 
+        # Fan the files out to a pool of writer workers
+        saving = self.model.configuration["experiment"]["Saving"]
+        writer_workers = int(saving.get("writer_workers", 1) or 1)
+        #: WriterPool: Workers that write the files, if more than one is requested.
+        self.writer_pool = None
+        if writer_workers > 1:
+            if hasattr(self.data_source, "set_writer_pool"):
+                self.writer_pool = WriterPool(
+                    writer_workers,
+                    directories=saving.get("writer_directories", None),
+                    base_directory=saving["save_directory"],
+                )
+                self.data_source.set_writer_pool(self.writer_pool)
+                logger.info(
+                    f"Writing {self.file_type} files with {writer_workers} workers."
+                )
+            else:
+                logger.info(f"{self.file_type} files are written by a single writer.")
+
+        # Assemble an overview of multi-position acquisitions from the stack MIPs
+        #: OverviewMosaic: Low-resolution overview of the positions, if any.
+        self.overview_mosaic = None
+        #: numpy.ndarray: The x, y positions of the multi-position table.
+        self.overview_positions = None
+        if self.data_source.positions > 1 and saving.get("overview_mosaic", True):
+            self.overview_positions = positions_to_array(
+                self.model.configuration["experiment"]["MultiPositions"]
+            )[:, :2]
+            positions = self.overview_positions[
+                np.isfinite(self.overview_positions).all(axis=1)
+            ]
+            if positions.shape[0] > 0:
+                self.overview_mosaic = OverviewMosaic(
+                    positions,
+                    (self.data_source.shape_y, self.data_source.shape_x),
+                    (self.data_source.dx, self.data_source.dy),
+                    self.data_source.shape_c,
+                    max_size=int(saving.get("overview_size", 2048)),
+                )
+        self.model.overview_mosaic = self.overview_mosaic
+
+        # Register neighbouring positions in the background, for data sources that
+        # store the positions of the tiles
+        #: TileRegistration: Registration of overlapping positions, if any.
+        self.tile_registration = None
+        if (
+            self.data_source.positions > 1
+            and hasattr(self.data_source.metadata, "stitching_translations")
+            and saving.get("tile_registration", True)
+        ):
+            tile_registration = TileRegistration(
+                positions_to_array(
+                    self.model.configuration["experiment"]["MultiPositions"]
+                )[:, :2],
+                (self.data_source.shape_y, self.data_source.shape_x),
+                (self.data_source.dx, self.data_source.dy),
+                max_workers=int(saving.get("registration_workers", 1)),
+                image_axes=self.data_source.metadata.image_axes,
+            )
+            if tile_registration.pairs:
+                self.tile_registration = tile_registration
+
         # Make sure that there is enough disk space to save the data.
         self.calculate_and_check_disk_space()
 
@@ -225,15 +294,24 @@ class ImageWriter:
                 self.data_source._current_frame, self.data_source.metadata.per_stack
             )
 
-            if c_idx == 0 and z_idx == 0:
+            # Channels may be acquired in a different order on each plane, so the
+            # stack starts at its first frame and ends once every frame arrived
+            if self.mip is None or self.data_source._is_first_frame_of_stack(
+                self.data_source._current_frame
+            ):
                 # Initialize MIP array with same number of channels as the data
-                self.mip = np.ndarray(
+                self.mip = np.zeros(
                     (
                         int(self.data_source.shape_c),
                         int(self.data_source.shape_y),
                         int(self.data_source.shape_x),
-                    )
-                ).astype(np.uint16)
+                    ),
+                    dtype=np.uint16,
+                )
+                self.mip_frames = np.zeros(
+                    (int(self.data_source.shape_c), int(self.data_source.shape_z)),
+                    dtype=bool,
+                )
 
             # flip image if necessary
             if self.flip_flags["x"] and self.flip_flags["y"]:
@@ -246,7 +324,7 @@ class ImageWriter:
                 image = self.data_buffer[idx]
             # Save data to disk
             try:
-                start_time = time.time()
+                start = tracer.begin()
                 self.data_source.write(
                     image,
                     x=self.model.data_buffer_positions[idx][0],
@@ -255,16 +333,16 @@ class ImageWriter:
                     theta=self.model.data_buffer_positions[idx][3],
                     f=self.model.data_buffer_positions[idx][4],
                 )
-                logger.info(f"C: {c_idx}, Z:{z_idx}, T:{t_idx}, P:{p_idx}, Write Time:"
-                            f" {time.time() - start_time}")
+                tracer.end("image writer", start, idx)
+                self.raise_writer_errors()
 
                 # Update MIP
                 self.mip[c_idx, :, :] = np.maximum(self.mip[c_idx, :, :], image)
+                self.mip_frames[c_idx, z_idx] = True
 
                 # Save the MIP
-                if (c_idx == self.data_source.shape_c - 1) and (
-                    z_idx == self.data_source.shape_z - 1
-                ):
+                if self.mip_frames.all():
+                    self.mip_frames[:] = False
                     for c_save_idx in range(self.data_source.shape_c):
                         mip_name = (
                             "P"
@@ -276,10 +354,25 @@ class ImageWriter:
                             + str(t_idx).zfill(6)
                             + ".tif"
                         )
-                        imsave(
+                        self.save_mip(
+                            p_idx * self.data_source.shape_c + c_save_idx,
                             os.path.join(self.mip_directory, mip_name),
                             self.mip[c_save_idx, :, :],
                         )
+                        # the stage may already be moving to the next position
+                        if (
+                            self.overview_mosaic is not None
+                            and np.isfinite(self.overview_positions[p_idx]).all()
+                        ):
+                            self.overview_mosaic.add_tile(
+                                self.mip[c_save_idx, :, :],
+                                x=self.overview_positions[p_idx][0],
+                                y=self.overview_positions[p_idx][1],
+                                channel=c_save_idx,
+                            )
+                    if self.tile_registration is not None:
+                        # The channels share the stage position, register the first
+                        self.tile_registration.add_tile(p_idx, self.mip[0, :, :])
             except Exception as e:
                 from traceback import format_exc
 
@@ -320,10 +413,73 @@ class ImageWriter:
         self.current_time_point += 1
         return image_name
 
+    def save_mip(self, shard, file_name, mip):
+        """Save a maximum intensity projection.
+
+        Parameters
+        ----------
+        shard : int
+            Writer pool shard of the position and channel.
+        file_name : str
+            Path to file.
+        mip : np.ndarray
+            Maximum intensity projection image.
+        """
+        if self.writer_pool is None:
+            imsave(file_name, mip)
+        else:
+            self.writer_pool.submit(shard, imsave, file_name, mip)
+
+    def raise_writer_errors(self):
+        """Raise the first error of the writer workers, if any."""
+        if self.writer_pool is None:
+            return
+        errors = self.writer_pool.get_errors()
+        if errors:
+            raise errors[0]
+
     def close(self):
         """Close the data source we are writing to.
         """
+        self.finish_tile_registration()
         self.data_source.close()
+        if self.overview_mosaic is not None and self.overview_mosaic.tile_count > 0:
+            try:
+                self.overview_mosaic.save(
+                    os.path.join(self.mip_directory, "overview.ome.tif")
+                )
+            except OSError as e:
+                logger.error(f"Image Writer: Unable to save the overview mosaic. {e}")
+        if self.writer_pool is not None:
+            self.writer_pool.shutdown()
+            completed, submitted = self.writer_pool.progress
+            logger.info(
+                f"ImageWriter. {completed} of {submitted} writer tasks finished."
+            )
+            errors = self.writer_pool.get_errors()
+            if errors:
+                logger.error(f"Error - ImageWriter: {errors[0]}")
+                self.model.event_queue.put(
+                    ("warning", f"Error - ImageWriter: {errors[0]}")
+                )
+
+    def finish_tile_registration(self):
+        """Pass the translations found by tile registration to the metadata."""
+        if self.tile_registration is None:
+            return
+        saving = self.model.configuration["experiment"]["Saving"]
+        if not self.tile_registration.wait(
+            float(saving.get("registration_timeout", 60))
+        ):
+            logger.warning("Image Writer: Tile registration timed out.")
+        registered, total = self.tile_registration.progress
+        if registered > 0:
+            self.data_source.metadata.stitching_translations = (
+                self.tile_registration.solve()
+            )
+        logger.info(f"Image Writer: {registered} of {total} tile pairs registered.")
+        self.tile_registration.shutdown()
+        self.tile_registration = None
 
     def calculate_and_check_disk_space(self):
         """Estimate the size of the data that will be written to disk, and confirm
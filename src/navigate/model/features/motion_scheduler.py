@@ -0,0 +1,167 @@
+# Copyright (c) 2021-2024  The University of Texas Southwestern Medical Center.
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted for academic and research use only
+# (subject to the limitations in the disclaimer below)
+# provided that the following conditions are met:
+
+#      * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#      * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+
+#      * Neither the name of the copyright holders nor the names of its
+#      contributors may be used to endorse or promote products derived from this
+#      software without specific prior written permission.
+
+# NO EXPRESS OR IMPLIED LICENSES TO ANY PARTY'S PATENT RIGHTS ARE GRANTED BY
+# THIS LICENSE. THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+# PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+#  Standard Imports
+import logging
+import time
+from threading import Thread
+
+# Third Party Imports
+
+# Local imports
+
+# Logger Setup
+p = __name__.split(".")[1]
+logger = logging.getLogger(p)
+
+
+class MotionScheduler:
+    """Issue stage moves in the background and wait for them before the next trigger.
+
+    A move is started as soon as its target is known, e.g. right after the last
+    exposure of a stack, so that it runs concurrently with the camera readout and the
+    writing of the data. The caller only blocks in `wait()`, right before the next
+    frame is triggered. The duration of every move and the time the caller was blocked
+    by it are recorded.
+    """
+
+    def __init__(self, model):
+        """Initialize the MotionScheduler class.
+
+        Parameters
+        ----------
+        model : navigate.model.model.Model
+            Navigate Model class for controlling hardware/acquisition.
+        """
+        #: navigate.model.model.Model: The microscope model.
+        self.model = model
+
+        #: Thread: The thread running the current move.
+        self.move_thread = None
+
+        #: dict: The timing record of the current move.
+        self.current_move = None
+
+        #: list: The timing records of all the finished moves.
+        self.timings = []
+
+    def move(self, pos_dict):
+        """Start a move in the background.
+
+        Any pending move is completed first.
+
+        Parameters
+        ----------
+        pos_dict : dict
+            Dictionary of stage positions, e.g. {"x_abs": 0, "y_abs": 0}.
+        """
+        self.wait()
+        self.current_move = {
+            "target": dict(pos_dict),
+            "issued": time.perf_counter(),
+            "finished": None,
+            "success": False,
+        }
+        self.move_thread = Thread(
+            target=self._move, args=(self.current_move,), name="MotionScheduler"
+        )
+        self.move_thread.start()
+
+    def _move(self, record):
+        """Move the stage and record when the move finished.
+
+        Parameters
+        ----------
+        record : dict
+            The timing record of the move.
+        """
+        try:
+            record["success"] = self.model.move_stage(
+                record["target"], wait_until_done=True
+            )
+        except Exception as e:
+            logger.exception(f"MotionScheduler - Stage move failed: {e}")
+        record["finished"] = time.perf_counter()
+
+    def is_moving(self):
+        """Is there a move that has not been waited for?
+
+        Returns
+        -------
+        bool
+            True if a move was issued and `wait()` has not been called yet.
+        """
+        return self.move_thread is not None
+
+    def wait(self):
+        """Block until the pending move is finished.
+
+        Returns
+        -------
+        bool
+            Was the move successful? True if there was no pending move.
+        """
+        if self.move_thread is None:
+            return True
+        start = time.perf_counter()
+        self.move_thread.join()
+        end = time.perf_counter()
+        record = self.current_move
+        record["move_time"] = record["finished"] - record["issued"]
+        record["blocked_time"] = end - start
+        self.timings.append(record)
+        self.move_thread = None
+        self.current_move = None
+        logger.info(
+            f"MotionScheduler - Moved to {record['target']} in "
+            f"{record['move_time']:.4f} s, blocked for {record['blocked_time']:.4f} s."
+        )
+        return record["success"]
+
+    def summary(self):
+        """Summarize the timing of all the finished moves.
+
+        Returns
+        -------
+        dict
+            The number of moves, the total move time, the total time spent blocked,
+            and the move time hidden behind other work, in seconds.
+        """
+        return {
+            "moves": len(self.timings),
+            "move_time": sum(record["move_time"] for record in self.timings),
+            "blocked_time": sum(record["blocked_time"] for record in self.timings),
+            "overlapped_time": sum(
+                max(record["move_time"] - record["blocked_time"], 0)
+                for record in self.timings
+            ),
+        }
@@ -31,13 +31,14 @@
 #
 
 # Standard Library Imports
-from math import ceil
+from math import ceil, isfinite
 from queue import Queue
 
 # Third Party Imports
 
 # Local Imports
 from navigate.model.analysis.boundary_detect import find_tissue_boundary_2d
+from navigate.tools.multipos_table_tools import positions_to_array
 
 
 def detect_tissue(image_data, percentage=0.0):
@@ -526,3 +527,80 @@ class RemoveEmptyPositions:
 
         self.model.event_queue.put(("remove_positions", self.position_records))
         return True
+
+
+class RemoveEmptyPositionsInOverview:
+    """Remove Empty Positions using the Overview Mosaic.
+
+    This class detects tissue at each position of the multi-position table in the
+    overview mosaic of the last multi-position acquisition, instead of imaging each
+    position again, and removes the positions without tissue.
+    """
+
+    def __init__(self, model, percentage=0.75, channel=0, detect_func=None):
+        """Initialize the RemoveEmptyPositionsInOverview class.
+
+        Parameters:
+        -----------
+        model : object
+            The model object representing the microscope.
+        percentage : float, optional
+            The minimum percentage of tissue required to consider a position as having
+            tissue. Default is 0.75 (75%).
+        channel : int, optional
+            The channel of the overview mosaic to analyze. Default is 0.
+        detect_func : function, optional
+            The custom tissue detection function to use. If not specified, the default
+            `detect_tissue` function will be used.
+        """
+
+        #: navigate.model.Model: The model object representing the microscope.
+        self.model = model
+
+        #: float: The minimum percentage of tissue required to consider a position as
+        # having tissue.
+        self.percentage = float(percentage)
+
+        #: int: The channel of the overview mosaic to analyze.
+        self.channel = int(channel)
+
+        #: function: The tissue detection function used to analyze the overview.
+        self.detect_func = detect_tissue if detect_func is None else detect_func
+
+        #: list: A list of flags, True if tissue was detected at a position.
+        self.position_records = []
+
+        #: dict: A dictionary specifying the configuration for signal and data
+        # functions.
+        self.config_table = {"signal": {"main": self.signal_func}}
+
+    def signal_func(self):
+        """Main signal processing function to remove empty positions.
+
+        Positions that are not in the overview mosaic are kept.
+
+        Returns:
+        --------
+        bool
+            False if there is no overview mosaic, True otherwise.
+        """
+        mosaic = self.model.overview_mosaic
+        if mosaic is None:
+            self.model.logger.debug("No overview mosaic to detect tissue in.")
+            return False
+
+        positions = positions_to_array(
+            self.model.configuration["experiment"]["MultiPositions"]
+        )
+        self.position_records = []
+        for x, y in positions[:, :2]:
+            if not (isfinite(x) and isfinite(y)):
+                self.position_records.append(True)
+                continue
+            image = mosaic.get_tile(x, y, self.channel)
+            self.position_records.append(
+                image is None or bool(self.detect_func(image, self.percentage))
+            )
+
+        self.model.event_queue.put(("remove_positions", self.position_records))
+        return True
@@ -39,6 +39,9 @@ import json
 from io import BytesIO
 from math import ceil
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import shared_memory
 
 # Third Party Imports
 
@@ -74,10 +77,122 @@ def prepare_service(service_url, **kwargs):
     return None
 
 
+class IlastikClient:
+    """Client of the Ilastik segmentation service.
+
+    Keeps one HTTP session open for all requests. Frames are sent in one of three
+    ways:
+
+    - "json": base64-encoded frames in a JSON body.
+    - "binary": the raw bytes of the frames as an application/octet-stream body,
+      with the dtype and shape in the X-Dtype and X-Shape headers.
+    - "shared_memory": the frames are copied to a shared memory block whose name is
+      posted to the service. Only works with a service on the same machine.
+
+    The service answers with the segmentation masks as an npz file.
+    """
+
+    #: tuple: Supported ways of transferring frames
+    TRANSFER_MODES = ("json", "binary", "shared_memory")
+
+    def __init__(self, service_url, transfer="binary"):
+        """Initialize the Ilastik client.
+
+        Parameters
+        ----------
+        service_url : str
+            url of the service
+        transfer : str
+            How the frames are sent, one of TRANSFER_MODES.
+        """
+        if transfer not in self.TRANSFER_MODES:
+            raise ValueError(f"Unknown Ilastik transfer mode: {transfer}")
+
+        #: str: url of the segmentation endpoint
+        self.segmentation_url = f"{service_url.rstrip('/')}/segmentation"
+
+        #: str: How the frames are sent
+        self.transfer = transfer
+
+        #: requests.Session: Persistent connection to the service
+        self.session = requests.Session()
+
+    def segment(self, images):
+        """Segment a batch of images.
+
+        Parameters
+        ----------
+        images : numpy.ndarray
+            (n, height, width) stack of images
+
+        Returns
+        -------
+        list or None
+            Segmentation mask of each image, None if the request failed.
+        """
+        images = numpy.ascontiguousarray(images)
+        shm = None
+        try:
+            if self.transfer == "binary":
+                response = self.session.post(
+                    self.segmentation_url,
+                    data=images.data.cast("B"),
+                    headers={
+                        "Content-Type": "application/octet-stream",
+                        "X-Dtype": str(images.dtype),
+                        "X-Shape": ",".join(str(n) for n in images.shape),
+                    },
+                    stream=True,
+                )
+            elif self.transfer == "shared_memory":
+                shm = shared_memory.SharedMemory(create=True, size=images.nbytes)
+                numpy.ndarray(images.shape, images.dtype, buffer=shm.buf)[:] = images
+                response = self.session.post(
+                    self.segmentation_url,
+                    json={
+                        "dtype": str(images.dtype),
+                        "shape": images.shape,
+                        "shared_memory": shm.name,
+                    },
+                    stream=True,
+                )
+            else:
+                response = self.session.post(
+                    self.segmentation_url,
+                    json={
+                        "dtype": str(images.dtype),
+                        "shape": images.shape[1:],
+                        "image": [
+                            base64.b64encode(img).decode("utf-8") for img in images
+                        ],
+                    },
+                    stream=True,
+                )
+        except requests.RequestException as e:
+            logger.error(f"Ilastik segmentation request failed: {e}")
+            return None
+        finally:
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+
+        if response.status_code != 200:
+            logger.error(f"Ilastik segmentation failed: {response.status_code}")
+            return None
+        # segmentation_mask is a dictionary like object with keys 'arr_0', 'arr_1'...
+        segmentation_mask = numpy.load(BytesIO(response.raw.read()))
+        return [segmentation_mask[f"arr_{i}"] for i in range(len(segmentation_mask))]
+
+    def close(self):
+        """Close the connection to the service."""
+        self.session.close()
+
+
 class IlastikSegmentation:
     """Ilastik segmentation class.
 
-    Uses Ilastik REST API to perform segmentation in a separate process.
+    Uses Ilastik REST API to perform segmentation in a separate process. Requests
+    are sent from a worker pool, so the data thread only copies the frames.
     """
 
     def __init__(self, model, microscope_name="Nanoscale", zoom_value="N/A"):
@@ -92,8 +207,40 @@ class IlastikSegmentation:
         #: navigate.model.Model: Model object
         self.model = model
 
+        ilastik_config = self.model.configuration["rest_api_config"]["Ilastik"]
+
         #: str: url of the service
-        self.service_url = self.model.configuration["rest_api_config"]["Ilastik"]["url"]
+        self.service_url = ilastik_config["url"]
+
+        #: str: How frames are sent to the service
+        self.transfer = ilastik_config.get("transfer", "json")
+
+        #: int: Number of frames sent per request
+        self.batch_size = max(int(ilastik_config.get("batch_size", 1)), 1)
+
+        #: int: Frames are downsampled by this factor before they are sent
+        self.downsample = max(int(ilastik_config.get("downsample", 1)), 1)
+
+        #: int: Number of requests in flight at the same time
+        self.max_workers = max(int(ilastik_config.get("max_workers", 1)), 1)
+
+        #: IlastikClient: Client of the service
+        self.client = None
+
+        #: ThreadPoolExecutor: Sends the requests off the data thread
+        self.executor = None
+
+        #: threading.BoundedSemaphore: Limits the number of queued batches
+        self.pending_batches = threading.BoundedSemaphore(2 * self.max_workers)
+
+        #: list: Frames waiting to be sent
+        self.pending_frames = []
+
+        #: list: Stage positions (x, y, z, theta, f) of the frames waiting to be sent
+        self.pending_positions = []
+
+        #: list: Futures of the submitted batches
+        self.futures = []
 
         #: str: project file for Ilastik segmentation
         self.project_file = None
@@ -117,7 +264,13 @@ class IlastikSegmentation:
         self.high_res_zoom_value = zoom_value
 
         #: dict: configuration table
-        self.config_table = {"data": {"init": self.init_func, "main": self.data_func}}
+        self.config_table = {
+            "data": {
+                "init": self.init_func,
+                "main": self.data_func,
+                "cleanup": self.cleanup_func,
+            }
+        }
 
     def init_func(self, *args):
         """Initialize Ilastik segmentation.
@@ -140,38 +293,116 @@ class IlastikSegmentation:
     def data_func(self, frame_ids):
         """Perform Ilastik segmentation.
 
+        The frames are copied, downsampled and queued. Full batches are segmented
+        asynchronously.
+
         Parameters
         ----------
         frame_ids : list
             list of frame ids
         """
-        # Ilastik process multiple images in sequence.
-        img_data = [base64.b64encode(self.model.data_buffer[idx]) for idx in frame_ids]
-        json_data = {
-            "dtype": "uint16",
-            "shape": (self.model.img_height, self.model.img_width),
-            "image": [img.decode("utf-8") for img in img_data],
-        }
+        d = self.downsample
+        for idx in frame_ids:
+            # copy, the data buffer is reused by the camera
+            self.pending_frames.append(
+                numpy.array(self.model.data_buffer[idx][::d, ::d])
+            )
+            # the stage may have moved on by the time the mask is ready
+            self.pending_positions.append(list(self.model.data_buffer_positions[idx]))
+        if len(self.pending_frames) >= self.batch_size:
+            self.submit()
 
-        response = requests.post(
-            f"{self.service_url}/segmentation", json=json_data, stream=True
-        )
-        if response.status_code == 200:
-            # segmentation_mask is a dictionary like object with keys 'arr_0',
-            # 'arr_1'...
-            segmentation_mask = numpy.load(BytesIO(response.raw.read()))
-            # display segmentation
-            for idx in range(len(segmentation_mask)):
-                segmentation_id = "arr_{}".format(idx)
-                if self.model.display_ilastik_segmentation:
-                    self.model.event_queue.put(
-                        ("ilastik_mask", segmentation_mask[segmentation_id])
-                    )
-                # mark position
-                if self.model.mark_ilastik_position:
-                    self.mark_position(segmentation_mask[segmentation_id])
-        else:
+    def submit(self):
+        """Send the queued frames to the service.
+
+        Blocks while too many batches are in flight, so a slow service cannot
+        exhaust the memory.
+        """
+        if not self.pending_frames:
+            return
+        if self.executor is None:
+            self.client = IlastikClient(self.service_url, self.transfer)
+            self.executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="Ilastik"
+            )
+        images = numpy.stack(self.pending_frames)
+        positions = self.pending_positions
+        self.pending_frames = []
+        self.pending_positions = []
+        self.pending_batches.acquire()
+        finished = [future for future in self.futures if future.done()]
+        self.futures = [future for future in self.futures if not future.done()]
+        self.log_errors(finished)
+        self.futures.append(self.executor.submit(self.segment, images, positions))
+
+    @staticmethod
+    def log_errors(futures):
+        """Log the errors raised by finished segmentation requests.
+
+        Parameters
+        ----------
+        futures : list
+            Finished futures of submitted batches
+        """
+        for future in futures:
+            if future.cancelled():
+                continue
+            error = future.exception()
+            if error is not None:
+                logger.error(f"Ilastik segmentation failed: {error}")
+
+    def segment(self, images, positions):
+        """Segment a batch of images and use the masks.
+
+        Runs in the worker pool. The masks are sent to the display and, if asked,
+        used to mark the positions of the targets.
+
+        Parameters
+        ----------
+        images : numpy.ndarray
+            (n, height, width) stack of images
+        positions : list
+            Stage positions (x, y, z, theta, f) of the images
+        """
+        try:
+            masks = self.client.segment(images)
+        finally:
+            self.pending_batches.release()
+        if masks is None:
             print("There is something wrong!")
+            return
+        for mask, position in zip(masks, positions):
+            # display segmentation
+            if self.model.display_ilastik_segmentation:
+                self.model.event_queue.put(("ilastik_mask", mask))
+            # mark position
+            if self.model.mark_ilastik_position:
+                self.mark_position(mask, position)
+
+    def wait(self, timeout=None):
+        """Send the queued frames and wait for all the segmentations to finish.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            Longest time to wait for each batch (s).
+        """
+        self.submit()
+        for future in self.futures:
+            future.result(timeout)
+        self.futures = []
+
+    def cleanup_func(self):
+        """Send the remaining frames, wait for them and stop the worker pool."""
+        self.submit()
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+        self.log_errors(self.futures)
+        self.futures = []
+        if self.client is not None:
+            self.client.close()
+            self.client = None
 
     def update_setting(self):
         """Update Ilastik segmentation settings."""
@@ -208,8 +439,8 @@ class IlastikSegmentation:
 
         #: float: position step size
         self.posistion_step_size = self.pieces_size * pixel_size
-        # calculate corner (x,y)
-        curr_fov_x = (
+        #: float: field of view in x
+        self.fov_x = (
             float(
                 self.model.configuration["experiment"]["CameraParameters"][
                     self.model.active_microscope_name
@@ -217,7 +448,8 @@ class IlastikSegmentation:
             )
             * curr_pixel_size
         )
-        curr_fov_y = (
+        #: float: field of view in y
+        self.fov_y = (
             float(
                 self.model.configuration["experiment"]["CameraParameters"][
                     self.model.active_microscope_name
@@ -226,49 +458,41 @@ class IlastikSegmentation:
             * curr_pixel_size
         )
 
-        #: float: x start position
-        self.x_start = (
-            float(self.model.configuration["experiment"]["StageParameters"]["x"])
-            - curr_fov_x / 2
-        )
-
-        #: float: y start position
-        self.y_start = (
-            float(self.model.configuration["experiment"]["StageParameters"]["y"])
-            - curr_fov_y / 2
-        )
-
-    def mark_position(self, mask):
+    def mark_position(self, mask, position):
         """Mark position based on the segmentation mask.
 
         Parameters
         ----------
         mask : numpy.ndarray
             segmentation mask
+        position : list
+            Stage position (x, y, z, theta, f) of the segmented frame
         """
 
         # target_label = self.model.ilastik_target
         target_label = self.model.ilastik_target_labels
-        lx, rx = 0, self.pieces_size
-        # get current z, theta, focus
+        # size of a piece in the (downsampled) mask
+        piece = ceil(self.pieces_size / self.downsample)
+        lx, rx = 0, piece
+        # z, theta, focus of the frame
         # TODO: are they same as high resolution?
-        z = self.model.configuration["experiment"]["StageParameters"]["z"]
-        theta = self.model.configuration["experiment"]["StageParameters"]["theta"]
-        f = self.model.configuration["experiment"]["StageParameters"]["f"]
-        pos_x, pos_y = self.x_start, self.y_start
+        x, y, z, theta, f = position
+        # corner (x, y) of the frame
+        y_start = float(y) - self.fov_y / 2
+        pos_x, pos_y = float(x) - self.fov_x / 2, y_start
         table_values = []
         for i in range(self.pieces_num):
-            ly, ry = 0, self.pieces_size
+            ly, ry = 0, piece
             for j in range(self.pieces_num):
                 for k in target_label:
                     if numpy.any(mask[lx:rx, ly:ry, 0] == k):
                         table_values.append([pos_x, pos_y, z, theta, f])
                         break
                 pos_y += self.posistion_step_size
-                ly += self.pieces_size
-                ry += self.pieces_size
-            lx += self.pieces_size
-            rx += self.pieces_size
+                ly += piece
+                ry += piece
+            lx += piece
+            rx += piece
             pos_x += self.posistion_step_size
-            pos_y = self.y_start
+            pos_y = y_start
         self.model.event_queue.put(("multiposition", table_values))
@@ -47,6 +47,9 @@ from navigate.tools.linear_algebra import affine_rotation, affine_shear
 p = __name__.split(".")[1]
 logger = logging.getLogger(p)
 
+#: tuple: Stage axes, in the column order of stage position arrays.
+STAGE_AXES = ("x", "y", "z", "theta", "f")
+
 
 class BigDataViewerMetadata(XMLMetadata):
     """Metadata for BigDataViewer files.
@@ -90,6 +93,14 @@ class BigDataViewerMetadata(XMLMetadata):
         #: npt.NDArray: Rotation transform matrix.
         self.rotate_transform = np.eye(3, 4)
 
+        #: npt.NDArray: Translation (x, y) of each position found by tile
+        # registration, in microns.
+        self.stitching_translations = None
+
+        #: tuple: Stage axes along the columns and the rows of the images, as
+        # placed by stage_positions_to_translations().
+        self.image_axes = ("y", "x")
+
     def get_affine_parameters(self, configuration):
         """Get the affine transform parameters from the configuration file.
 
@@ -116,7 +127,7 @@ class BigDataViewerMetadata(XMLMetadata):
             self.rotate_angle_z = bdv_configuration["rotate"].get("Z", 0)
 
     def bdv_xml_dict(
-        self, file_name: Union[str, list, None], views: list, **kw
+        self, file_name: Union[str, list, None], views: Union[list, npt.ArrayLike], **kw
     ) -> dict:
         """Create a BigDataViewer XML dictionary from a list of views.
 
@@ -124,8 +135,9 @@ class BigDataViewerMetadata(XMLMetadata):
         ----------
         file_name : str
             The file name of the file to be written.
-        views : list
-            A list of dictionaries containing metadata for each view.
+        views : Union[list, npt.ArrayLike]
+            A list of dictionaries containing metadata for each view, or an (N, 5)
+            array of (x, y, z, theta, f) stage positions.
         **kw
             Additional keyword arguments.
 
@@ -226,9 +238,10 @@ class BigDataViewerMetadata(XMLMetadata):
                 bdv_dict["SequenceDescription"]["ViewSetups"]["ViewSetup"].append(d)
                 view_id += 1
         # Finish up the Tile Attributes outside of the channels loop so we have
-        # one per tile
+        # one per tile. Tiles are named by their multi-position table index.
+        position_indices = self.position_indices
         for p in range(self.positions):
-            tile = {"id": {"text": str(p)}, "name": {"text": str(p)}}
+            tile = {"id": {"text": str(p)}, "name": {"text": str(position_indices[p])}}
             bdv_dict["SequenceDescription"]["ViewSetups"]["Attributes"][2][
                 "Tile"
             ].append(tile)
@@ -241,82 +254,215 @@ class BigDataViewerMetadata(XMLMetadata):
         }
 
         # View registrations
-        bdv_dict["ViewRegistrations"] = {"ViewRegistration": []}
-        for t in range(self.shape_t):
-            for p in range(self.positions):
-                for c in range(self.shape_c):
-                    view_id = c * self.positions + p
-                    mat = np.zeros((3, 4), dtype=float)
-                    for z in range(self.shape_z):
-                        matrix_id = (
-                            z
-                            + self.shape_z * c
-                            + p * self.shape_c * self.shape_z
-                            + t * self.shape_c * self.shape_z * self.positions
-                        )
-
-                        # Construct centroid of volume matrix
-                        # print(matrix_id, views[matrix_id])
-                        try:
-                            mat += (
-                                self.stage_positions_to_affine_matrix(
-                                    **views[matrix_id]
-                                )
-                                / self.shape_z
-                            )
-                        except IndexError:
-                            # We have most likely canceled in the middle of
-                            # an acquisition.
-                            pass
-
-                    view_transforms = [
-                        {
-                            "type": "affine",
-                            "Name": "Translation to Regular Grid",
-                            "affine": {
-                                "text": " ".join([f"{x:.6f}" for x in mat.ravel()])
-                            },
-                        }
-                    ]
-
-                    if self.shear_data:
-                        view_transforms.append(
-                            {
-                                "type": "affine",
-                                "Name": "Shearing Transform",
-                                "affine": {
-                                    "text": " ".join(
-                                        [
-                                            f"{x:.6f}"
-                                            for x in self.shear_transform.ravel()
-                                        ]
-                                    )
-                                },
-                            }
-                        )
-
-                    if self.rotate_data:
-                        view_transforms.append(
-                            {
-                                "type": "affine",
-                                "Name": "Rotation Transform",
-                                "affine": {
-                                    "text": " ".join(
-                                        [
-                                            f"{x:.6f}"
-                                            for x in self.rotate_transform.ravel()
-                                        ]
-                                    )
-                                },
-                            }
-                        )
-
-                    d = dict(timepoint=t, setup=view_id, ViewTransform=view_transforms)
-
-                    bdv_dict["ViewRegistrations"]["ViewRegistration"].append(d)
+        bdv_dict["ViewRegistrations"] = {
+            "ViewRegistration": self.bdv_view_registrations(views)
+        }
 
         return bdv_dict
 
+    def bdv_view_registrations(self, views: Union[list, npt.ArrayLike]) -> list:
+        """Create the ViewRegistration entries of a BigDataViewer XML.
+
+        Each view (timepoint, position, channel) is registered at the average
+        affine matrix of its z-planes. Views missing planes, e.g. because the
+        acquisition was canceled, average only over the planes acquired.
+
+        Parameters
+        ----------
+        views : Union[list, npt.ArrayLike]
+            A list of dictionaries containing the stage positions of each frame, or
+            an (N, 5) array of (x, y, z, theta, f) stage positions.
+
+        Returns
+        -------
+        list
+            A list of ViewRegistration dictionaries, ordered by timepoint,
+            position and channel.
+        """
+        positions = self.views_to_stage_positions(views)
+        n_views = self.shape_t * self.positions * self.shape_c
+        n_frames = n_views * self.shape_z
+        n_acquired = min(len(positions), n_frames)
+
+        # Frames are ordered (t, p, c, z). Pad missing frames with zeros so they
+        # add nothing to the average.
+        translations = np.zeros((n_frames, 3), dtype=float)
+        translations[:n_acquired] = self.stage_positions_to_translations(
+            positions[:n_acquired]
+        )
+        translations = translations.reshape(n_views, self.shape_z, 3)
+        acquired = (np.arange(n_frames) < n_acquired).reshape(n_views, self.shape_z)
+
+        # Accumulate plane by plane to match summing the per-plane matrices
+        diagonal = np.zeros(n_views, dtype=float)
+        mean_translations = np.zeros((n_views, 3), dtype=float)
+        for z in range(self.shape_z):
+            diagonal += acquired[:, z] / self.shape_z
+            mean_translations += translations[:, z] / self.shape_z
+
+        mats = np.zeros((n_views, 3, 4), dtype=float)
+        mats[:, [0, 1, 2], [0, 1, 2]] = diagonal[:, None]
+        mats[:, :, 3] = mean_translations
+
+        affine_format = " ".join(["%.6f"] * 12)
+        extra_transforms = []
+        if self.shear_data:
+            extra_transforms.append(
+                {
+                    "type": "affine",
+                    "Name": "Shearing Transform",
+                    "affine": {
+                        "text": affine_format % tuple(self.shear_transform.ravel())
+                    },
+                }
+            )
+        if self.rotate_data:
+            extra_transforms.append(
+                {
+                    "type": "affine",
+                    "Name": "Rotation Transform",
+                    "affine": {
+                        "text": affine_format % tuple(self.rotate_transform.ravel())
+                    },
+                }
+            )
+
+        stitching_transforms = None
+        if self.stitching_translations is not None:
+            # Translation in pixels, in the same order as the grid translation
+            translations = np.asarray(self.stitching_translations, dtype=float)
+            stitching_transforms = np.zeros((self.positions, 3, 4), dtype=float)
+            stitching_transforms[:, [0, 1, 2], [0, 1, 2]] = 1
+            stitching_transforms[: len(translations), 0, 3] = (
+                translations[: self.positions, 1] / self.dy
+            )
+            stitching_transforms[: len(translations), 1, 3] = (
+                translations[: self.positions, 0] / self.dx
+            )
+
+        view_registrations = []
+        setups = (
+            np.arange(self.shape_c)[None, :] * self.positions
+            + np.arange(self.positions)[:, None]
+        ).ravel()
+        for i, mat in enumerate(mats.reshape(n_views, 12).tolist()):
+            t, setup = divmod(i, self.positions * self.shape_c)
+            view_transforms = [
+                {
+                    "type": "affine",
+                    "Name": "Translation to Regular Grid",
+                    "affine": {"text": affine_format % tuple(mat)},
+                }
+            ] + extra_transforms
+            if stitching_transforms is not None:
+                # Applied last, in the space of the grid
+                mat = stitching_transforms[setup // self.shape_c].ravel()
+                view_transforms.insert(
+                    0,
+                    {
+                        "type": "affine",
+                        "Name": "Stitching Transform",
+                        "affine": {"text": affine_format % tuple(mat)},
+                    },
+                )
+            view_registrations.append(
+                dict(
+                    timepoint=t,
+                    setup=int(setups[setup]),
+                    ViewTransform=view_transforms,
+                )
+            )
+
+        return view_registrations
+
+    @staticmethod
+    def views_to_stage_positions(views: Union[list, npt.ArrayLike]) -> npt.NDArray:
+        """Gather the stage positions of each frame into an array.
+
+        Parameters
+        ----------
+        views : Union[list, npt.ArrayLike]
+            A list of dictionaries with keys x, y, z, theta and f, or an array of
+            stage positions.
+
+        Returns
+        -------
+        npt.NDArray
+            An (N, 5) array of (x, y, z, theta, f) stage positions. Missing focus
+            positions are NaN.
+        """
+        if isinstance(views, np.ndarray):
+            return views.reshape(-1, 5).astype(float, copy=False)
+        positions = np.empty((len(views), 5), dtype=float)
+        for i, axis in enumerate(STAGE_AXES):
+            positions[:, i] = np.array(
+                [view.get(axis, None) for view in views], dtype=float
+            )
+        return positions
+
+    def stage_positions_to_translations(self, positions: npt.ArrayLike) -> npt.NDArray:
+        """Convert an (N, 5) array of stage positions to pixel translations.
+
+        Batch equivalent of the translation column of
+        stage_positions_to_affine_matrix().
+
+        Parameters
+        ----------
+        positions : npt.ArrayLike
+            An (N, 5) array of (x, y, z, theta, f) stage positions.
+
+        Returns
+        -------
+        npt.NDArray
+            An (N, 3) array of (y, x, z) translations in pixels.
+        """
+        positions = np.asarray(positions, dtype=float).reshape(-1, 5)
+        translations = np.empty((positions.shape[0], 3), dtype=float)
+        translations[:, 0] = positions[:, 1] / self.dy
+        translations[:, 1] = positions[:, 0] / self.dx
+        translations[:, 2] = positions[:, 2] / self.dz
+
+        # Allow additional axes (e.g. f) to couple onto existing axes (e.g. z)
+        # if they are both moving along the same physical dimension
+        if self._coupled_axes is not None:
+            for leader, follower in self._coupled_axes.items():
+                column = {"y": 0, "x": 1, "z": 2}.get(leader.lower())
+                if column is None:
+                    print(
+                        f"Unrecognized coupled axis {leader}. "
+                        "Not gonna do anything with this."
+                    )
+                    continue
+                step = (self.dy, self.dx, self.dz)[column]
+                translations[:, column] += (
+                    positions[:, STAGE_AXES.index(follower.lower())] / step
+                )
+
+        return translations
+
+    def stage_positions_to_affine_matrices(
+        self, positions: npt.ArrayLike
+    ) -> npt.NDArray:
+        """Convert an (N, 5) array of stage positions to affine matrices.
+
+        Batch equivalent of stage_positions_to_affine_matrix().
+
+        Parameters
+        ----------
+        positions : npt.ArrayLike
+            An (N, 5) array of (x, y, z, theta, f) stage positions.
+
+        Returns
+        -------
+        npt.NDArray
+            An (N, 3, 4) array of affine matrices.
+        """
+        translations = self.stage_positions_to_translations(positions)
+        arr = np.zeros((translations.shape[0], 3, 4), dtype=float)
+        arr[:, [0, 1, 2], [0, 1, 2]] = 1
+        arr[:, :, 3] = translations
+        return arr
+
     def stage_positions_to_affine_matrix(
         self, x: float, y: float, z: float, theta: float, f: Optional[float] = None
     ) -> npt.ArrayLike:
@@ -457,7 +603,7 @@ class BigDataViewerMetadata(XMLMetadata):
 
         # Parse the file path
         base_path = root.find("BasePath")
-        file = root.find("SequenceDescription/ImageLoader/hdf5")
+        file = image_loader.find(image_loader.attrib["format"].split(".")[-1])
         file_path = os.path.join(base_path.text, file.text)
 
         # Get setups. Each setup represents a visualisation data source in the viewer
@@ -77,6 +77,7 @@ class Metadata:
         self._per_stack = True
         self._multiposition = False
         self._coupled_axes = None
+        self._channel_orders = None
 
         #: int: Shape of the data in x
         #: int: Shape of the data in y
@@ -238,6 +239,57 @@ class Metadata:
             state["stack_cycling_mode"] == "per_stack"
             and state["image_mode"] != "single"
         )
+        # Channels may be acquired out of table order in per-z stack cycling
+        orders = state.get("channel_acquisition_order", None)
+        if orders and not self._per_stack:
+            self._channel_orders = [list(order) for order in orders]
+        else:
+            self._channel_orders = None
+
+    def channel_index(self, c: int, z: int) -> int:
+        """Return the table index of a channel acquired out of order
+
+        Parameters
+        ----------
+        c : int
+            Position of the channel in the acquisition order of the plane
+        z : int
+            Index of the plane
+
+        Returns
+        -------
+        int
+            Index of the channel among the selected channels, in table order
+        """
+        if self._channel_orders is None:
+            return c
+        order = self._channel_orders[z % len(self._channel_orders)]
+        if len(order) != self.shape_c:
+            return c
+        return order[c]
+
+    @property
+    def position_indices(self) -> list:
+        """Return the multi-position table index of each acquired position
+
+        Positions are acquired in table order unless a feature reordered them, in
+        which case the original table indices are stored in the experiment.
+
+        Returns
+        -------
+        list
+            Original table index of each position
+        """
+        indices = None
+        if self.configuration is not None and self._multiposition:
+            experiment = self.configuration.get("experiment")
+            if experiment is not None:
+                indices = experiment["MicroscopeState"].get(
+                    "multiposition_original_indices", None
+                )
+        if indices is None or len(indices) != self.positions:
+            return list(range(self.positions))
+        return list(indices)
 
     @property
     def voxel_size(self) -> tuple:
@@ -300,38 +352,61 @@ class XMLMetadata(Metadata):
         )
         # TODO: should os.path.basename be the default? Added this for BigDataViewer's
         # relative path.
-        xml += self.to_xml(file_type, root, file_name=os.path.basename(file_name), **kw)
+        d = self.to_xml_dict(file_type, file_name=os.path.basename(file_name), **kw)
         file_name = os.path.splitext(file_name)[0] + ".xml"
         with open(file_name, "w") as fp:
             fp.write(xml)
+            if d is not None:
+                # Stream the document rather than building one large string
+                fp.writelines(xml_tools.iter_xml(d, root))
 
-    def to_xml(self, file_type: str, root: Optional[str] = None, **kw) -> str:
+    def to_xml_dict(self, file_type: str, **kw) -> Optional[dict]:
         """
-        Convert stored metadata to XML
+        Convert stored metadata to a nested dictionary for XML export
 
         Parameters
         ----------
         file_type : str
             File type
-        root : Optional[str]
-            Root, by default None
         **kw
             Keyword arguments
 
         Returns
         -------
-        str
-            XML string
+        Optional[dict]
+            Nested metadata dictionary, None if file_type is not supported
         """
-        xml = ""
         try:
-            d = getattr(
+            return getattr(
                 self, f"{file_type.lower().replace(' ','_').replace('-','_')}_xml_dict"
             )(**kw)
-            xml = xml_tools.dict_to_xml(d, root)
         except AttributeError:
             logging.debug(
                 f"Metadata Writer - I do not know how to export {file_type} "
                 f"metadata to XML."
             )
+        return None
+
+    def to_xml(self, file_type: str, root: Optional[str] = None, **kw) -> str:
+        """
+        Convert stored metadata to XML
+
+        Parameters
+        ----------
+        file_type : str
+            File type
+        root : Optional[str]
+            Root, by default None
+        **kw
+            Keyword arguments
+
+        Returns
+        -------
+        str
+            XML string
+        """
+        xml = ""
+        d = self.to_xml_dict(file_type, **kw)
+        if d is not None:
+            xml = xml_tools.dict_to_xml(d, root)
         return xml
@@ -49,6 +49,18 @@ logger = logging.getLogger(p)
 class OMEZarrMetadata(Metadata):
     """Class to generate OME-Zarr metadata."""
 
+    def __init__(self) -> None:
+        """Initialize the OME-Zarr metadata object."""
+        super().__init__()
+
+        #: npt.NDArray: Translation (x, y) of each position found by tile
+        # registration, in microns.
+        self.stitching_translations = None
+
+        #: tuple: Stage axes along the columns and the rows of the images, as
+        # placed by _stage_positions_to_translation_transform().
+        self.image_axes = ("x", "y")
+
     @property
     def _axes(self) -> Dict:
         """Return tczyx axes in navigate units.
@@ -228,3 +240,29 @@ class OMEZarrMetadata(Metadata):
             )
 
         return d
+
+    def stitch_multiscales(self, multiscales: List[Dict]) -> List[Dict]:
+        """Add the tile registration translations to the multiscales metadata.
+
+        Parameters
+        ----------
+        multiscales : List[Dict]
+            Multiscales metadata, one entry per position, as made by
+            multiscales_dict().
+
+        Returns
+        -------
+        List[Dict]
+            Multiscales metadata with refined translations.
+        """
+        if self.stitching_translations is None:
+            return multiscales
+        for scale, (x, y) in zip(multiscales, self.stitching_translations):
+            for transformation in scale.get("coordinateTransformations", []):
+                if transformation["type"] == "translation":
+                    # t, c, z, y, x
+                    translation = list(transformation["translation"])
+                    translation[-2] += float(y)
+                    translation[-1] += float(x)
+                    transformation["translation"] = translation
+        return multiscales
@@ -34,11 +34,13 @@ import logging
 import importlib  # noqa: F401
 from multiprocessing.managers import ListProxy
 import reprlib
+import time
 from typing import Any, Dict
 
 # Third-party imports
 
 # Local application imports
+from navigate.model.channel_scheduler import ChannelScheduler
 from navigate.model.device_startup_functions import start_stage
 from navigate.tools.common_functions import build_ref_name
 
@@ -126,6 +128,26 @@ class Microscope:
         #: list: List of available channels.
         self.available_channels = None
 
+        #: list: Channel orders, plane z is imaged in the order
+        #: channel_orders[z % len(channel_orders)].
+        self.channel_orders = None
+
+        #: int: Number of planes after which the channel orders start over.
+        self.channel_cycle_planes = 1
+
+        #: int: Number of times the channels have been cycled through.
+        self.channel_cycle = 0
+
+        #: ChannelScheduler: Estimates channel switch times and plans the order.
+        self.channel_scheduler = None
+
+        #: dict: Channel settings sent to the devices, to skip redundant commands.
+        self.channel_settings = {}
+
+        #: dict: Number of channel switches, and their expected and actual duration.
+        self.channel_switch_statistics = {}
+        self.reset_channel_switch_statistics()
+
         #: int: Number of images.
         self.number_of_frames = None
 
@@ -135,6 +157,9 @@ class Microscope:
         #: Bool: Is a synthetic microscope.
         self.is_synthetic = is_synthetic
 
+        #: Bool: Is a virtual microscope.
+        self.is_virtual = is_virtual
+
         #: list: List of laser wavelengths.
         self.laser_wavelength = []
 
@@ -356,6 +381,9 @@ class Microscope:
         # connect daq and camera in synthetic mode
         if is_synthetic and self.daq is not None:
             self.daq.add_camera(self.microscope_name, self.camera)
+        # the synthetic camera renders its phantom at the stage position
+        if hasattr(self.camera, "stage_position_source"):
+            self.camera.stage_position_source = self.get_stage_position
 
     def update_data_buffer(self, data_buffer, number_of_frames):
         """Update the data buffer for the camera.
@@ -438,6 +466,8 @@ class Microscope:
                 filter(lambda k: self.channels[k]["is_selected"], self.channels.keys()),
             )
         )
+        self.schedule_channels()
+        self.reset_channel_switch_statistics()
         if self.camera.is_acquiring:
             self.camera.close_image_series()
 
@@ -495,6 +525,7 @@ class Microscope:
         for k in self.lasers:
             self.lasers[k].turn_off()
         self.current_channel = 0
+        self.channel_settings = {}
         self.central_focus = None
         logger.info("Acquisition Ended")
 
@@ -680,6 +711,110 @@ class Microscope:
         """
         return self.exposure_times, self.sweep_times
 
+    def schedule_channels(self):
+        """Plan the order in which the selected channels are imaged.
+
+        In per-z stack cycling of a z-stack, the channel order that minimizes the
+        time spent switching filters and lasers is chosen, possibly reversing the
+        order on every other plane. The order is stored in the experiment as indices
+        into the selected channels, so data sources can keep the channels of saved
+        data in table order.
+        """
+        microscope_state = self.configuration["experiment"]["MicroscopeState"]
+        self.channel_scheduler = ChannelScheduler(
+            {c: self.channels[f"channel_{c}"] for c in self.available_channels},
+            self.filter_wheel,
+            self.lasers,
+            self.laser_wavelength,
+        )
+        orders, number_of_planes = [list(self.available_channels)], 1
+        if (
+            microscope_state["image_mode"] == "z-stack"
+            and microscope_state["stack_cycling_mode"] == "per_z"
+            and microscope_state.get("optimize_channel_order", True)
+        ):
+            number_of_planes = int(microscope_state["number_z_steps"])
+            orders, table_time, optimized_time = self.channel_scheduler.optimize(
+                self.available_channels, number_of_planes
+            )
+            if orders != [self.available_channels]:
+                logger.info(
+                    f"Channel orders {orders}, estimated switch time per stack "
+                    f"{table_time:.3f}s -> {optimized_time:.3f}s"
+                )
+        self.set_channel_schedule(orders, number_of_planes)
+
+        if self.is_virtual:
+            return
+        if orders != [self.available_channels]:
+            microscope_state["channel_acquisition_order"] = [
+                [self.available_channels.index(c) for c in order] for order in orders
+            ]
+        else:
+            microscope_state.pop("channel_acquisition_order", None)
+
+    def set_channel_schedule(self, orders, number_of_planes=1):
+        """Set the order in which the selected channels are imaged.
+
+        Parameters
+        ----------
+        orders : list
+            Lists of channel numbers, plane z is imaged in the order
+            orders[z % len(orders)].
+        number_of_planes : int
+            Number of planes after which the orders start over.
+        """
+        self.channel_orders = [list(order) for order in orders]
+        self.channel_cycle_planes = max(int(number_of_planes), 1)
+        self.channel_cycle = 0
+
+    def get_channel_order(self):
+        """Get the order of the channels of the current plane.
+
+        Returns
+        -------
+        list
+            Channel numbers in the order they are imaged.
+        """
+        if not self.channel_orders:
+            return self.available_channels
+        plane = self.channel_cycle % self.channel_cycle_planes
+        return self.channel_orders[plane % len(self.channel_orders)]
+
+    def reset_channel_switch_statistics(self):
+        """Reset the channel switch statistics."""
+        self.channel_switch_statistics = {
+            "switches": 0,
+            "expected_time": 0.0,
+            "actual_time": 0.0,
+        }
+
+    def get_channel_switch_summary(self, reset=True):
+        """Summarize the channel switches, e.g. of the last stack.
+
+        The expected time is estimated from the filter wheel and laser models, the
+        actual time is the time spent preparing the channels.
+
+        Parameters
+        ----------
+        reset : bool
+            Reset the statistics after summarizing them.
+
+        Returns
+        -------
+        str
+            Number of switches, expected and actual switch time.
+        """
+        statistics = self.channel_switch_statistics
+        summary = (
+            f"{statistics['switches']} channel switches, expected "
+            f"{statistics['expected_time']:.3f}s, actual "
+            f"{statistics['actual_time']:.3f}s"
+        )
+        if reset:
+            self.reset_channel_switch_statistics()
+        return summary
+
     def prepare_next_channel(self, update_daq_task_flag=True):
         """Prepare the next channel.
 
@@ -699,57 +834,70 @@ class Microscope:
         curr_channel = self.current_channel
         prefix = "channel_"
         if self.current_channel == 0:
-            self.current_channel = self.available_channels[0]
+            # start over, and send all the channel settings to the devices
+            self.channel_cycle = 0
+            self.channel_settings = {}
+            self.current_channel = self.get_channel_order()[0]
         else:
-            idx = (self.available_channels.index(self.current_channel) + 1) % len(
-                self.available_channels
-            )
-            self.current_channel = self.available_channels[idx]
+            channel_order = self.get_channel_order()
+            idx = channel_order.index(self.current_channel) + 1
+            if idx == len(channel_order):
+                self.channel_cycle += 1
+                channel_order = self.get_channel_order()
+                idx = 0
+            self.current_channel = channel_order[idx]
         if curr_channel == self.current_channel:
             return
+        start_time = time.perf_counter()
 
         channel_key = prefix + str(self.current_channel)
         channel = self.configuration["experiment"]["MicroscopeState"]["channels"][
             channel_key
         ]
-        # Filter Wheel Settings.
+        # Filter Wheel Settings. Wheels already at the filter are not moved.
         for k in self.filter_wheel:
-            self.filter_wheel[k].set_filter(channel[k])
+            if self.channel_settings.get(("filter_wheel", k)) != channel[k]:
+                self.filter_wheel[k].set_filter(channel[k])
+                self.channel_settings[("filter_wheel", k)] = channel[k]
 
         # Camera Settings
-        self.current_exposure_time = float(channel["camera_exposure_time"]) / 1000
-        if (
-            self.configuration["experiment"]["CameraParameters"][self.microscope_name][
-                "sensor_mode"
-            ]
-            == "Light-Sheet"
-        ):
-            (
-                self.current_exposure_time,
-                camera_line_interval,
-                _,
-            ) = self.camera.calculate_light_sheet_exposure_time(
-                self.current_exposure_time,
-                int(
-                    self.configuration["experiment"]["CameraParameters"][
-                        self.microscope_name
-                    ]["number_of_pixels"]
-                ),
-            )
-            self.camera.set_line_interval(camera_line_interval)
-        self.camera.set_exposure_time(self.current_exposure_time)
+        camera_parameters = self.configuration["experiment"]["CameraParameters"][
+            self.microscope_name
+        ]
+        camera_settings = (
+            channel["camera_exposure_time"],
+            camera_parameters["sensor_mode"],
+            camera_parameters.get("number_of_pixels"),
+        )
+        if self.channel_settings.get("camera") != camera_settings:
+            self.current_exposure_time = float(channel["camera_exposure_time"]) / 1000
+            if camera_parameters["sensor_mode"] == "Light-Sheet":
+                (
+                    self.current_exposure_time,
+                    camera_line_interval,
+                    _,
+                ) = self.camera.calculate_light_sheet_exposure_time(
+                    self.current_exposure_time,
+                    int(camera_parameters["number_of_pixels"]),
+                )
+                self.camera.set_line_interval(camera_line_interval)
+            self.camera.set_exposure_time(self.current_exposure_time)
+            self.channel_settings["camera"] = camera_settings
 
         # Laser Settings
         self.current_laser_index = channel["laser_index"]
-        for k in self.lasers:
-            self.lasers[k].turn_off()
-        self.lasers[str(self.laser_wavelength[self.current_laser_index])].set_power(
-            channel["laser_power"]
-        )
-        logger.info(
-            f"{self.laser_wavelength[self.current_laser_index]} "
-            f"nm laser power set to {channel['laser_power']}"
-        )
+        laser_settings = (channel["laser_index"], channel["laser_power"])
+        if self.channel_settings.get("laser") != laser_settings:
+            for k in self.lasers:
+                self.lasers[k].turn_off()
+            self.lasers[str(self.laser_wavelength[self.current_laser_index])].set_power(
+                channel["laser_power"]
+            )
+            logger.info(
+                f"{self.laser_wavelength[self.current_laser_index]} "
+                f"nm laser power set to {channel['laser_power']}"
+            )
+            self.channel_settings["laser"] = laser_settings
         # self.lasers[str(self.laser_wavelength[self.current_laser_index])].turn_on()
 
         # stop daq before writing new waveform
@@ -757,7 +905,7 @@ class Microscope:
         # choose to not update the waveform is very useful when running ZStack
         # if there is a NI Galvo stage in the system.
         if update_daq_task_flag:
-            self.daq.stop_acquisition()
+            self.daq.stop_tasks()
             self.daq.prepare_acquisition(channel_key)
 
         # Add Defocus term
@@ -772,6 +920,15 @@ class Microscope:
                 update_focus=False,
             )
 
+        # Compare the time spent switching channels with the device models.
+        if curr_channel != 0 and self.channel_scheduler is not None:
+            statistics = self.channel_switch_statistics
+            statistics["switches"] += 1
+            statistics["expected_time"] += self.channel_scheduler.switch_time(
+                curr_channel, self.current_channel
+            )
+            statistics["actual_time"] += time.perf_counter() - start_time
+
     def move_stage(
         self, pos_dict: dict, wait_until_done=False, update_focus=True
     ) -> bool:
@@ -817,6 +974,50 @@ class Microscope:
 
         return success
 
+    def predict_stage_move_time(self, pos_dict: dict):
+        """Predict how long a stage move takes, e.g. to plan z-stacks and tiles.
+
+        Parameters
+        ----------
+        pos_dict : dict
+            Dictionary of stage positions, e.g. {"x_abs": 100, "z_abs": 5}
+
+        Returns
+        -------
+        float or None
+            Predicted duration in seconds, None if no stage can predict it.
+        """
+        predicted_times = []
+        for stage, axes in self.stages_list:
+            pos = {
+                axis: pos_dict[axis]
+                for axis in pos_dict
+                if axis[: axis.index("_")] in axes
+            }
+            if pos:
+                predicted_times.append(stage.predict_move_time(pos))
+        predicted_times = [t for t in predicted_times if t is not None]
+        return max(predicted_times) if predicted_times else None
+
+    def get_stage_motion_statistics(self) -> dict:
+        """Get the move time statistics of the stage axes.
+
+        Returns
+        -------
+        dict
+            Statistics of each axis, for the stages with a motion model.
+        """
+        statistics = {}
+        for stage, axes in self.stages_list:
+            statistics.update(
+                {
+                    axis: value
+                    for axis, value in stage.get_motion_statistics().items()
+                    if axis in axes
+                }
+            )
+        return statistics
+
     def stop_stage(self) -> None:
         """Stop stage."""
 
@@ -42,6 +42,8 @@ import os
 
 # Local Imports
 from navigate.model.concurrency.concurrency_tools import SharedNDArray
+from navigate.model.shared_waveforms import WaveformPublisher
+from navigate.model.analysis.camera import CameraImageCorrection, crop_camera_map
 from navigate.model.features.autofocus import Autofocus
 from navigate.model.features.adaptive_optics import TonyWilson
 from navigate.model.features.image_writer import ImageWriter
@@ -74,6 +76,7 @@ from navigate.log_files.log_functions import log_setup
 from navigate.tools.common_dict_tools import update_stage_dict
 from navigate.tools.common_functions import load_module_from_file, VariableWithLock
 from navigate.tools.file_functions import load_yaml_file, save_yaml_file
+from navigate.tools.tracing import tracer
 from navigate.model.device_startup_functions import load_devices
 from navigate.model.microscope import Microscope
 from navigate.config.config import get_navigate_path
@@ -110,6 +113,10 @@ class Model:
         #: dict: Configuration dictionary.
         self.configuration = configuration
 
+        # Record the timing of the acquisition pipeline
+        if getattr(args, "trace", None):
+            tracer.configure(enabled=True)
+
         # Plugins
         plugins = PluginsModel()
         plugin_devices, plugin_acquisition_modes = plugins.load_plugins()
@@ -164,9 +171,6 @@ class Model:
         #: float: Pre-exposure time in milliseconds
         self.pre_exposure_time = 0  # milliseconds
 
-        #: int: Number of timeouts before aborting acquisition.
-        self.camera_wait_iterations = 20  # Thread waits this * 500 ms before it ends
-
         #: float: Time before acquisition.
         self.start_time = None
 
@@ -189,6 +193,12 @@ class Model:
         #: array: stage positions.
         self.data_buffer_positions = None
 
+        #: OverviewMosaic: Overview of the last multi-position acquisition.
+        self.overview_mosaic = None
+
+        #: CameraImageCorrection: Offset and flatfield correction of the frames.
+        self.image_correction = None
+
         #: array: saving flags for a frame
         self.data_buffer_saving_flags = None
 
@@ -224,6 +234,9 @@ class Model:
         #: multiprocessing.Queue: Waveform queue.
         self.event_queue = event_queue
 
+        #: WaveformPublisher: Shares the waveforms with the controller.
+        self.waveform_publisher = WaveformPublisher()
+
         # frame signal id
         #: int: Frame ID.
         self.frame_id = 0
@@ -253,6 +266,10 @@ class Model:
         #: bool: Ask to pause data thread?
         self.ask_to_pause_data_thread = False
 
+        #: list: Functions called right before the next frame is triggered, e.g., to
+        #: wait for a stage move issued by a feature.
+        self.before_next_trigger = []
+
         # data buffer for image frames
         #: int: Number of frames in the data buffer.
         self.number_of_frames = self.configuration["experiment"]["CameraParameters"][
@@ -393,14 +410,39 @@ class Model:
             ],
             "customized": [],
         }
-        # append plugin acquisition mode
-        for mode in self.plugin_acquisition_modes:
-            self.acquisition_modes_feature_setting[
-                mode
-            ] = self.plugin_acquisition_modes[mode].feature_list
-
         self.load_feature_records()
 
+    def get_acquisition_mode_feature_list(self, mode):
+        """Get the feature list of an acquisition mode.
+
+        Plugin acquisition modes are imported the first time they are used.
+
+        Parameters
+        ----------
+        mode : str
+            The acquisition mode name.
+
+        Returns
+        -------
+        list
+            The feature list of the acquisition mode.
+        """
+        if mode in self.plugin_acquisition_modes:
+            return self.plugin_acquisition_modes[mode].feature_list
+        return self.acquisition_modes_feature_setting[mode]
+
+    def publish_waveforms(self, waveform_dict):
+        """Share the waveforms through shared memory and notify the controller.
+
+        Parameters
+        ----------
+        waveform_dict : dict
+            Dictionary of the camera, remote focus and galvo waveforms.
+        """
+        self.event_queue.put(
+            ("waveform", self.waveform_publisher.publish(waveform_dict))
+        )
+
     def update_data_buffer(self, img_width=512, img_height=512):
         """Update the Data Buffer
 
@@ -455,6 +497,28 @@ class Model:
             self.update_data_buffer(img_width, img_height)
         return self.data_buffer
 
+    def get_overview_mosaic(self, channel=0, region=None, max_size=None):
+        """Get the overview mosaic of the last multi-position acquisition.
+
+        Parameters
+        ----------
+        channel : int
+            Channel index.
+        region : tuple
+            (x_min, x_max, y_min, y_max) region in stage coordinates, in microns.
+            The whole mosaic if None.
+        max_size : int
+            Maximum size of the longest side of the image in pixels.
+
+        Returns
+        -------
+        image : np.ndarray or None
+            The mosaic, or None if there is no mosaic.
+        """
+        if self.overview_mosaic is None:
+            return None
+        return self.overview_mosaic.get_image(channel, region, max_size)
+
     def create_pipe(self, pipe_name):
         """Create a data pipe.
 
@@ -516,6 +580,36 @@ class Model:
 
         return self.active_microscope.camera.get_offset_variance_maps()
 
+    def update_image_correction(self):
+        """Prepare the offset and flatfield correction of the acquired frames.
+
+        Frames are only corrected if `correct_images` is enabled in the camera
+        configuration and an offset map of the camera is available.
+        """
+        self.image_correction = None
+        camera_config = self.configuration["configuration"]["microscopes"][
+            self.active_microscope_name
+        ]["camera"]
+        if not camera_config.get("correct_images", False):
+            return
+
+        binning = self.configuration["experiment"]["CameraParameters"][
+            self.active_microscope_name
+        ]["binning"]
+        if binning != "1x1":
+            self.logger.info(f"Frames are not corrected with binning {binning}.")
+            return
+
+        camera = self.active_microscope.camera
+        shape = (self.img_height, self.img_width)
+        offset, _ = camera.get_offset_variance_maps()
+        offset = crop_camera_map(offset, shape)
+        if offset is None:
+            self.logger.info("Frames are not corrected, no camera offset map found.")
+            return
+        flatfield = crop_camera_map(camera.get_flatfield_map(), shape)
+        self.image_correction = CameraImageCorrection(offset, flatfield)
+
     def run_command(self, command, *args, **kwargs):
         """Receives commands from the controller.
 
@@ -558,7 +652,7 @@ class Model:
                 self.data_buffer_saving_flags = [False] * self.number_of_frames
             else:
                 self.signal_container, self.data_container = load_features(
-                    self, self.acquisition_modes_feature_setting[self.imaging_mode]
+                    self, self.get_acquisition_mode_feature_list(self.imaging_mode)
                 )
                 self.data_buffer_saving_flags = None
 
@@ -649,13 +743,13 @@ class Model:
             else:
                 waveform_dict = self.active_microscope.calculate_all_waveform()
 
-            self.event_queue.put(("waveform", waveform_dict))
+            self.publish_waveforms(waveform_dict)
 
             if self.is_acquiring:
                 # prepare devices based on updated info
                 # load features
                 self.signal_container, self.data_container = load_features(
-                    self, self.acquisition_modes_feature_setting[self.imaging_mode]
+                    self, self.get_acquisition_mode_feature_list(self.imaging_mode)
                 )
                 self.stop_send_signal = False
                 self.signal_thread = threading.Thread(target=self.run_live_acquisition)
@@ -892,31 +986,30 @@ class Model:
         data_func : object
             Function to run on the acquired data.
         """
-        wait_num = self.camera_wait_iterations
         acquired_frame_num = 0
 
         # whether acquire specific number of frames.
         count_frame = num_of_frames > 0
 
+        frame_timeout = self.get_camera_frame_timeout()
+        deadline = time.perf_counter() + frame_timeout
+
         while not self.stop_acquisition:
             if self.ask_to_pause_data_thread:
                 self.pause_data_ready_lock.release()
                 self.pause_data_event.clear()
                 self.pause_data_event.wait()
+                deadline = time.perf_counter() + frame_timeout
+            start = tracer.begin()
+            # blocks until a frame arrives or the camera's wait times out
             frame_ids = self.active_microscope.camera.get_new_frame()
-            self.logger.info(f"Running data process, getting frames {frame_ids}")
             # if there is at least one frame available
             if not frame_ids:
-                self.logger.debug(
-                    f"Frame not received. Waiting {wait_num}"
-                    f"/{self.camera_wait_iterations} iterations"
-                )
-                wait_num -= 1
-                if wait_num <= 0:
+                if time.perf_counter() > deadline:
                     error_statement = (
                         "Acquisition aborted due to camera time out "
-                        "error. Please verify that the external "
-                        "trigger is connected and configured properly."
+                        f"error ({frame_timeout:.1f} s). Please verify that the "
+                        "external trigger is connected and configured properly."
                     )
 
                     self.logger.debug(error_statement)
@@ -924,9 +1017,17 @@ class Model:
                     break
                 continue
 
+            tracer.end("camera", start, frame_ids[-1])
             acquired_frame_num += len(frame_ids)
 
-            wait_num = self.camera_wait_iterations
+            deadline = time.perf_counter() + frame_timeout
+
+            # correct the frames before they are processed, saved and displayed
+            if self.image_correction is not None:
+                start = tracer.begin()
+                for idx in frame_ids:
+                    self.image_correction(self.data_buffer[idx])
+                tracer.end("image correction", start, frame_ids[-1])
 
             if hasattr(self, "data_container") and not self.data_container.end_flag:
                 if self.data_container.is_closed:
@@ -941,8 +1042,10 @@ class Model:
                 data_func(frame_ids)
 
             # show image
-            self.logger.info(f"Image delivered to controller: {frame_ids[0]}")
+            start = tracer.begin()
             self.show_img_pipe.send(frame_ids[-1])
+            tracer.end("display pipe", start, frame_ids[-1])
+            tracer.publish(self.event_queue)
 
             if count_frame and acquired_frame_num >= num_of_frames:
                 self.logger.info("Loop stop condition met.")
@@ -958,6 +1061,34 @@ class Model:
 
         self.end_acquisition()  # Need this to turn off the lasers/close the shutters
 
+    def get_camera_frame_timeout(self, microscope=None):
+        """Longest time the data thread waits for a frame before aborting.
+
+        Derived from the longest exposure time of the selected channels and the
+        readout time of the camera.
+
+        Parameters
+        ----------
+        microscope : Microscope, optional
+            Microscope whose camera delivers the frames. Defaults to the active
+            microscope.
+
+        Returns
+        -------
+        float
+            Timeout in seconds.
+        """
+        if microscope is None:
+            microscope = self.active_microscope
+        channels = self.configuration["experiment"]["MicroscopeState"]["channels"]
+        exposure_times = [
+            float(channel["camera_exposure_time"])
+            for channel in channels.values()
+            if channel["is_selected"]
+        ]
+        exposure_time = max(exposure_times, default=0) / 1000
+        return microscope.camera.get_frame_timeout(exposure_time)
+
     def pause_data_thread(self):
         """Pause the data thread.
 
@@ -979,6 +1110,36 @@ class Model:
         if self.pause_data_ready_lock.locked():
             self.pause_data_ready_lock.release()
 
+    def set_tracing(self, enabled):
+        """Enable or disable tracing of the acquisition pipeline.
+
+        Parameters
+        ----------
+        enabled : bool
+            Record the timing of each stage of the acquisition pipeline.
+        """
+        tracer.configure(enabled=enabled)
+
+    def get_trace_events(self):
+        """Get the recorded acquisition pipeline spans.
+
+        Returns
+        -------
+        list
+            Chrome trace events of the model process.
+        """
+        return tracer.events()
+
+    def get_trace_summary(self):
+        """Get the timing percentiles of each acquisition pipeline stage.
+
+        Returns
+        -------
+        dict
+            {stage: {"count", "mean_ms", "p50_ms", "p90_ms", "p99_ms", "max_ms"}}
+        """
+        return tracer.summary()
+
     def simplified_data_process(self, microscope, show_img_pipe, data_func=None):
         """Run the data process.
 
@@ -994,25 +1155,35 @@ class Model:
 
         acquired_frame_num = 0
 
+        frame_timeout = self.get_camera_frame_timeout(microscope)
+        deadline = time.perf_counter() + frame_timeout
+
         while not self.stop_acquisition:
-            frame_ids = (
-                microscope.camera.get_new_frame()
-            )  # This is the 500 ms wait for Hamamatsu
-            self.logger.info(
-                f"Running data process, getting frames {frame_ids} from "
-                f"{microscope.microscope_name}"
-            )
+            # blocks until a frame arrives or the camera's wait times out
+            frame_ids = microscope.camera.get_new_frame()
             # if there is at least one frame available
             if not frame_ids:
+                if time.perf_counter() > deadline:
+                    self.logger.debug(
+                        "Data process aborted due to camera time out error "
+                        f"({frame_timeout:.1f} s) -- {microscope.microscope_name}"
+                    )
+                    break
                 continue
 
+            self.logger.debug(
+                f"Running data process, getting frames {frame_ids} from "
+                f"{microscope.microscope_name}"
+            )
+            deadline = time.perf_counter() + frame_timeout
+
             # Leave it here for now to work with current ImageWriter workflow
             # Will move it feature container later
             if data_func:
                 data_func(frame_ids)
 
             # show image
-            self.logger.info(
+            self.logger.debug(
                 f"Navigate Model - Sent through pipe{frame_ids[0]} -- "
                 f"{microscope.microscope_name}"
             )
@@ -1054,8 +1225,18 @@ class Model:
 
         # prepare active microscope
         waveform_dict = self.active_microscope.prepare_acquisition()
-        self.event_queue.put(("waveform", waveform_dict))
+        self.publish_waveforms(waveform_dict)
+
+        # virtual microscopes image the channels in the order of the active one
+        for m in self.virtual_microscopes:
+            self.virtual_microscopes[m].set_channel_schedule(
+                self.active_microscope.channel_orders,
+                self.active_microscope.channel_cycle_planes,
+            )
 
+        self.update_image_correction()
+
+        self.before_next_trigger = []
         self.frame_id = 0
 
     def snap_image(self):
@@ -1068,6 +1249,9 @@ class Model:
         if hasattr(self, "signal_container"):
             self.signal_container.run()
 
+        while self.before_next_trigger:
+            self.before_next_trigger.pop(0)()
+
         # Stash current position, channel, timepoint. Do this here, because signal
         # container functions can inject changes to the stage. NOTE: This line is
         # wildly expensive when get_stage_position() does not cache results.
@@ -1098,8 +1282,9 @@ class Model:
             )
             self.active_microscope.daq.run_acquisition()
         finally:
-            # Ensure the laser is turned off
-            self.active_microscope.turn_off_lasers()
+            # Ensure the laser is turned off, unless the DAQ is running a sequence
+            if not self.active_microscope.daq.is_sequence_running():
+                self.active_microscope.turn_off_lasers()
 
         if hasattr(self, "signal_container"):
             self.signal_container.run(wait_response=True)
@@ -1436,11 +1621,17 @@ class Model:
             filename of the feature list
         features: list
             list of feature names
+
+        Returns
+        -------
+        int
+            number of feature lists, i.e. the id of the last loaded feature list
         """
         module = load_module_from_file(filename[filename.rindex("/") + 1 :], filename)
         for name in features:
             feature = getattr(module, name)
             self.feature_list.append(feature())
+        return len(self.feature_list)
 
     def load_feature_list_from_str(self, feature_list_str):
         """Append feature list from feature_list_str
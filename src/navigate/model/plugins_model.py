@@ -39,9 +39,15 @@ from typing import Union
 
 # Local application imports
 from navigate.tools.file_functions import save_yaml_file
-from navigate.tools.decorators import FeatureList, AcquisitionMode
 from navigate.config.config import get_navigate_path
-from navigate.plugins.plugin_manager import PluginFileManager, PluginPackageManager
+from navigate.plugins.plugin_manager import (
+    PluginFileManager,
+    PluginPackageManager,
+    PluginManifest,
+    register_plugin_features,
+    get_plugin_acquisition_modes,
+    get_plugin_devices,
+)
 
 
 class PluginsModel:
@@ -59,7 +65,11 @@ class PluginsModel:
         self.feature_lists_path = os.path.join(get_navigate_path(), "feature_lists")
 
     def load_plugins(self) -> tuple:
-        """Load plugins"""
+        """Load plugins
+
+        What each plugin provides is read from the plugin manifest, and the plugin
+        modules are imported on first use.
+        """
         if not os.path.exists(self.feature_lists_path):
             os.makedirs(self.feature_lists_path)
 
@@ -67,13 +77,19 @@ class PluginsModel:
         plugins_config_path = os.path.join(
             get_navigate_path(), "config", "plugins_config.yml"
         )
+        plugin_manifest = PluginManifest(
+            os.path.join(get_navigate_path(), "config", "plugins_manifest.yml")
+        )
         plugin_file_manager = PluginFileManager(plugins_path, plugins_config_path)
-        self.load_plugins_through_manager(plugin_file_manager)
-        self.load_plugins_through_manager(PluginPackageManager)
+        self.load_plugins_through_manager(plugin_file_manager, plugin_manifest)
+        self.load_plugins_through_manager(PluginPackageManager, plugin_manifest)
+        plugin_manifest.save()
         return self.devices_dict, self.plugin_acquisition_modes
 
     def load_plugins_through_manager(
-        self, plugin_manager: Union[PluginFileManager, PluginPackageManager]
+        self,
+        plugin_manager: Union[PluginFileManager, PluginPackageManager],
+        plugin_manifest: PluginManifest,
     ) -> None:
         """Load plugins through plugin manager
 
@@ -82,32 +98,42 @@ class PluginsModel:
         plugin_manager : PluginFileManager or PluginPackageManager
             - PluginFileManager
             - PluginPackageManager
+        plugin_manifest : PluginManifest
+            Cache of what each plugin provides
 
         """
         plugins = plugin_manager.get_plugins()
 
-        for _, plugin_ref in plugins.items():
-            # read "plugin_config.yml"
-            plugin_config = plugin_manager.load_config(plugin_ref)
-            if plugin_config is None:
+        for plugin_name, plugin_ref in plugins.items():
+            manifest = plugin_manifest.get_manifest(
+                plugin_manager, plugin_name, plugin_ref
+            )
+            if manifest is None:
                 continue
 
             # feature
-            plugin_manager.load_features(plugin_ref)
+            register_plugin_features(plugin_manager, plugin_ref, manifest)
 
             # feature lists
-            plugin_manager.load_feature_lists(plugin_ref, self.register_feature_list)
+            if manifest["feature_lists"]:
+                self.register_feature_list(
+                    os.path.join(manifest["path"], "feature_list.py"),
+                    manifest["feature_lists"],
+                )
 
             # acquisition mode
-            acquisition_modes = plugin_config.get("acquisition_modes", [])
-            plugin_manager.load_acquisition_modes(
-                plugin_ref,
-                acquisition_modes,
-                self.register_acquisition_mode,
+            acquisition_modes = get_plugin_acquisition_modes(
+                plugin_manager, plugin_ref, manifest
             )
+            for acquisition_mode_name, acquisition_mode in acquisition_modes.items():
+                self.register_acquisition_mode(
+                    acquisition_mode_name, acquisition_mode(acquisition_mode_name)
+                )
 
             # load devices
-            plugin_manager.load_devices(plugin_ref, self.register_device)
+            devices = get_plugin_devices(plugin_manager, plugin_ref, manifest)
+            for device, module in devices.items():
+                self.register_device(device, module)
 
     def register_device(self, device, module):
         """Register device
@@ -116,13 +142,13 @@ class PluginsModel:
         ----------
         device : str
             device type name
-        module : module
+        module : LazyPluginModule
             device_startup_functions module
         """
         if module:
             try:
                 device_type_name = module.DEVICE_TYPE_NAME
-            except AttributeError:
+            except (AttributeError, ImportError):
                 print(
                     f"Plugin device: {device} is not set correctly!"
                     "Please make sure the DEVICE_TYPE_NAME is given right!"
@@ -170,42 +196,30 @@ class PluginsModel:
                     "start_device"
                 ] = module.start_device
 
-    def register_acquisition_mode(self, acquisition_mode_name, module):
+    def register_acquisition_mode(self, acquisition_mode_name, acquisition_mode):
         """Register acquisition mode
 
         Parameters
         ----------
         acquisition_mode_name : str
             The name of an acquisition mode
-        module : module
-            acquisition_mode module
+        acquisition_mode : LazyAcquisitionMode
+            acquisition mode object
         """
-        if not module:
-            return
-        acquisition_mode = [
-            m for m in dir(module) if isinstance(getattr(module, m), AcquisitionMode)
-        ]
-        if acquisition_mode:
-            self.plugin_acquisition_modes[acquisition_mode_name] = getattr(
-                module, acquisition_mode[0]
-            )(acquisition_mode_name)
-
-    def register_feature_list(self, plugin_feature_list, module):
+        self.plugin_acquisition_modes[acquisition_mode_name] = acquisition_mode
+
+    def register_feature_list(self, plugin_feature_list, feature_list_names):
         """Register feature list
 
         Parameters
         ----------
         plugin_feature_list : str
             plugin_feature_list path string
-        module : module
-            feature list module
+        feature_list_names : list
+            names of the feature list functions
         """
-        features = [
-            f for f in dir(module) if isinstance(getattr(module, f), FeatureList)
-        ]
-        for feature_name in features:
-            feature = getattr(module, feature_name)
-            feature_list_name = feature.feature_list_name
+        for feature_name in feature_list_names:
+            feature_list_name = str.title(feature_name.replace("_", " "))
             feature_list_file_name = "_".join(feature_list_name.split())
             feature_list_content = {
                 "module_name": feature_name,
@@ -0,0 +1,178 @@
+# Copyright (c) 2021-2024  The University of Texas Southwestern Medical Center.
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted for academic and research use only
+# (subject to the limitations in the disclaimer below)
+# provided that the following conditions are met:
+
+#      * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#      * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+
+#      * Neither the name of the copyright holders nor the names of its
+#      contributors may be used to endorse or promote products derived from this
+#      software without specific prior written permission.
+
+# NO EXPRESS OR IMPLIED LICENSES TO ANY PARTY'S PATENT RIGHTS ARE GRANTED BY
+# THIS LICENSE. THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+# PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+# Standard Library Imports
+import hashlib
+import logging
+
+# Third Party Imports
+import numpy as np
+
+# Local Imports
+from navigate.model.concurrency.concurrency_tools import SharedNDArray
+
+# Logger Setup
+p = __name__.split(".")[1]
+logger = logging.getLogger(p)
+
+
+class WaveformPublisher:
+    """Publish waveforms to other processes through shared memory.
+
+    The waveforms are packed into a shared buffer, and only a small notification
+    with the name of the buffer and the position of each waveform in it goes
+    through the event queue. Two buffers are used in turn, so a reader of the
+    previous notification is not overwritten by the next one.
+    """
+
+    def __init__(self, number_of_buffers=2):
+        """Initialize the waveform publisher.
+
+        Parameters
+        ----------
+        number_of_buffers : int
+            Number of shared buffers written in turn.
+        """
+        #: list: Shared buffers, allocated on demand.
+        self.buffers = [None] * number_of_buffers
+
+        #: int: Incremented each time the waveforms change.
+        self.version = 0
+
+        #: bytes: Digest of the last published waveforms.
+        self.digest = None
+
+        #: dict: Last notification.
+        self.notification = None
+
+    def publish(self, waveform_dict):
+        """Copy the waveforms to shared memory.
+
+        Parameters
+        ----------
+        waveform_dict : dict
+            Camera, remote focus and galvo waveforms of each channel, as returned
+            by Microscope.calculate_all_waveform().
+
+        Returns
+        -------
+        notification : dict
+            Shared buffer, layout of the waveforms and version. The version only
+            changes when the waveforms do.
+        """
+        arrays = []
+        offset = 0
+
+        def pack(waveforms):
+            nonlocal offset
+            layout = {}
+            for channel_key, waveform in (waveforms or {}).items():
+                if waveform is None:
+                    layout[channel_key] = None
+                    continue
+                waveform = np.asarray(waveform, dtype=np.float64).ravel()
+                layout[channel_key] = (offset, len(waveform))
+                arrays.append(waveform)
+                offset += len(waveform)
+            return layout
+
+        layout = {
+            "camera_waveform": pack(waveform_dict.get("camera_waveform")),
+            "remote_focus_waveform": pack(waveform_dict.get("remote_focus_waveform")),
+            "galvo_waveform": [
+                pack(galvo_waveform)
+                for galvo_waveform in waveform_dict.get("galvo_waveform", [])
+            ],
+        }
+        packed = np.concatenate(arrays) if arrays else np.zeros(0)
+
+        digest = hashlib.blake2b(packed, digest_size=16)
+        digest.update(repr(layout).encode())
+        digest = digest.digest()
+        if digest == self.digest:
+            return self.notification
+
+        self.version += 1
+        slot = self.version % len(self.buffers)
+        buffer = self.buffers[slot]
+        if buffer is None or buffer.size < packed.size:
+            buffer = SharedNDArray(shape=(max(packed.size, 1),), dtype=np.float64)
+            self.buffers[slot] = buffer
+        buffer[: packed.size] = packed
+
+        self.digest = digest
+        self.notification = {
+            "buffer": buffer,
+            "layout": layout,
+            "version": self.version,
+        }
+        logger.debug(
+            f"Published waveforms version {self.version}, {packed.size} samples"
+        )
+        return self.notification
+
+
+def read_waveforms(notification, copy=True):
+    """Rebuild the waveform dictionary from a notification.
+
+    Parameters
+    ----------
+    notification : dict
+        Notification returned by WaveformPublisher.publish().
+    copy : bool
+        Copy the waveforms out of the shared buffer. Without a copy, the
+        waveforms are overwritten once the buffer is reused.
+
+    Returns
+    -------
+    waveform_dict : dict
+        Camera, remote focus and galvo waveforms of each channel.
+    """
+    buffer = np.asarray(notification["buffer"]).view(np.ndarray)
+
+    def unpack(layout):
+        waveforms = {}
+        for channel_key, position in layout.items():
+            if position is None:
+                waveforms[channel_key] = None
+                continue
+            offset, length = position
+            waveform = buffer[offset : offset + length]
+            waveforms[channel_key] = waveform.copy() if copy else waveform
+        return waveforms
+
+    layout = notification["layout"]
+    return {
+        "camera_waveform": unpack(layout["camera_waveform"]),
+        "remote_focus_waveform": unpack(layout["remote_focus_waveform"]),
+        "galvo_waveform": [unpack(galvo) for galvo in layout["galvo_waveform"]],
+    }
@@ -45,7 +45,11 @@ logger = logging.getLogger(p)
 
 
 def camera_exposure(
-    sample_rate=100000, sweep_time=0.4, exposure=0.4, camera_delay=0.001
+    sample_rate=100000,
+    sweep_time=0.4,
+    exposure=0.4,
+    camera_delay=0.001,
+    dtype=np.float64,
 ):
     """Calculates timing and duration of camera exposure.
     Not actually used to trigger the camera.  Only meant for visualization.
@@ -60,6 +64,8 @@ def camera_exposure(
         Unit - Seconds
     camera_delay : Float
         Unit - Seconds
+    dtype : np.dtype
+        Data type of the waveform, e.g. np.float32 to halve the memory to upload
 
     Returns
     -------
@@ -80,7 +86,7 @@ def camera_exposure(
     samples = int(np.multiply(sample_rate, sweep_time))
 
     # create an array just containing the offset voltage:
-    array = np.zeros(samples)
+    array = np.zeros(samples, dtype=dtype)
 
     # convert pulse width and delay in % into number of samples
     pulse_delay_samples = int(camera_delay * sample_rate)
@@ -88,11 +94,17 @@ def camera_exposure(
 
     # modify the array
     array[pulse_delay_samples : (pulse_samples + pulse_delay_samples)] = amplitude
-    return np.array(array)
+    return array
 
 
 def single_pulse(
-    sample_rate=100000, sweep_time=0.4, delay=10, pulse_width=1, amplitude=1, offset=0
+    sample_rate=100000,
+    sweep_time=0.4,
+    delay=10,
+    pulse_width=1,
+    amplitude=1,
+    offset=0,
+    dtype=np.float64,
 ):
     """
     Returns a numpy array with a single pulse
@@ -113,6 +125,8 @@ def single_pulse(
         Unit - Volts
     offset : Float
         Unit - Volts
+    dtype : np.dtype
+        Data type of the waveform
 
     Returns
     -------
@@ -126,7 +140,7 @@ def single_pulse(
     samples = int(np.floor(np.multiply(sample_rate, sweep_time)))
 
     # create an array just containing the offset voltage:
-    array = np.zeros((samples)) + offset
+    array = np.full(samples, 0.0 + offset, dtype=dtype)
 
     # convert pulse width and delay in % into number of samples
     pulsedelay_samples = int(samples * delay / 100)
@@ -134,7 +148,7 @@ def single_pulse(
 
     # modify the array
     array[pulsedelay_samples : pulsesamples + pulsedelay_samples] = amplitude
-    return np.array(array)
+    return array
 
 
 def remote_focus_ramp(
@@ -146,6 +160,7 @@ def remote_focus_ramp(
     fall=0.05,
     amplitude=1,
     offset=0,
+    dtype=np.float64,
 ):
     """Returns a numpy array with a sawtooth ramp - typically used for remote focusing.
 
@@ -174,6 +189,8 @@ def remote_focus_ramp(
         Unit - Volts
     offset : Float
         Unit - Volts
+    dtype : np.dtype
+        Data type of the waveform
 
     Returns
     -------
@@ -185,30 +202,34 @@ def remote_focus_ramp(
         camera_delay, fall, amplitude, offset)
 
     """
-    # create an array just containing the negative amplitude voltage:
+    # the delay is at the negative amplitude voltage
     delay_samples = int(remote_focus_delay * sample_rate)
-    delay_array = np.zeros(delay_samples) + offset - amplitude
 
     # 10-7.5 -> 1.025 * .2
     #
     ramp_samples = int(
         (exposure_time + camera_delay - remote_focus_delay) * sample_rate
     )
-    ramp_array = np.linspace(offset - amplitude, offset + amplitude, ramp_samples)
 
     # fall_samples = .025 * .2 * 100000 = 500
     fall_samples = int(fall * sample_rate)
-    fall_array = np.linspace(offset + amplitude, offset - amplitude, fall_samples)
 
     extra_samples = int(
         int(np.multiply(sample_rate, sweep_time))
         - (delay_samples + ramp_samples + fall_samples)
     )
-    if extra_samples > 0:
-        extra_array = np.zeros(extra_samples) + offset - amplitude
-        waveform = np.hstack([delay_array, ramp_array, fall_array, extra_array])
-    else:
-        waveform = np.hstack([delay_array, ramp_array, fall_array])
+    fall_end = delay_samples + ramp_samples + fall_samples
+
+    # write each part of the ramp into a single array
+    waveform = np.empty(fall_end + max(extra_samples, 0), dtype=dtype)
+    waveform[:delay_samples] = offset - amplitude
+    waveform[delay_samples : delay_samples + ramp_samples] = np.linspace(
+        offset - amplitude, offset + amplitude, ramp_samples
+    )
+    waveform[delay_samples + ramp_samples : fall_end] = np.linspace(
+        offset + amplitude, offset - amplitude, fall_samples
+    )
+    waveform[fall_end:] = offset - amplitude
 
     return waveform
 
@@ -222,6 +243,7 @@ def remote_focus_ramp_triangular(
     amplitude=1,
     offset=0,
     ramp_type="Rising",
+    dtype=np.float64,
 ):
     """Returns a numpy array with a triangular ramp typically used for remote focusing
 
@@ -248,7 +270,9 @@ def remote_focus_ramp_triangular(
     offset : Float
         Unit - Volts
     ramp_type : String
-
+        "Rising" or "Falling"
+    dtype : np.dtype
+        Data type of the waveform
 
     Returns
     -------
@@ -260,45 +284,36 @@ def remote_focus_ramp_triangular(
         camera_delay, fall, amplitude, offset)
 
     """
-    # create an array just containing the negative amplitude voltage:
     # In theory, delay here should be 4H.
     delay_samples = int(remote_focus_delay * sample_rate)
-    delay_array = np.zeros(delay_samples) + offset
 
     # ramp samples
     ramp_samples = int(
         (exposure_time + camera_delay - remote_focus_delay) * sample_rate
     )
-    rise_ramp_array = np.linspace(offset - amplitude, offset + amplitude, ramp_samples)
-    fall_ramp_array = np.linspace(offset + amplitude, offset - amplitude, ramp_samples)
 
     settle_samples = int(
         int(np.multiply(sample_rate, sweep_time)) - (delay_samples + ramp_samples)
     )
-    settle_array = np.zeros(settle_samples) + offset
+    if min(delay_samples, ramp_samples, settle_samples) < 0:
+        raise ValueError("negative dimensions are not allowed")
 
     if ramp_type == "Rising":
-        waveform = np.hstack(
-            [
-                delay_array - amplitude,
-                rise_ramp_array,
-                settle_array + amplitude,
-                delay_array + amplitude,
-                fall_ramp_array,
-                settle_array - amplitude,
-            ]
-        )
+        sign = 1
     elif ramp_type == "Falling":
-        waveform = np.hstack(
-            [
-                delay_array + amplitude,
-                fall_ramp_array,
-                settle_array - amplitude,
-                delay_array - amplitude,
-                rise_ramp_array,
-                settle_array + amplitude,
-            ]
-        )
+        sign = -1
+
+    # write the delay, ramp and settle parts of both sweeps into a single array
+    half = delay_samples + ramp_samples + settle_samples
+    waveform = np.empty(2 * half, dtype=dtype)
+    for start, direction in ((0, sign), (half, -sign)):
+        low = offset - direction * amplitude
+        high = offset + direction * amplitude
+        ramp_start = start + delay_samples
+        ramp_end = ramp_start + ramp_samples
+        waveform[start:ramp_start] = low
+        waveform[ramp_start:ramp_end] = np.linspace(low, high, ramp_samples)
+        waveform[ramp_end : start + half] = high
 
     return waveform
 
@@ -311,6 +326,7 @@ def sawtooth(
     offset=0,
     duty_cycle=50,
     phase=np.pi / 2,
+    dtype=np.float64,
 ):
     """
     Returns a numpy array with a sawtooth function.
@@ -332,6 +348,8 @@ def sawtooth(
         Unit - Percent
     phase : Float
         Unit - Radians
+    dtype : np.dtype
+        Data type of the waveform
 
     Returns
     -------
@@ -345,13 +363,16 @@ def sawtooth(
     samples = int(np.multiply(sample_rate, sweep_time))
     duty_cycle = duty_cycle / 100
     t = np.linspace(0, sweep_time, samples)
-    waveform = signal.sawtooth(2 * np.pi * frequency * (t - phase), width=duty_cycle)
-    waveform = amplitude * waveform + offset
+    t -= phase
+    t *= 2 * np.pi * frequency
+    waveform = signal.sawtooth(t, width=duty_cycle)
+    waveform *= amplitude
+    waveform += offset
 
-    return waveform
+    return waveform.astype(dtype, copy=False)
 
 
-def dc_value(sample_rate=100000, sweep_time=0.4, amplitude=1):
+def dc_value(sample_rate=100000, sweep_time=0.4, amplitude=1, dtype=np.float64):
     """
     Returns a numpy array with a DC value
     Used for creating the resonant galvo drive voltage.
@@ -364,6 +385,8 @@ def dc_value(sample_rate=100000, sweep_time=0.4, amplitude=1):
         Unit - Seconds
     amplitude : Float
         Unit - Volts
+    dtype : np.dtype
+        Data type of the waveform
 
     Returns
     -------
@@ -375,9 +398,7 @@ def dc_value(sample_rate=100000, sweep_time=0.4, amplitude=1):
 
     """
     samples = np.multiply(float(sample_rate), sweep_time)
-    waveform = np.zeros(int(samples))
-    waveform[:] = amplitude
-    return waveform
+    return np.full(int(samples), amplitude, dtype=dtype)
 
 
 def square(
@@ -388,6 +409,7 @@ def square(
     offset=0,
     duty_cycle=50,
     phase=np.pi,
+    dtype=np.float64,
 ):
     """Returns a numpy array with a square function.
     Used for creating analog laser drive voltage.
@@ -408,6 +430,8 @@ def square(
         Unit - Percent
     phase : Float
         Unit - Radians
+    dtype : np.dtype
+        Data type of the waveform
 
     Returns
     -------
@@ -420,13 +444,22 @@ def square(
     samples = int(sample_rate * sweep_time)
     duty_cycle = duty_cycle / 100
     t = np.linspace(0, sweep_time, samples)
-    waveform = signal.square(2 * np.pi * frequency * t + phase, duty=duty_cycle)
-    waveform = amplitude * waveform + offset
-    return waveform
+    t *= 2 * np.pi * frequency
+    t += phase
+    waveform = signal.square(t, duty=duty_cycle)
+    waveform *= amplitude
+    waveform += offset
+    return waveform.astype(dtype, copy=False)
 
 
 def sine_wave(
-    sample_rate=100000, sweep_time=0.4, frequency=10, amplitude=1, offset=0, phase=0
+    sample_rate=100000,
+    sweep_time=0.4,
+    frequency=10,
+    amplitude=1,
+    offset=0,
+    phase=0,
+    dtype=np.float64,
 ):
     """Returns a numpy array with a sine waveform
 
@@ -446,6 +479,8 @@ def sine_wave(
         Unit - Volts, by default 0
     phase : float, optional
         Unit - Radians, by default 0
+    dtype : np.dtype, optional
+        Data type of the waveform, by default np.float64
 
     Returns
     -------
@@ -458,12 +493,21 @@ def sine_wave(
     """
     samples = int(sample_rate * sweep_time)
     t = np.linspace(0, sweep_time, samples)
-    waveform = amplitude * np.sin((2 * np.pi * frequency * t) - phase) + offset
-    return waveform
+    t *= 2 * np.pi * frequency
+    t -= phase
+    waveform = np.sin(t, out=t)
+    waveform *= amplitude
+    waveform += offset
+    return waveform.astype(dtype, copy=False)
 
 
 def smooth_waveform(waveform, percent_smoothing=10):
-    """Smooths a numpy array via convolution
+    """Smooths a numpy array with a moving average
+
+    The waveform is padded with its edge values on both sides by the length of the
+    moving average window, as in a convolution with a box window. The moving average
+    is computed from a cumulative sum, so the cost does not depend on the window
+    length.
 
     Parameters
     ----------
@@ -482,9 +526,17 @@ def smooth_waveform(waveform, percent_smoothing=10):
     if window_length == 0:
         # cannot smooth
         return waveform
-    waveform_padded = np.pad(waveform, window_length, mode="edge")
-    smoothed_waveform = (
-        np.convolve(waveform_padded, np.ones(window_length), "valid") / window_length
-    )
+    # sum relative to the first value to limit the rounding errors of the sum
+    first_value = np.float64(waveform[0])
+    cumulative_sum = np.empty(waveform_length + 2 * window_length + 1)
+    cumulative_sum[: window_length + 1] = 0
+    cumulative_sum[window_length + 1 : window_length + waveform_length + 1] = waveform
+    cumulative_sum[window_length + waveform_length + 1 :] = waveform[-1]
+    cumulative_sum[window_length + 1 :] -= first_value
+    np.cumsum(cumulative_sum, out=cumulative_sum)
+
+    smoothed_waveform = cumulative_sum[window_length:] - cumulative_sum[:-window_length]
+    smoothed_waveform /= window_length
+    smoothed_waveform += first_value
 
     return smoothed_waveform
@@ -31,17 +31,17 @@
 #
 
 # Standard library imports
+import ast
 import importlib
+import importlib.util
 from importlib.metadata import entry_points
-import importlib.resources
-import pkgutil
+import functools
 import os
-import inspect
 import logging
 from typing import Optional, Any
 
 # Local application imports
-from navigate.tools.file_functions import load_yaml_file
+from navigate.tools.file_functions import load_yaml_file, save_yaml_file
 from navigate.tools.common_functions import load_module_from_file
 from navigate.model.features import feature_related_functions
 
@@ -50,17 +50,510 @@ p = __name__.split(".")[1]
 logger = logging.getLogger(p)
 
 
-def register_features(module) -> None:
-    """Register features
+def parse_python_file(file_path: str) -> Optional[ast.Module]:
+    """Parse a python file without importing it
 
     Parameters
     ----------
-    module : module
-        A python module contains features
+    file_path : str
+        python file path
+
+    Returns
+    -------
+    tree : Optional[ast.Module]
+        The syntax tree of the file, or `None` if the file can't be parsed.
+    """
+    try:
+        with open(file_path, encoding="utf-8") as f:
+            return ast.parse(f.read(), filename=file_path)
+    except (OSError, SyntaxError, ValueError):
+        logger.debug(f"Plugin file {file_path} can't be parsed.")
+        return None
+
+
+def get_decorator_names(node) -> list:
+    """Get the decorator names of a class or function definition
+
+    Parameters
+    ----------
+    node : ast.ClassDef or ast.FunctionDef
+        class or function definition
+
+    Returns
+    -------
+    decorator_names : list
+        decorator names
+    """
+    decorator_names = []
+    for decorator in node.decorator_list:
+        if isinstance(decorator, ast.Call):
+            decorator = decorator.func
+        if isinstance(decorator, ast.Attribute):
+            decorator_names.append(decorator.attr)
+        elif isinstance(decorator, ast.Name):
+            decorator_names.append(decorator.id)
+    return decorator_names
+
+
+def get_definitions(file_path: str, node_type=ast.ClassDef, decorator=None) -> list:
+    """Get the names of the classes or functions defined in a python file
+
+    Parameters
+    ----------
+    file_path : str
+        python file path
+    node_type : type
+        ast.ClassDef or ast.FunctionDef
+    decorator : str, optional
+        only get the definitions with this decorator
+
+    Returns
+    -------
+    names : list
+        class or function names, in the order they are defined
+    """
+    tree = parse_python_file(file_path)
+    if tree is None:
+        return []
+    return [
+        node.name
+        for node in tree.body
+        if isinstance(node, node_type)
+        and (decorator is None or decorator in get_decorator_names(node))
+    ]
+
+
+def get_constants(file_path: str, names: list) -> dict:
+    """Get the literal values assigned to module level names in a python file
+
+    Parameters
+    ----------
+    file_path : str
+        python file path
+    names : list
+        variable names
+
+    Returns
+    -------
+    constants : dict
+        values of the variables that are assigned a literal
+    """
+    constants = {}
+    tree = parse_python_file(file_path)
+    if tree is None:
+        return constants
+    for node in tree.body:
+        if not isinstance(node, ast.Assign):
+            continue
+        for target in node.targets:
+            if isinstance(target, ast.Name) and target.id in names:
+                try:
+                    constants[target.id] = ast.literal_eval(node.value)
+                except (ValueError, TypeError, SyntaxError):
+                    logger.debug(f"{target.id} in {file_path} is not a literal.")
+    return constants
+
+
+def get_plugin_signature(plugin_path: str) -> str:
+    """Get the signature of a plugin folder
+
+    The signature changes whenever a python or yaml file of the plugin is
+    added, removed or modified.
+
+    Parameters
+    ----------
+    plugin_path : str
+        plugin path
+
+    Returns
+    -------
+    signature : str
+        latest modification time and number of files
+    """
+    latest_time = 0
+    file_count = 0
+    for root, dirs, files in os.walk(plugin_path):
+        dirs[:] = [d for d in dirs if d != "__pycache__"]
+        latest_time = max(latest_time, os.stat(root).st_mtime_ns)
+        for file_name in files:
+            if file_name.endswith((".py", ".yml", ".yaml")):
+                file_path = os.path.join(root, file_name)
+                latest_time = max(latest_time, os.stat(file_path).st_mtime_ns)
+                file_count += 1
+    return f"{latest_time}-{file_count}"
+
+
+def scan_plugin(plugin_path: str, plugin_name: str, plugin_config: dict) -> dict:
+    """List what a plugin provides without importing it
+
+    Parameters
+    ----------
+    plugin_path : str
+        plugin path
+    plugin_name : str
+        plugin name
+    plugin_config : dict
+        plugin configuration
+
+    Returns
+    -------
+    manifest : dict
+        GUI, features, feature lists, acquisition modes and devices of the plugin
+    """
+    plugin_display_name = plugin_config.get("name", plugin_name)
+    file_name = "_".join(plugin_display_name.lower().split())
+    manifest = {
+        "name": plugin_display_name,
+        "config": plugin_config,
+        "gui": os.path.isfile(
+            os.path.join(plugin_path, "view", f"{file_name}_frame.py")
+        )
+        and os.path.isfile(
+            os.path.join(plugin_path, "controller", f"{file_name}_controller.py")
+        ),
+        "features": {},
+        "feature_lists": [],
+        "acquisition_modes": {},
+        "devices": {},
+    }
+
+    # features
+    features_dir = os.path.join(plugin_path, "model", "features")
+    if os.path.isdir(features_dir):
+        for feature_file in sorted(os.listdir(features_dir)):
+            if not feature_file.endswith(".py"):
+                continue
+            class_names = get_definitions(os.path.join(features_dir, feature_file))
+            if class_names:
+                manifest["features"][f"model/features/{feature_file}"] = class_names
+
+    # feature lists
+    manifest["feature_lists"] = get_definitions(
+        os.path.join(plugin_path, "feature_list.py"), ast.FunctionDef, "FeatureList"
+    )
+
+    # acquisition modes
+    for acquisition_mode_config in plugin_config.get("acquisition_modes", None) or []:
+        acquisition_file = acquisition_mode_config["file_name"]
+        class_names = get_definitions(
+            os.path.join(plugin_path, acquisition_file), decorator="AcquisitionMode"
+        )
+        if class_names:
+            manifest["acquisition_modes"][acquisition_mode_config["name"]] = {
+                "file_name": acquisition_file,
+                "class_name": class_names[0],
+            }
+
+    # devices
+    device_dir = os.path.join(plugin_path, "model", "devices")
+    if os.path.isdir(device_dir):
+        for device in sorted(os.listdir(device_dir)):
+            device_file = os.path.join(
+                device_dir, device, "device_startup_functions.py"
+            )
+            if os.path.isfile(device_file):
+                manifest["devices"][device] = get_constants(
+                    device_file, ["DEVICE_TYPE_NAME", "DEVICE_REF_LIST"]
+                )
+
+    return manifest
+
+
+class PluginManifest:
+    """Cache of what each installed plugin provides
+
+    The manifest of a plugin is rebuilt only when the signature of its folder
+    changes, so plugins don't need to be imported to be registered.
+    """
+
+    def __init__(self, manifest_path: str) -> None:
+        """Initialize PluginManifest
+
+        Parameters
+        ----------
+        manifest_path : str
+            manifest file path
+        """
+        #: str: manifest file path
+        self.manifest_path = manifest_path
+
+        #: dict: manifest of each plugin, by plugin reference
+        self.plugins = load_yaml_file(manifest_path)
+        if not isinstance(self.plugins, dict):
+            self.plugins = {}
+
+        #: bool: whether a plugin manifest has been rebuilt
+        self.changed = False
+
+    def get_manifest(self, plugin_manager, plugin_name, plugin_ref) -> Optional[dict]:
+        """Get the manifest of a plugin
+
+        Parameters
+        ----------
+        plugin_manager : PluginFileManager or PluginPackageManager
+            plugin manager
+        plugin_name : str
+            plugin name
+        plugin_ref : str
+            plugin path or package name
+
+        Returns
+        -------
+        manifest : Optional[dict]
+            plugin manifest, or `None` if it isn't a plugin.
+        """
+        plugin_path = plugin_manager.get_plugin_path(plugin_ref)
+        if plugin_path is None or not os.path.isfile(
+            os.path.join(plugin_path, "plugin_config.yml")
+        ):
+            return None
+        signature = get_plugin_signature(plugin_path)
+        manifest = self.plugins.get(plugin_ref, None)
+        if (
+            manifest is None
+            or manifest.get("signature", None) != signature
+            or manifest.get("path", None) != plugin_path
+        ):
+            plugin_config = plugin_manager.load_config(plugin_ref)
+            if plugin_config is None:
+                return None
+            manifest = scan_plugin(plugin_path, plugin_name, plugin_config)
+            manifest["path"] = plugin_path
+            manifest["signature"] = signature
+            self.plugins[plugin_ref] = manifest
+            self.changed = True
+            logger.info(f"Plugin {plugin_name} scanned.")
+        return manifest
+
+    def save(self) -> None:
+        """Save the manifest if any plugin has been rescanned"""
+        if not self.changed:
+            return
+        save_yaml_file(
+            os.path.dirname(self.manifest_path),
+            self.plugins,
+            os.path.basename(self.manifest_path),
+        )
+        self.changed = False
+
+
+class LazyPluginModule:
+    """A plugin module that is imported on first use"""
+
+    def __init__(
+        self, plugin_manager, plugin_ref, file_name, attributes=None, functions=()
+    ):
+        """Initialize LazyPluginModule
+
+        Parameters
+        ----------
+        plugin_manager : PluginFileManager or PluginPackageManager
+            plugin manager
+        plugin_ref : str
+            plugin path or package name
+        file_name : str
+            python file path relative to the plugin folder, e.g.
+            "model/features/plugin_feature.py"
+        attributes : dict, optional
+            module attributes that are known without importing the module
+        functions : list, optional
+            names of the module functions that import the module when called
+        """
+        #: PluginFileManager or PluginPackageManager: plugin manager
+        self._plugin_manager = plugin_manager
+
+        #: str: plugin path or package name
+        self._plugin_ref = plugin_ref
+
+        #: str: python file path relative to the plugin folder
+        self._file_name = file_name
+
+        #: dict: module attributes that are known without importing the module
+        self._attributes = attributes if attributes is not None else {}
+
+        #: list: names of the module functions that import the module when called
+        self._functions = functions
+
+        #: module: the imported module
+        self._module = None
+
+    def _load(self):
+        """Import the module
+
+        Returns
+        -------
+        module : module
+            the plugin module
+        """
+        if self._module is None:
+            module = self._plugin_manager.load_module(self._plugin_ref, self._file_name)
+            if module is None:
+                raise ImportError(f"Plugin module {self._file_name} can't be loaded.")
+            logger.debug(f"Plugin module {self._file_name} loaded.")
+            self._module = module
+        return self._module
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        if name in self._attributes:
+            return self._attributes[name]
+        if name in self._functions:
+
+            def func(*args, **kwargs):
+                return getattr(self._load(), name)(*args, **kwargs)
+
+            func.__name__ = name
+            return func
+        return getattr(self._load(), name)
+
+
+class LazyAcquisitionMode:
+    """A plugin acquisition mode that is imported on first use"""
+
+    def __init__(self, module, class_name, name):
+        """Initialize LazyAcquisitionMode
+
+        Parameters
+        ----------
+        module : LazyPluginModule
+            acquisition mode module
+        class_name : str
+            name of the acquisition mode class
+        name : str
+            The name of the acquisition mode
+        """
+        #: LazyPluginModule: acquisition mode module
+        self._module = module
+
+        #: str: name of the acquisition mode class
+        self._class_name = class_name
+
+        #: str: The name of the acquisition mode
+        self._name = name
+
+        #: object: the acquisition mode object
+        self._acquisition_mode = None
+
+    def _load(self):
+        """Create the acquisition mode object
+
+        Returns
+        -------
+        acquisition_mode : object
+            the acquisition mode object
+        """
+        if self._acquisition_mode is None:
+            self._acquisition_mode = getattr(self._module, self._class_name)(self._name)
+        return self._acquisition_mode
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self._load(), name)
+
+
+def lazy_class(load_class):
+    """Defer loading a class until an object is created
+
+    Parameters
+    ----------
+    load_class : func
+        the function to load the class
+
+    Returns
+    -------
+    create : func
+        the function to create an object of the class
+    """
+    classes = {}
+
+    def create(*args, **kwargs):
+        if "class" not in classes:
+            classes["class"] = load_class()
+        return classes["class"](*args, **kwargs)
+
+    return create
+
+
+def register_plugin_features(plugin_manager, plugin_ref, manifest) -> None:
+    """Register the features of a plugin, which are imported on first use
+
+    Parameters
+    ----------
+    plugin_manager : PluginFileManager or PluginPackageManager
+        plugin manager
+    plugin_ref : str
+        plugin path or package name
+    manifest : dict
+        plugin manifest
+    """
+    for file_name, class_names in manifest["features"].items():
+        module = LazyPluginModule(plugin_manager, plugin_ref, file_name)
+        for class_name in class_names:
+            # plugin features replace the navigate features with the same name
+            vars(feature_related_functions).pop(class_name, None)
+            feature_related_functions.lazy_features[class_name] = functools.partial(
+                getattr, module, class_name
+            )
+
+
+def get_plugin_acquisition_modes(plugin_manager, plugin_ref, manifest) -> dict:
+    """Get the acquisition modes of a plugin, which are imported on first use
+
+    Parameters
+    ----------
+    plugin_manager : PluginFileManager or PluginPackageManager
+        plugin manager
+    plugin_ref : str
+        plugin path or package name
+    manifest : dict
+        plugin manifest
+
+    Returns
+    -------
+    acquisition_modes : dict
+        the function to create each acquisition mode object, by acquisition mode
+        name. It is called with the acquisition mode name.
     """
-    for c in dir(module):
-        if inspect.isclass(getattr(module, c)):
-            setattr(feature_related_functions, c, getattr(module, c))
+    acquisition_modes = {}
+    for name, acquisition_mode in manifest["acquisition_modes"].items():
+        module = LazyPluginModule(
+            plugin_manager, plugin_ref, acquisition_mode["file_name"]
+        )
+        acquisition_modes[name] = functools.partial(
+            LazyAcquisitionMode, module, acquisition_mode["class_name"]
+        )
+    return acquisition_modes
+
+
+def get_plugin_devices(plugin_manager, plugin_ref, manifest) -> dict:
+    """Get the device startup modules of a plugin, which are imported on first use
+
+    Parameters
+    ----------
+    plugin_manager : PluginFileManager or PluginPackageManager
+        plugin manager
+    plugin_ref : str
+        plugin path or package name
+    manifest : dict
+        plugin manifest
+
+    Returns
+    -------
+    devices : dict
+        device_startup_functions module of each device, by device folder name
+    """
+    devices = {}
+    for device, constants in manifest["devices"].items():
+        devices[device] = LazyPluginModule(
+            plugin_manager,
+            plugin_ref,
+            f"model/devices/{device}/device_startup_functions.py",
+            attributes=constants,
+            functions=("load_device", "start_device"),
+        )
+    return devices
 
 
 class PluginPackageManager:
@@ -89,6 +582,31 @@ class PluginPackageManager:
             plugins[plugin_package_name] = plugin_package_name
         return plugins
 
+    @staticmethod
+    def get_plugin_path(package_name: str) -> Optional[str]:
+        """Get the folder of a plugin package without importing it
+
+        Parameters
+        ----------
+        package_name : str
+            package name
+
+        Returns
+        -------
+        package_path : Optional[str]
+            package folder, or `None` if the package can't be found.
+        """
+        try:
+            spec = importlib.util.find_spec(package_name)
+        except (ImportError, ValueError):
+            spec = None
+        if spec is None:
+            logger.debug(f"Plugin package {package_name} not found.")
+            return None
+        if spec.submodule_search_locations:
+            return list(spec.submodule_search_locations)[0]
+        return os.path.dirname(spec.origin)
+
     @staticmethod
     def load_config(package_name: str) -> dict:
         """Load plugin_config.yml
@@ -103,10 +621,31 @@ class PluginPackageManager:
         plugin_config : dict
             plugin configuration
         """
-        package_path = importlib.resources.files(package_name)
+        package_path = PluginPackageManager.get_plugin_path(package_name)
+        if package_path is None:
+            return None
         plugin_config = load_yaml_file(os.path.join(package_path, "plugin_config.yml"))
         return plugin_config
 
+    @staticmethod
+    def load_module(package_name: str, file_name: str):
+        """Load a module of a plugin package
+
+        Parameters
+        ----------
+        package_name : str
+            package name
+        file_name : str
+            python file path relative to the package folder
+
+        Returns
+        -------
+        module : module
+            the plugin module
+        """
+        module_name = os.path.splitext(file_name)[0].replace("/", ".")
+        return importlib.import_module(f"{package_name}.{module_name}")
+
     @staticmethod
     def load_controller(package_name: str, controller_name: str) -> Optional[Any]:
         """Load controller
@@ -169,97 +708,6 @@ class PluginPackageManager:
             logger.debug("Plugin view not found.")
             return None
 
-    @staticmethod
-    def load_feature_lists(package_name, register_func) -> None:
-        """Load feature lists
-
-        Parameters
-        ----------
-        package_name : str
-            package name
-        register_func : func
-            the function to handle feature lists
-        """
-        try:
-            module = importlib.import_module(f"{package_name}.feature_list")
-            register_func(
-                importlib.resources.files(package_name).joinpath("feature_list.py"),
-                module,
-            )
-        except (ImportError, AttributeError):
-            logger.debug("Plugin feature list not found.")
-            pass
-
-    @staticmethod
-    def load_features(package_name):
-        """Load features
-
-        Parameters
-        ----------
-        package_name : str
-            package name
-        """
-        for _, module_name, is_pkg in pkgutil.iter_modules(
-            [importlib.resources.files(package_name).joinpath("model/features")]
-        ):
-            if not is_pkg:
-                full_module_name = f"{package_name}.model.features.{module_name}"
-                try:
-                    module = importlib.import_module(full_module_name)
-                except (ImportError, AttributeError):
-                    logger.debug("Plugin feature not found.")
-                    continue
-                register_features(module)
-
-    @staticmethod
-    def load_acquisition_modes(package_name, acquisition_modes, register_func):
-        """Load acquisition modes
-
-        Parameters
-        ----------
-        package_name : str
-            package name
-        acquisition_modes : []
-            list of acquisition mode configurations
-        register_func : func
-            the function to register acquisition modes
-        """
-        for acquisition_mode_config in acquisition_modes:
-            acquisition_file = acquisition_mode_config["file_name"][:-3]
-            try:
-                module = importlib.import_module(f"{package_name}.{acquisition_file}")
-            except (ImportError, AttributeError):
-                logger.debug("Plugin acquisition mode not found.")
-                continue
-            if module:
-                register_func(acquisition_mode_config["name"], module)
-
-    @staticmethod
-    def load_devices(package_name, register_func):
-        """Load devices
-
-        Parameters
-        ----------
-        package_name : str
-            package name
-        register_func : func
-            the function to register devices
-        """
-        for _, module_name, is_pkg in pkgutil.iter_modules(
-            [importlib.resources.files(package_name).joinpath("model/devices")]
-        ):
-            if is_pkg:
-                full_module_name = (
-                    f"{package_name}.model."
-                    f"devices.{module_name}.device_startup_functions"
-                )
-                try:
-                    module = importlib.import_module(full_module_name)
-                except (ImportError, AttributeError):
-                    logger.debug("Plugin device not found.")
-                    continue
-                register_func(module_name, module)
-
 
 class PluginFileManager:
     """Plugin file manager"""
@@ -311,6 +759,22 @@ class PluginFileManager:
 
         return plugins
 
+    @staticmethod
+    def get_plugin_path(plugin_path):
+        """Get the folder of a plugin
+
+        Parameters
+        ----------
+        plugin_path : str
+            plugin path
+
+        Returns
+        -------
+        plugin_path : str
+            plugin path
+        """
+        return plugin_path
+
     @staticmethod
     def load_config(plugin_path):
         """Load plugin_config.yml
@@ -383,85 +847,22 @@ class PluginFileManager:
         return None
 
     @staticmethod
-    def load_feature_lists(plugin_path, register_func):
-        """Load feature lists
+    def load_module(plugin_path, file_name):
+        """Load a module of a plugin
 
         Parameters
         ----------
         plugin_path : str
             plugin path
-        register_func : func
-            the function to handle feature lists
-        """
-        plugin_feature_list = os.path.join(plugin_path, "feature_list.py")
-        if os.path.exists(plugin_feature_list):
-            module = load_module_from_file("feature_list_temp", plugin_feature_list)
-            register_func(plugin_feature_list, module)
-
-    @staticmethod
-    def load_features(plugin_path):
-        """Load features
+        file_name : str
+            python file path relative to the plugin folder
 
-        Parameters
-        ----------
-        plugin_path : str
-            plugin path
-        """
-        features_dir = os.path.join(plugin_path, "model", "features")
-        features = []
-        if os.path.exists(features_dir):
-            features = os.listdir(features_dir)
-        for feature in features:
-            feature_file = os.path.join(features_dir, feature)
-            if os.path.isfile(feature_file):
-                module = load_module_from_file(feature, feature_file)
-                register_features(module)
-
-    @staticmethod
-    def load_acquisition_modes(plugin_path, acquisition_modes, register_func):
-        """Load acquisition modes
-
-        Parameters
-        ----------
-        plugin_path : str
-            plugin path
-        acquisition_modes : []
-            list of acquisition mode configurations
-        register_func : func
-            the function to register acquisition modes
-        """
-        for acquisition_mode_config in acquisition_modes:
-            acquisition_file = acquisition_mode_config["file_name"]
-            full_path_name = os.path.join(plugin_path, acquisition_file)
-            if os.path.exists(full_path_name):
-                module = load_module_from_file(acquisition_file[:-3], full_path_name)
-                if module:
-                    register_func(acquisition_mode_config["name"], module)
-
-    @staticmethod
-    def load_devices(plugin_path, register_func):
-        """Load devices
-
-        Parameters
-        ----------
-        plugin_path : str
-            plugin path
-        register_func : func
-            the function to register devices
+        Returns
+        -------
+        module : module
+            the plugin module
         """
-        device_dir = os.path.join(plugin_path, "model", "devices")
-        if os.path.exists(device_dir) and os.path.isdir(device_dir):
-            devices = os.listdir(device_dir)
-            for device in devices:
-                device_path = os.path.join(device_dir, device)
-                if not os.path.isdir(device_path):
-                    continue
-                try:
-                    module = load_module_from_file(
-                        "device_module",
-                        os.path.join(device_path, "device_startup_functions.py"),
-                    )
-                except FileNotFoundError:
-                    logger.debug(f"Plugin device {device} not found.")
-                    continue
-                register_func(device, module)
+        module_name = os.path.splitext(os.path.basename(file_name))[0]
+        return load_module_from_file(
+            module_name, os.path.join(plugin_path, *file_name.split("/"))
+        )
@@ -31,8 +31,14 @@
 #
 
 import importlib
+import logging
+from multiprocessing import managers
 from threading import Lock
 
+# Logger Setup
+p = __name__.split(".")[1]
+logger = logging.getLogger(p)
+
 
 def combine_funcs(*funclist):
     """this function will combine a list of functions to a new function
@@ -75,6 +81,31 @@ def build_ref_name(separator, *args):
     return separator.join(alist)
 
 
+def snapshot_proxy_object(proxy):
+    """Copy a nested proxy dict or list to plain python objects.
+
+    Each shared dict or list is fetched with a single `_getvalue()` call instead of
+    one call per value. All the proxies of a manager share the connection of the
+    calling thread.
+
+    Parameters
+    ----------
+    proxy: multiprocessing.managers.BaseProxy
+        the proxy object
+
+    Returns
+    -------
+    result: dict/list
+    """
+    if type(proxy) in (managers.DictProxy, managers.ListProxy):
+        proxy = proxy._getvalue()
+    if type(proxy) is dict:
+        return {k: snapshot_proxy_object(v) for k, v in proxy.items()}
+    if type(proxy) is list:
+        return [snapshot_proxy_object(v) for v in proxy]
+    return proxy
+
+
 def copy_proxy_object(content):
     """This function will serialize proxy dict and list
 
@@ -87,9 +118,13 @@ def copy_proxy_object(content):
     -------
     result: dict/list
     """
-    from multiprocessing import managers
 
     def func(content):
+        if type(content) in (managers.DictProxy, managers.ListProxy):
+            try:
+                return snapshot_proxy_object(content)
+            except Exception as e:
+                logger.debug(f"Copying {content._token} value by value: {e}")
         if type(content) == managers.DictProxy:
             result = {}
             for k in content.keys():
@@ -257,4 +257,231 @@ def create_parser():
         "This file specifies how the logging will be performed.",
     )
 
+    input_args.add_argument(
+        "--trace",
+        type=Path,
+        required=False,
+        default=None,
+        help="Record the timing of each stage of the acquisition pipeline and "
+        "save it on exit to this JSON file (chrome://tracing or Perfetto).",
+    )
+
     return parser
+
+
+def create_headless_parser():
+    """Add headless (GUI-free) acquisition arguments to an ArgumentParser Object.
+
+    Returns
+    -------
+    parser : object
+        ArgumentParserObject with Added Input Arguments"""
+
+    parser = argparse.ArgumentParser(
+        description="navigate Headless Acquisition Command Line Arguments"
+    )
+
+    input_args = parser.add_argument_group("Input Arguments")
+
+    input_args.add_argument(
+        "-sh",
+        "--synthetic-hardware",
+        required=False,
+        default=False,
+        action="store_true",
+        help="Synthetic Hardware - "
+        "Allows running acquisitions without the physical devices attached.",
+    )
+
+    for name, file_name in [
+        ("config", "configuration.yaml"),
+        ("experiment", "experiment.yml"),
+        ("waveform-constants", "waveform_constants.yml"),
+        ("rest-api", "rest_api_config.yml"),
+        ("waveform-templates", "waveform_templates.yml"),
+    ]:
+        input_args.add_argument(
+            f"--{name}-file",
+            type=Path,
+            required=False,
+            default=None,
+            help=f"Non-default path to the {file_name} file.",
+        )
+
+    input_args.add_argument(
+        "--logging-config",
+        type=Path,
+        required=False,
+        default=None,
+        help="Non-default path to the logging.yml config file \n"
+        "This file specifies how the logging will be performed.",
+    )
+
+    acquisition_args = parser.add_argument_group("Acquisition Arguments")
+
+    acquisition_args.add_argument(
+        "--mode",
+        required=False,
+        default=None,
+        choices=["single", "z-stack", "customized"],
+        help="Acquisition mode. Defaults to the mode of the experiment file, or "
+        "'customized' if a feature list is given.",
+    )
+
+    acquisition_args.add_argument(
+        "--feature-list-file",
+        type=Path,
+        required=False,
+        default=None,
+        help="Python file with functions that return feature lists.",
+    )
+
+    acquisition_args.add_argument(
+        "--feature-names",
+        nargs="+",
+        required=False,
+        default=[],
+        help="Names of the feature list functions to load from the feature list "
+        "file. The last one is run.",
+    )
+
+    save_args = acquisition_args.add_mutually_exclusive_group()
+    save_args.add_argument(
+        "--save",
+        dest="save",
+        action="store_true",
+        default=None,
+        help="Save the acquired data.",
+    )
+    save_args.add_argument(
+        "--no-save",
+        dest="save",
+        action="store_false",
+        help="Do not save the acquired data.",
+    )
+
+    acquisition_args.add_argument(
+        "--save-directory",
+        type=Path,
+        required=False,
+        default=None,
+        help="Root directory for saving data. Defaults to the experiment file.",
+    )
+
+    acquisition_args.add_argument(
+        "--repeat",
+        type=int,
+        required=False,
+        default=1,
+        help="Number of times to run the acquisition.",
+    )
+
+    acquisition_args.add_argument(
+        "--timeout",
+        type=float,
+        required=False,
+        default=None,
+        help="Stop the acquisition if no frame arrives for this many seconds.",
+    )
+
+    acquisition_args.add_argument(
+        "--subprocess",
+        required=False,
+        default=False,
+        action="store_true",
+        help="Run the model in a child process, as the GUI does.",
+    )
+
+    report_args = parser.add_argument_group("Report Arguments")
+
+    report_args.add_argument(
+        "--json-log",
+        type=Path,
+        required=False,
+        default=None,
+        help="Append progress, throughput and warnings to this JSON Lines file.",
+    )
+
+    report_args.add_argument(
+        "--progress-interval",
+        type=float,
+        required=False,
+        default=1.0,
+        help="Minimum time between progress reports, in seconds.",
+    )
+
+    report_args.add_argument(
+        "--trace",
+        type=Path,
+        required=False,
+        default=None,
+        help="Record the timing of each stage of the acquisition pipeline, report "
+        "its percentiles and save it on exit to this JSON file (chrome://tracing "
+        "or Perfetto).",
+    )
+
+    report_args.add_argument(
+        "-q",
+        "--quiet",
+        required=False,
+        default=False,
+        action="store_true",
+        help="Do not print reports to stdout.",
+    )
+
+    return parser
+
+
+def evaluate_headless_parser_input_arguments(args):
+    """Retrieve the configuration paths for a headless acquisition.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        Dictionary of parser input arguments, see create_headless_parser()
+
+    Returns
+    -------
+    configuration_path : str
+        Path to configuration file.
+    experiment_path : str
+        Path to experiment file
+    waveform_constants_path : str
+        Path to remote focusing and galvo waveform constants file
+    rest_api_path : str
+        Path to REST API file
+    waveform_templates_path : str
+        Path to waveform templates file
+    logging_path : str
+        Path to non-default logging location
+    """
+    (
+        configuration_path,
+        experiment_path,
+        waveform_constants_path,
+        rest_api_path,
+        waveform_templates_path,
+        _,
+    ) = get_configuration_paths()
+
+    paths = {
+        "config_file": configuration_path,
+        "experiment_file": experiment_path,
+        "waveform_constants_file": waveform_constants_path,
+        "rest_api_file": rest_api_path,
+        "waveform_templates_file": waveform_templates_path,
+        "logging_config": None,
+    }
+    for name in paths:
+        path = getattr(args, name)
+        if path:
+            assert path.exists(), f"{name} Path {path} not valid"
+            paths[name] = path
+
+    if args.feature_list_file:
+        assert (
+            args.feature_list_file.exists()
+        ), f"feature_list_file Path {args.feature_list_file} not valid"
+        assert args.feature_names, "Feature list names are required"
+
+    return tuple(paths.values())
@@ -31,12 +31,14 @@
 
 # Standard library imports
 from math import ceil
+from multiprocessing.managers import ListProxy
 
 # Third party imports
 import numpy as np
 import pandas as pd
 
 # Local application imports
+from navigate.tools.common_functions import copy_proxy_object
 
 
 def sign(x):
@@ -245,3 +247,356 @@ def update_table(table, pos, append=False):
     table.resetColors()
     table.redraw()
     table.tableChanged()
+
+
+def positions_to_array(positions):
+    """Convert multi-position table entries to an (N, 5) float array.
+
+    Parameters
+    ----------
+    positions : list, np.array, pandas.DataFrame or ListProxy
+        Rows of X, Y, Z, R, F positions. Extra columns are ignored.
+
+    Returns
+    -------
+    np.array
+        Positions in the order (x, y, z, theta, f). Entries that are missing or
+        can not be converted to a number are NaN.
+    """
+    if type(positions) is ListProxy:
+        # Fetch all rows with one call to the manager
+        positions = copy_proxy_object(positions._getvalue())
+    if not isinstance(positions, pd.DataFrame):
+        try:
+            # Fast path for well-formed tables
+            array = np.array(positions, dtype=float)
+        except (TypeError, ValueError):
+            array = None
+        if array is not None and array.size == 0:
+            return np.empty((0, 5), dtype=float)
+        if array is not None and array.ndim == 2 and array.shape[1] >= 5:
+            return array[:, :5]
+        positions = pd.DataFrame(list(positions))
+
+    frame = positions.iloc[:, :5].apply(pd.to_numeric, errors="coerce")
+    array = frame.to_numpy(dtype=float, na_value=np.nan)
+    if array.shape[1] < 5:
+        array = np.hstack(
+            (array, np.full((array.shape[0], 5 - array.shape[1]), np.nan))
+        )
+    return array
+
+
+def validate_positions(positions, stage_config=None):
+    """Find the valid rows of a multi-position table.
+
+    Parameters
+    ----------
+    positions : np.array
+        (N, 5) array of positions in the order (x, y, z, theta, f).
+    stage_config : dict, optional
+        The stage configuration of a microscope, e.g.
+        configuration["configuration"]["microscopes"][microscope_name]["stage"].
+        If given, positions outside of the ``{axis}_min`` and ``{axis}_max`` stage
+        limits are invalid.
+
+    Returns
+    -------
+    np.array
+        Boolean mask, True for each row with finite values within the stage limits.
+    """
+    positions = np.asarray(positions, dtype=float).reshape(-1, 5)
+    valid = np.isfinite(positions).all(axis=1)
+    if stage_config is not None:
+        lower, upper = np.full(5, -np.inf), np.full(5, np.inf)
+        for i, axis in enumerate(["x", "y", "z", "theta", "f"]):
+            try:
+                lower[i] = float(stage_config.get(f"{axis}_min", -np.inf))
+                upper[i] = float(stage_config.get(f"{axis}_max", np.inf))
+            except (TypeError, ValueError):
+                lower[i], upper[i] = -np.inf, np.inf
+        valid &= ((positions >= lower) & (positions <= upper)).all(axis=1)
+    return valid
+
+
+def load_positions_from_csv(filename):
+    """Load a multi-position table from a csv file.
+
+    Parameters
+    ----------
+    filename : str
+        Path to a csv file with the header X, Y, Z, R, F.
+
+    Returns
+    -------
+    np.array
+        (N, 5) array of positions in the order (x, y, z, theta, f).
+
+    Raises
+    ------
+    ValueError
+        If the csv file does not have the columns X, Y, Z, R, F.
+    """
+    df = pd.read_csv(filename, float_precision="round_trip")
+    columns = [str(column).strip().upper() for column in df.columns]
+    if columns != list("XYZRF"):
+        raise ValueError("The csv file should contain the columns [X, Y, Z, R, F]")
+    return positions_to_array(df)
+
+
+def save_positions_to_csv(filename, positions):
+    """Save a multi-position table to a csv file.
+
+    Parameters
+    ----------
+    filename : str
+        Path to the csv file.
+    positions : list, np.array or pandas.DataFrame
+        Rows of X, Y, Z, R, F positions.
+    """
+    frame = pd.DataFrame(positions_to_array(positions), columns=list("XYZRF"))
+    frame.to_csv(filename, index=False)
+
+
+def get_axis_speeds(stage_config, default_speed=1000.0, default_theta_speed=10.0):
+    """Read the per-axis travel speed from a stage configuration.
+
+    Speeds are read from optional ``{axis}_speed`` entries of the microscope stage
+    configuration, in stage units (um or degrees) per second.
+
+    Parameters
+    ----------
+    stage_config : dict
+        The stage configuration of a microscope, e.g.
+        configuration["configuration"]["microscopes"][microscope_name]["stage"]
+    default_speed : float
+        Speed used for x, y, z and f if not specified, in um/s.
+    default_theta_speed : float
+        Speed used for theta if not specified, in degrees/s.
+
+    Returns
+    -------
+    np.array
+        Speed of each axis in the order (x, y, z, theta, f).
+    """
+    speeds = []
+    for axis in ["x", "y", "z", "theta", "f"]:
+        default = default_theta_speed if axis == "theta" else default_speed
+        try:
+            speed = float(stage_config.get(f"{axis}_speed", default))
+        except (TypeError, ValueError):
+            speed = default
+        speeds.append(speed if speed > 0 else default)
+    return np.array(speeds, dtype=float)
+
+
+def position_travel_times(positions, speeds, weights=None, targets=None):
+    """Estimate the time to move between positions.
+
+    All axes are assumed to move concurrently, so the time of a move is set by the
+    slowest axis.
+
+    Parameters
+    ----------
+    positions : np.array
+        (n_positions x (x, y, z, theta, f)) array of positions.
+    speeds : np.array
+        Speed of each axis (x, y, z, theta, f).
+    weights : np.array, optional
+        Penalty applied to the travel time of each axis, e.g. to discourage theta
+        and focus changes.
+    targets : np.array, optional
+        (m_positions x 5) array of positions to move to. Defaults to positions.
+
+    Returns
+    -------
+    np.array
+        (n_positions x m_positions) array of move times.
+    """
+    positions = np.asarray(positions, dtype=float)
+    targets = positions if targets is None else np.asarray(targets, dtype=float)
+    scale = 1.0 / np.asarray(speeds, dtype=float)
+    if weights is not None:
+        scale = scale * np.asarray(weights, dtype=float)
+    times = np.zeros((positions.shape[0], targets.shape[0]))
+    for i in range(5):
+        np.maximum(
+            times,
+            np.abs(positions[:, i, None] - targets[None, :, i]) * scale[i],
+            out=times,
+        )
+    return times
+
+
+def path_travel_time(positions, speeds, weights=None):
+    """Estimate the time to visit positions in the given order.
+
+    Parameters
+    ----------
+    positions : np.array
+        (n_positions x (x, y, z, theta, f)) array of positions, in the order they
+        are visited.
+    speeds : np.array
+        Speed of each axis (x, y, z, theta, f).
+    weights : np.array, optional
+        Penalty applied to the travel time of each axis.
+
+    Returns
+    -------
+    float
+        The sum of the move times along the path.
+    """
+    positions = np.asarray(positions, dtype=float)
+    scale = 1.0 / np.asarray(speeds, dtype=float)
+    if weights is not None:
+        scale = scale * np.asarray(weights, dtype=float)
+    times = np.abs(np.diff(positions, axis=0)) * scale
+    return float(times.max(axis=1, initial=0).sum())
+
+
+def _nearest_neighbor_path(nodes, speeds, weights, cost=None):
+    """Build an open path starting at node 0 by always moving to the closest
+    unvisited node. Rows of the cost matrix are computed on the fly if it is not
+    given."""
+    n = nodes.shape[0]
+    path = np.zeros(n, dtype=int)
+    visited = np.zeros(n, dtype=bool)
+    visited[0] = True
+    for i in range(1, n):
+        if cost is None:
+            row = position_travel_times(
+                nodes[path[i - 1], None], speeds, weights, nodes
+            )[0]
+        else:
+            row = cost[path[i - 1]]
+        row = np.where(visited, np.inf, row)
+        path[i] = np.argmin(row)
+        visited[path[i]] = True
+    return path
+
+
+def _two_opt(path, cost, max_iterations):
+    """Reverse path segments while it shortens the open path. Node 0 stays first."""
+    n = len(path)
+    for _ in range(max_iterations):
+        improved = False
+        for i in range(1, n - 1):
+            j = np.arange(i + 1, n)
+            a, b = path[i - 1], path[i]
+            c = path[j]
+            # the last node has no outgoing edge in an open path
+            d = path[np.minimum(j + 1, n - 1)]
+            last = j == n - 1
+            delta = cost[a, c] - cost[a, b]
+            delta += np.where(last, 0, cost[b, d] - cost[c, d])
+            k = np.argmin(delta)
+            if delta[k] < -1e-9:
+                path[i : j[k] + 1] = path[i : j[k] + 1][::-1]
+                improved = True
+        if not improved:
+            break
+    return path
+
+
+def _or_opt(path, cost, max_iterations, max_segment=3):
+    """Move short path segments to their cheapest position while it shortens the
+    open path. Node 0 stays first."""
+    n = len(path)
+    for _ in range(max_iterations):
+        improved = False
+        for length in range(1, max_segment + 1):
+            i = 1
+            while i + length <= n:
+                seg = path[i : i + length]
+                s0, s1 = seg[0], seg[-1]
+                prev = path[i - 1]
+                if i + length < n:
+                    nxt = path[i + length]
+                    gain = cost[prev, s0] + cost[s1, nxt] - cost[prev, nxt]
+                else:
+                    gain = cost[prev, s0]
+                rest = np.concatenate((path[:i], path[i + length :]))
+                # insert the segment after rest[k]
+                insert = np.empty(len(rest))
+                insert[:-1] = (
+                    cost[rest[:-1], s0] + cost[s1, rest[1:]] - cost[rest[:-1], rest[1:]]
+                )
+                insert[-1] = cost[rest[-1], s0]
+                k = np.argmin(insert)
+                if gain - insert[k] > 1e-9:
+                    path = np.concatenate((rest[: k + 1], seg, rest[k + 1 :]))
+                    improved = True
+                i += 1
+        if not improved:
+            break
+    return path
+
+
+def optimize_position_order(
+    positions,
+    speeds,
+    start_position=None,
+    weights=None,
+    refine=True,
+    max_iterations=20,
+    refine_limit=2000,
+):
+    """Reorder positions to minimize the (weighted) time spent moving the stage.
+
+    A nearest-neighbour path is built first and, for tables of up to
+    `refine_limit` positions, refined with 2-opt and Or-opt moves.
+
+    Parameters
+    ----------
+    positions : list or np.array
+        (n_positions x (x, y, z, theta, f)) positions.
+    speeds : np.array
+        Speed of each axis (x, y, z, theta, f).
+    start_position : list or np.array, optional
+        Stage position (x, y, z, theta, f) the path starts from. Defaults to the
+        first position in the table.
+    weights : np.array, optional
+        Penalty applied to the travel time of each axis when choosing the order.
+    refine : bool
+        Refine the nearest-neighbour path with 2-opt and Or-opt moves.
+    max_iterations : int
+        Maximum number of passes of each refinement.
+    refine_limit : int
+        Skip refinement for larger tables.
+
+    Returns
+    -------
+    order : np.array
+        Indices of the original positions in the order they should be visited.
+    original_time : float
+        Estimated travel time of the table order in seconds.
+    optimized_time : float
+        Estimated travel time of the optimized order in seconds.
+    """
+    positions = np.asarray(positions, dtype=float).reshape(-1, 5)
+    n = positions.shape[0]
+    if n == 0:
+        return np.zeros(0, dtype=int), 0.0, 0.0
+    if start_position is None:
+        start_position = positions[0]
+    nodes = np.vstack(
+        [np.asarray(start_position, dtype=float).reshape(1, 5), positions]
+    )
+
+    # the full cost matrix is only built for tables that are refined
+    cost = None
+    if refine and n <= refine_limit:
+        cost = position_travel_times(nodes, speeds, weights)
+    path = _nearest_neighbor_path(nodes, speeds, weights, cost)
+    if cost is not None:
+        path = _two_opt(path, cost, max_iterations)
+        path = _or_opt(path, cost, max_iterations)
+
+    original_time = path_travel_time(nodes, speeds)
+    optimized_time = path_travel_time(nodes[path], speeds)
+    if optimized_time > original_time:
+        # keep the table order if it can not be improved
+        path = np.arange(n + 1)
+        optimized_time = original_time
+
+    return path[1:] - 1, original_time, optimized_time
@@ -0,0 +1,337 @@
+# Copyright (c) 2021-2024  The University of Texas Southwestern Medical Center.
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted for academic and research use only
+# (subject to the limitations in the disclaimer below)
+# provided that the following conditions are met:
+
+#      * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#      * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+
+#      * Neither the name of the copyright holders nor the names of its
+#      contributors may be used to endorse or promote products derived from this
+#      software without specific prior written permission.
+
+# NO EXPRESS OR IMPLIED LICENSES TO ANY PARTY'S PATENT RIGHTS ARE GRANTED BY
+# THIS LICENSE. THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+# PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+# Standard Library Imports
+import os
+import json
+import math
+import threading
+from contextlib import nullcontext
+from itertools import count
+from queue import Full
+from time import perf_counter, perf_counter_ns
+
+# Third Party Imports
+import numpy as np
+
+# Local Imports
+
+#: int: Number of histogram bins per decade of span duration.
+BINS_PER_DECADE = 20
+
+#: int: Number of histogram bins, covering 1 ns to 1000 s.
+NUMBER_OF_BINS = 12 * BINS_PER_DECADE
+
+#: contextlib.nullcontext: The span returned while tracing is disabled.
+_NULL_SPAN = nullcontext()
+
+
+class _Span:
+    """Context manager that records one span in a Tracer."""
+
+    __slots__ = ("tracer", "name", "frame", "start")
+
+    def __init__(self, tracer, name, frame):
+        self.tracer = tracer
+        self.name = name
+        self.frame = frame
+        self.start = 0
+
+    def __enter__(self):
+        self.start = perf_counter_ns()
+        return self
+
+    def __exit__(self, *args):
+        self.tracer.end(self.name, self.start, self.frame)
+
+
+class Tracer:
+    """Low-overhead tracing of the acquisition pipeline.
+
+    Spans (e.g. waiting for the camera, running a feature, writing a frame) are
+    recorded with monotonic nanosecond timestamps into a preallocated ring buffer,
+    and aggregated into per-stage log-scale histograms from which percentiles are
+    computed. While tracing is disabled, `begin()`, `end()` and `span()` return
+    immediately, so the instrumentation can stay in the hot path.
+
+    Timestamps come from time.perf_counter_ns(), which is a system-wide monotonic
+    clock on the supported platforms, so the events of the model and the controller
+    processes can be merged into one trace.
+    """
+
+    def __init__(self, capacity=65536, enabled=False):
+        """Initialize the Tracer.
+
+        Parameters
+        ----------
+        capacity : int
+            Number of spans kept in the ring buffer.
+        enabled : bool
+            Record spans.
+        """
+        #: bool: Record spans.
+        self.enabled = enabled
+
+        #: int: Number of spans kept in the ring buffer.
+        self.capacity = 0
+
+        #: float: Last time the summary was published, in seconds.
+        self.last_publish_time = 0
+
+        self.reset(capacity)
+
+    def reset(self, capacity=None):
+        """Discard all recorded spans.
+
+        Parameters
+        ----------
+        capacity : int, optional
+            New capacity of the ring buffer.
+        """
+        if capacity is not None:
+            self.capacity = int(capacity)
+        # Plain lists are cheaper to write element-wise than numpy arrays.
+        self._names = [None] * self.capacity
+        self._starts = [0] * self.capacity
+        self._durations = [0] * self.capacity
+        self._frames = [-1] * self.capacity
+        self._threads = [0] * self.capacity
+        # next() on itertools.count is atomic, so threads never share a slot.
+        self._counter = count()
+        self._recorded = 0
+        # thread id -> thread name, the threads may be gone when the trace is saved
+        self._thread_names = {}
+        # stage name -> [histogram, count, total duration, maximum duration]
+        self._stages = {}
+
+    def configure(self, enabled=None, capacity=None):
+        """Enable or disable tracing and/or resize the ring buffer.
+
+        Parameters
+        ----------
+        enabled : bool, optional
+            Record spans.
+        capacity : int, optional
+            Number of spans kept in the ring buffer. Changing it discards all
+            recorded spans.
+        """
+        if capacity is not None and int(capacity) != self.capacity:
+            self.reset(capacity)
+        if enabled is not None:
+            self.enabled = bool(enabled)
+
+    def begin(self):
+        """Start a span.
+
+        Returns
+        -------
+        int
+            Start time in nanoseconds, 0 if tracing is disabled.
+        """
+        return perf_counter_ns() if self.enabled else 0
+
+    def end(self, name, start, frame=-1):
+        """Finish a span started with begin().
+
+        Parameters
+        ----------
+        name : str
+            Name of the pipeline stage.
+        start : int
+            Value returned by begin().
+        frame : int
+            Id of the frame the span belongs to, -1 if none.
+        """
+        if not start:
+            return
+        duration = perf_counter_ns() - start
+        i = next(self._counter) % self.capacity
+        self._names[i] = name
+        self._starts[i] = start
+        self._durations[i] = duration
+        self._frames[i] = frame
+        self._threads[i] = tid = threading.get_ident()
+        self._recorded += 1
+        if tid not in self._thread_names:
+            self._thread_names[tid] = threading.current_thread().name
+
+        stage = self._stages.get(name)
+        if stage is None:
+            stage = self._stages.setdefault(name, [[0] * NUMBER_OF_BINS, 0, 0, 0])
+        b = int(math.log10(duration) * BINS_PER_DECADE) if duration > 1 else 0
+        stage[0][min(b, NUMBER_OF_BINS - 1)] += 1
+        stage[1] += 1
+        stage[2] += duration
+        if duration > stage[3]:
+            stage[3] = duration
+
+    def span(self, name, frame=-1):
+        """Context manager that records the enclosed block as a span.
+
+        Parameters
+        ----------
+        name : str
+            Name of the pipeline stage.
+        frame : int
+            Id of the frame the span belongs to, -1 if none.
+
+        Returns
+        -------
+        context manager
+            Records the span on exit. A shared no-op context if tracing is disabled.
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, frame)
+
+    def summary(self, percentiles=(50, 90, 99)):
+        """Aggregate the recorded spans per pipeline stage.
+
+        Percentiles are read from the histograms and are accurate to about 12%.
+
+        Parameters
+        ----------
+        percentiles : tuple
+            Percentiles to report.
+
+        Returns
+        -------
+        dict
+            {stage: {"count", "mean_ms", "p50_ms", ..., "max_ms"}}
+        """
+        # bin b holds durations in [10**(b/BINS_PER_DECADE), 10**((b+1)/...)) ns
+        centers_ms = 10 ** ((np.arange(NUMBER_OF_BINS) + 0.5) / BINS_PER_DECADE) / 1e6
+        summary = {}
+        for name, (histogram, number, total, maximum) in list(self._stages.items()):
+            if number == 0:
+                continue
+            cumulative = np.cumsum(histogram)
+            stage_summary = {"count": number, "mean_ms": total / number / 1e6}
+            for q in percentiles:
+                b = int(np.searchsorted(cumulative, q / 100 * cumulative[-1]))
+                stage_summary[f"p{q}_ms"] = min(float(centers_ms[b]), maximum / 1e6)
+            stage_summary["max_ms"] = maximum / 1e6
+            summary[name] = stage_summary
+        return summary
+
+    def publish(self, event_queue, interval=1.0):
+        """Put the summary on an event queue as a ('tracing', summary) event.
+
+        Parameters
+        ----------
+        event_queue : multiprocessing.Queue
+            Event queue of the model.
+        interval : float
+            Minimum time between two events, in seconds.
+        """
+        if not self.enabled or event_queue is None:
+            return
+        current_time = perf_counter()
+        if current_time - self.last_publish_time < interval:
+            return
+        self.last_publish_time = current_time
+        try:
+            event_queue.put_nowait(("tracing", self.summary()))
+        except Full:
+            pass
+
+    def events(self):
+        """Return the spans in the ring buffer as Chrome trace events.
+
+        Returns
+        -------
+        list
+            Complete ('X') events, oldest first, with timestamps in microseconds.
+        """
+        recorded = min(self._recorded, self.capacity)
+        first = self._recorded - recorded
+        pid = os.getpid()
+        events = []
+        for i in range(first, first + recorded):
+            i %= self.capacity
+            if self._names[i] is None:
+                continue
+            event = {
+                "name": self._names[i],
+                "cat": "navigate",
+                "ph": "X",
+                "ts": self._starts[i] / 1000,
+                "dur": self._durations[i] / 1000,
+                "pid": pid,
+                "tid": self._threads[i],
+            }
+            if self._frames[i] >= 0:
+                event["args"] = {"frame": self._frames[i]}
+            events.append(event)
+        for tid in {event["tid"] for event in events}:
+            events.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": pid,
+                    "tid": tid,
+                    "args": {"name": self._thread_names.get(tid, str(tid))},
+                }
+            )
+        return events
+
+    def dump_chrome_trace(self, filename, events=None, summary=None):
+        """Write a trace that can be opened in chrome://tracing or Perfetto.
+
+        Parameters
+        ----------
+        filename : str
+            Path of the JSON file.
+        events : list, optional
+            Events to write, e.g. merged from several processes. Defaults to the
+            events of this tracer.
+        summary : dict, optional
+            Stage percentiles to store with the events. Defaults to the summary of
+            this tracer.
+        """
+        if events is None:
+            events = self.events()
+        if summary is None:
+            summary = self.summary()
+        with open(filename, "w") as f:
+            json.dump(
+                {
+                    "traceEvents": events,
+                    "displayTimeUnit": "ms",
+                    "otherData": {"summary": summary},
+                },
+                f,
+            )
+
+
+#: Tracer: The tracer of this process.
+tracer = Tracer()
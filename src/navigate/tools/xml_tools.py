@@ -48,42 +48,63 @@ def dict_to_xml(d, tag=None, level=0):
     xml : str
         String of XML tags produced from dictionary.
     """
+    return "".join(iter_xml(d, tag, level))
+
+
+def iter_xml(d, tag=None, level=0):
+    """Stream a Python dictionary as XML.
+
+    Yields the same text as dict_to_xml() in pieces, so large documents can be
+    written to file without building the whole XML string in memory.
+
+    Parameters
+    ----------
+    d: dict
+        Dictionary to parse to XML.
+    tag : str
+        Root key of dictionary
+    level : int
+        Indentation level of the root tag
+
+    Yields
+    ------
+    xml : str
+        Pieces of the XML produced from dictionary.
+    """
 
     if tag is None:
         tag = list(d.keys())[0]
 
     xml = "  " * level + f"<{tag}"
-    if isinstance(d, dict):
-        next_xml = ""
-        text = ""
-        next_level = level + 1
-        for k, v in d.items():
-            if isinstance(v, dict):
-                # Not a leaf node
-                next_xml += dict_to_xml(v, k, next_level)
-            elif isinstance(v, list):
-                for el in v:
-                    next_xml += dict_to_xml(el, k, next_level)
-            else:
-                if k == "text":
-                    text = str(v)
-                else:
-                    xml += f' {k}="{v}"'
-        if text != "" or next_xml != "":
-            xml += ">"
-            if text != "":
-                xml += text
-            if next_xml != "":
-                xml += f"\n{next_xml}"
-            if text != "":
-                xml += f"</{tag}>\n"
-            else:
-                xml += "  " * level
-                xml += f"</{tag}>\n"
+    if not isinstance(d, dict):
+        yield xml
+        return
+
+    children = []
+    text = ""
+    for k, v in d.items():
+        if isinstance(v, dict):
+            # Not a leaf node
+            children.append((k, v))
+        elif isinstance(v, list):
+            children.extend((k, el) for el in v)
+        elif k == "text":
+            text = str(v)
         else:
-            xml += "/>\n"
+            xml += f' {k}="{v}"'
 
-    return xml
+    if text == "" and len(children) == 0:
+        yield xml + "/>\n"
+        return
+
+    xml += ">" + text
+    if len(children) > 0:
+        yield xml + "\n"
+        next_level = level + 1
+        for k, v in children:
+            yield from iter_xml(v, k, next_level)
+        xml = "" if text != "" else "  " * level
+    yield xml + f"</{tag}>\n"
 
 
 def parse_xml(root: ET.Element) -> dict:
@@ -219,6 +219,7 @@ class AdaptiveOpticsPopup:
             "Pixel Max",
             "Pixel Average",
             "DCT Shannon Entropy",
+            "Fourier Annulus",
         )
         tw_metric_combo.state(["readonly"])
         tw_metric_combo.grid(row=6, column=1, pady=5)
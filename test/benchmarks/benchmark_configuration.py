@@ -0,0 +1,169 @@
+# Copyright (c) 2021-2024  The University of Texas Southwestern Medical Center.
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted for academic and research use only
+# (subject to the limitations in the disclaimer below)
+# provided that the following conditions are met:
+
+#      * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#      * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+
+#      * Neither the name of the copyright holders nor the names of its
+#      contributors may be used to endorse or promote products derived from this
+#      software without specific prior written permission.
+
+# NO EXPRESS OR IMPLIED LICENSES TO ANY PARTY'S PATENT RIGHTS ARE GRANTED BY
+# THIS LICENSE. THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+# PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""Benchmark of loading, verifying and copying the shared configuration.
+
+Run with ``python -m test.benchmarks.benchmark_configuration``.
+"""
+
+# Standard Library Imports
+import argparse
+import os
+import tempfile
+import timeit
+from multiprocessing import Manager, managers
+
+# Third Party Imports
+import yaml
+
+# Local Imports
+from navigate.config import config
+from navigate.tools.common_functions import copy_proxy_object
+
+
+def reference_build_nested_dict(manager, parent_dict, key_name, dict_data):
+    """Share a configuration value by value, for comparison."""
+    if type(dict_data) != dict and type(dict_data) != list:
+        parent_dict[key_name] = dict_data
+        return
+    if type(dict_data) == dict:
+        d = manager.dict()
+        for k in dict_data:
+            reference_build_nested_dict(manager, d, k, dict_data[k])
+    else:
+        d = manager.list()
+        for i, v in enumerate(dict_data):
+            d.append(None)
+            reference_build_nested_dict(manager, d, i, v)
+    parent_dict[key_name] = d
+
+
+def reference_copy_proxy_object(content):
+    """Copy a shared configuration value by value, for comparison."""
+    if type(content) == managers.DictProxy:
+        return {k: reference_copy_proxy_object(content[k]) for k in content.keys()}
+    if type(content) == managers.ListProxy:
+        return [reference_copy_proxy_object(v) for v in content]
+    return content
+
+
+def write_experiment(path, positions):
+    """Write an experiment file with a multi-position table.
+
+    Parameters
+    ----------
+    path : str
+        Directory of the experiment file
+    positions : int
+        Number of rows of the multi-position table
+
+    Returns
+    -------
+    str
+        Experiment file path
+    """
+    config_path = os.path.dirname(config.__file__)
+    with open(os.path.join(config_path, "experiment.yml")) as f:
+        experiment = yaml.load(f, Loader=yaml.FullLoader)
+    experiment["MultiPositions"] = [
+        [float(i), float(i), 15500.0, 0.0, 70000.0] for i in range(positions)
+    ]
+    file_name = os.path.join(path, "experiment.yml")
+    with open(file_name, "w") as f:
+        yaml.dump(experiment, f)
+    return file_name
+
+
+def run(positions, repeat):
+    """Time the configuration at start up and when it is saved.
+
+    Parameters
+    ----------
+    positions : list
+        Numbers of rows of the multi-position table
+    repeat : int
+        Number of calls to average over
+    """
+    config_path = os.path.dirname(config.__file__)
+    manager = Manager()
+    print(f"{'step':<40}{'positions':>10}{'time (ms)':>12}")
+    with tempfile.TemporaryDirectory() as path:
+        for n in positions:
+            config_files = {
+                "configuration": os.path.join(config_path, "configuration.yaml"),
+                "experiment": write_experiment(path, n),
+                "waveform_constants": os.path.join(
+                    config_path, "waveform_constants.yml"
+                ),
+            }
+            plain = config.load_configs(None, **config_files)
+
+            def build():
+                d = manager.dict()
+                for k, v in plain.items():
+                    reference_build_nested_dict(manager, d, k, v)
+
+            def verify_shared():
+                c = config.load_configs(manager, **config_files)
+                config.verify_configuration(manager, c)
+                config.verify_experiment_config(manager, c)
+                config.verify_waveform_constants(manager, c)
+
+            def verify_plain():
+                c = config.load_configs(None, **config_files)
+                config.verify_configuration(None, c)
+                config.verify_experiment_config(None, c)
+                config.verify_waveform_constants(None, c)
+                config.publish_config(manager, c)
+
+            shared = config.publish_config(manager, plain)
+            steps = {
+                "share value by value": build,
+                "publish_config": lambda: config.publish_config(manager, plain),
+                "load and verify (shared)": verify_shared,
+                "load and verify (plain), publish": verify_plain,
+                "copy value by value": lambda: reference_copy_proxy_object(shared),
+                "copy_proxy_object": lambda: copy_proxy_object(shared),
+            }
+            for name, func in steps.items():
+                t = timeit.timeit(func, number=repeat) / repeat
+                print(f"{name:<40}{n:>10}{t * 1000:>12.3f}")
+    manager.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--positions", type=int, nargs="+", default=[10, 1000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    run(args.positions, args.repeat)
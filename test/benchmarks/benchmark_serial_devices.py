@@ -0,0 +1,365 @@
+# Copyright (c) 2021-2024  The University of Texas Southwestern Medical Center.
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted for academic and research use only
+# (subject to the limitations in the disclaimer below)
+# provided that the following conditions are met:
+
+#      * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#      * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+
+#      * Neither the name of the copyright holders nor the names of its
+#      contributors may be used to endorse or promote products derived from this
+#      software without specific prior written permission.
+
+# NO EXPRESS OR IMPLIED LICENSES TO ANY PARTY'S PATENT RIGHTS ARE GRANTED BY
+# THIS LICENSE. THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+# PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""Benchmark of the serial device drivers against their protocol emulators.
+
+Measures the command rate, the move-to-settled latency and the polling overhead of
+each driver. The overhead is the settle time beyond the emulated motion. Run with
+``python -m test.benchmarks.benchmark_serial_devices``.
+"""
+
+# Standard Library Imports
+import argparse
+import contextlib
+import time
+
+# Third Party Imports
+import serial
+
+# Local Imports
+from navigate.model.devices.emulators.asi import MS2000Emulator, TigerEmulator
+from navigate.model.devices.emulators.serial_port import EmulatedSerial, PtyTransport
+from navigate.model.devices.emulators.sutter import (
+    MP285Emulator,
+    SutterFilterWheelEmulator,
+)
+from navigate.model.devices.APIs.asi.asi_tiger_controller import TigerController
+from navigate.model.devices.APIs.asi.asi_MS2000_controller import MS2000Controller
+from navigate.model.devices.APIs.sutter.MP285 import MP285
+from navigate.model.devices.filter_wheel.asi import ASIFilterWheel
+from navigate.model.devices.filter_wheel.sutter import SutterFilterWheel
+from navigate.model.devices.stages.asi import ASIStage
+
+
+def connect(emulator, transport, stack):
+    """Serve an emulator on a transport.
+
+    Parameters
+    ----------
+    emulator : SerialEmulator
+        Emulated device
+    transport : str
+        "emulated" for an in-process port, "pty" for a pseudo-terminal
+    stack : contextlib.ExitStack
+        Stops the pseudo-terminal on exit
+
+    Returns
+    -------
+    port : str
+        Port name
+    serial_port : EmulatedSerial or None
+        In-process port, to use instead of opening the port name
+    """
+    if transport == "pty":
+        return stack.enter_context(PtyTransport(emulator)).port, None
+    return "emulated", EmulatedSerial(emulator)
+
+
+def command_rate(func, repeat):
+    """Return the number of calls of func per second."""
+    start_time = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return repeat / (time.perf_counter() - start_time)
+
+
+def time_moves(moves, emulator, poll_command):
+    """Time moves and count the status requests they send.
+
+    Parameters
+    ----------
+    moves : list
+        (move, motion_time) pairs: move() moves and waits until it is done,
+        motion_time() returns the emulated duration of the move before it starts.
+    emulator : SerialEmulator
+        Emulated device
+    poll_command : str or bytes
+        Name of the status request, None if the driver does not poll
+
+    Returns
+    -------
+    dict
+        Mean settle time, motion time, overhead and status requests per move
+    """
+    settle, motion, polls = 0.0, 0.0, 0
+    for move, motion_time in moves:
+        motion += motion_time()
+        count = emulator.command_counts.get(poll_command, 0)
+        start_time = time.perf_counter()
+        move()
+        settle += time.perf_counter() - start_time
+        polls += emulator.command_counts.get(poll_command, 0) - count
+    n = len(moves)
+    return {
+        "settle": settle / n,
+        "motion": motion / n,
+        "overhead": (settle - motion) / n,
+        "polls": polls / n if poll_command is not None else None,
+    }
+
+
+def tiger_controller(emulator, transport, stack):
+    """Connect a TigerController to an emulator."""
+    port, serial_port = connect(emulator, transport, stack)
+    controller = TigerController(port, 115200)
+    if serial_port is not None:
+        controller.serial_port = serial_port
+    controller.connect_to_serial()
+    return controller
+
+
+def bench_tiger(transport, stack, latency, moves, repeat, step=5.0):
+    """Benchmark the TigerController with and without the ASIStage motion model."""
+    emulator = TigerEmulator(latency=latency)
+    controller = tiger_controller(emulator, transport, stack)
+    # the speed ASIStage sets
+    controller.set_speed_as_percent_max(0.9)
+    rate = command_rate(lambda: controller.get_position(["X", "Y", "Z"]), repeat)
+    axis = emulator.axes["X"]
+
+    def controller_move(i):
+        position = step * 10 * ((i + 1) % 2)
+        return (
+            lambda: (controller.move({"X": position}), controller.wait_for_device()),
+            lambda: axis.move_time(position - axis.target_position),
+        )
+
+    results = {
+        "TigerController": dict(
+            rate=rate,
+            **time_moves([controller_move(i) for i in range(moves)], emulator, "/"),
+        )
+    }
+
+    configuration = {
+        "configuration": {
+            "microscopes": {
+                "benchmark": {
+                    "zoom": {"pixel_size": {"1x": 1.0}},
+                    "stage": {
+                        "hardware": {"axes": ["x", "y", "z", "f"]},
+                        "x_min": -1e6,
+                        "x_max": 1e6,
+                        "y_min": -1e6,
+                        "y_max": 1e6,
+                        "z_min": -1e6,
+                        "z_max": 1e6,
+                        "f_min": -1e6,
+                        "f_max": 1e6,
+                    },
+                }
+            }
+        }
+    }
+    stage = ASIStage("benchmark", controller, configuration)
+    stage.report_position()
+
+    def stage_move(i):
+        position = step * ((i + 1) % 2)
+        return (
+            lambda: stage.move_absolute({"z_abs": position}, wait_until_done=True),
+            lambda: axis.move_time(position * 10 - axis.target_position),
+        )
+
+    # the stage positions are not reported between the moves of a z-stack
+    results["ASIStage (motion model)"] = dict(
+        rate=rate,
+        **time_moves([stage_move(i) for i in range(moves)], emulator, "/"),
+    )
+    return results
+
+
+def bench_ms2000(transport, stack, latency, moves, repeat, step=5.0):
+    """Benchmark the MS2000Controller."""
+    emulator = MS2000Emulator(latency=latency)
+    port, serial_port = connect(emulator, transport, stack)
+    controller = MS2000Controller(port, 115200)
+    if serial_port is not None:
+        controller.serial_port = serial_port
+    controller.connect_to_serial()
+    rate = command_rate(lambda: controller.get_position(["X", "Y", "Z"]), repeat)
+    axis = emulator.axes["X"]
+
+    def move(i):
+        position = step * 10 * ((i + 1) % 2)
+        return (
+            lambda: (controller.move({"X": position}), controller.wait_for_device()),
+            lambda: axis.move_time(position - axis.target_position),
+        )
+
+    return {
+        "MS2000Controller": dict(
+            rate=rate, **time_moves([move(i) for i in range(moves)], emulator, "/")
+        )
+    }
+
+
+def bench_mp285(transport, stack, latency, moves, repeat, step=5.0):
+    """Benchmark the Sutter MP285."""
+    emulator = MP285Emulator(latency=latency)
+    port, serial_port = connect(emulator, transport, stack)
+    stage = MP285(port, 9600)
+    if serial_port is not None:
+        stage.serial = serial_port
+    stage.connect_to_serial()
+    stage.set_resolution_and_velocity(1000, "high")
+    rate = command_rate(stage.get_current_position, repeat)
+
+    def move(i):
+        position = step * ((i + 1) % 2)
+        return (
+            lambda: stage.move_to_specified_position(0, 0, position),
+            lambda: abs(position / 0.04 - emulator.target_position[2])
+            * 0.04
+            / emulator.speed,
+        )
+
+    # the driver waits for the end of the move without sending commands
+    return {
+        "MP285": dict(
+            rate=rate, **time_moves([move(i) for i in range(moves)], emulator, None)
+        )
+    }
+
+
+def bench_sutter_filter_wheel(transport, stack, latency, moves, repeat):
+    """Benchmark the SutterFilterWheel between adjacent positions."""
+    emulator = SutterFilterWheelEmulator(latency=latency)
+    port, serial_port = connect(emulator, transport, stack)
+    if serial_port is None:
+        serial_port = serial.Serial(port, 9600, timeout=0.25)
+    filter_wheel = SutterFilterWheel(
+        serial_port,
+        {"available_filters": {"0": 0, "1": 1}, "hardware": {"wheel_number": 1}},
+    )
+
+    def move(i):
+        position = (i + 1) % 2
+        return (
+            lambda: filter_wheel.set_filter(str(position)),
+            lambda: emulator.move_time(0, position, filter_wheel.speed),
+        )
+
+    # the driver sleeps for the tabulated switch time, then reads the reply
+    return {
+        "SutterFilterWheel": dict(
+            rate=None,
+            **time_moves([move(i) for i in range(moves)], emulator, None),
+        )
+    }
+
+
+def bench_asi_filter_wheel(transport, stack, latency, moves, repeat):
+    """Benchmark the ASIFilterWheel between adjacent positions."""
+    emulator = TigerEmulator(latency=latency)
+    controller = tiger_controller(emulator, transport, stack)
+    filter_wheel = ASIFilterWheel(
+        controller,
+        {
+            "available_filters": {"0": 0, "1": 1},
+            "hardware": {"wheel_number": 0},
+            "filter_wheel_delay": 0.04,
+        },
+    )
+    rate = command_rate(lambda: controller.select_filter_wheel(0), repeat)
+    wheel = emulator.filter_wheels[0]
+
+    def move(i):
+        position = (i + 1) % 2
+        return (
+            lambda: filter_wheel.set_filter(str(position)),
+            lambda: wheel.move_time(position),
+        )
+
+    # the driver sleeps for the estimated switch time without polling
+    return {
+        "ASIFilterWheel": dict(
+            rate=rate, **time_moves([move(i) for i in range(moves)], emulator, None)
+        )
+    }
+
+
+#: dict: Benchmark of each driver.
+BENCHMARKS = {
+    "tiger": bench_tiger,
+    "ms2000": bench_ms2000,
+    "mp285": bench_mp285,
+    "sutter_filter_wheel": bench_sutter_filter_wheel,
+    "asi_filter_wheel": bench_asi_filter_wheel,
+}
+
+
+def run(devices, transport, latency, moves, repeat):
+    """Benchmark the drivers and print a table of the results.
+
+    Parameters
+    ----------
+    devices : list
+        Keys of BENCHMARKS
+    transport : str
+        "emulated" for an in-process port, "pty" for a pseudo-terminal
+    latency : float
+        Time for the emulated devices to answer a command, in seconds
+    moves : int
+        Number of moves per driver
+    repeat : int
+        Number of commands to measure the command rate
+    """
+    print(
+        f"{'driver':<26}{'commands/s':>12}{'settle (ms)':>13}{'motion (ms)':>13}"
+        f"{'overhead (ms)':>15}{'polls/move':>12}"
+    )
+    for device in devices:
+        with contextlib.ExitStack() as stack:
+            results = BENCHMARKS[device](transport, stack, latency, moves, repeat)
+        for name, r in results.items():
+            rate = "-" if r["rate"] is None else f"{r['rate']:.1f}"
+            polls = "-" if r["polls"] is None else f"{r['polls']:.1f}"
+            print(
+                f"{name:<26}{rate:>12}{r['settle'] * 1000:>13.2f}"
+                f"{r['motion'] * 1000:>13.2f}{r['overhead'] * 1000:>15.2f}"
+                f"{polls:>12}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--devices", nargs="+", choices=list(BENCHMARKS), default=list(BENCHMARKS)
+    )
+    parser.add_argument("--transport", choices=["emulated", "pty"], default="emulated")
+    parser.add_argument("--latency", type=float, default=0.001)
+    parser.add_argument("--moves", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    run(args.devices, args.transport, args.latency, args.moves, args.repeat)
@@ -0,0 +1,158 @@
+# Copyright (c) 2021-2024  The University of Texas Southwestern Medical Center.
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted for academic and research use only
+# (subject to the limitations in the disclaimer below)
+# provided that the following conditions are met:
+
+#      * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#      * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+
+#      * Neither the name of the copyright holders nor the names of its
+#      contributors may be used to endorse or promote products derived from this
+#      software without specific prior written permission.
+
+# NO EXPRESS OR IMPLIED LICENSES TO ANY PARTY'S PATENT RIGHTS ARE GRANTED BY
+# THIS LICENSE. THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+# PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""Micro-benchmark of the waveform generators.
+
+Run with ``python -m test.benchmarks.benchmark_waveforms``.
+"""
+
+# Standard Library Imports
+import argparse
+import timeit
+
+# Third Party Imports
+import numpy as np
+
+# Local Imports
+from navigate.model import waveforms
+
+
+def reference_smooth_waveform(waveform, percent_smoothing=10):
+    """Smoothing by direct convolution with a box window, for comparison."""
+    waveform_length = np.size(waveform)
+    window_length = int(np.ceil(waveform_length * percent_smoothing / 100))
+    if window_length == 0:
+        return waveform
+    waveform_padded = np.pad(waveform, window_length, mode="edge")
+    return (
+        np.convolve(waveform_padded, np.ones(window_length), "valid") / window_length
+    )
+
+
+def get_generators(sample_rate, sweep_time, dtype):
+    """Waveform generators called with realistic parameters."""
+    exposure_time = 0.8 * sweep_time
+    return {
+        "camera_exposure": lambda: waveforms.camera_exposure(
+            sample_rate, sweep_time, exposure_time, 0.001, dtype=dtype
+        ),
+        "single_pulse": lambda: waveforms.single_pulse(
+            sample_rate, sweep_time, 10, 1, 1, 0, dtype=dtype
+        ),
+        "remote_focus_ramp": lambda: waveforms.remote_focus_ramp(
+            sample_rate,
+            exposure_time,
+            sweep_time,
+            0.005,
+            0.001,
+            0.005,
+            1,
+            0,
+            dtype=dtype,
+        ),
+        "remote_focus_ramp_triangular": lambda: (
+            waveforms.remote_focus_ramp_triangular(
+                sample_rate, exposure_time, sweep_time, 0.005, 0.001, 1, 0, dtype=dtype
+            )
+        ),
+        "sawtooth": lambda: waveforms.sawtooth(
+            sample_rate, sweep_time, 100, 1, 0, 50, dtype=dtype
+        ),
+        "dc_value": lambda: waveforms.dc_value(sample_rate, sweep_time, 1, dtype=dtype),
+        "square": lambda: waveforms.square(
+            sample_rate, sweep_time, 100, 1, 0, 50, dtype=dtype
+        ),
+        "sine_wave": lambda: waveforms.sine_wave(
+            sample_rate, sweep_time, 100, 1, 0, 0, dtype=dtype
+        ),
+    }
+
+
+def run(sample_rates, sweep_times, percent_smoothing, dtype, repeat):
+    """Time each waveform generator and the smoothing.
+
+    Parameters
+    ----------
+    sample_rates : list
+        Sample rates (Hz)
+    sweep_times : list
+        Sweep times (s)
+    percent_smoothing : float
+        Smoothing window as a percentage of the waveform length
+    dtype : np.dtype
+        Data type of the waveforms
+    repeat : int
+        Number of calls to average over
+    """
+    print(f"{'waveform':<30}{'samples':>10}{'time (ms)':>12}")
+    for sample_rate in sample_rates:
+        for sweep_time in sweep_times:
+            samples = int(sample_rate * sweep_time)
+            for name, func in get_generators(sample_rate, sweep_time, dtype).items():
+                t = timeit.timeit(func, number=repeat) / repeat
+                print(f"{name:<30}{samples:>10}{t * 1000:>12.3f}")
+
+            ramp = waveforms.remote_focus_ramp(
+                sample_rate, 0.8 * sweep_time, sweep_time, 0.005, 0.001, 0.005, 1, 0
+            )
+            t = (
+                timeit.timeit(
+                    lambda: waveforms.smooth_waveform(ramp, percent_smoothing),
+                    number=repeat,
+                )
+                / repeat
+            )
+            print(f"{'smooth_waveform':<30}{samples:>10}{t * 1000:>12.3f}")
+            t = timeit.timeit(
+                lambda: reference_smooth_waveform(ramp, percent_smoothing), number=1
+            )
+            print(f"{'smooth_waveform (convolve)':<30}{samples:>10}{t * 1000:>12.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sample-rates", type=int, nargs="+", default=[100000, 1000000]
+    )
+    parser.add_argument("--sweep-times", type=float, nargs="+", default=[0.2, 2.0])
+    parser.add_argument("--percent-smoothing", type=float, default=10)
+    parser.add_argument("--float32", action="store_true")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    run(
+        args.sample_rates,
+        args.sweep_times,
+        args.percent_smoothing,
+        np.float32 if args.float32 else np.float64,
+        args.repeat,
+    )
@@ -47,6 +47,7 @@ import sys
 # Local Imports
 import navigate.config.config as config
 from navigate.tools.file_functions import save_yaml_file, delete_folder, load_yaml_file
+from navigate.tools.common_functions import copy_proxy_object
 
 
 def test_config_methods():
@@ -54,6 +55,7 @@ def test_config_methods():
     desired_methods = [
         "DictProxy",
         "ListProxy",
+        "READ_ONLY_TABLES",
         "Path",
         "__builtins__",
         "__cached__",
@@ -65,16 +67,22 @@ def test_config_methods():
         "__spec__",
         "build_nested_dict",
         "build_ref_name",
+        "copy",
         "get_configuration_paths",
         "get_navigate_path",
         "isfile",
+        "is_dict",
+        "is_table",
         "load_configs",
         "os",
         "platform",
+        "positions_to_array",
+        "publish_config",
         "shutil",
         "sys",
         "time",
         "update_config_dict",
+        "validate_positions",
         "verify_experiment_config",
         "verify_waveform_constants",
         "verify_configuration",
@@ -220,6 +228,72 @@ class TestBuildNestedDict(unittest.TestCase):
         for key in dict_data.keys():
             assert self.parent_dict[self.key_name][key] == dict_data[key]
 
+    def test_build_nested_dict_with_table_data(self):
+        table_data = [[1.0, 2.0, 3.0, 4.0, 5.0], [6.0, 7.0, 8.0, 9.0, 10.0]]
+
+        config.build_nested_dict(
+            self.manager, self.parent_dict, self.key_name, table_data
+        )
+
+        # rows of a table are shared, so they can be modified in place
+        assert isinstance(self.parent_dict[self.key_name], ListProxy)
+        for i in range(2):
+            assert isinstance(self.parent_dict[self.key_name][i], ListProxy)
+            assert self.parent_dict[self.key_name][i][:] == table_data[i]
+        self.parent_dict[self.key_name][1][0] = 0.0
+        assert self.parent_dict[self.key_name][1][0] == 0.0
+
+        # rows of a read-only table are stored as plain lists in a single shared list
+        config.build_nested_dict(
+            self.manager, self.parent_dict, "MultiPositions", table_data
+        )
+        assert isinstance(self.parent_dict["MultiPositions"], ListProxy)
+        for i in range(2):
+            assert type(self.parent_dict["MultiPositions"][i]) is list
+            assert self.parent_dict["MultiPositions"][i] == table_data[i]
+
+        assert config.is_table(table_data)
+        assert not config.is_table([])
+        assert not config.is_table(["string1", "string2"])
+        assert not config.is_table([[1.0, 2.0], {"key1": "string1"}])
+        assert not config.is_table([[1.0, [2.0]]])
+
+    def test_publish_config(self):
+        config_data = {
+            "b": 1,
+            "a": {"x": [1, 2], "y": [{"z": 3}]},
+            "c": [[1.0, 2.0], [3.0, 4.0]],
+            "d": "string",
+            "MultiPositions": [[1.0, 2.0], [3.0, 4.0]],
+        }
+
+        shared = config.publish_config(self.manager, config_data)
+
+        # keys keep their order and every container is shared
+        assert isinstance(shared, DictProxy)
+        assert list(shared.keys()) == list(config_data.keys())
+        assert isinstance(shared["a"], DictProxy)
+        assert isinstance(shared["a"]["x"], ListProxy)
+        assert isinstance(shared["a"]["y"][0], DictProxy)
+        assert isinstance(shared["c"], ListProxy)
+        assert isinstance(shared["c"][0], ListProxy)
+        assert isinstance(shared["MultiPositions"], ListProxy)
+        assert type(shared["MultiPositions"][0]) is list
+        assert copy_proxy_object(shared) == config_data
+
+        # without a manager, a plain copy is returned
+        plain = config.publish_config(None, config_data)
+        assert plain == config_data
+        assert plain is not config_data
+        assert plain["a"] is not config_data["a"]
+
+    def test_is_dict(self):
+        assert config.is_dict(None, {})
+        assert not config.is_dict(None, self.manager.dict())
+        assert config.is_dict(self.manager, self.manager.dict())
+        assert not config.is_dict(self.manager, {})
+        assert not config.is_dict(None, [])
+
     def test_update_config_dict_with_bad_file_name(self):
         test_entry = "string"
         dict_data = {"key1": "string1", "key2": "string2"}
@@ -424,6 +498,40 @@ class TestVerifyExperimentConfig(unittest.TestCase):
         for i, position in enumerate(self.experiment_sample["MultiPositions"]):
             assert position == experiement_config["MultiPositions"][i]
 
+    def test_verify_plain_configuration(self):
+        experiment_file_path = os.path.join(self.test_root, "experiment.yml")
+        with open(experiment_file_path, "w") as f:
+            f.write("")
+        config_files = {
+            "configuration": os.path.join(self.config_path, "configuration.yaml"),
+            "experiment": experiment_file_path,
+            "waveform_constants": os.path.join(
+                self.config_path, "waveform_constants.yml"
+            ),
+        }
+
+        # verify through the manager
+        shared_configuration = config.load_configs(self.manager, **config_files)
+        config.verify_configuration(self.manager, shared_configuration)
+        config.verify_experiment_config(self.manager, shared_configuration)
+        config.verify_waveform_constants(self.manager, shared_configuration)
+
+        # verify plain dictionaries, then share them
+        configuration = config.load_configs(None, **config_files)
+        config.verify_configuration(None, configuration)
+        config.verify_experiment_config(None, configuration)
+        config.verify_waveform_constants(None, configuration)
+        published = config.publish_config(self.manager, configuration)
+
+        assert type(configuration["experiment"]) is dict
+        assert isinstance(published["experiment"]["MicroscopeState"], DictProxy)
+
+        # the save directory is time-stamped
+        for c in (shared_configuration, configuration, published):
+            c["experiment"]["Saving"].pop("save_directory")
+        assert copy_proxy_object(shared_configuration) == configuration
+        assert copy_proxy_object(published) == configuration
+
     def test_load_experiment_file_with_missing_parameters(self):
         experiment = load_yaml_file(os.path.join(self.config_path, "experiment.yml"))
         # Saving prameters
@@ -503,6 +611,36 @@ class TestVerifyExperimentConfig(unittest.TestCase):
                     k in configuration["experiment"]["StageParameters"][microscope_name]
                 )
 
+    def test_verify_multipositions(self):
+        configuration = config.load_configs(
+            self.manager,
+            configuration=os.path.join(self.config_path, "configuration.yaml"),
+            experiment=os.path.join(self.config_path, "experiment.yml"),
+        )
+        config.verify_configuration(self.manager, configuration)
+        experiment = configuration["experiment"]
+
+        # invalid positions are removed
+        experiment["MultiPositions"] = [
+            [1, 2, 3, 4, 5],
+            [1, "abc", 3, 4, 5],
+            [1, 2, 3],
+            ["6", 7.0, 8, 9, 10],
+        ]
+        config.verify_experiment_config(self.manager, configuration)
+        assert isinstance(experiment["MultiPositions"], ListProxy)
+        assert list(experiment["MultiPositions"]) == [
+            [1.0, 2.0, 3.0, 4.0, 5.0],
+            [6.0, 7.0, 8.0, 9.0, 10.0],
+        ]
+        assert experiment["MicroscopeState"]["multiposition_count"] == 2
+
+        # an empty table gets a default position
+        experiment["MultiPositions"] = "abc"
+        config.verify_experiment_config(self.manager, configuration)
+        assert list(experiment["MultiPositions"]) == [[10.0, 10.0, 10.0, 10.0, 10.0]]
+        assert experiment["MicroscopeState"]["multiposition_count"] == 1
+
     def test_load_experiment_file_with_wrong_parameter_values(self):
         configuration = config.load_configs(
             self.manager,
@@ -608,6 +608,25 @@ class TestCameraViewController:
         # Not currently in use
         pass
 
+    def test_identify_channel_index_with_channel_order(self):
+        microscope_state = dict(
+            self.microscope_state, stack_cycling_mode="per_z", number_z_steps=2
+        )
+        self.camera_view.initialize_non_live_display(
+            microscope_state, {"img_x_pixels": 50, "img_y_pixels": 100}
+        )
+        experiment_state = self.camera_view.parent_controller.configuration[
+            "experiment"
+        ]["MicroscopeState"]
+        experiment_state["channel_acquisition_order"] = [[2, 0, 1], [1, 0, 2]]
+        try:
+            indices = [
+                self.camera_view.identify_channel_index_and_slice() for _ in range(7)
+            ]
+        finally:
+            experiment_state.pop("channel_acquisition_order")
+        assert indices == [(2, 0), (0, 0), (1, 0), (1, 1), (0, 1), (2, 1), (2, 0)]
+
     def test_retrieve_image_slice_from_volume(self):
         # Not currently in use
         pass
@@ -0,0 +1,60 @@
+# Copyright (c) 2021-2024  The University of Texas Southwestern Medical Center.
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted for academic and research use only
+# (subject to the limitations in the disclaimer below)
+# provided that the following conditions are met:
+
+#      * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#      * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+
+#      * Neither the name of the copyright holders nor the names of its
+#      contributors may be used to endorse or promote products derived from this
+#      software without specific prior written permission.
+
+# NO EXPRESS OR IMPLIED LICENSES TO ANY PARTY'S PATENT RIGHTS ARE GRANTED BY
+# THIS LICENSE. THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+# PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+# Third Party Imports
+import numpy as np
+
+# Local Imports
+from navigate.controller.sub_controllers.waveform_tab import min_max_envelope
+
+
+def test_min_max_envelope():
+    waveform = np.sin(np.linspace(0, 4 * np.pi, 100000))
+    index, envelope = min_max_envelope(waveform, 500)
+
+    assert len(index) == len(envelope) == 1000
+    assert np.all(np.diff(index) >= 0)
+    # the envelope keeps the extremes of the waveform
+    assert envelope.max() == waveform.max()
+    assert envelope.min() == waveform.min()
+    # each pair holds the minimum and maximum of one bin
+    assert np.all(envelope[0::2] <= envelope[1::2])
+    np.testing.assert_array_equal(
+        envelope[:2], [waveform[:200].min(), waveform[:200].max()]
+    )
+
+
+def test_min_max_envelope_short_waveform():
+    waveform = np.arange(10.0)
+    index, envelope = min_max_envelope(waveform, 500)
+    np.testing.assert_array_equal(index, np.arange(10))
+    np.testing.assert_array_equal(envelope, waveform)
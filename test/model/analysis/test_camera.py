@@ -54,3 +54,66 @@ def test_compute_signal_to_noise():
     snr = compute_signal_to_noise(image, offset, variance)
 
     np.testing.assert_allclose(snr, 0.5, rtol=0.2)
+
+
+def test_streaming_camera_statistics():
+    from navigate.model.analysis.camera import (
+        StreamingCameraStatistics,
+        compute_scmos_offset_and_variance_map,
+        compute_flatfield_map,
+    )
+
+    rng = np.random.default_rng(0)
+    image = rng.normal(100, 5, (50, 32, 48)).clip(0).astype(np.uint16)
+
+    statistics = StreamingCameraStatistics(image.shape[1:])
+    for frame in image:
+        statistics.update(frame)
+
+    assert statistics.count == 50
+    np.testing.assert_allclose(statistics.mean, np.mean(image, axis=0))
+    np.testing.assert_allclose(statistics.variance, np.var(image, axis=0))
+
+    offset, variance = statistics.offset_and_variance_map(image.dtype)
+    offset_true, variance_true = compute_scmos_offset_and_variance_map(image)
+    assert offset.dtype == np.uint16
+    # the maps are truncated to integers, rounding errors may change them by 1
+    np.testing.assert_allclose(offset, offset_true, atol=1)
+    np.testing.assert_allclose(variance, variance_true, atol=1)
+
+    dark = np.full(image.shape[1:], 90.0)
+    np.testing.assert_allclose(
+        statistics.flatfield_map(dark), compute_flatfield_map(image, dark)
+    )
+
+
+@pytest.mark.parametrize("use_flatfield", [True, False])
+def test_camera_image_correction(use_flatfield):
+    from navigate.model.analysis.camera import CameraImageCorrection
+
+    offset = np.array([[100, 100], [100, 0]], dtype=np.uint16)
+    flatfield = np.array([[0.5, 1.0], [0.0, 2.0]]) if use_flatfield else None
+    image = np.array([[150, 50], [65535, 65535]], dtype=np.uint16)
+
+    correction = CameraImageCorrection(offset, flatfield)
+    result = correction(image)
+
+    # corrected in place
+    assert result is image
+    assert image.dtype == np.uint16
+    if use_flatfield:
+        # saturates at 0 and 65535, flatfield of 0 is ignored
+        np.testing.assert_array_equal(image, [[100, 0], [65435, 32768]])
+    else:
+        np.testing.assert_array_equal(image, [[50, 0], [65435, 65535]])
+
+
+def test_crop_camera_map():
+    from navigate.model.analysis.camera import crop_camera_map
+
+    camera_map = np.arange(64).reshape(8, 8)
+    np.testing.assert_array_equal(
+        crop_camera_map(camera_map, (2, 4)), camera_map[3:5, 2:6]
+    )
+    assert crop_camera_map(camera_map, (16, 4)) is None
+    assert crop_camera_map(None, (2, 4)) is None
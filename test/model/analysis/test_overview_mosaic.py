@@ -0,0 +1,95 @@
+# Copyright (c) 2021-2024  The University of Texas Southwestern Medical Center.
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted for academic and research use only
+# (subject to the limitations in the disclaimer below)
+# provided that the following conditions are met:
+
+#      * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#      * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+
+#      * Neither the name of the copyright holders nor the names of its
+#      contributors may be used to endorse or promote products derived from this
+#      software without specific prior written permission.
+
+# NO EXPRESS OR IMPLIED LICENSES TO ANY PARTY'S PATENT RIGHTS ARE GRANTED BY
+# THIS LICENSE. THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+# PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+import numpy as np
+import pytest
+import tifffile
+
+from navigate.model.analysis.overview_mosaic import OverviewMosaic
+
+
+@pytest.fixture
+def mosaic():
+    # 2 x 2 tiles of 100 x 100 pixels of 1 micron, overlapping by 20 microns
+    positions = [[0, 0], [80, 0], [0, 80], [80, 80]]
+    return OverviewMosaic(positions, (100, 100), (1, 1), 2, max_size=90)
+
+
+def test_overview_mosaic_shape(mosaic):
+    # the 180 micron extent is down-sampled to fit in 90 pixels
+    assert mosaic.extent == (-50, 130, -50, 130)
+    assert mosaic.pixel_size == 2
+    assert mosaic.shape == (2, 90, 90)
+    assert mosaic.footprint == (50, 50)
+
+
+def test_overview_mosaic_add_tile(mosaic):
+    assert mosaic.get_tile(0, 0) is None
+
+    assert mosaic.add_tile(np.full((100, 100), 100, dtype=np.uint16), 0, 0)
+    assert mosaic.add_tile(np.full((100, 100), 300, dtype=np.uint16), 80, 0)
+    assert not mosaic.add_tile(np.ones((100, 100)), 1000, 1000)
+    assert mosaic.tile_count == 2
+
+    image = mosaic.get_image()
+    assert image.dtype == np.uint16
+    # tile interiors keep their values, the overlap blends between them
+    assert image[25, 5] == 100
+    assert image[25, 85] == 300
+    assert 100 < image[25, 41] < 300
+    # the other channel and positions are empty
+    assert not mosaic.get_image(1).any()
+    assert mosaic.get_tile(0, 80) is None
+
+    # a tile that is added again replaces the previous one
+    mosaic.add_tile(np.full((100, 100), 200, dtype=np.uint16), 0, 0)
+    assert mosaic.get_image()[25, 5] == 200
+
+
+def test_overview_mosaic_region(mosaic):
+    mosaic.add_tile(np.full((100, 100), 100, dtype=np.uint16), 0, 0)
+
+    region = mosaic.get_image(region=(-50, 50, -50, 50))
+    assert region.shape == (50, 50)
+    assert np.all(region == 100)
+    assert mosaic.get_image(max_size=30).shape == (30, 30)
+
+
+def test_overview_mosaic_save(mosaic, tmp_path):
+    mosaic.add_tile(np.full((100, 100), 100, dtype=np.uint16), 0, 0, channel=1)
+    file_name = str(tmp_path / "overview.ome.tif")
+    mosaic.save(file_name, min_size=45)
+
+    with tifffile.TiffFile(file_name) as tif:
+        levels = tif.series[0].levels
+        assert [level.shape for level in levels] == [(2, 90, 90), (2, 45, 45)]
+        np.testing.assert_equal(levels[0].asarray()[1], mosaic.get_image(1))
@@ -0,0 +1,148 @@
+# Copyright (c) 2021-2024  The University of Texas Southwestern Medical Center.
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted for academic and research use only
+# (subject to the limitations in the disclaimer below)
+# provided that the following conditions are met:
+
+#      * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#      * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+
+#      * Neither the name of the copyright holders nor the names of its
+#      contributors may be used to endorse or promote products derived from this
+#      software without specific prior written permission.
+
+# NO EXPRESS OR IMPLIED LICENSES TO ANY PARTY'S PATENT RIGHTS ARE GRANTED BY
+# THIS LICENSE. THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+# PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+import cv2
+import numpy as np
+import pytest
+
+from navigate.model.analysis.tile_registration import (
+    TileRegistration,
+    find_neighbours,
+    phase_correlation,
+    solve_translations,
+)
+from navigate.tools.multipos_table_tools import compute_tiles_from_bounding_box
+
+
+@pytest.fixture(scope="module")
+def sample():
+    rng = np.random.default_rng(0)
+    image = rng.random((700, 700)).astype(np.float32)
+    return cv2.GaussianBlur(image, (0, 0), 3) * 1000
+
+
+def test_phase_correlation(sample):
+    reference = sample[100:356, 100:356]
+    moving = sample[103:359, 95:351]
+    (shift_y, shift_x), peak = phase_correlation(reference, moving)
+    assert shift_y == pytest.approx(3, abs=0.1)
+    assert shift_x == pytest.approx(-5, abs=0.1)
+    assert peak > 0.5
+
+    # unrelated images do not correlate
+    _, peak = phase_correlation(reference, sample[400:656, 400:656])
+    assert peak < 0.2
+
+
+def test_find_neighbours():
+    # 3 x 2 grid of 100 micron tiles, overlapping by 10 %
+    positions = compute_tiles_from_bounding_box(
+        0, 3, 100, 0.1, 0, 2, 100, 0.1, 0, 1, 0, 0, 0, 1, 0, 0, 0, 1, 0, 0
+    )
+    pairs = find_neighbours(positions[:, :2], (100, 100))
+    # diagonal neighbours share 1 % of the tile
+    assert sorted(pairs) == [(0, 1), (0, 3), (1, 2), (1, 4), (2, 5), (3, 4), (4, 5)]
+    assert len(find_neighbours(positions[:, :2], (100, 100), 0.005)) == 11
+
+    # positions that are not set have no neighbours
+    positions[1] = np.nan
+    assert len(find_neighbours(positions[:, :2], (100, 100))) == 4
+
+
+def test_solve_translations():
+    # tiles 0 to 3 are off their stage positions by 0, 2, -2 and -1 pixels, and
+    # the shift of (0, 3) is an outlier
+    pairs = [(0, 1), (1, 2), (0, 2), (2, 3), (1, 3), (0, 3)]
+    shifts = [[2], [-4], [-2], [1], [-3], [40]]
+    translations = solve_translations(5, pairs, shifts, max_residual=1)
+
+    # the outlier is dropped, and the translations have zero mean
+    np.testing.assert_allclose(translations[:4, 0] - translations[0, 0], [0, 2, -2, -1])
+    np.testing.assert_allclose(translations[:4].mean(), 0, atol=1e-9)
+    # tile 4 has no pairs
+    assert translations[4, 0] == 0
+
+
+def test_tile_registration(sample):
+    # 2 x 2 tiles of 256 x 256 pixels of 0.5 microns, overlapping by 20 %, with
+    # tile 1 off its stage position
+    errors = {1: (3, -5)}
+    positions, tiles = [], []
+    for index, (row, column) in enumerate([(0, 0), (0, 1), (1, 0), (1, 1)]):
+        y0, x0 = 100 + row * 205, 100 + column * 205
+        error_y, error_x = errors.get(index, (0, 0))
+        tiles.append(
+            sample[y0 + error_y : y0 + error_y + 256, x0 + error_x : x0 + error_x + 256]
+        )
+        positions.append(((x0 + 128) * 0.5, (y0 + 128) * 0.5))
+
+    registration = TileRegistration(positions, (256, 256), (0.5, 0.5), downsample=2)
+    assert sorted(registration.pairs) == [(0, 1), (0, 2), (1, 3), (2, 3)]
+    try:
+        for index, tile in enumerate(tiles):
+            assert registration.add_tile(index, tile)
+        # tiles are released once all of their pairs are sent to the pool
+        assert registration.wait(60)
+        assert registration.progress == (4, 4)
+        assert not registration._tiles
+        assert not registration.add_tile(0, tiles[0])
+
+        translations = registration.solve()
+    finally:
+        registration.shutdown()
+
+    # (x, y) in microns, relative to tile 0
+    translations -= translations[0]
+    np.testing.assert_allclose(translations[1], [-2.5, 1.5], atol=0.5)
+    np.testing.assert_allclose(translations[2:], 0, atol=0.5)
+
+
+def test_tile_registration_image_axes(sample):
+    # two tiles side by side along the columns, which follow the stage y axis, with
+    # tile 1 off its stage position
+    tiles = [sample[100:356, 100:356], sample[103:359, 300:556]]
+    positions = [(114.0, 114.0), (114.0, 216.5)]
+
+    registration = TileRegistration(
+        positions, (256, 256), (0.5, 0.5), downsample=2, image_axes=("y", "x")
+    )
+    assert registration.pairs == [(0, 1)]
+    try:
+        for index, tile in enumerate(tiles):
+            registration.add_tile(index, tile)
+        assert registration.wait(60)
+        translations = registration.solve()
+    finally:
+        registration.shutdown()
+
+    # the row error is along stage x, the column error along stage y
+    np.testing.assert_allclose(translations[1] - translations[0], [1.5, -2.5], atol=0.5)
@@ -93,3 +93,23 @@ def test_data_source_cztp_indices():
     )
 
     # assert False
+
+
+def test_data_source_cztp_indices_channel_order():
+    from navigate.model.data_sources.data_source import DataSource
+    from navigate.model.metadata_sources.metadata import Metadata
+
+    ds = DataSource()
+    ds.metadata = Metadata()
+    ds.metadata.shape_c = ds.shape_c = 3
+    ds.shape_z = 2
+    ds.shape_t = 1
+    ds.positions = 2
+    ds.metadata._channel_orders = [[2, 0, 1], [1, 0, 2]]
+
+    channels = [ds._cztp_indices(i, False)[0] for i in range(12)]
+    assert channels == [2, 0, 1, 1, 0, 2] * 2
+
+    # per-stack cycling keeps the table order
+    channels = [ds._cztp_indices(i, True)[0] for i in range(12)]
+    assert channels == [0, 0, 1, 1, 2, 2] * 2
@@ -0,0 +1,140 @@
+import time
+
+import pytest
+import numpy as np
+import tifffile
+
+
+def test_chunk_cache_evicts_least_recently_used():
+    from navigate.model.data_sources.lazy_array import ChunkCache
+
+    chunk = np.zeros(10, dtype=np.uint8)
+    cache = ChunkCache(max_bytes=30)
+    for key in range(3):
+        cache.put(key, chunk.copy())
+    assert cache.get(0) is not None
+
+    cache.put(3, chunk.copy())
+    assert 1 not in cache
+    assert 0 in cache and 2 in cache and 3 in cache
+    assert cache.nbytes == 30
+
+    # Chunks larger than the cache are not kept
+    cache.put(4, np.zeros(40, dtype=np.uint8))
+    assert 4 not in cache
+    assert len(cache) == 3
+
+
+@pytest.fixture
+def tiff_stack(tmp_path):
+    fn = str(tmp_path / "test.tif")
+    data = (np.random.rand(6, 16, 12) * 2**16).astype(np.uint16)
+    with tifffile.TiffWriter(fn, ome=False) as tif:
+        for image in data:
+            tif.write(image, metadata={"axes": "ZYX"}, contiguous=True)
+    return fn, data
+
+
+def test_tiff_read_is_memory_mapped(tiff_stack):
+    from navigate.model.data_sources.tiff_data_source import TiffDataSource
+
+    fn, data = tiff_stack
+    ds = TiffDataSource(fn, "r")
+
+    assert isinstance(ds._array, np.memmap)
+    assert (ds.shape_z, ds.shape_y, ds.shape_x) == data.shape
+    np.testing.assert_equal(
+        ds.get_slice(slice(2, 5), slice(None), 0, slice(1, 3)), data[1:3, :, 2:5]
+    )
+    ds.close()
+
+
+@pytest.mark.parametrize("prefetch", [0, 2])
+def test_lazy_array_indexing(tiff_stack, prefetch):
+    from navigate.model.data_sources.tiff_data_source import TiffDataSource
+    from navigate.model.data_sources.lazy_array import LazyArray
+
+    fn, data = tiff_stack
+    ds = TiffDataSource(fn, "r")
+    lazy = LazyArray(ds, prefetch=prefetch)
+    expected = data[None, None, :, None, :, :]
+
+    assert lazy.shape == expected.shape
+    assert lazy.dtype == data.dtype
+    np.testing.assert_equal(lazy[0, 0, :, 0], data)
+    np.testing.assert_equal(lazy[..., 3:7, 2], expected[..., 3:7, 2])
+    np.testing.assert_equal(lazy[:, :, ::-2], expected[:, :, ::-2])
+    np.testing.assert_equal(lazy[0, 0, -1, 0, -1, -1], data[-1, -1, -1])
+    np.testing.assert_equal(np.asarray(lazy), expected)
+
+    with pytest.raises(IndexError):
+        lazy[0, 0, 6]
+    with pytest.raises(IndexError):
+        lazy[0, 0, 0, 0, 0, 0, 0]
+
+    lazy.close()
+    ds.close()
+
+
+def test_lazy_array_reads_ahead(tiff_stack):
+    from navigate.model.data_sources.tiff_data_source import TiffDataSource
+    from navigate.model.data_sources.lazy_array import LazyArray
+
+    fn, data = tiff_stack
+    ds = TiffDataSource(fn, "r")
+    lazy = LazyArray(ds, cache_size=3 * data[0].nbytes, prefetch=2)
+
+    lazy[0, 0, 0, 0]
+    lazy[0, 0, 1, 0]
+    # Stepping along z reads the next planes in the background
+    for _ in range(100):
+        if (0, 0, 0, 3) in lazy.cache:
+            break
+        time.sleep(0.01)
+    assert (0, 0, 0, 2) in lazy.cache and (0, 0, 0, 3) in lazy.cache
+
+    misses = lazy.cache.misses
+    np.testing.assert_equal(lazy[0, 0, 2, 0], data[2])
+    assert lazy.cache.misses == misses
+
+    # The cache holds at most three planes
+    assert lazy.cache.nbytes <= 3 * data[0].nbytes
+
+    lazy.close()
+    ds.close()
+
+
+def test_lazy_stacks(tiff_stack):
+    from navigate.model.data_sources.tiff_data_source import TiffDataSource
+    from navigate.model.data_sources.lazy_array import LazyArray
+
+    fn, data = tiff_stack
+    ds = TiffDataSource(fn, "r")
+    lazy = LazyArray(ds, prefetch=0)
+
+    stacks = list(lazy.stacks())
+    assert len(stacks) == 1
+    assert len(stacks[0]) == data.shape[0]
+    np.testing.assert_equal(stacks[0][4], data[4])
+
+    lazy.close()
+    ds.close()
+
+
+def test_lazy_array_bdv(tmp_path):
+    from navigate.model.data_sources.bdv_data_source import BigDataViewerDataSource
+    from navigate.model.data_sources.lazy_array import LazyArray
+    from test.model.data_sources.test_bdv_data_source import bdv_ds, close_bdv_ds
+
+    fn = str(tmp_path / "test.h5")
+    ds = bdv_ds(fn, True, True, True, False, (64, 32))
+    ds.close()
+
+    ds = BigDataViewerDataSource(fn, "r")
+    lazy = LazyArray(ds)
+    assert lazy.chunk_depth == ds.get_chunk_shape()[0]
+    np.testing.assert_equal(lazy[...], ds[:, :, :, :, :, :])
+    np.testing.assert_equal(lazy[:, :, :, 1:, 5], ds[:, 5, 1:, ...][:, :, :, :, 0])
+
+    lazy.close()
+    close_bdv_ds(ds)
@@ -106,3 +106,72 @@ def test_tiff_write_read(is_ome, multiposition, per_stack, z_stack, stop_early):
         raise e
     finally:
         delete_folder("test_save_dir")
+
+
+@pytest.mark.parametrize("is_ome", [True, False])
+def test_tiff_write_with_writer_pool(is_ome, tmp_path):
+    import numpy as np
+
+    from test.model.dummy import DummyModel
+    from navigate.model.data_sources.tiff_data_source import TiffDataSource
+    from navigate.model.data_sources.writer_pool import WriterPool
+
+    model = DummyModel()
+    state = model.configuration["experiment"]["MicroscopeState"]
+    state["image_mode"] = "z-stack"
+    state["number_z_steps"] = 3
+    state["is_multiposition"] = True
+    state["timepoints"] = 2
+
+    ext = ".ome.tif" if is_ome else ".tif"
+    serial_dir = tmp_path / "serial"
+    pool_dir = tmp_path / "pool"
+    disks = [str(tmp_path / "disk0"), str(tmp_path / "disk1")]
+    serial_dir.mkdir()
+    pool_dir.mkdir()
+
+    serial_ds = TiffDataSource(str(serial_dir / f"test{ext}"))
+    serial_ds.set_metadata_from_configuration_experiment(model.configuration)
+    pool = WriterPool(3, directories=disks, base_directory=str(pool_dir))
+    pool_ds = TiffDataSource(str(pool_dir / f"test{ext}"))
+    pool_ds.set_metadata_from_configuration_experiment(model.configuration)
+    pool_ds.set_writer_pool(pool)
+
+    n_images = (
+        serial_ds.shape_c * serial_ds.shape_z * serial_ds.shape_t * serial_ds.positions
+    )
+    data = np.random.rand(n_images, serial_ds.shape_y, serial_ds.shape_x) * 2**16
+    data = data.astype(np.uint16)
+    image = np.empty_like(data[0])
+    serial_files, pool_files = [], []
+    for i in range(n_images):
+        serial_ds.write(data[i])
+        # reuse the same buffer, as the image writer does with the data buffer
+        image[:] = data[i]
+        pool_ds.write(image)
+        image[:] = 0
+        serial_files.extend(f for f in serial_ds.file_name if f not in serial_files)
+        pool_files.extend(f for f in pool_ds.file_name if f not in pool_files)
+    serial_ds.close()
+    pool_ds.close()
+    pool.shutdown()
+    assert pool.get_errors() == []
+
+    # same layout, spread over the target directories
+    assert len(serial_files) == len(pool_files) == n_images // serial_ds.shape_z
+    pool_disks = [
+        next(d for d in disks if f.startswith(d + os.sep)) for f in pool_files
+    ]
+    assert set(pool_disks) == set(disks)
+    assert [os.path.relpath(f, d) for f, d in zip(pool_files, pool_disks)] == [
+        os.path.relpath(f, serial_dir) for f in serial_files
+    ]
+    for serial_file, pool_file in zip(serial_files, pool_files):
+        assert os.path.basename(serial_file) == os.path.basename(pool_file)
+        serial_read = TiffDataSource(serial_file, "r")
+        pool_read = TiffDataSource(pool_file, "r")
+        np.testing.assert_equal(serial_read.data, pool_read.data)
+        if is_ome:
+            assert pool_read.image.is_ome
+        serial_read.close()
+        pool_read.close()
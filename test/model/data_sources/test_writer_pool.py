@@ -0,0 +1,102 @@
+import os
+import threading
+import time
+
+import pytest
+
+
+def test_writer_pool_shards_keep_order():
+    from navigate.model.data_sources.writer_pool import WriterPool
+
+    pool = WriterPool(3)
+    results = {shard: [] for shard in range(6)}
+    threads = {shard: set() for shard in range(6)}
+
+    def task(shard, i):
+        # make later tasks of other shards likely to finish first
+        time.sleep(0.001 * (shard % 2))
+        results[shard].append(i)
+        threads[shard].add(threading.current_thread().name)
+
+    for i in range(20):
+        for shard in range(6):
+            pool.submit(shard, task, shard, i)
+    assert pool.wait(10)
+    pool.shutdown()
+
+    for shard in range(6):
+        # each shard is written by one worker, in order
+        assert results[shard] == list(range(20))
+        assert len(threads[shard]) == 1
+        assert pool.worker_index(shard) == shard % 3
+    assert threads[0] == threads[3]
+    assert threads[0] != threads[1]
+    assert pool.progress == (120, 120)
+    assert pool.get_errors() == []
+
+
+def test_writer_pool_errors():
+    from navigate.model.data_sources.writer_pool import WriterPool
+
+    pool = WriterPool(2)
+
+    def fail():
+        raise OSError("disk full")
+
+    pool.submit(0, fail)
+    pool.submit(1, lambda: None)
+    assert pool.wait(10)
+    errors = pool.get_errors()
+    assert len(errors) == 1
+    assert isinstance(errors[0], OSError)
+    # errors are only reported once
+    assert pool.get_errors() == []
+    assert pool.progress == (2, 2)
+    pool.shutdown()
+
+    # tasks submitted after shutdown are reported as errors
+    pool.submit(0, lambda: None)
+    assert isinstance(pool.get_errors()[0], RuntimeError)
+
+
+def test_writer_pool_max_pending():
+    from navigate.model.data_sources.writer_pool import WriterPool
+
+    pool = WriterPool(1, max_pending=2)
+    release = threading.Event()
+    pool.submit(0, release.wait)
+    pool.submit(0, lambda: None)
+
+    # the third task waits until a task is finished
+    submitted = threading.Event()
+    thread = threading.Thread(
+        target=lambda: (pool.submit(0, lambda: None), submitted.set())
+    )
+    thread.start()
+    assert not submitted.wait(0.2)
+    release.set()
+    assert submitted.wait(10)
+    thread.join()
+    assert pool.wait(10)
+    pool.shutdown()
+
+
+@pytest.mark.parametrize("directories", [None, ["disk0", "disk1"]])
+def test_writer_pool_get_path(directories):
+    from navigate.model.data_sources.writer_pool import WriterPool
+
+    base = os.path.join("data", "cell")
+    pool = WriterPool(4, directories=directories, base_directory=base)
+    file_name = os.path.join(base, "Position1", "CH00_000000.tif")
+    if directories is None:
+        assert pool.get_path(3, file_name) == file_name
+    else:
+        assert pool.get_path(2, file_name) == os.path.join(
+            "disk0", "Position1", "CH00_000000.tif"
+        )
+        assert pool.get_path(3, file_name) == os.path.join(
+            "disk1", "Position1", "CH00_000000.tif"
+        )
+    # files outside of the base directory are not moved
+    assert pool.get_path(3, "other.tif") == "other.tif"
+    pool.shutdown()
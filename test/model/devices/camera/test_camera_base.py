@@ -78,3 +78,47 @@ def test_camera_base_functions(dummy_model):
             getattr(camera, f)(*a)
         else:
             getattr(camera, f)()
+
+
+def test_camera_base_frame_ready(dummy_model):
+    import threading
+    import time
+
+    model = dummy_model
+    microscope_name = model.configuration["experiment"]["MicroscopeState"][
+        "microscope_name"
+    ]
+    camera = CameraBase(microscope_name, None, model.configuration)
+
+    # times out without a frame
+    start_time = time.perf_counter()
+    assert camera.wait_for_frame(lambda: False, 0.05) is False
+    assert time.perf_counter() - start_time >= 0.05
+
+    # wakes up as soon as a producer signals a frame
+    frames = []
+    timer = threading.Timer(
+        0.05, lambda: (frames.append(0), camera.notify_frame_ready())
+    )
+    start_time = time.perf_counter()
+    timer.start()
+    assert camera.wait_for_frame(lambda: len(frames) > 0, 5) is True
+    assert time.perf_counter() - start_time < 1
+    timer.join()
+
+
+def test_camera_base_frame_timeout(dummy_model):
+    model = dummy_model
+    microscope_name = model.configuration["experiment"]["MicroscopeState"][
+        "microscope_name"
+    ]
+    camera = CameraBase(microscope_name, None, model.configuration)
+    # CameraBase doesn't know its readout time
+    assert abs(camera.get_frame_timeout(0.5) - 5.0) < 1e-9
+
+    camera.calculate_readout_time = lambda: 0.01
+    assert abs(camera.get_frame_timeout(0.5) - 5.1) < 1e-9
+
+    # short exposures fail fast, but not faster than the floor
+    assert camera.get_frame_timeout(0.01) == camera.frame_timeout_floor
+    assert camera.get_frame_timeout(0.01) < 10
@@ -184,6 +184,148 @@ class TestSyntheticCamera:
             self.synthetic_camera.is_acquiring is False
         ), "is_acquiring should be False"
 
+    def test_synthetic_camera_frame_notification(self):
+        import threading
+        import time
+
+        number_of_frames = 10
+        data_buffer = [np.zeros((4, 4), dtype=np.uint16) for _ in range(10)]
+        x_pixels, y_pixels = (
+            self.synthetic_camera.x_pixels,
+            self.synthetic_camera.y_pixels,
+        )
+        self.synthetic_camera.x_pixels, self.synthetic_camera.y_pixels = 4, 4
+        self.synthetic_camera.frame_wait_timeout = 0.1
+        self.synthetic_camera.initialize_image_series(data_buffer, number_of_frames)
+
+        # no frame within the timeout
+        start_time = time.perf_counter()
+        assert self.synthetic_camera.get_new_frame() == []
+        assert time.perf_counter() - start_time >= 0.1
+
+        # frames from another thread are delivered as soon as they are generated
+        self.synthetic_camera.frame_wait_timeout = 5
+        timer = threading.Timer(0.05, self.synthetic_camera.generate_new_frame)
+        timer.start()
+        start_time = time.perf_counter()
+        assert self.synthetic_camera.get_new_frame() == [0]
+        assert time.perf_counter() - start_time < 1
+        timer.join()
+
+        # closing the image series wakes up the waiting thread
+        timer = threading.Timer(0.05, self.synthetic_camera.close_image_series)
+        timer.start()
+        start_time = time.perf_counter()
+        assert self.synthetic_camera.get_new_frame() == []
+        assert time.perf_counter() - start_time < 1
+        timer.join()
+
+        self.synthetic_camera.frame_wait_timeout = 0.5
+        self.synthetic_camera.x_pixels, self.synthetic_camera.y_pixels = (
+            x_pixels,
+            y_pixels,
+        )
+
+    def test_synthetic_camera_noise_bank(self):
+        x_pixels, y_pixels = (
+            self.synthetic_camera.x_pixels,
+            self.synthetic_camera.y_pixels,
+        )
+        self.synthetic_camera.x_pixels, self.synthetic_camera.y_pixels = 64, 32
+        self.synthetic_camera.build_noise_bank()
+
+        bank = self.synthetic_camera._noise_bank
+        assert bank.dtype == np.uint16
+        assert bank.size == (self.synthetic_camera.noise_bank_size + 1) * 64 * 32
+        assert abs(bank.mean() - self.synthetic_camera._mean_background_count) < 5
+
+        frames = [self.synthetic_camera.get_noise_frame() for _ in range(5)]
+        for frame in frames:
+            assert frame.shape == (64 * 32,)
+            assert np.shares_memory(frame, bank)
+        assert any(not np.array_equal(frames[0], frame) for frame in frames[1:])
+
+        self.synthetic_camera.x_pixels, self.synthetic_camera.y_pixels = (
+            x_pixels,
+            y_pixels,
+        )
+        self.synthetic_camera._noise_bank = None
+
+    def test_synthetic_camera_phantom(self):
+        x_pixels, y_pixels = (
+            self.synthetic_camera.x_pixels,
+            self.synthetic_camera.y_pixels,
+        )
+        self.synthetic_camera.x_pixels, self.synthetic_camera.y_pixels = 32, 32
+        self.synthetic_camera.phantom = {
+            "type": "sphere",
+            "size": 8,
+            "intensity": 1000,
+            "pixel_size": 1,
+            "depth_of_field": 1,
+        }
+        position = {"x_pos": 0, "y_pos": 0, "z_pos": 0, "f_pos": 0}
+        self.synthetic_camera.stage_position_source = lambda: position
+
+        image = self.synthetic_camera.get_phantom_slice().reshape(32, 32)
+        assert image[16, 16] == 1000
+        assert image[0, 0] == 0
+        # the slice is cached by stage position
+        assert self.synthetic_camera.get_phantom_slice() is image.base
+
+        # moving the stage moves the object in the field of view
+        position["x_pos"] = 8
+        shifted = self.synthetic_camera.get_phantom_slice().reshape(32, 32)
+        assert shifted[16, 8] == 1000
+        assert shifted[16, 24] == 0
+
+        # defocus softens the edges of the object
+        position["x_pos"] = 0
+        position["f_pos"] = 20
+        blurred = self.synthetic_camera.get_phantom_slice().reshape(32, 32)
+        assert (
+            np.abs(np.diff(blurred.astype(float))).max()
+            < np.abs(np.diff(image.astype(float))).max()
+        )
+
+        # out of the object along z
+        position["z_pos"] = 20
+        assert not self.synthetic_camera.get_phantom_slice().any()
+
+        self.synthetic_camera.phantom_cache_size = 2
+        position["z_pos"] = 40
+        self.synthetic_camera.get_phantom_slice()
+        assert len(self.synthetic_camera._phantom_slices) == 2
+
+        # frames are noise plus the phantom
+        data_buffer = [np.zeros((32, 32), dtype=np.uint16) for _ in range(2)]
+        self.synthetic_camera.initialize_image_series(data_buffer, 2)
+        position["z_pos"] = 0
+        position["f_pos"] = 0
+        self.synthetic_camera.generate_new_frame()
+        assert data_buffer[0][16, 16] > 1000
+        assert data_buffer[0][0, 0] < 1000
+        self.synthetic_camera.close_image_series()
+
+        self.synthetic_camera.phantom = None
+        self.synthetic_camera.phantom_cache_size = 32
+        self.synthetic_camera.stage_position_source = None
+        self.synthetic_camera._phantom_slices.clear()
+        self.synthetic_camera._noise_bank = None
+        self.synthetic_camera.x_pixels, self.synthetic_camera.y_pixels = (
+            x_pixels,
+            y_pixels,
+        )
+
+    def test_synthetic_camera_readout_time(self):
+        readout_time = self.synthetic_camera.readout_time
+        self.synthetic_camera.readout_time = 0.005
+        assert self.synthetic_camera.calculate_readout_time() == 0.005
+        assert self.synthetic_camera.get_frame_timeout(0.5) == pytest.approx(
+            0.505 * self.synthetic_camera.frame_timeout_factor
+        )
+        self.synthetic_camera.readout_time = readout_time
+
     def test_synthetic_camera_set_roi(self):
         self.synthetic_camera.set_ROI()
         assert self.synthetic_camera.x_pixels == 2048
@@ -0,0 +1,23 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+
+@pytest.fixture
+def mock_nidaqmx(monkeypatch):
+    """Replace the tasks of nidaqmx with mocks that record their calls.
+
+    Returns the list of created tasks.
+    """
+    import nidaqmx
+
+    tasks = []
+
+    def create_task(*args, **kwargs):
+        task = MagicMock()
+        task.is_task_done.return_value = True
+        tasks.append(task)
+        return task
+
+    monkeypatch.setattr(nidaqmx, "Task", create_task)
+    return tasks
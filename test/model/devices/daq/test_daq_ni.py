@@ -76,3 +76,167 @@ def test_daq_ni_functions():
             getattr(daq, f)(*a)
         else:
             getattr(daq, f)()
+
+
+def test_daq_ni_sequence():
+    from unittest.mock import MagicMock
+
+    import nidaqmx
+    from navigate.model.devices.daq.ni import NIDAQ
+    from test.model.dummy import DummyModel
+
+    model = DummyModel()
+    daq = NIDAQ(model.configuration)
+    daq.camera_trigger_task = MagicMock()
+    daq.master_trigger_task = MagicMock()
+    daq.analog_output_tasks = {"PXI6259": MagicMock()}
+    daq.n_sample = 100
+    daq.sweep_times = {"channel_1": 0.001}
+    daq.current_channel_key = "channel_1"
+
+    daq.set_sequence_length(3)
+    daq.camera_trigger_task.timing.cfg_implicit_timing.assert_called_with(
+        sample_mode=nidaqmx.constants.AcquisitionType.FINITE, samps_per_chan=3
+    )
+    samples = daq.analog_output_tasks[
+        "PXI6259"
+    ].timing.cfg_samp_clk_timing.call_args.kwargs["samps_per_chan"]
+    assert samples == 300
+
+    # the frames before the last one are timed by the DAQ and do not wait
+    for _ in range(2):
+        daq.run_acquisition()
+        daq.camera_trigger_task.wait_until_done.assert_not_called()
+    daq.run_acquisition()
+
+    # the tasks are started and stopped once for the sequence
+    assert daq.master_trigger_task.write.call_count == 1
+    assert daq.camera_trigger_task.wait_until_done.call_count == 1
+    assert not daq.is_sequence_running()
+
+    daq.run_acquisition()
+    assert daq.master_trigger_task.write.call_count == 2
+    assert daq.is_sequence_running()
+    daq.stop_acquisition()
+    assert not daq.is_sequence_running()
+
+
+def test_daq_ni_retriggerable_scan(mock_nidaqmx):
+    from unittest.mock import MagicMock
+
+    from navigate.model.devices.daq.ni import NIDAQ
+    from test.model.dummy import DummyModel
+
+    model = DummyModel()
+    daq = NIDAQ(model.configuration)
+    camera_task = daq.camera_trigger_task = MagicMock()
+    master_task = daq.master_trigger_task = MagicMock()
+    ao_task = MagicMock()
+    daq.analog_output_tasks = {"PXI6259": ao_task}
+    daq.sweep_times = {"channel_1": 0.05}
+    daq.current_channel_key = "channel_1"
+
+    # a frame and the camera delay must pass before the next trigger is accepted
+    assert daq.get_trigger_period("channel_1") == pytest.approx(
+        0.05 * daq.waveform_repeat_num * daq.waveform_expand_num + daq.camera_delay
+    )
+
+    daq.set_external_trigger("/PXI6259/PFI1", retriggerable=True)
+    assert camera_task.triggers.start_trigger.retriggerable is True
+    assert ao_task.triggers.start_trigger.retriggerable is True
+    camera_task.triggers.start_trigger.cfg_dig_edge_start_trig.assert_called_with(
+        "/PXI6259/PFI1"
+    )
+
+    # the tasks are armed once for all the encoder pulses of the scan
+    camera_task.stop.reset_mock()
+    camera_task.is_task_done.return_value = True
+    daq.run_acquisition()
+    camera_task.is_task_done.return_value = False
+    for _ in range(4):
+        daq.run_acquisition()
+    assert camera_task.start.call_count == 1
+    assert ao_task.start.call_count == 1
+    camera_task.wait_until_done.assert_not_called()
+    camera_task.stop.assert_not_called()
+    master_task.write.assert_not_called()
+
+    # the scan ends with the self-trigger
+    daq.set_external_trigger(None)
+    assert not daq.retriggerable
+    camera_task.stop.assert_called()
+    assert camera_task.triggers.start_trigger.retriggerable is False
+    assert ao_task.triggers.start_trigger.retriggerable is False
+
+    # other external triggers run one frame per trigger
+    daq.set_external_trigger("/PXI6259/PFI2")
+    assert not daq.retriggerable
+    assert camera_task.triggers.start_trigger.retriggerable is False
+    daq.run_acquisition()
+    camera_task.wait_until_done.assert_called_once()
+
+
+def test_daq_ni_reuse_tasks(mock_nidaqmx):
+    import numpy as np
+
+    from navigate.model.devices.daq.ni import NIDAQ
+    from test.model.dummy import DummyModel
+
+    model = DummyModel()
+    model.configuration["waveform_templates"] = {}
+    daq = NIDAQ(model.configuration)
+    daq.sweep_times = {"channel_1": 0.01, "channel_2": 0.01, "channel_3": 0.02}
+    n_sample = int(daq.sample_rate * 0.01)
+    ramp = np.linspace(0, 1, n_sample)
+    daq.analog_outputs = {
+        "PXI6259/ao0": {
+            "waveform": {
+                "channel_1": ramp,
+                "channel_2": ramp.copy(),
+                "channel_3": np.linspace(0, 1, 2 * n_sample),
+            }
+        },
+        "PXI6259/ao1": {
+            "waveform": {
+                "channel_1": ramp,
+                "channel_2": 2 * ramp,
+                "channel_3": np.linspace(0, 2, 2 * n_sample),
+            }
+        },
+    }
+
+    daq.prepare_acquisition("channel_1")
+    # camera, analog output and master trigger tasks
+    assert len(mock_nidaqmx) == 3
+    assert daq.task_counts["written"] == 1
+    ao_task = daq.analog_output_tasks["PXI6259"]
+    np.testing.assert_array_equal(ao_task.write.call_args.args[0], [ramp, ramp])
+
+    for channel_key in ["channel_2", "channel_1", "channel_2"]:
+        daq.stop_tasks()
+        daq.prepare_acquisition(channel_key)
+    # the tasks are reused and each channel switch rewrites the changed waveforms
+    assert len(mock_nidaqmx) == 3
+    assert ao_task.write.call_count == 4
+    ao_task.timing.cfg_samp_clk_timing.assert_called_once()
+    daq.camera_trigger_task.timing.cfg_implicit_timing.assert_called_once()
+
+    # the expanded waveforms are cached per channel
+    daq.stop_tasks()
+    waveforms = daq.get_analog_waveforms("PXI6259", "channel_2")
+    daq.prepare_acquisition("channel_2")
+    assert daq.get_analog_waveforms("PXI6259", "channel_2") is waveforms
+    assert ao_task.write.call_count == 4
+    assert daq.task_counts["reused"] == 1
+
+    # a longer buffer needs a new analog output task
+    daq.stop_tasks()
+    daq.prepare_acquisition("channel_3")
+    assert len(mock_nidaqmx) == 4
+    ao_task.close.assert_called_once()
+
+    daq.stop_acquisition()
+    assert daq.camera_trigger_task is None
+    assert daq.analog_output_tasks == {}
+    for task in mock_nidaqmx[1:]:
+        task.close.assert_called()
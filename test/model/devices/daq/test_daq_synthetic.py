@@ -1,3 +1,6 @@
+import time
+
+
 def test_initialize_daq_synthetic():
     from navigate.model.devices.daq.synthetic import SyntheticDAQ
     from test.model.dummy import DummyModel
@@ -50,3 +53,98 @@ def test_synthetic_daq_functions():
             getattr(daq, f)(*a)
         else:
             getattr(daq, f)()
+
+
+def test_synthetic_daq_scan_trigger():
+    from unittest.mock import MagicMock
+
+    from navigate.model.devices.daq.synthetic import SyntheticDAQ
+    from test.model.dummy import DummyModel
+
+    model = DummyModel()
+    daq = SyntheticDAQ(model.configuration)
+    daq_config = model.configuration["configuration"]["microscopes"][
+        daq.microscope_name
+    ]["daq"]
+    daq_config["scan_trigger_source"] = "/PXI6259/PFI1"
+    camera = MagicMock()
+    daq.add_camera(daq.microscope_name, camera)
+
+    daq.set_external_trigger("/PXI6259/PFI3")
+    daq.run_acquisition()
+    camera.generate_new_frame.assert_not_called()
+
+    # encoder pulses of a scanning stage trigger the camera
+    daq.set_external_trigger("/PXI6259/PFI1")
+    daq.run_acquisition()
+    assert camera.generate_new_frame.call_count == 1
+
+    daq.set_external_trigger("/PXI6259/PFI1", retriggerable=True)
+    assert daq.retriggerable
+    daq.run_acquisition()
+    assert camera.generate_new_frame.call_count == 2
+
+    daq.set_external_trigger(None)
+    assert not daq.retriggerable
+    daq.run_acquisition()
+    assert camera.generate_new_frame.call_count == 3
+
+
+def test_synthetic_daq_sequence():
+    from unittest.mock import MagicMock
+
+    from navigate.model.devices.daq.synthetic import SyntheticDAQ
+    from test.model.dummy import DummyModel
+
+    model = DummyModel()
+    daq = SyntheticDAQ(model.configuration)
+    camera = MagicMock()
+    daq.add_camera(daq.microscope_name, camera)
+    daq.task_overhead = 0.05
+
+    daq.set_sequence_length(3)
+    assert not daq.is_sequence_running()
+
+    daq.run_acquisition()
+    assert daq.is_sequence_running()
+    start_time = time.perf_counter()
+    daq.run_acquisition()
+    daq.run_acquisition()
+    # only the first frame of the sequence starts the tasks
+    assert time.perf_counter() - start_time < daq.task_overhead
+    assert not daq.is_sequence_running()
+    assert camera.generate_new_frame.call_count == 3
+
+    daq.run_acquisition()
+    assert daq.is_sequence_running()
+    daq.stop_acquisition()
+    assert not daq.is_sequence_running()
+
+    # sequences are not triggered externally
+    daq.set_external_trigger("/PXI6259/PFI1")
+    assert daq.sequence_length == 1
+    daq.set_sequence_length(3)
+    assert daq.sequence_length == 1
+
+
+def test_synthetic_daq_frame_period():
+    from unittest.mock import MagicMock
+
+    from navigate.model.devices.daq.synthetic import SyntheticDAQ
+    from test.model.dummy import DummyModel
+
+    model = DummyModel()
+    daq = SyntheticDAQ(model.configuration)
+    camera = MagicMock()
+    daq.add_camera(daq.microscope_name, camera)
+    daq.task_overhead = 0
+    daq.sweep_times = {"channel_1": 0.05}
+    daq.waveform_repeat_num = 1
+    daq.waveform_expand_num = 1
+    daq.prepare_acquisition("channel_1")
+
+    # the frame is triggered, then the DAQ blocks until it is done
+    start_time = time.perf_counter()
+    daq.run_acquisition()
+    assert time.perf_counter() - start_time >= 0.05
+    camera.generate_new_frame.assert_called_once()
@@ -0,0 +1,179 @@
+# Copyright (c) 2021-2024  The University of Texas Southwestern Medical Center.
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted for academic and research use only (subject to the
+# limitations in the disclaimer below) provided that the following conditions are met:
+
+#      * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#      * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+
+#      * Neither the name of the copyright holders nor the names of its
+#      contributors may be used to endorse or promote products derived from this
+#      software without specific prior written permission.
+
+# NO EXPRESS OR IMPLIED LICENSES TO ANY PARTY'S PATENT RIGHTS ARE GRANTED BY
+# THIS LICENSE. THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+# PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+#
+
+# Standard Library Imports
+import time
+
+# Third Party Imports
+import pytest
+
+# Local Imports
+from navigate.model.devices.emulators.asi import (
+    EmulatedAxis,
+    EmulatedFilterWheel,
+    MS2000Emulator,
+    TigerEmulator,
+)
+from navigate.model.devices.emulators.serial_port import EmulatedSerial
+from navigate.model.devices.APIs.asi.asi_MS2000_controller import MS2000Controller
+from navigate.model.devices.APIs.asi.asi_tiger_controller import TigerController
+from navigate.model.devices.filter_wheel.asi import ASIFilterWheel
+
+
+@pytest.fixture
+def tiger():
+    emulator = TigerEmulator(speed=1.0, ramp_time=10)
+    port = EmulatedSerial(emulator)
+    port.open()
+
+    def query(command):
+        port.write(bytes(f"{command}\r", encoding="ascii"))
+        return port.readline().decode(encoding="ascii")
+
+    query.emulator = emulator
+    return query
+
+
+def test_axis_move_time():
+    axis = EmulatedAxis(speed=2.0, ramp_time=100)
+    assert axis.move_time(0) == 0
+    # 1 mm at 2 mm/s plus the ramp time
+    assert axis.move_time(10000) == pytest.approx(0.6)
+    assert axis.move_time(1000) == pytest.approx(2 * (0.1 * 0.1 / 2) ** 0.5)
+
+
+def test_axis_motion():
+    axis = EmulatedAxis(speed=1.0, ramp_time=0)
+    axis.move(10000, now=0.0)
+    assert axis.is_busy(0.5)
+    assert axis.position(0.5) == pytest.approx(5000)
+    assert not axis.is_busy(1.0)
+    assert axis.position(2.0) == 10000
+    axis.move(0, now=2.0)
+    axis.halt(now=2.25)
+    assert not axis.is_busy(2.25)
+    assert axis.position(3.0) == pytest.approx(7500)
+
+
+def test_build(tiger):
+    lines = tiger("BU X").split("\r")
+    assert lines[1] == "Motor Axes: X Y Z M N"
+    assert lines[2] == "Axis Types: x x z z z"
+
+
+def test_move_and_status(tiger):
+    assert tiger("MOVE X=100 Y=-50") == ":A\r\n"
+    assert tiger("/") == "B\r\n"
+    assert tiger("RS X?") == ":A B\r\n"
+    assert tiger("RS Z?") == ":A N\r\n"
+    time.sleep(0.05)
+    assert tiger("/") == "N\r\n"
+    assert tiger("WHERE Y X") == ":A 100.0 -50.0\r\n"
+    tiger("MOVREL X=20")
+    time.sleep(0.05)
+    assert tiger("WHERE X") == ":A 120.0\r\n"
+
+
+def test_halt(tiger):
+    tiger("MOVE X=1000000")
+    assert tiger("/") == "B\r\n"
+    assert tiger("HALT") == ":A\r\n"
+    assert tiger("/") == "N\r\n"
+    assert 0 < float(tiger("WHERE X").split()[1]) < 1000000
+
+
+def test_settings(tiger):
+    assert tiger("SPEED X=2.5 Y=100") == ":A\r\n"
+    assert tiger("SPEED X? Y?") == ":A X=2.500000 Y=7.500000\r\n"
+    assert tiger("AC X=50") == ":A\r\n"
+    assert tiger("AC X?") == ":A X=50\r\n"
+    assert tiger("CNTS X?") == ":A X=10000 counts/mm\r\n"
+    assert tiger("AA X=85") == ":A\r\n"
+    assert tiger("MOVE Q=1") == ":N-1\r\n"
+    assert tiger.emulator.command_counts["SPEED"] == 2
+    assert tiger.emulator.history[-1] == "MOVE Q=1"
+
+
+def test_filter_wheel_move_time():
+    wheel = EmulatedFilterWheel(switch_time=0.04, positions=8)
+    assert wheel.move_time(0) == 0
+    assert wheel.move_time(3) == pytest.approx(0.12)
+    # shortest way around
+    assert wheel.move_time(7) == pytest.approx(0.04)
+    wheel.move(3, now=0.0)
+    wheel.move(4, now=0.0)
+    assert wheel.busy_until == pytest.approx(0.16)
+
+
+def test_filter_wheel_commands(tiger):
+    assert tiger("FW 1\n") == "1\r\n"
+    assert tiger("MP 3\n") == "3\r\n"
+    assert tiger.emulator.filter_wheels[1].position == 3
+    assert tiger.emulator.filter_wheels[0].position == 0
+    assert tiger.emulator.is_filter_wheel_busy(time.perf_counter())
+    assert tiger("HA\n") == "0\r\n"
+    assert not tiger.emulator.is_filter_wheel_busy(time.perf_counter())
+    assert tiger("HO\n") == "0\r\n"
+    assert tiger("FW 2\n") == ":N-1\r\n"
+    assert tiger("MP 8\n") == ":N-1\r\n"
+
+
+def test_asi_filter_wheel_driver():
+    emulator = TigerEmulator(switch_time=0.01)
+    controller = TigerController("COM1", 115200)
+    controller.serial_port = EmulatedSerial(emulator)
+    controller.connect_to_serial()
+    filter_wheel = ASIFilterWheel(
+        controller,
+        {
+            "available_filters": {"a": 0, "b": 5},
+            "hardware": {"wheel_number": 1},
+            "filter_wheel_delay": 0.01,
+        },
+    )
+    filter_wheel.set_filter("b")
+    assert emulator.filter_wheels[1].position == 5
+    filter_wheel.set_filter("a")
+    assert emulator.filter_wheels[1].position == 0
+    assert not emulator.is_filter_wheel_busy(time.perf_counter())
+
+
+def test_ms2000_driver():
+    emulator = MS2000Emulator(speed=2.0, ramp_time=10)
+    controller = MS2000Controller("COM1", 115200)
+    controller.serial_port = EmulatedSerial(emulator)
+    controller.connect_to_serial()
+    assert controller.get_default_motor_axis_sequence() == ["X", "Y", "Z"]
+    controller.move({"X": 100, "Z": -20})
+    controller.wait_for_device()
+    assert not emulator.is_busy(time.perf_counter())
+    assert controller.get_position(["X", "Z"]) == {"X": 100.0, "Z": -20.0}
@@ -0,0 +1,141 @@
+# Copyright (c) 2021-2024  The University of Texas Southwestern Medical Center.
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted for academic and research use only (subject to the
+# limitations in the disclaimer below) provided that the following conditions are met:
+
+#      * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#      * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+
+#      * Neither the name of the copyright holders nor the names of its
+#      contributors may be used to endorse or promote products derived from this
+#      software without specific prior written permission.
+
+# NO EXPRESS OR IMPLIED LICENSES TO ANY PARTY'S PATENT RIGHTS ARE GRANTED BY
+# THIS LICENSE. THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+# PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+#
+
+# Standard Library Imports
+import os
+import time
+
+# Third Party Imports
+import pytest
+import serial
+
+# Local Imports
+from navigate.model.devices.emulators.serial_port import (
+    EmulatedSerial,
+    PtyTransport,
+    SerialEmulator,
+)
+
+
+class EchoEmulator(SerialEmulator):
+    """Answer each command with itself, or nothing for 'QUIET'."""
+
+    def handle(self, command):
+        self.count(command)
+        if command == b"QUIET":
+            return b"", 0.0
+        response = command + b"\r\n"
+        return response, self.get_latency(command, command, response)
+
+
+def test_split_commands():
+    emulator = EchoEmulator()
+    data = bytearray(b"A\rBC\rD")
+    assert emulator.split(data) == [b"A", b"BC"]
+    assert data == b"D"
+
+
+def test_output_queue():
+    emulator = EchoEmulator()
+    emulator.receive(b"NOW\r")
+    emulator.send(b"LATE", 10.0)
+    # responses are sent in order
+    emulator.send(b"AFTER", 0.0)
+    assert emulator.read_output() == b"NOW\r\n"
+    assert emulator.next_output_time() > time.perf_counter() + 5
+    emulator.cancel_output()
+    assert emulator.next_output_time() is None
+    assert emulator.read_output() == b""
+
+
+def test_write_and_read():
+    port = EmulatedSerial(EchoEmulator(), timeout=0.01)
+    port.open()
+    assert port.is_open
+    port.write(b"HEL")
+    assert port.in_waiting == 0
+    port.write(b"LO\rWORLD\r")
+    assert port.readline() == b"HELLO\r\n"
+    assert port.read(3) == b"WOR"
+    assert port.inWaiting() == 4
+    assert port.read_all() == b"LD\r\n"
+    port.write(b"QUIET\r")
+    assert port.readline() == b""
+    assert port.emulator.command_counts == {b"HELLO": 1, b"WORLD": 1, b"QUIET": 1}
+    port.close()
+    assert not port.is_open
+
+
+def test_latency():
+    emulator = EchoEmulator(latency=0.05, command_latency={b"FAST": 0.0})
+    port = EmulatedSerial(emulator)
+    port.write(b"SLOW\r")
+    assert port.read_all() == b""
+    start_time = time.perf_counter()
+    assert port.readline() == b"SLOW\r\n"
+    assert time.perf_counter() - start_time == pytest.approx(0.05, abs=0.04)
+
+    port.write(b"FAST\r")
+    assert port.read_all() == b"FAST\r\n"
+
+    emulator.baud_rate = 100
+    assert emulator.get_latency(b"A", b"A", b"B") == pytest.approx(0.25)
+
+
+def test_timeout():
+    port = EmulatedSerial(EchoEmulator(latency=1.0), timeout=0.01)
+    port.write(b"LATE\r")
+    start_time = time.perf_counter()
+    assert port.readline() == b""
+    assert time.perf_counter() - start_time == pytest.approx(0.01, abs=0.2)
+
+
+def test_reset_input_buffer():
+    port = EmulatedSerial(EchoEmulator(latency=0.02))
+    port.write(b"OLD\r")
+    time.sleep(0.03)
+    port.write(b"NEW\r")
+    # only the bytes already received are discarded
+    port.reset_input_buffer()
+    assert port.readline() == b"NEW\r\n"
+
+
+@pytest.mark.skipif(not hasattr(os, "openpty"), reason="requires a POSIX system")
+def test_pty_transport():
+    with PtyTransport(EchoEmulator(latency=0.01)) as transport:
+        port = serial.Serial(transport.port, 115200, timeout=1)
+        port.write(b"HELLO\rWOR")
+        assert port.readline() == b"HELLO\r\n"
+        port.write(b"LD\r")
+        assert port.readline() == b"WORLD\r\n"
+        port.close()
+    assert transport.port is not None
@@ -0,0 +1,133 @@
+# Copyright (c) 2021-2024  The University of Texas Southwestern Medical Center.
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted for academic and research use only (subject to the
+# limitations in the disclaimer below) provided that the following conditions are met:
+
+#      * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#      * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+
+#      * Neither the name of the copyright holders nor the names of its
+#      contributors may be used to endorse or promote products derived from this
+#      software without specific prior written permission.
+
+# NO EXPRESS OR IMPLIED LICENSES TO ANY PARTY'S PATENT RIGHTS ARE GRANTED BY
+# THIS LICENSE. THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+# PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+#
+
+# Standard Library Imports
+import time
+
+# Third Party Imports
+import pytest
+
+# Local Imports
+from navigate.model.devices.emulators.serial_port import EmulatedSerial
+from navigate.model.devices.emulators.sutter import (
+    MP285Emulator,
+    SutterFilterWheelEmulator,
+)
+from navigate.model.devices.APIs.sutter.MP285 import MP285
+from navigate.model.devices.filter_wheel.sutter import SutterFilterWheel
+
+
+@pytest.fixture
+def mp285():
+    emulator = MP285Emulator()
+    stage = MP285("COM1", 9600)
+    stage.serial = EmulatedSerial(emulator, timeout=0.25)
+    stage.connect_to_serial()
+    stage.emulator = emulator
+    return stage
+
+
+def test_mp285_split():
+    emulator = MP285Emulator()
+    data = bytearray(b"c\rm" + bytes(12) + b"\r\x03V\x01")
+    assert emulator.split(data) == [b"c\r", b"m" + bytes(12) + b"\r", b"\x03"]
+    assert data == b"V\x01"
+
+
+def test_mp285_move(mp285):
+    assert mp285.set_resolution_and_velocity(1000, "high")
+    assert mp285.emulator.speed == 1000
+    assert mp285.emulator.resolution == "high"
+
+    start_time = time.perf_counter()
+    assert mp285.move_to_specified_position(20, -10, 4)
+    # the controller answers at the end of the 20 um move
+    assert time.perf_counter() - start_time == pytest.approx(0.02, abs=0.015)
+    assert mp285.get_current_position() == pytest.approx((20, -10, 4))
+    assert mp285.refresh_display()
+    assert mp285.reset_controller()
+
+
+def test_mp285_commands_wait_for_move():
+    emulator = MP285Emulator(speed=1000)
+    port = EmulatedSerial(emulator)
+    port.write(b"m" + (2500).to_bytes(4, "little", signed=True) + bytes(8) + b"\r")
+    port.write(b"c\r")
+    start_time = time.perf_counter()
+    # 100 um at 1000 um/s
+    assert port.read(14)[1:5] == (2500).to_bytes(4, "little", signed=True)
+    assert time.perf_counter() - start_time == pytest.approx(0.1, abs=0.05)
+
+
+def test_mp285_interrupt():
+    emulator = MP285Emulator(speed=100)
+    port = EmulatedSerial(emulator)
+    port.write(b"m" + (2500).to_bytes(4, "little", signed=True) + bytes(8) + b"\r")
+    time.sleep(0.1)
+    port.write(b"\x03c\r")
+    response = port.read(14)
+    assert response[:1] == b"="
+    position = int.from_bytes(response[1:5], "little", signed=True)
+    assert 0 < position < 2500
+    assert not emulator.is_busy(time.perf_counter())
+    assert port.read_all() == b""
+
+
+def test_sutter_filter_wheel_emulator():
+    emulator = SutterFilterWheelEmulator()
+    assert emulator.move_time(0, 0, 0) == 0
+    assert emulator.move_time(0, 1, 0) == pytest.approx(0.031)
+    assert emulator.move_time(0, 9, 7) == pytest.approx(0.230)
+    assert emulator.move_time(0, 3, 0) == pytest.approx(0.031 * 2.3)
+
+    port = EmulatedSerial(emulator)
+    port.write(b"\xee")
+    assert port.read(2) == b"\xee\r"
+    # wheel B to position 2 at speed 1
+    port.write(bytes([128 + 16 + 2]))
+    assert port.read(1) == bytes([128 + 16 + 2])
+    assert port.in_waiting == 0
+    assert port.read(1) == b"\r"
+    assert emulator.wheel_positions == [0, 2]
+
+
+def test_sutter_filter_wheel_driver():
+    emulator = SutterFilterWheelEmulator()
+    filter_wheel = SutterFilterWheel(
+        EmulatedSerial(emulator, timeout=0.25),
+        {"available_filters": {"a": 0, "b": 3}, "hardware": {"wheel_number": 1}},
+    )
+    filter_wheel.set_filter("b")
+    assert emulator.wheel_positions[0] == 3
+    assert filter_wheel.serial.in_waiting == 0
+    filter_wheel.close()
+    assert emulator.wheel_positions[0] == 0
@@ -116,6 +116,24 @@ class TestASIFilterWheel(unittest.TestCase):
         if_wait_duration = (delta - 1) * 0.04
         self.assertGreater(if_wait_duration, actual_duration)
 
+    def test_set_filter_updates_position(self):
+        self.filter_wheel.set_filter("filter3", wait_until_done=False)
+        self.assertEqual(self.filter_wheel.filter_wheel_position, 2)
+        self.filter_wheel.set_filter("filter1", wait_until_done=False)
+        self.assertEqual(self.filter_wheel.wait_until_done_delay, 2 * 0.04)
+
+    def test_switch_time(self):
+        self.filter_wheel.set_filter("filter3", wait_until_done=False)
+        self.assertAlmostEqual(
+            self.filter_wheel.switch_time("filter1", "filter4"), 0.12
+        )
+        self.assertAlmostEqual(
+            self.filter_wheel.switch_time("filter4", "filter2"), 0.08
+        )
+        self.assertEqual(self.filter_wheel.switch_time("filter2", "filter2"), 0)
+        # the filter wheel does not move
+        self.assertEqual(self.filter_wheel.filter_wheel_position, 2)
+
     def test_close(self):
         self.mock_device_connection.reset_mock()
         self.filter_wheel.close()
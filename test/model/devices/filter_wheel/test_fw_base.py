@@ -24,3 +24,23 @@ def test_filter_wheel_base_functions():
         assert True
         return
     assert False
+
+
+def test_filter_wheel_base_switch_time():
+    from navigate.model.devices.filter_wheel.base import FilterWheelBase
+
+    fw = FilterWheelBase(
+        None,
+        {
+            "available_filters": {"filter1": 0, "filter2": 1, "filter3": 1},
+            "hardware": {"wheel_number": 1},
+        },
+    )
+    # no delay model
+    assert fw.switch_time("filter1", "filter2") == 0
+
+    # fixed delay for every move
+    fw.wait_until_done_delay = 0.03
+    assert fw.switch_time("filter1", "filter2") == 0.03
+    assert fw.switch_time("filter2", "filter3") == 0
+    assert fw.switch_time("filter1", "filter1") == 0
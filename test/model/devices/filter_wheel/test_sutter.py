@@ -96,6 +96,17 @@ class TestSutterFilterWheel(unittest.TestCase):
                 self.filter_wheel.delay_matrix[self.speed, delta],
             )
 
+    def test_switch_time(self):
+        filters = list(self.filter_wheel.filter_dictionary.keys())
+        self.filter_wheel.set_filter(filters[2])
+        for delta in range(6):
+            self.assertEqual(
+                self.filter_wheel.switch_time(filters[delta], filters[0]),
+                self.filter_wheel.delay_matrix[self.speed, delta],
+            )
+        # the filter wheel does not move
+        self.assertEqual(self.filter_wheel.wheel_position, 2)
+
     def test_set_filter_does_not_exist(self):
         self.mock_device_connection.reset_mock()
         with self.assertRaises(ValueError):
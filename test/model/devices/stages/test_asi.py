@@ -33,12 +33,15 @@
 # Standard Library Imports
 import pytest
 import random
+import time
 
 # Third Party Imports
 
 # Local Imports
 from navigate.model.devices.stages.asi import ASIStage
 from navigate.model.devices.APIs.asi.asi_tiger_controller import TigerController
+from navigate.model.devices.emulators.asi import TigerEmulator
+from navigate.model.devices.emulators.serial_port import EmulatedSerial
 
 
 class MockASIStage:
@@ -335,3 +338,74 @@ class TestStageASI:
         self.random_multiple_axes_test(stage)
         stage.stage_limits = False
         self.random_multiple_axes_test(stage)
+
+    def test_motion_model(self):
+        self.stage_configuration["stage"]["hardware"]["axes"] = ["x", "y", "z", "f"]
+        self.stage_configuration["stage"]["hardware"]["axes_mapping"] = None
+        self.stage_configuration["stage"]["hardware"]["acceleration_time"] = 70
+        self.configuration["configuration"]["microscopes"][self.microscope_name][
+            "zoom"
+        ] = {"pixel_size": {"5X": 1.3}}
+        stage = ASIStage(self.microscope_name, None, self.configuration)
+        assert stage.motion_model.axis_models["x"].speed == 1000
+        assert stage.motion_model.axis_models["x"].acceleration_time == 0.07
+
+        emulator = TigerEmulator()
+        asi_stage = TigerController("COM1", 115200)
+        asi_stage.serial_port = EmulatedSerial(emulator)
+        asi_stage.connect_to_serial()
+        stage = ASIStage(self.microscope_name, asi_stage, self.configuration)
+        # the speed set on the controller, 90% of the maximum
+        assert stage.motion_model.axis_models["x"].speed == pytest.approx(6750)
+
+        assert stage.predict_move_time({"x_abs": 50}) == pytest.approx(
+            stage.motion_model.axis_models["x"].predict(50)
+        )
+        polls = []
+        for i in range(8):
+            count = emulator.command_counts.get("/", 0)
+            stage.move_absolute({"x_abs": 50 * ((i + 1) % 2), "y_abs": 10 * i}, True)
+            polls.append(emulator.command_counts["/"] - count)
+            assert not emulator.is_busy(time.perf_counter())
+        assert stage.report_position()["y_pos"] == pytest.approx(70)
+
+        statistics = stage.get_motion_statistics()
+        assert statistics["x"]["count"] == 8
+        assert statistics["y"]["count"] == 0
+        # polling starts close to the predicted end of the calibrated moves
+        assert min(polls[:3]) > max(polls[-3:])
+
+    def test_motion_model_skips_unmeasured_moves(self):
+        from functools import partial
+
+        self.stage_configuration["stage"]["hardware"]["axes"] = ["x", "y", "z", "f"]
+        self.stage_configuration["stage"]["hardware"]["axes_mapping"] = None
+        emulator = TigerEmulator()
+        asi_stage = TigerController("COM1", 115200)
+        asi_stage.serial_port = EmulatedSerial(emulator)
+        asi_stage.connect_to_serial()
+        stage = ASIStage(self.microscope_name, asi_stage, self.configuration)
+        for i in range(4):
+            stage.move_absolute({"x_abs": 50 * ((i + 1) % 2)}, True)
+        statistics = stage.get_motion_statistics()["x"]
+        assert statistics["count"] == 4
+
+        # a move that times out does not change the model
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(asi_stage, "is_device_busy", lambda: True)
+            mp.setattr(
+                asi_stage,
+                "wait_for_device",
+                partial(TigerController.wait_for_device, asi_stage, 0.05),
+            )
+            stage.move_absolute({"x_abs": 100}, True)
+        assert stage.get_motion_statistics()["x"] == statistics
+        while emulator.is_busy(time.perf_counter()):
+            time.sleep(0.01)
+
+        # neither does a move that is done before polling starts
+        x_model = stage.motion_model.axis_models["x"]
+        x_model.scale *= 5
+        statistics = stage.get_motion_statistics()["x"]
+        stage.move_absolute({"x_abs": 0}, True)
+        assert stage.get_motion_statistics()["x"] == statistics
@@ -0,0 +1,135 @@
+# Copyright (c) 2021-2024  The University of Texas Southwestern Medical Center.
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted for academic and research use only (subject to the
+# limitations in the disclaimer below) provided that the following conditions are met:
+
+#      * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#      * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+
+#      * Neither the name of the copyright holders nor the names of its
+#      contributors may be used to endorse or promote products derived from this
+#      software without specific prior written permission.
+
+# NO EXPRESS OR IMPLIED LICENSES TO ANY PARTY'S PATENT RIGHTS ARE GRANTED BY
+# THIS LICENSE. THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+# PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+#
+
+# Standard Library Imports
+import math
+
+# Third Party Imports
+import pytest
+
+# Local Imports
+from navigate.model.devices.stages.motion_model import (
+    AxisMotionModel,
+    MotionTimeModel,
+)
+
+
+class TestAxisMotionModel:
+    """Unit Test for AxisMotionModel Class"""
+
+    def test_profile_time(self):
+        model = AxisMotionModel(speed=1000, acceleration_time=0.1)
+        assert model.profile_time(0) == 0
+        # cruising move
+        assert model.profile_time(500) == pytest.approx(0.6)
+        assert model.profile_time(-500) == pytest.approx(0.6)
+        # short move never reaches full speed
+        assert model.profile_time(25) == pytest.approx(2 * math.sqrt(25 * 0.1 / 1000))
+        # both profiles meet at the ramp distance
+        assert model.profile_time(100) == pytest.approx(0.2)
+
+        model = AxisMotionModel(speed=1000, acceleration_time=0)
+        assert model.profile_time(500) == pytest.approx(0.5)
+
+    def test_predict(self):
+        model = AxisMotionModel(speed=1000, acceleration_time=0.1, overhead=0.01)
+        assert model.predict(0) == 0
+        assert model.predict(500) == pytest.approx(0.61)
+
+    def test_calibrate_overhead_and_scale(self):
+        model = AxisMotionModel(speed=1000, acceleration_time=0.1)
+        for distance in [50, 200, 400, 800, 100, 300]:
+            model.observe(distance, 0.02 + 1.5 * model.profile_time(distance))
+        assert model.overhead == pytest.approx(0.02)
+        assert model.scale == pytest.approx(1.5)
+        assert model.predict(600) == pytest.approx(0.02 + 1.5 * 0.7)
+
+    def test_calibrate_overhead_only(self):
+        model = AxisMotionModel(speed=1000, acceleration_time=0.1)
+        for _ in range(4):
+            model.observe(500, 0.63)
+        assert model.scale == 1.0
+        assert model.overhead == pytest.approx(0.03)
+
+    def test_statistics(self):
+        model = AxisMotionModel(speed=1000, acceleration_time=0.1)
+        assert model.get_statistics()["count"] == 0
+        assert model.get_statistics()["mean_duration"] == 0
+        model.observe(0, 1.0)
+        model.observe(500, 0.7)
+        model.observe(500, 0.5)
+        statistics = model.get_statistics()
+        assert statistics["count"] == 2
+        assert statistics["mean_duration"] == pytest.approx(0.6)
+        assert statistics["max_duration"] == pytest.approx(0.7)
+        assert statistics["mean_error"] > 0
+
+
+class TestMotionTimeModel:
+    """Unit Test for MotionTimeModel Class"""
+
+    @pytest.fixture(autouse=True)
+    def setup_class(self):
+        self.model = MotionTimeModel(
+            {
+                "x": AxisMotionModel(speed=1000, acceleration_time=0.1),
+                "z": AxisMotionModel(speed=100, acceleration_time=0.1),
+            },
+            min_observations=2,
+        )
+
+    def test_predict_slowest_axis(self):
+        assert self.model.predict({}) == 0
+        assert self.model.predict({"x": 500, "z": 10, "theta": 1e6}) == (
+            pytest.approx(0.6)
+        )
+        assert self.model.predict({"x": 500, "z": 100}) == pytest.approx(1.1)
+
+    def test_is_calibrated(self):
+        assert self.model.is_calibrated({"x": 0})
+        assert not self.model.is_calibrated({"x": 100})
+        self.model.observe({"x": 100}, 0.2)
+        self.model.observe({"x": 200, "z": 1}, 0.3)
+        assert self.model.is_calibrated({"x": 100, "z": 0, "theta": 5})
+        # the uncalibrated z axis is faster than x on this move
+        assert self.model.is_calibrated({"x": 100, "z": 1})
+        assert not self.model.is_calibrated({"x": 100, "z": 50})
+        assert self.model.dominant_axis({"x": 100, "z": 50}) == "z"
+        assert self.model.dominant_axis({"x": 0, "theta": 5}) is None
+
+    def test_observe_dominant_axis(self):
+        self.model.observe({"x": 0, "z": 0}, 1.0)
+        self.model.observe({"x": 500, "z": 100}, 1.2)
+        statistics = self.model.get_statistics()
+        assert statistics["x"]["count"] == 0
+        assert statistics["z"]["count"] == 1
+        assert statistics["z"]["max_duration"] == pytest.approx(1.2)
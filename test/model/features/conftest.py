@@ -94,6 +94,7 @@ class DummyModelToTestFeatures:
         self.stop_acquisition = False
         self.frame_id = 0  # signal_num
         self.frame_id_completed = -1
+        self.before_next_trigger = []
 
         self.data = []
         self.signal_records = []
@@ -105,6 +106,9 @@ class DummyModelToTestFeatures:
             if self.signal_container:
                 self.signal_container.run()
 
+            while self.before_next_trigger:
+                self.before_next_trigger.pop(0)()
+
             self.signal_pipe.send("signal")
             self.signal_pipe.recv()
 
@@ -142,6 +146,7 @@ class DummyModelToTestFeatures:
         self.stop_acquisition = False
         self.frame_id = 0  # signal_num
         self.frame_id_completed = -1
+        self.before_next_trigger = []
 
         self.signal_pipe, self.data_pipe = self.device.setup()
 
@@ -162,6 +167,12 @@ class DummyModelToTestFeatures:
         stage_pos = self.configuration["experiment"]["StageParameters"]
         return dict(map(lambda axis: (axis + "_pos", stage_pos[axis]), axes))
 
+    def move_stage(self, pos_dict, wait_until_done=False):
+        RecordObj(
+            "move_stage", self.signal_records, self.frame_id, self.frame_id_completed
+        )(pos_dict, wait_until_done=wait_until_done)
+        return True
+
     def __getattr__(self, __name: str):
         return RecordObj(
             __name, self.signal_records, self.frame_id, self.frame_id_completed
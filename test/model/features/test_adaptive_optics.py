@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+from scipy.optimize import curve_fit
+
+from navigate.model.features.adaptive_optics import (
+    annulus_mask,
+    fit_poly2,
+    fourier_annulus,
+    fourier_annulus_metric,
+    poly2,
+)
+
+
+def bounded_curve_fit(x, y):
+    c = np.min(y)
+    b = (np.max(y) - c) / np.max(np.abs(x))
+    a = -b / 2
+    p, _ = curve_fit(
+        poly2,
+        x,
+        y,
+        p0=[a, b, c],
+        bounds=([-np.inf, -np.inf, -np.inf], [0.0, np.inf, np.inf]),
+    )
+    return p
+
+
+@pytest.mark.parametrize("n_steps", [3, 5, 9])
+def test_fit_poly2_concave(n_steps):
+    x = np.linspace(-0.5, 0.5, n_steps)
+    y = poly2(x, -4.0, 1.0, 100.0) + np.random.default_rng(0).normal(0, 0.01, n_steps)
+
+    np.testing.assert_allclose(
+        fit_poly2(x, y), bounded_curve_fit(x, y), rtol=1e-4, atol=1e-4
+    )
+
+
+def test_fit_poly2_convex_clamped():
+    x = np.linspace(-0.5, 0.5, 7)
+    y = poly2(x, 4.0, 1.0, 100.0)
+
+    p = fit_poly2(x, y)
+
+    assert p[0] == 0
+    np.testing.assert_allclose(p, bounded_curve_fit(x, y), rtol=1e-4, atol=1e-4)
+
+
+@pytest.mark.parametrize("shape", [(64, 64), (63, 65), (64, 63)])
+def test_fourier_annulus_metric(shape):
+    im = np.random.default_rng(1).integers(0, 2**16, shape).astype(np.uint16)
+
+    expected = fourier_annulus(im, radius_1=4, radius_2=20)[0]
+    result = fourier_annulus_metric(im, radius_1=4, radius_2=20)
+
+    assert result == pytest.approx(expected, rel=1e-5)
+
+
+def test_annulus_mask_cached():
+    mask = annulus_mask((32, 32), 0, 8)
+
+    assert annulus_mask((32, 32), 0, 8) is mask
+    assert not mask.flags.writeable
@@ -0,0 +1,83 @@
+import os
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+import tifffile
+
+
+@pytest.fixture
+def calibration_model():
+    model = MagicMock()
+    model.stop_acquisition = False
+    model.data_buffer = [np.zeros((16, 24), dtype=np.uint16) for _ in range(10)]
+    camera = model.active_microscope.camera
+    camera.camera_parameters = {"hardware": {"serial_number": "1234"}}
+    return model
+
+
+def run_calibration(feature, model, frames):
+    feature.pre_signal_func()
+    feature.pre_data_func()
+    for i, frame in enumerate(frames):
+        assert feature.signal_func()
+        idx = i % len(model.data_buffer)
+        model.data_buffer[idx][:] = frame
+        is_end = feature.signal_end()
+        feature.in_data_func([idx])
+        if feature.end_data_func():
+            break
+    return is_end
+
+
+def test_camera_calibration_offset(calibration_model, tmp_path):
+    from navigate.model.features.camera_calibration import CameraCalibration
+
+    model = calibration_model
+    rng = np.random.default_rng(1)
+    frames = rng.normal(100, 3, (20, 16, 24)).astype(np.uint16)
+
+    feature = CameraCalibration(model, "offset", 20)
+    with patch(
+        "navigate.model.features.camera_calibration.get_navigate_path",
+        return_value=str(tmp_path),
+    ):
+        assert run_calibration(feature, model, frames)
+
+    assert model.image_correction is None
+    offset = tifffile.imread(os.path.join(tmp_path, "camera_maps", "1234_off.tiff"))
+    variance = tifffile.imread(os.path.join(tmp_path, "camera_maps", "1234_var.tiff"))
+    np.testing.assert_allclose(offset, np.mean(frames, axis=0), atol=1)
+    np.testing.assert_allclose(variance, np.var(frames, axis=0), atol=1)
+    model.active_microscope.camera.get_offset_variance_maps.assert_called()
+
+
+def test_camera_calibration_flatfield(calibration_model, tmp_path):
+    from navigate.model.features.camera_calibration import CameraCalibration
+
+    model = calibration_model
+    camera = model.active_microscope.camera
+    camera.get_offset_variance_maps.return_value = (
+        np.full((32, 32), 100, dtype=np.uint16),
+        None,
+    )
+    frames = np.full((5, 16, 24), 1100, dtype=np.uint16)
+
+    feature = CameraCalibration(model, "flatfield", 5)
+    with patch(
+        "navigate.model.features.camera_calibration.get_navigate_path",
+        return_value=str(tmp_path),
+    ):
+        run_calibration(feature, model, frames)
+
+    flatfield = tifffile.imread(os.path.join(tmp_path, "camera_maps", "1234_flat.tiff"))
+    assert flatfield.shape == (16, 24)
+    np.testing.assert_allclose(flatfield, 1000 / 1001)
+    camera.get_flatfield_map.assert_called_once()
+
+
+def test_camera_calibration_map_type(calibration_model):
+    from navigate.model.features.camera_calibration import CameraCalibration
+
+    with pytest.raises(ValueError):
+        CameraCalibration(calibration_model, "gain")
@@ -33,7 +33,10 @@
 
 import random
 import pytest
-from navigate.model.features.common_features import ZStackAcquisition
+from navigate.model.features.common_features import (
+    ZStackAcquisition,
+    ScannedZStackAcquisition,
+)
 
 
 class TestZStack:
@@ -151,6 +154,8 @@ class TestZStack:
                     f"should move to {axis}: {pos[i]}, "
                     f"but moved to {pos_moved[axis + '_abs']}"
                 )
+            # the first z, f position is moved together with x, y, theta
+            idx -= 1
 
             # (x, y, z, theta, f)
             z_pos = pos[2] + self.config["start_position"]
@@ -486,3 +491,366 @@ class TestZStack:
         self.z_stack_verification()
 
         self.config["is_multiposition"] = False
+
+    def test_next_stack_move_starts_after_last_trigger(self, monkeypatch):
+        from navigate.model.features.motion_scheduler import MotionScheduler
+
+        issued_moves = []
+        move = MotionScheduler.move
+
+        def record_move(scheduler, pos_dict):
+            issued_moves.append((self.model.frame_id, self.model.frame_id_completed))
+            move(scheduler, pos_dict)
+
+        monkeypatch.setattr(MotionScheduler, "move", record_move)
+
+        # 2 channels per_stack
+        self.config["is_multiposition"] = True
+        self.config["stack_cycling_mode"] = "per_stack"
+        self.config["selected_channels"] = 2
+        self.config["channels"]["channel_1"]["is_selected"] = True
+        self.config["channels"]["channel_2"]["is_selected"] = True
+        self.config["channels"]["channel_3"]["is_selected"] = False
+        try:
+            self.model.start(self.feature_list)
+        finally:
+            # the configuration is shared with the other tests
+            self.config["is_multiposition"] = False
+            self.config["selected_channels"] = 3
+            self.config["channels"]["channel_3"]["is_selected"] = True
+
+        number_z_steps = self.config["number_z_steps"]
+        stacks = 2 * len(self.model.configuration["experiment"]["MultiPositions"])
+
+        # the move to the next stack starts once the last frame is triggered
+        assert len(issued_moves) == stacks - 1
+        for i, (frame_id, frame_id_completed) in enumerate(issued_moves):
+            assert frame_id == (i + 1) * number_z_steps - 1
+            assert frame_id_completed == frame_id
+
+        # one move per frame and the final restore, no redundant blocking moves
+        moves = [r for r in self.model.signal_records if r[0] == "move_stage"]
+        assert len(moves) == stacks * number_z_steps + 1
+
+
+def test_optimize_multiposition_order(dummy_model):
+    from unittest.mock import MagicMock
+    from navigate.model.features.common_features import OptimizeMultiPositionOrder
+
+    model = MagicMock()
+    model.configuration = {
+        "configuration": dummy_model.configuration["configuration"],
+        "experiment": {
+            "MicroscopeState": {},
+            "MultiPositions": [
+                [0, 0, 0, 0, 0],
+                [3000, 0, 0, 0, 0],
+                [1000, 0, 0, 0, 0],
+                [2000, 0, 0, 0, 0],
+            ],
+        },
+    }
+    model.active_microscope_name = "Mesoscale"
+    model.is_save = False
+    model.get_stage_position.return_value = {
+        "x_pos": 0,
+        "y_pos": 0,
+        "z_pos": 0,
+        "theta_pos": 0,
+        "f_pos": 0,
+    }
+
+    feature = OptimizeMultiPositionOrder(model)
+    assert feature.signal_func()
+
+    experiment = model.configuration["experiment"]
+    assert experiment["MicroscopeState"]["multiposition_original_indices"] == [
+        0,
+        2,
+        3,
+        1,
+    ]
+    assert [pos[0] for pos in experiment["MultiPositions"]] == [0, 1000, 2000, 3000]
+    model.event_queue.put.assert_called_once_with(
+        ("multiposition", experiment["MultiPositions"])
+    )
+
+    # a second reorder maps to the original table, not to the reordered one
+    model.get_stage_position.return_value["x_pos"] = 3000
+    assert feature.signal_func()
+    assert experiment["MicroscopeState"]["multiposition_original_indices"] == [
+        1,
+        3,
+        2,
+        0,
+    ]
+    assert [pos[0] for pos in experiment["MultiPositions"]] == [3000, 2000, 1000, 0]
+
+
+def test_move_to_next_position_waits_before_next_trigger():
+    import threading
+    from unittest.mock import MagicMock
+    from navigate.model.features.common_features import (
+        MoveToNextPositionInMultiPositionTable,
+    )
+
+    model = MagicMock()
+    model.configuration = {
+        "experiment": {
+            "MicroscopeState": {"multiposition_count": 2},
+            "MultiPositions": [[5000, 0, 0, 0, 0], [5000, 10, 0, 0, 0]],
+        },
+    }
+    model.before_next_trigger = []
+    model.get_stage_position.return_value = {
+        "x_pos": 0,
+        "y_pos": 0,
+        "z_pos": 0,
+        "theta_pos": 0,
+        "f_pos": 0,
+    }
+    stage_arrived = threading.Event()
+    model.move_stage.side_effect = lambda *args, **kwargs: stage_arrived.wait(5)
+
+    feature = MoveToNextPositionInMultiPositionTable(model)
+    feature.pre_signal_func()
+
+    # the move is issued without blocking the signal thread
+    assert feature.signal_func()
+    assert feature.motion_scheduler.is_moving()
+    model.pause_data_thread.assert_not_called()
+    assert model.before_next_trigger == [feature.wait_for_move]
+
+    # long moves pause the data thread while waiting, right before the trigger
+    stage_arrived.set()
+    model.before_next_trigger.pop(0)()
+    assert not feature.motion_scheduler.is_moving()
+    model.move_stage.assert_called_once()
+    assert model.move_stage.call_args[0][0]["x_abs"] == 5000
+    model.pause_data_thread.assert_called_once()
+    model.resume_data_thread.assert_called_once()
+
+    # short moves do not pause the data thread
+    feature.signal_func()
+    model.before_next_trigger.pop(0)()
+    assert model.move_stage.call_args[0][0]["y_abs"] == 10
+    model.pause_data_thread.assert_called_once()
+    feature.cleanup()
+
+
+class TestScannedZStack:
+    @pytest.fixture(autouse=True)
+    def _prepare_test(self):
+        from unittest.mock import MagicMock
+        import numpy as np
+
+        self.model = MagicMock()
+        self.model.configuration = {
+            "configuration": {
+                "microscopes": {
+                    "Mesoscale": {"daq": {"scan_trigger_source": "/PXI6259/PFI1"}}
+                }
+            },
+            "experiment": {
+                "MicroscopeState": {
+                    "stack_cycling_mode": "per_stack",
+                    "selected_channels": 2,
+                    "number_z_steps": 5,
+                    "start_position": 0,
+                    "end_position": 20,
+                    "step_size": 5,
+                    "start_focus": 0,
+                    "end_focus": 0,
+                    "is_multiposition": False,
+                    "channels": {
+                        "channel_1": {"is_selected": True, "defocus": 0},
+                        "channel_2": {"is_selected": True, "defocus": 10},
+                    },
+                },
+            },
+        }
+        self.model.active_microscope_name = "Mesoscale"
+        self.model.virtual_microscopes = {}
+        self.model.stop_acquisition = False
+        self.model.frame_id = 0
+        self.model.data_buffer_positions = np.zeros((20, 5))
+        self.model.get_stage_position.return_value = {
+            "x_pos": 1,
+            "y_pos": 2,
+            "z_pos": 100,
+            "theta_pos": 0,
+            "f_pos": 50,
+        }
+        self.microscope = self.model.active_microscope
+
+        def prepare_next_channel():
+            self.microscope.current_channel = self.microscope.current_channel % 2 + 1
+
+        self.microscope.prepare_next_channel.side_effect = prepare_next_channel
+        self.microscope.get_exposure_sweep_times.return_value = (
+            {},
+            {"channel_1": 0.05, "channel_2": 0.05},
+        )
+        self.microscope.daq.get_trigger_period.return_value = 0.04
+        self.stage = MagicMock()
+        self.stage.axes_mapping = {"z": "Z"}
+        self.stage.get_speed.return_value = 1.0
+        self.microscope.stages = {"z": self.stage}
+
+    def run_feature(self, **kwargs):
+        from navigate.model.features.feature_container import load_features
+
+        feature_list = [[{"name": ScannedZStackAcquisition, "args": ()}]]
+        if kwargs:
+            feature_list[0][0]["args"] = (False, False, "z-stack") + tuple(
+                kwargs.values()
+            )
+        signal_container, _ = load_features(self.model, feature_list)
+        signal_container.reset()
+        while not signal_container.end_flag:
+            signal_container.run()
+            signal_container.run(wait_response=True)
+            self.model.frame_id += 1
+        signal_container.cleanup()
+
+    def test_scanned_z_stack(self):
+        self.run_feature()
+
+        # one scan per channel
+        assert self.stage.start_scan.call_count == 2
+        assert self.stage.stop_scan.call_count == 2
+        self.stage.scanr.assert_called_with(0.1, 0.12, 0.005, axis="z")
+        self.stage.set_speed.assert_any_call({"Z": 0.005 / 0.05})
+        self.stage.set_speed.assert_called_with({"Z": 1.0})
+        # the DAQ is armed once for all the encoder pulses of a scan
+        self.microscope.daq.set_external_trigger.assert_any_call(
+            "/PXI6259/PFI1", retriggerable=True
+        )
+        self.microscope.daq.set_external_trigger.assert_called_with(None)
+
+        # the stage only moves to the start of each stack and back
+        z_moves = [
+            c.args[0]["z_abs"]
+            for c in self.model.move_stage.call_args_list
+            if "z_abs" in c.args[0]
+        ]
+        assert z_moves == [100, 100, 100]
+
+        positions = self.model.data_buffer_positions
+        assert self.model.frame_id == 10
+        assert list(positions[:5, 2]) == [100, 105, 110, 115, 120]
+        assert list(positions[5:10, 2]) == [100, 105, 110, 115, 120]
+        assert list(positions[:5, 4]) == [50] * 5
+        assert list(positions[5:10, 4]) == [60] * 5
+
+    @pytest.mark.parametrize(
+        "change",
+        [
+            {"end_focus": 10},
+            {"stack_cycling_mode": "per_z"},
+            {"number_z_steps": 1},
+        ],
+    )
+    def test_scanned_z_stack_fallback(self, change):
+        self.model.configuration["experiment"]["MicroscopeState"].update(change)
+        self.run_feature()
+
+        self.stage.start_scan.assert_not_called()
+        self.microscope.daq.set_external_trigger.assert_not_called()
+
+    def test_scanned_z_stack_without_scan_support(self):
+        del self.stage.scanr
+        self.run_feature()
+
+        self.microscope.daq.set_external_trigger.assert_not_called()
+        z_moves = [
+            c.args[0]["z_abs"]
+            for c in self.model.move_stage.call_args_list
+            if "z_abs" in c.args[0]
+        ]
+        assert len(z_moves) == 2 * 5 + 1
+
+    def test_scanned_z_stack_trigger_channel(self):
+        del self.model.configuration["configuration"]["microscopes"]["Mesoscale"][
+            "daq"
+        ]["scan_trigger_source"]
+        self.run_feature()
+        self.stage.start_scan.assert_not_called()
+
+        self.run_feature(trigger_channel="/PXI6259/PFI2")
+        self.microscope.daq.set_external_trigger.assert_any_call(
+            "/PXI6259/PFI2", retriggerable=True
+        )
+
+    def test_scanned_z_stack_trigger_period(self):
+        # the encoder pulses must not arrive faster than the DAQ accepts them
+        self.microscope.daq.get_trigger_period.return_value = 0.08
+        self.run_feature()
+        self.stage.set_speed.assert_any_call({"Z": 0.005 / 0.08})
+
+
+def test_hardware_timed_sequence():
+    from unittest.mock import MagicMock
+    from navigate.model.features.common_features import HardwareTimedSequence
+
+    model = MagicMock()
+    daq = model.active_microscope.daq
+
+    feature = HardwareTimedSequence(model, number_of_frames=3, saving_flag=True)
+    feature.pre_signal_func()
+    daq.set_sequence_length.assert_called_with(3)
+
+    for _ in range(2):
+        assert feature.signal_func()
+        assert feature.signal_response_func()
+        assert not feature.signal_end()
+    assert feature.signal_func()
+    daq.set_sequence_length.assert_called_with(3)
+    assert feature.signal_response_func()
+    assert feature.signal_end()
+    daq.set_sequence_length.assert_called_with(1)
+
+    feature.pre_data_func()
+    feature.in_data_func([0, 1])
+    assert not feature.end_data_func()
+    feature.in_data_func([2])
+    assert feature.end_data_func()
+    assert model.mark_saving_flags.call_count == 2
+
+
+def test_hardware_timed_sequence_runs_all_frames():
+    from unittest.mock import MagicMock
+    from navigate.model.devices.daq.synthetic import SyntheticDAQ
+    from navigate.model.features.common_features import HardwareTimedSequence
+    from navigate.model.features.feature_container import load_features
+    from test.model.dummy import DummyModel
+
+    model = MagicMock()
+    daq = SyntheticDAQ(DummyModel().configuration)
+    camera = MagicMock()
+    daq.add_camera(daq.microscope_name, camera)
+    model.active_microscope.daq = daq
+
+    sequence_lengths = []
+    run_acquisition = daq.run_acquisition
+
+    def record_run_acquisition():
+        sequence_lengths.append(daq.sequence_length)
+        run_acquisition()
+
+    daq.run_acquisition = record_run_acquisition
+
+    feature_list = [[{"name": HardwareTimedSequence, "args": (3,)}]]
+    signal_container, _ = load_features(model, feature_list)
+    signal_container.reset()
+    # the order of Model.snap_image
+    while not signal_container.end_flag:
+        signal_container.run()
+        daq.run_acquisition()
+        signal_container.run(wait_response=True)
+
+    # all the frames are run as one sequence, which finishes by itself
+    assert sequence_lengths == [3, 3, 3]
+    assert camera.generate_new_frame.call_count == 3
+    assert not daq.is_sequence_running()
+    assert daq.sequence_length == 1
@@ -46,3 +46,224 @@ def test_image_write(image_writer):
     assert ls
 
     delete_folder("test_save_dir")
+
+
+def test_image_write_with_writer_pool(dummy_model, tmp_path):
+    import numpy as np
+    from navigate.model.features.image_writer import ImageWriter
+
+    disks = [str(tmp_path / "disk0"), str(tmp_path / "disk1")]
+    saving = dummy_model.configuration["experiment"]["Saving"]
+    saving["save_directory"] = str(tmp_path / "data")
+    saving["file_type"] = "TIFF"
+    saving["writer_workers"] = 2
+    saving["writer_directories"] = disks
+
+    writer = ImageWriter(dummy_model)
+    assert writer.writer_pool.number_of_workers == 2
+    assert writer.data_source.writer_pool is writer.writer_pool
+
+    for i in range(dummy_model.data_buffer.shape[0]):
+        dummy_model.data_buffer[i, ...] = np.random.rand(
+            dummy_model.img_width, dummy_model.img_height
+        )
+    writer.save_image(list(range(dummy_model.number_of_frames)))
+    writer.close()
+
+    completed, submitted = writer.writer_pool.progress
+    assert completed == submitted > 0
+    # the images are spread over the target directories, the MIPs stay in the
+    # save directory
+    written = [f for d in disks if os.path.exists(d) for f in os.listdir(d)]
+    assert written
+    assert os.listdir(tmp_path / "data" / "MIP")
+    assert os.listdir(tmp_path / "data") == ["MIP"]
+
+
+def test_image_write_with_writer_pool_error(dummy_model, tmp_path):
+    from unittest.mock import MagicMock, patch
+    from navigate.model.features.image_writer import ImageWriter
+
+    saving = dummy_model.configuration["experiment"]["Saving"]
+    saving["save_directory"] = str(tmp_path)
+    saving["file_type"] = "TIFF"
+    saving["writer_workers"] = 2
+    dummy_model.event_queue = MagicMock()
+    dummy_model.stop_acquisition = False
+
+    writer = ImageWriter(dummy_model)
+    with patch("tifffile.TiffWriter.write", side_effect=OSError("disk full")):
+        writer.save_image([0])
+        writer.writer_pool.wait(10)
+        writer.save_image([1])
+
+    # the error of the worker stops the acquisition
+    assert dummy_model.stop_acquisition is True
+    message = dummy_model.event_queue.put.call_args[0][0]
+    assert message[0] == "warning"
+    assert "disk full" in message[1]
+    writer.close()
+
+
+def test_image_write_overview_mosaic(dummy_model, tmp_path):
+    import numpy as np
+    from unittest.mock import MagicMock
+    from navigate.model.features.image_writer import ImageWriter
+    from navigate.model.features.remove_empty_tiles import (
+        RemoveEmptyPositionsInOverview,
+    )
+
+    experiment = dummy_model.configuration["experiment"]
+    saving = experiment["Saving"]
+    microscope_state = experiment["MicroscopeState"]
+    # the configuration is shared with the other tests
+    saved_state = {
+        "is_multiposition": microscope_state["is_multiposition"],
+        "image_mode": microscope_state["image_mode"],
+    }
+    saved_positions = [list(p) for p in experiment["MultiPositions"]]
+    event_queue = dummy_model.event_queue
+    saving["save_directory"] = str(tmp_path)
+    saving["file_type"] = "TIFF"
+    microscope_state["is_multiposition"] = True
+    microscope_state["image_mode"] = "single"
+    positions = [[15000.0, 12000.0, 0, 0, 0], [35000.0, 42000.0, 0, 0, 0]]
+    experiment["MultiPositions"] = positions
+
+    try:
+        writer = ImageWriter(dummy_model)
+        mosaic = writer.overview_mosaic
+        assert dummy_model.overview_mosaic is mosaic
+        assert max(mosaic.shape[1:]) <= 2048
+
+        # one stack of one plane per channel at the first position, the last frame is
+        # read out while the stage is already moving to the second position
+        for i in range(writer.data_source.shape_c):
+            dummy_model.data_buffer[i, ...] = 1000
+            dummy_model.data_buffer_positions[i][:2] = positions[0][:2]
+        dummy_model.data_buffer_positions[writer.data_source.shape_c - 1][:2] = [
+            25000.0,
+            27000.0,
+        ]
+        writer.save_image(list(range(writer.data_source.shape_c)))
+        writer.close()
+
+        assert mosaic.tile_count == writer.data_source.shape_c
+        assert np.all(mosaic.get_tile(*positions[0][:2]) == 1000)
+        assert mosaic.get_tile(*positions[1][:2]) is None
+        assert os.path.exists(tmp_path / "MIP" / "overview.ome.tif")
+
+        # the uniform tile has no tissue, the position that was not imaged is kept
+        dummy_model.event_queue = MagicMock()
+        feature = RemoveEmptyPositionsInOverview(dummy_model, percentage=0.5)
+        assert feature.signal_func() is True
+        assert feature.position_records == [False, True]
+        dummy_model.event_queue.put.assert_called_with(
+            ("remove_positions", [False, True])
+        )
+    finally:
+        microscope_state.update(saved_state)
+        experiment["MultiPositions"] = saved_positions
+        dummy_model.event_queue = event_queue
+        dummy_model.overview_mosaic = None
+
+
+def test_image_write_tile_registration(dummy_model, tmp_path):
+    import cv2
+    import numpy as np
+    from navigate.model.features.image_writer import ImageWriter
+
+    experiment = dummy_model.configuration["experiment"]
+    saving = experiment["Saving"]
+    microscope_state = experiment["MicroscopeState"]
+    # the configuration is shared with the other tests
+    saved_state = {
+        "is_multiposition": microscope_state["is_multiposition"],
+        "image_mode": microscope_state["image_mode"],
+    }
+    saved_positions = [list(p) for p in experiment["MultiPositions"]]
+    saving["save_directory"] = str(tmp_path)
+    saving["file_type"] = "H5"
+    microscope_state["is_multiposition"] = True
+    microscope_state["image_mode"] = "single"
+    pixel_size = float(
+        dummy_model.configuration["configuration"]["microscopes"][
+            microscope_state["microscope_name"]
+        ]["zoom"]["pixel_size"][microscope_state["zoom"]]
+    )
+    height, width = dummy_model.data_buffer.shape[1:]
+    # BigDataViewer places stage y along the columns. The two positions overlap by
+    # half a tile along the columns, and the second tile is 6 pixels further along
+    # the columns than its stage position.
+    step, error = width // 2, 6
+    positions = [[0.0, 0.0, 0, 0, 0], [0.0, step * pixel_size, 0, 0, 0]]
+    experiment["MultiPositions"] = positions
+    rng = np.random.default_rng(0)
+    scene = cv2.GaussianBlur(
+        rng.random((height, 2 * width)).astype(np.float32), (0, 0), 3
+    )
+    tiles = [scene[:, :width], scene[:, step + error : step + error + width]]
+
+    try:
+        writer = ImageWriter(dummy_model)
+        assert writer.tile_registration.pairs == [(0, 1)]
+        frames = writer.data_source.shape_c * writer.data_source.positions
+        for i in range(frames):
+            position = i // writer.data_source.shape_c
+            dummy_model.data_buffer[i, ...] = tiles[position] * 1000
+            dummy_model.data_buffer_positions[i][:2] = positions[position][:2]
+        writer.save_image(list(range(frames)))
+        metadata = writer.data_source.metadata
+        writer.close()
+
+        assert writer.tile_registration is None
+        translations = metadata.stitching_translations
+        np.testing.assert_allclose(
+            translations[1] - translations[0], [0, error * pixel_size], atol=pixel_size
+        )
+        with open(writer.data_source.file_name.replace(".h5", ".xml")) as f:
+            assert "Stitching Transform" in f.read()
+    finally:
+        microscope_state.update(saved_state)
+        experiment["MultiPositions"] = saved_positions
+
+
+def test_image_write_mip_with_channel_orders(dummy_model, tmp_path):
+    import numpy as np
+    import tifffile
+    from navigate.model.features.image_writer import ImageWriter
+
+    experiment = dummy_model.configuration["experiment"]
+    microscope_state = experiment["MicroscopeState"]
+    # the configuration is shared with the other tests
+    saved_state = {
+        k: microscope_state[k]
+        for k in ["image_mode", "stack_cycling_mode", "number_z_steps"]
+    }
+    experiment["Saving"]["save_directory"] = str(tmp_path)
+    experiment["Saving"]["file_type"] = "TIFF"
+    microscope_state["image_mode"] = "z-stack"
+    microscope_state["stack_cycling_mode"] = "per_z"
+    microscope_state["number_z_steps"] = 2
+    # channels 2, 1, 3 on the first plane and 3, 1, 2 on the second
+    microscope_state["channel_acquisition_order"] = [[1, 0, 2], [2, 0, 1]]
+
+    try:
+        writer = ImageWriter(dummy_model)
+        for i in range(6):
+            dummy_model.data_buffer[i, ...] = i + 1
+        mip_directory = tmp_path / "MIP"
+
+        writer.save_image(list(range(5)))
+        # the last channel of the last plane is missing
+        assert not os.listdir(mip_directory)
+
+        writer.save_image([5])
+        writer.close()
+        # table channel c collects the frames acquired in channel c
+        for c, value in enumerate([5, 6, 4]):
+            mip = tifffile.imread(mip_directory / f"P0000_CH0{c}_000000.tif")
+            assert np.all(mip == value)
+    finally:
+        microscope_state.update(saved_state)
+        microscope_state.pop("channel_acquisition_order")
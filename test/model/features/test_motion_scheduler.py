@@ -0,0 +1,59 @@
+import time
+from unittest.mock import MagicMock
+
+from navigate.model.features.motion_scheduler import MotionScheduler
+
+
+def test_motion_scheduler_overlaps_move():
+    model = MagicMock()
+
+    def move_stage(pos_dict, wait_until_done=False):
+        time.sleep(0.05)
+        return True
+
+    model.move_stage.side_effect = move_stage
+    scheduler = MotionScheduler(model)
+
+    assert scheduler.wait()
+    assert not scheduler.is_moving()
+
+    scheduler.move({"x_abs": 10, "y_abs": 20})
+    assert scheduler.is_moving()
+    # other work runs while the stage is moving
+    time.sleep(0.05)
+    assert scheduler.wait()
+    assert not scheduler.is_moving()
+    model.move_stage.assert_called_once_with(
+        {"x_abs": 10, "y_abs": 20}, wait_until_done=True
+    )
+
+    record = scheduler.timings[0]
+    assert record["target"] == {"x_abs": 10, "y_abs": 20}
+    assert record["move_time"] >= 0.05
+    assert record["blocked_time"] < record["move_time"]
+
+    summary = scheduler.summary()
+    assert summary["moves"] == 1
+    assert summary["overlapped_time"] > 0
+
+
+def test_motion_scheduler_waits_for_pending_move():
+    model = MagicMock()
+    model.move_stage.return_value = True
+    scheduler = MotionScheduler(model)
+
+    scheduler.move({"z_abs": 1})
+    scheduler.move({"z_abs": 2})
+    assert len(scheduler.timings) == 1
+    scheduler.wait()
+    assert [record["target"]["z_abs"] for record in scheduler.timings] == [1, 2]
+
+
+def test_motion_scheduler_failed_move():
+    model = MagicMock()
+    model.move_stage.side_effect = RuntimeError("stage error")
+    scheduler = MotionScheduler(model)
+
+    scheduler.move({"z_abs": 1})
+    assert scheduler.wait() is False
+    assert scheduler.summary()["moves"] == 1
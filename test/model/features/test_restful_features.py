@@ -36,6 +36,9 @@ import base64
 import unittest
 import json
 import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing import shared_memory
 from unittest.mock import patch, Mock, MagicMock
 from io import BytesIO
 
@@ -45,6 +48,7 @@ import numpy as np
 # Local Imports
 from navigate.model.features.restful_features import (
     prepare_service,
+    IlastikClient,
     IlastikSegmentation,
 )
 
@@ -121,6 +125,9 @@ class TestIlastikSegmentation(unittest.TestCase):
             0: np.random.randint(0, 65536, size=shape, dtype=np.uint16),
             1: np.random.randint(0, 65536, size=shape, dtype=np.uint16),
         }
+        self.mock_model.data_buffer_positions = np.array(
+            [[100, 100, 50, 0, 1.0], [100, 100, 50, 0, 1.0]]
+        )
 
         self.mock_model.img_height = shape[0]
         self.mock_model.img_width = shape[1]
@@ -131,7 +138,7 @@ class TestIlastikSegmentation(unittest.TestCase):
 
         self.ilastik_segmentation = IlastikSegmentation(self.mock_model)
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_data_func_success(self, mock_post):
         frame_ids = [0, 1]
         expected_json_data = {
@@ -155,6 +162,7 @@ class TestIlastikSegmentation(unittest.TestCase):
         mock_post.return_value = mock_response
 
         self.ilastik_segmentation.data_func(frame_ids)
+        self.ilastik_segmentation.wait()
 
         mock_post.assert_called_once_with(
             "http://example.com/ilastik/segmentation",
@@ -170,12 +178,13 @@ class TestIlastikSegmentation(unittest.TestCase):
         self.mock_model.ilastik_target_labels = range(1)
         self.ilastik_segmentation.update_setting()
         self.ilastik_segmentation.data_func(frame_ids)
+        self.ilastik_segmentation.wait()
         assert self.mock_model.event_queue.put.call_count == 2
         # self.mock_model.event_queue.put.assert_called_with(("multiposition"))
         called_args, _ = self.mock_model.event_queue.put.call_args
         assert "multiposition" in called_args[0]
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_data_func_failure(self, mock_post):
         frame_ids = [0, 1]
         mock_response = Mock()
@@ -185,6 +194,7 @@ class TestIlastikSegmentation(unittest.TestCase):
 
         with patch("builtins.print") as mocked_print:
             self.ilastik_segmentation.data_func(frame_ids)
+            self.ilastik_segmentation.wait()
             mocked_print.assert_called_once_with("There is something wrong!")
 
     def test_update_setting(self):
@@ -195,8 +205,8 @@ class TestIlastikSegmentation(unittest.TestCase):
         self.assertEqual(self.ilastik_segmentation.pieces_num, 1)
         self.assertEqual(self.ilastik_segmentation.pieces_size, 2048)
         self.assertEqual(self.ilastik_segmentation.posistion_step_size, 2048)
-        self.assertEqual(self.ilastik_segmentation.x_start, -924)
-        self.assertEqual(self.ilastik_segmentation.y_start, -924)
+        self.assertEqual(self.ilastik_segmentation.fov_x, 2048)
+        self.assertEqual(self.ilastik_segmentation.fov_y, 2048)
 
     def test_init_func_update_settings(self):
         with patch.object(
@@ -213,9 +223,174 @@ class TestIlastikSegmentation(unittest.TestCase):
         self.mock_model.ilastik_target_labels = [1]
 
         self.ilastik_segmentation.update_setting()
-        self.ilastik_segmentation.mark_position(mask)
+        self.ilastik_segmentation.mark_position(mask, [300, 200, 60, 0, 2.0])
 
-        self.mock_model.event_queue.put.assert_called()
+        # the corner of the frame at its own stage position
+        self.mock_model.event_queue.put.assert_called_with(
+            ("multiposition", [[-724, -824, 60, 0, 2.0]])
+        )
+
+
+class SegmentationHandler(BaseHTTPRequestHandler):
+    """Local stand-in for the Ilastik server, labels pixels above 1000 with 1"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.server.client_ports.add(self.client_address[1])
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        if self.headers["Content-Type"] == "application/octet-stream":
+            shape = [int(n) for n in self.headers["X-Shape"].split(",")]
+            images = np.frombuffer(body, dtype=self.headers["X-Dtype"]).reshape(shape)
+        else:
+            data = json.loads(body)
+            if "shared_memory" in data:
+                shm = shared_memory.SharedMemory(name=data["shared_memory"])
+                images = np.ndarray(data["shape"], data["dtype"], buffer=shm.buf)
+                images = images.copy()
+                shm.close()
+            else:
+                images = np.stack(
+                    [
+                        np.frombuffer(base64.b64decode(img), data["dtype"]).reshape(
+                            data["shape"]
+                        )
+                        for img in data["image"]
+                    ]
+                )
+        buffer = BytesIO()
+        np.savez(buffer, *[(img > 1000).astype(np.uint8)[..., None] for img in images])
+        content = buffer.getvalue()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestIlastikClient(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), SegmentationHandler)
+        self.server.client_ports = set()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/ilastik"
+
+        self.images = np.zeros((3, 64, 64), dtype=np.uint16)
+        self.images[:, 16:32, 8:24] = 2000
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_transfer_modes(self):
+        for transfer in IlastikClient.TRANSFER_MODES:
+            client = IlastikClient(self.url, transfer)
+            masks = client.segment(self.images)
+            client.close()
+            assert len(masks) == 3
+            for mask in masks:
+                np.testing.assert_array_equal(mask[..., 0], self.images[0] > 1000)
+
+        with self.assertRaises(ValueError):
+            IlastikClient(self.url, "carrier_pigeon")
+
+    def test_persistent_connection(self):
+        client = IlastikClient(self.url, "binary")
+        for _ in range(3):
+            client.segment(self.images)
+        client.close()
+        assert len(self.server.client_ports) == 1
+
+    def test_request_failure(self):
+        client = IlastikClient("http://127.0.0.1:1/ilastik", "binary")
+        assert client.segment(self.images) is None
+
+    def test_batched_downsampled_segmentation(self):
+        model = Mock()
+        model.configuration = {
+            "rest_api_config": {
+                "Ilastik": {
+                    "url": self.url,
+                    "transfer": "binary",
+                    "batch_size": 2,
+                    "downsample": 2,
+                    "max_workers": 2,
+                }
+            },
+        }
+        model.data_buffer = self.images
+        model.data_buffer_positions = np.array(
+            [[10 * i, 0, i, 0, 0] for i in range(3)], dtype=float
+        )
+        model.display_ilastik_segmentation = True
+        model.mark_ilastik_position = True
+        model.event_queue = MagicMock()
+
+        segmentation = IlastikSegmentation(model)
+        segmentation.pieces_num = 2
+        segmentation.pieces_size = 32
+        segmentation.posistion_step_size = 32
+        segmentation.fov_x = segmentation.fov_y = 0
+        model.ilastik_target_labels = [1]
+
+        # a single frame waits for the batch to fill up
+        segmentation.data_func([0])
+        assert segmentation.pending_frames[0].shape == (32, 32)
+        assert segmentation.futures == []
+
+        segmentation.data_func([1, 2])
+        # the stage moves on while the frames are segmented
+        model.data_buffer_positions[:] = -1
+        segmentation.wait()
+        assert segmentation.pending_frames == []
+        assert len(self.server.client_ports) == 1
+
+        events = [args[0][0] for args in model.event_queue.put.call_args_list]
+        masks = [value for event, value in events if event == "ilastik_mask"]
+        assert len(masks) == 3
+        assert masks[0].shape == (32, 32, 1)
+        # the object is in the first piece in x and y, at the position of each frame
+        positions = [value for event, value in events if event == "multiposition"]
+        assert sorted(positions) == [[[10 * i, 0, i, 0, 0]] for i in range(3)]
+
+        segmentation.cleanup_func()
+        assert segmentation.executor is None
+
+    def test_cleanup_finishes_batches(self):
+        model = Mock()
+        model.configuration = {
+            "rest_api_config": {
+                "Ilastik": {"url": self.url, "transfer": "binary", "max_workers": 1}
+            },
+        }
+        model.data_buffer = self.images
+        model.data_buffer_positions = np.zeros((3, 5))
+        model.display_ilastik_segmentation = True
+        model.mark_ilastik_position = False
+        model.event_queue = MagicMock()
+
+        # the batches in flight are segmented before the connection is closed
+        segmentation = IlastikSegmentation(model)
+        segmentation.data_func([0])
+        segmentation.data_func([1])
+        client = segmentation.client
+        with patch.object(client, "close", wraps=client.close) as close:
+            segmentation.cleanup_func()
+            close.assert_called_once()
+        assert model.event_queue.put.call_count == 2
+        assert segmentation.client is None
+        assert segmentation.futures == []
+
+        # failed batches are logged
+        with patch.object(
+            segmentation, "segment", side_effect=RuntimeError("no service")
+        ):
+            segmentation.data_func([2])
+            with self.assertLogs("model", level="ERROR") as logs:
+                segmentation.cleanup_func()
+        assert "no service" in logs.output[0]
 
 
 if __name__ == "__main__":
@@ -70,3 +70,100 @@ def test_bdv_metadata(ext):
     # Make sure we can still write the data.
     md.write_xml(f"test_bdv.{ext}", views)
     os.remove("test_bdv.xml")
+
+
+def test_bdv_stage_positions_to_affine_matrices():
+    from navigate.model.metadata_sources.bdv_metadata import BigDataViewerMetadata
+
+    md = BigDataViewerMetadata()
+    md.dx, md.dy, md.dz = 0.5, 0.25, 2
+    md._coupled_axes = {"z": "f"}
+
+    views = [
+        {
+            "x": np.random.uniform(-1000, 1000),
+            "y": np.random.uniform(-1000, 1000),
+            "z": np.random.uniform(-1000, 1000),
+            "theta": np.random.uniform(-1000, 1000),
+            "f": np.random.uniform(-1000, 1000),
+        }
+        for _ in range(10)
+    ]
+    positions = md.views_to_stage_positions(views)
+    assert positions.shape == (10, 5)
+
+    mats = md.stage_positions_to_affine_matrices(positions)
+    for view, mat in zip(views, mats):
+        np.testing.assert_array_equal(mat, md.stage_positions_to_affine_matrix(**view))
+
+
+@pytest.mark.parametrize("n_frames", [24, 17])
+def test_bdv_view_registrations(n_frames):
+    from navigate.model.metadata_sources.bdv_metadata import BigDataViewerMetadata
+
+    md = BigDataViewerMetadata()
+    md.shape_t, md.positions, md.shape_c, md.shape_z = 2, 3, 2, 2
+    md.dx, md.dy, md.dz = 0.167, 0.167, 1.3
+
+    views = [
+        {
+            "x": np.random.uniform(-1000, 1000),
+            "y": np.random.uniform(-1000, 1000),
+            "z": np.random.uniform(-1000, 1000),
+            "theta": 0,
+            "f": 0,
+        }
+        for _ in range(n_frames)
+    ]
+    registrations = md.bdv_view_registrations(views)
+    assert len(registrations) == 12
+
+    # Compare against averaging the per-plane matrices one at a time, in
+    # acquisition order (t, p, c, z)
+    i = 0
+    for t in range(md.shape_t):
+        for p in range(md.positions):
+            for c in range(md.shape_c):
+                mat = np.zeros((3, 4))
+                for z in range(md.shape_z):
+                    matrix_id = z + md.shape_z * (
+                        c + md.shape_c * (p + md.positions * t)
+                    )
+                    if matrix_id < n_frames:
+                        mat += (
+                            md.stage_positions_to_affine_matrix(**views[matrix_id])
+                            / md.shape_z
+                        )
+                registration = registrations[i]
+                assert registration["timepoint"] == t
+                assert registration["setup"] == c * md.positions + p
+                assert registration["ViewTransform"][0]["affine"]["text"] == " ".join(
+                    [f"{x:.6f}" for x in mat.ravel()]
+                )
+                i += 1
+
+
+def test_bdv_view_registrations_stitching():
+    from navigate.model.metadata_sources.bdv_metadata import BigDataViewerMetadata
+
+    md = BigDataViewerMetadata()
+    md.shape_t, md.positions, md.shape_c, md.shape_z = 1, 2, 2, 1
+    md.dx, md.dy, md.dz = 0.5, 0.25, 1.0
+
+    views = np.zeros((4, 5))
+    grid = md.bdv_view_registrations(views)
+    md.stitching_translations = np.array([[1.0, -1.0], [-2.0, 0.5]])
+    registrations = md.bdv_view_registrations(views)
+
+    for registration, reference in zip(registrations, grid):
+        p = registration["setup"] % md.positions
+        x, y = md.stitching_translations[p]
+        transforms = registration["ViewTransform"]
+        # the stitching transform is applied after the grid transform
+        assert transforms[0]["Name"] == "Stitching Transform"
+        assert transforms[1:] == reference["ViewTransform"]
+        mat = np.array(transforms[0]["affine"]["text"].split(), dtype=float)
+        np.testing.assert_allclose(
+            mat.reshape(3, 4),
+            [[1, 0, 0, y / md.dy], [0, 1, 0, x / md.dx], [0, 0, 1, 0]],
+        )
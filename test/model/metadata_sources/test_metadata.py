@@ -101,3 +101,29 @@ def test_metadata_set_stack_order_from_configuration_experiment(
         assert md._per_stack is True
     else:
         assert md._per_stack is False
+
+
+def test_metadata_channel_index(dummy_model):
+    from navigate.model.metadata_sources.metadata import Metadata
+
+    microscope_state = dummy_model.configuration["experiment"]["MicroscopeState"]
+    image_mode = microscope_state["image_mode"]
+    stack_cycling_mode = microscope_state["stack_cycling_mode"]
+    microscope_state["image_mode"] = "z-stack"
+    microscope_state["stack_cycling_mode"] = "per_z"
+    microscope_state["channel_acquisition_order"] = [[2, 0, 1], [1, 0, 2]]
+
+    try:
+        md = Metadata()
+        md.configuration = dummy_model.configuration
+        assert md.shape_c == 3
+        assert [md.channel_index(c, 0) for c in range(3)] == [2, 0, 1]
+        assert [md.channel_index(c, 3) for c in range(3)] == [1, 0, 2]
+
+        microscope_state["stack_cycling_mode"] = "per_stack"
+        md.configuration = dummy_model.configuration
+        assert [md.channel_index(c, 1) for c in range(3)] == [0, 1, 2]
+    finally:
+        microscope_state["image_mode"] = image_mode
+        microscope_state["stack_cycling_mode"] = stack_cycling_mode
+        microscope_state.pop("channel_acquisition_order")
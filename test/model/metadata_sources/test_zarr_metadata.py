@@ -187,3 +187,33 @@ def test_multiscale_metadata(dummy_metadata):
     # the type of downscaling method used to generate the multiscale image pyramid.
     # It SHOULD contain the field "metadata", which contains a dictionary with
     # additional information about the downscaling method.
+
+
+def test_stitch_multiscales(dummy_metadata):
+    import numpy as np
+
+    resolutions = np.array([[1, 1, 1]])
+    views = [
+        {"x": 10.0, "y": 20.0, "z": 0.0, "theta": 0.0, "f": 0.0},
+        {"x": 110.0, "y": 20.0, "z": 0.0, "theta": 0.0, "f": 0.0},
+    ]
+    multiscales = [
+        dummy_metadata.multiscales_dict(f"p{i}", ["path"], resolutions, view)
+        for i, view in enumerate(views)
+    ]
+    translations = [
+        d["coordinateTransformations"][1]["translation"] for d in multiscales
+    ]
+
+    # nothing to do without registration
+    assert dummy_metadata.stitch_multiscales(multiscales) == multiscales
+
+    dummy_metadata.stitching_translations = np.array([[1.5, -2.0], [0.0, 0.5]])
+    stitched = dummy_metadata.stitch_multiscales(multiscales)
+    for d, translation, (x, y) in zip(
+        stitched, translations, dummy_metadata.stitching_translations
+    ):
+        # t, c, z, y, x
+        assert d["coordinateTransformations"][1]["translation"] == (
+            translation[:3] + [translation[3] + y, translation[4] + x]
+        )
@@ -0,0 +1,138 @@
+# Copyright (c) 2021-2024  The University of Texas Southwestern Medical Center.
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted for academic and research use only (subject to the
+# limitations in the disclaimer below) provided that the following conditions are met:
+
+#      * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#      * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+
+#      * Neither the name of the copyright holders nor the names of its
+#      contributors may be used to endorse or promote products derived from this
+#      software without specific prior written permission.
+
+# NO EXPRESS OR IMPLIED LICENSES TO ANY PARTY'S PATENT RIGHTS ARE GRANTED BY
+# THIS LICENSE. THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+# PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+#
+
+# Standard Library Imports
+from types import SimpleNamespace
+
+# Third Party Imports
+import pytest
+
+# Local Imports
+from navigate.model.channel_scheduler import ChannelScheduler
+
+
+class PositionFilterWheel:
+    """Filter wheel taking 0.1 s per position."""
+
+    def __init__(self):
+        self.filter_dictionary = {f"filter{i}": i for i in range(10)}
+
+    def switch_time(self, from_filter, to_filter):
+        return 0.1 * abs(
+            self.filter_dictionary[from_filter] - self.filter_dictionary[to_filter]
+        )
+
+
+def make_channel(filter_position, laser_index=0, laser_power=10):
+    return {
+        "laser_index": laser_index,
+        "laser_power": laser_power,
+        "filter_wheel_0": f"filter{filter_position}",
+    }
+
+
+@pytest.fixture
+def scheduler():
+    channels = {1: make_channel(0), 2: make_channel(5), 3: make_channel(1)}
+    return ChannelScheduler(channels, {"filter_wheel_0": PositionFilterWheel()})
+
+
+def test_switch_time(scheduler):
+    assert scheduler.switch_time(1, 1) == 0
+    assert scheduler.switch_time(1, 2) == pytest.approx(0.5)
+    assert scheduler.switch_time(2, 3) == pytest.approx(0.4)
+    assert scheduler.path_time([1, 2, 3]) == pytest.approx(0.9)
+
+
+def test_switch_time_with_lasers():
+    channels = {
+        1: make_channel(0, laser_index=0),
+        2: make_channel(0, laser_index=1),
+        3: make_channel(0, laser_index=1, laser_power=50),
+        4: make_channel(0, laser_index=1, laser_power=50),
+    }
+    lasers = {
+        "488": SimpleNamespace(switch_time=0.2),
+        "561": SimpleNamespace(switch_time=0.3),
+    }
+    scheduler = ChannelScheduler(channels, {}, lasers, [488, 561])
+    assert scheduler.switch_time(1, 2) == pytest.approx(0.3)
+    assert scheduler.switch_time(2, 1) == pytest.approx(0.2)
+    # a change of power also needs the laser to be set up
+    assert scheduler.switch_time(2, 3) == pytest.approx(0.3)
+    # same laser settings
+    assert scheduler.switch_time(3, 4) == 0
+
+
+@pytest.mark.parametrize("number_of_planes", [1, 3, 4])
+def test_schedule_time(scheduler, number_of_planes):
+    # fixed order, including the switch back to the first channel
+    assert scheduler.schedule_time([[1, 2, 3]], number_of_planes) == pytest.approx(
+        1.0 * number_of_planes
+    )
+    # alternate directions, there is no switch between planes
+    expected_time = 0.5 * number_of_planes
+    if number_of_planes % 2 == 1:
+        # the last plane does not end on the first channel of the next stack
+        expected_time += 0.5
+    assert scheduler.schedule_time(
+        [[1, 3, 2], [2, 3, 1]], number_of_planes
+    ) == pytest.approx(expected_time)
+
+
+def test_optimize(scheduler):
+    orders, table_time, optimized_time = scheduler.optimize([1, 2, 3], 4)
+    assert orders == [[1, 3, 2], [2, 3, 1]]
+    assert table_time == pytest.approx(4.0)
+    assert optimized_time == pytest.approx(2.0)
+
+    # without reversing, every cycle through three channels takes as long
+    orders, table_time, optimized_time = scheduler.optimize(
+        [1, 2, 3], 4, allow_reverse=False
+    )
+    assert orders == [[1, 2, 3]]
+    assert optimized_time == table_time
+
+
+def test_optimize_keeps_table_order():
+    channels = {i: make_channel(0) for i in range(1, 5)}
+    scheduler = ChannelScheduler(channels, {"filter_wheel_0": PositionFilterWheel()})
+    assert scheduler.optimize([1, 2, 3, 4], 10) == ([[1, 2, 3, 4]], 0, 0)
+    assert scheduler.optimize([2], 10) == ([[2]], 0, 0)
+
+
+def test_optimize_many_channels(scheduler):
+    scheduler.exhaustive_limit = 2
+    assert scheduler.nearest_neighbor_order([1, 2, 3]) == [1, 3, 2]
+    orders, table_time, optimized_time = scheduler.optimize([1, 2, 3], 4)
+    assert orders == [[1, 3, 2], [2, 3, 1]]
+    assert optimized_time == pytest.approx(2.0)
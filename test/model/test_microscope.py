@@ -102,6 +102,31 @@ def test_get_stage_position(dummy_microscope):
     assert dummy_microscope.ask_stage_for_position is False
 
 
+def test_predict_stage_move_time(dummy_microscope):
+    from navigate.model.devices.stages.motion_model import (
+        AxisMotionModel,
+        MotionTimeModel,
+    )
+
+    pos_dict = {"x_abs": 100, "f_abs": 10}
+    # synthetic stages have no motion model
+    assert dummy_microscope.predict_stage_move_time(pos_dict) is None
+    assert dummy_microscope.get_stage_motion_statistics() == {}
+
+    stage = dummy_microscope.stages["x"]
+    stage.motion_model = MotionTimeModel(
+        {"x": AxisMotionModel(speed=1000, acceleration_time=0)}
+    )
+    try:
+        distance = abs(100 - stage.x_pos)
+        assert dummy_microscope.predict_stage_move_time(pos_dict) == pytest.approx(
+            distance / 1000
+        )
+        assert list(dummy_microscope.get_stage_motion_statistics()) == ["x"]
+    finally:
+        stage.motion_model = None
+
+
 def test_prepare_next_channel(dummy_microscope):
     dummy_microscope.prepare_acquisition()
 
@@ -120,6 +145,99 @@ def test_prepare_next_channel(dummy_microscope):
     )
 
 
+def test_prepare_next_channel_skips_redundant_settings(dummy_microscope):
+    from unittest.mock import patch
+
+    channels = dummy_microscope.configuration["experiment"]["MicroscopeState"][
+        "channels"
+    ]
+    dummy_microscope.prepare_acquisition()
+    dummy_microscope.available_channels = [1, 2]
+    dummy_microscope.set_channel_schedule([[1, 2]])
+    filter_wheel = dummy_microscope.filter_wheel["filter_wheel_0"]
+    laser = dummy_microscope.lasers["488"]
+    laser_power = channels["channel_1"]["laser_power"]
+    laser_index = channels["channel_2"]["laser_index"]
+    channels["channel_2"]["laser_index"] = channels["channel_1"]["laser_index"]
+    channels["channel_2"]["laser_power"] = laser_power
+    try:
+        with patch.object(filter_wheel, "set_filter") as set_filter, patch.object(
+            laser, "set_power"
+        ) as set_power, patch.object(
+            dummy_microscope.camera, "set_exposure_time"
+        ) as set_exposure_time:
+            dummy_microscope.prepare_next_channel()
+            assert dummy_microscope.current_channel == 1
+            assert set_filter.call_count == 1
+            assert set_power.call_count == 1
+            assert set_exposure_time.call_count == 1
+
+            # both channels share the filters, laser and exposure time
+            dummy_microscope.prepare_next_channel()
+            assert dummy_microscope.current_channel == 2
+            assert set_filter.call_count == 1
+            assert set_power.call_count == 1
+            assert set_exposure_time.call_count == 1
+
+            channels["channel_1"]["laser_power"] = laser_power + 10
+            dummy_microscope.prepare_next_channel()
+            assert dummy_microscope.current_channel == 1
+            assert set_filter.call_count == 1
+            set_power.assert_called_with(laser_power + 10)
+
+            # starting over sends all the settings again
+            dummy_microscope.current_channel = 0
+            dummy_microscope.prepare_next_channel()
+            assert set_filter.call_count == 2
+            assert set_power.call_count == 3
+            assert set_exposure_time.call_count == 2
+    finally:
+        channels["channel_1"]["laser_power"] = laser_power
+        channels["channel_2"]["laser_index"] = laser_index
+        dummy_microscope.end_acquisition()
+
+
+def test_schedule_channels(dummy_microscope):
+    microscope_state = dummy_microscope.configuration["experiment"]["MicroscopeState"]
+    saved_state = {
+        k: microscope_state[k]
+        for k in ["image_mode", "stack_cycling_mode", "number_z_steps"]
+    }
+    microscope_state["image_mode"] = "z-stack"
+    microscope_state["stack_cycling_mode"] = "per_z"
+    microscope_state["number_z_steps"] = 4
+    switch_times = {"488": 0.1, "562": 1.0, "642": 0.1}
+    for wavelength, switch_time in switch_times.items():
+        dummy_microscope.lasers[wavelength].switch_time = switch_time
+    try:
+        dummy_microscope.prepare_acquisition()
+        assert dummy_microscope.available_channels == [1, 2, 3]
+        # the slow laser is only switched to once every other plane
+        assert dummy_microscope.channel_orders == [[1, 3, 2], [2, 3, 1]]
+        assert microscope_state["channel_acquisition_order"] == [[0, 2, 1], [1, 2, 0]]
+
+        acquired_channels = []
+        for _ in range(13):
+            dummy_microscope.prepare_next_channel()
+            acquired_channels.append(dummy_microscope.current_channel)
+        assert acquired_channels == [1, 3, 2, 2, 3, 1, 1, 3, 2, 2, 3, 1, 1]
+
+        summary = dummy_microscope.get_channel_switch_summary()
+        assert summary.startswith("8 channel switches, expected 2.600s")
+        assert dummy_microscope.channel_switch_statistics["switches"] == 0
+
+        # table order in per-stack cycling
+        microscope_state["stack_cycling_mode"] = "per_stack"
+        dummy_microscope.prepare_acquisition()
+        assert dummy_microscope.channel_orders == [[1, 2, 3]]
+        assert "channel_acquisition_order" not in microscope_state
+    finally:
+        for wavelength in switch_times:
+            dummy_microscope.lasers[wavelength].switch_time = 0
+        microscope_state.update(saved_state)
+        dummy_microscope.end_acquisition()
+
+
 def test_calculate_all_waveform(dummy_microscope):
     # set waveform template to default
     dummy_microscope.configuration["experiment"]["MicroscopeState"][
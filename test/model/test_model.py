@@ -426,3 +426,66 @@ def test_load_feature_records(model):
     feature_records_2 = load_yaml_file(f"{feature_lists_path}/__sequence.yml")
     assert feature_records == feature_records_2
     os.remove(f"{feature_lists_path}/__sequence.yml")
+
+
+def test_update_image_correction(model):
+    import numpy as np
+
+    camera_config = model.configuration["configuration"]["microscopes"][
+        model.active_microscope_name
+    ]["camera"]
+    camera = model.active_microscope.camera
+    binning = model.configuration["experiment"]["CameraParameters"][
+        model.active_microscope_name
+    ]["binning"]
+
+    camera_config["correct_images"] = False
+    model.update_image_correction()
+    assert model.image_correction is None
+
+    camera_config["correct_images"] = True
+    offset = np.full((4096, 4096), 100, dtype=np.uint16)
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(camera, "get_offset_variance_maps", lambda: (offset, None))
+        mp.setattr(camera, "get_flatfield_map", lambda: None)
+        model.configuration["experiment"]["CameraParameters"][
+            model.active_microscope_name
+        ]["binning"] = "1x1"
+        model.update_image_correction()
+        assert model.image_correction.shape == (model.img_height, model.img_width)
+        assert model.image_correction.gain is None
+
+        mp.setattr(camera, "get_offset_variance_maps", lambda: (None, None))
+        model.update_image_correction()
+        assert model.image_correction is None
+
+    model.configuration["experiment"]["CameraParameters"][
+        model.active_microscope_name
+    ]["binning"] = binning
+    camera_config["correct_images"] = False
+
+
+def test_simplified_data_process_timeout(model):
+    from unittest.mock import MagicMock
+
+    microscope = MagicMock()
+    microscope.microscope_name = "virtual"
+    frames = [[0], [1]]
+    microscope.camera.get_new_frame.side_effect = lambda: (
+        frames.pop(0) if frames else []
+    )
+    show_img_pipe = MagicMock()
+    data_func = MagicMock()
+
+    stop_acquisition = model.stop_acquisition
+    model.stop_acquisition = False
+    try:
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(model, "get_camera_frame_timeout", lambda microscope: 0.05)
+            # stops once no frame arrives before the deadline
+            model.simplified_data_process(microscope, show_img_pipe, data_func)
+    finally:
+        model.stop_acquisition = stop_acquisition
+
+    assert [c.args[0] for c in data_func.call_args_list] == [[0], [1]]
+    assert [c.args[0] for c in show_img_pipe.send.call_args_list] == [0, 1, "stop"]
@@ -0,0 +1,122 @@
+# Copyright (c) 2021-2024  The University of Texas Southwestern Medical Center.
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted for academic and research use only
+# (subject to the limitations in the disclaimer below)
+# provided that the following conditions are met:
+
+#      * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#      * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+
+#      * Neither the name of the copyright holders nor the names of its
+#      contributors may be used to endorse or promote products derived from this
+#      software without specific prior written permission.
+
+# NO EXPRESS OR IMPLIED LICENSES TO ANY PARTY'S PATENT RIGHTS ARE GRANTED BY
+# THIS LICENSE. THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+# PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+# Standard Library Imports
+import pickle
+
+# Third Party Imports
+import numpy as np
+
+# Local Imports
+from navigate.model.shared_waveforms import WaveformPublisher, read_waveforms
+
+
+def waveform_dict(amplitude=1.0):
+    return {
+        "camera_waveform": {
+            "channel_1": np.ones(100) * amplitude,
+            "channel_2": np.zeros(50),
+        },
+        "remote_focus_waveform": {
+            "channel_1": np.linspace(-amplitude, amplitude, 100),
+            "channel_2": None,
+        },
+        "galvo_waveform": [
+            {"channel_1": np.sin(np.arange(100)), "channel_2": None},
+            {"channel_1": np.cos(np.arange(100)), "channel_2": None},
+        ],
+    }
+
+
+def assert_equal_waveforms(waveforms, expected):
+    for k in ("camera_waveform", "remote_focus_waveform"):
+        assert waveforms[k].keys() == expected[k].keys()
+        for channel_key, waveform in expected[k].items():
+            if waveform is None:
+                assert waveforms[k][channel_key] is None
+            else:
+                np.testing.assert_array_equal(waveforms[k][channel_key], waveform)
+    assert len(waveforms["galvo_waveform"]) == len(expected["galvo_waveform"])
+    for galvo, expected_galvo in zip(
+        waveforms["galvo_waveform"], expected["galvo_waveform"]
+    ):
+        for channel_key, waveform in expected_galvo.items():
+            if waveform is None:
+                assert galvo[channel_key] is None
+            else:
+                np.testing.assert_array_equal(galvo[channel_key], waveform)
+
+
+def test_publish_and_read_waveforms():
+    publisher = WaveformPublisher()
+    expected = waveform_dict()
+    notification = publisher.publish(expected)
+
+    # only the name of the shared buffer is pickled
+    message = pickle.dumps(notification)
+    assert len(message) < 1000
+    assert_equal_waveforms(read_waveforms(pickle.loads(message)), expected)
+
+
+def test_version_changes_with_waveforms():
+    publisher = WaveformPublisher()
+    first = publisher.publish(waveform_dict())
+    assert publisher.publish(waveform_dict())["version"] == first["version"]
+
+    second = publisher.publish(waveform_dict(2.0))
+    assert second["version"] == first["version"] + 1
+    # the buffers are used in turn
+    assert second["buffer"].shared_memory.name != first["buffer"].shared_memory.name
+    assert_equal_waveforms(read_waveforms(first), waveform_dict())
+    assert_equal_waveforms(read_waveforms(second), waveform_dict(2.0))
+
+
+def test_read_waveforms_copy():
+    publisher = WaveformPublisher(number_of_buffers=1)
+    notification = publisher.publish(waveform_dict())
+    view = read_waveforms(notification, copy=False)
+    copy = read_waveforms(notification)
+
+    # a single buffer is reused by the next waveforms
+    publisher.publish(waveform_dict(2.0))
+    assert np.all(view["camera_waveform"]["channel_1"] == 2.0)
+    assert np.all(copy["camera_waveform"]["channel_1"] == 1.0)
+
+
+def test_publish_empty_waveforms():
+    publisher = WaveformPublisher()
+    notification = publisher.publish(
+        {"camera_waveform": {}, "remote_focus_waveform": {}, "galvo_waveform": []}
+    )
+    waveforms = read_waveforms(notification)
+    assert waveforms["camera_waveform"] == {}
+    assert waveforms["galvo_waveform"] == []
@@ -232,3 +232,67 @@ class TestWaveforms(unittest.TestCase):
             sample_rate=sr, sweep_time=st, exposure=ex, camera_delay=cd
         )
         assert np.sum(v > 0) == int(sr * (ex - cd))
+
+    def test_smoothing_matches_convolution(self):
+        rng = np.random.default_rng(0)
+        for waveform, ps in [
+            (waveforms.remote_focus_ramp(), 10),
+            (waveforms.remote_focus_ramp(sample_rate=16), 10),
+            (rng.normal(size=12345), 3.7),
+            (rng.normal(size=100).astype(np.float32), 50),
+        ]:
+            window_length = int(np.ceil(len(waveform) * ps / 100))
+            expected = (
+                np.convolve(
+                    np.pad(waveform, window_length, mode="edge"),
+                    np.ones(window_length),
+                    "valid",
+                )
+                / window_length
+            )
+            smoothed_waveform = waveforms.smooth_waveform(waveform, ps)
+            assert smoothed_waveform.dtype == expected.dtype
+            np.testing.assert_allclose(smoothed_waveform, expected, atol=1e-12)
+
+    def test_waveform_dtype(self):
+        for func, kwargs in [
+            (waveforms.camera_exposure, {}),
+            (waveforms.single_pulse, {}),
+            (waveforms.remote_focus_ramp, {}),
+            (waveforms.remote_focus_ramp_triangular, {}),
+            (waveforms.remote_focus_ramp_triangular, {"ramp_type": "Falling"}),
+            (waveforms.sawtooth, {}),
+            (waveforms.dc_value, {}),
+            (waveforms.square, {}),
+            (waveforms.sine_wave, {}),
+        ]:
+            expected = func(**kwargs)
+            data = func(dtype=np.float32, **kwargs)
+            assert expected.dtype == np.float64
+            assert data.dtype == np.float32
+            np.testing.assert_array_equal(data, expected.astype(np.float32))
+
+    def test_remote_focus_ramp_triangular(self):
+        sample_rate, sweep_time, amplitude, offset = 1000, 0.24, 1.5, 0.5
+        data = waveforms.remote_focus_ramp_triangular(
+            sample_rate=sample_rate,
+            sweep_time=sweep_time,
+            amplitude=amplitude,
+            offset=offset,
+        )
+        half = int(sample_rate * sweep_time)
+        assert len(data) == 2 * half
+        assert data[0] == offset - amplitude
+        assert data[half - 1] == offset + amplitude
+        assert data[half] == offset + amplitude
+        assert data[-1] == offset - amplitude
+        np.testing.assert_array_equal(
+            waveforms.remote_focus_ramp_triangular(
+                sample_rate=sample_rate,
+                sweep_time=sweep_time,
+                amplitude=amplitude,
+                offset=offset,
+                ramp_type="Falling",
+            ),
+            np.roll(data, half),
+        )
@@ -0,0 +1,271 @@
+# Copyright (c) 2021-2024  The University of Texas Southwestern Medical Center.
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted for academic and research use only (subject to the
+# limitations in the disclaimer below) provided that the following conditions are met:
+
+#      * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#      * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+
+#      * Neither the name of the copyright holders nor the names of its
+#      contributors may be used to endorse or promote products derived from this
+#      software without specific prior written permission.
+
+# NO EXPRESS OR IMPLIED LICENSES TO ANY PARTY'S PATENT RIGHTS ARE GRANTED BY
+# THIS LICENSE. THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+# PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+#
+
+# Standard library imports
+import os
+import textwrap
+from unittest.mock import patch
+
+# Third party imports
+import pytest
+
+# Local application imports
+from navigate.model.features import feature_related_functions
+from navigate.model.plugins_model import PluginsModel
+from navigate.plugins import plugin_manager
+from navigate.plugins.plugin_manager import (
+    PluginFileManager,
+    PluginManifest,
+    PluginPackageManager,
+    get_plugin_signature,
+    scan_plugin,
+)
+
+PLUGIN_FILES = {
+    "plugin_config.yml": """
+        name: Test Plugin
+        view: Popup
+        acquisition_modes:
+          - name: Test Acquisition
+            file_name: test_acquisition_mode.py
+    """,
+    "view/test_plugin_frame.py": """
+        class TestPluginFrame:
+            pass
+    """,
+    "controller/test_plugin_controller.py": """
+        class TestPluginController:
+            pass
+    """,
+    "model/features/test_plugin_feature.py": """
+        class TestPluginFeature:
+            def __init__(self, model, *args):
+                self.model = model
+                self.config_table = {"signal": {}}
+    """,
+    "feature_list.py": """
+        from navigate.tools.decorators import FeatureList
+
+
+        def helper():
+            return []
+
+
+        @FeatureList
+        def test_plugin_feature_list():
+            return [{"name": "TestPluginFeature"}]
+    """,
+    "test_acquisition_mode.py": """
+        from navigate.tools.decorators import AcquisitionMode
+
+
+        @AcquisitionMode
+        class TestAcquisitionMode:
+            def __init__(self, name):
+                self.acquisition_mode = name
+                self.feature_list = [{"name": "TestPluginFeature"}]
+    """,
+    "model/devices/test_device/device_startup_functions.py": """
+        DEVICE_TYPE_NAME = "test_device"
+        DEVICE_REF_LIST = ["type", "serial_number"]
+
+
+        def load_device(hardware_configuration, is_synthetic=False):
+            return "test_connection"
+
+
+        def start_device(
+            microscope_name, device_connection, configuration, is_synthetic=False
+        ):
+            return "test_device_object"
+    """,
+}
+
+
+@pytest.fixture
+def plugins_path(tmp_path):
+    plugin_path = tmp_path / "plugins" / "test_plugin"
+    for file_name, content in PLUGIN_FILES.items():
+        file_path = plugin_path / file_name
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_text(textwrap.dedent(content))
+    yield str(tmp_path / "plugins")
+    feature_related_functions.lazy_features.pop("TestPluginFeature", None)
+    vars(feature_related_functions).pop("TestPluginFeature", None)
+
+
+@pytest.fixture
+def plugin_file_manager(plugins_path):
+    return PluginFileManager(plugins_path, os.path.join(plugins_path, "none.yml"))
+
+
+def test_scan_plugin(plugins_path):
+    plugin_path = os.path.join(plugins_path, "test_plugin")
+    plugin_config = PluginFileManager.load_config(plugin_path)
+
+    with patch.object(
+        plugin_manager,
+        "load_module_from_file",
+        wraps=plugin_manager.load_module_from_file,
+    ) as load_module:
+        manifest = scan_plugin(plugin_path, "test_plugin", plugin_config)
+
+    # nothing is imported to build the manifest
+    load_module.assert_not_called()
+    assert manifest["name"] == "Test Plugin"
+    assert manifest["gui"] is True
+    assert manifest["features"] == {
+        "model/features/test_plugin_feature.py": ["TestPluginFeature"]
+    }
+    assert manifest["feature_lists"] == ["test_plugin_feature_list"]
+    assert manifest["acquisition_modes"] == {
+        "Test Acquisition": {
+            "file_name": "test_acquisition_mode.py",
+            "class_name": "TestAcquisitionMode",
+        }
+    }
+    assert manifest["devices"] == {
+        "test_device": {
+            "DEVICE_TYPE_NAME": "test_device",
+            "DEVICE_REF_LIST": ["type", "serial_number"],
+        }
+    }
+
+
+def test_plugin_manifest_cache(plugins_path, plugin_file_manager, tmp_path):
+    plugin_path = os.path.join(plugins_path, "test_plugin")
+    manifest_path = str(tmp_path / "plugins_manifest.yml")
+
+    with patch.object(plugin_manager, "scan_plugin", wraps=scan_plugin) as scan:
+        plugin_manifest = PluginManifest(manifest_path)
+        manifest = plugin_manifest.get_manifest(
+            plugin_file_manager, "test_plugin", plugin_path
+        )
+        assert manifest["path"] == plugin_path
+        assert manifest["signature"] == get_plugin_signature(plugin_path)
+        plugin_manifest.get_manifest(plugin_file_manager, "test_plugin", plugin_path)
+        assert scan.call_count == 1
+        plugin_manifest.save()
+        assert os.path.exists(manifest_path)
+
+        # the saved manifest is used on the next start
+        plugin_manifest = PluginManifest(manifest_path)
+        assert (
+            plugin_manifest.get_manifest(
+                plugin_file_manager, "test_plugin", plugin_path
+            )
+            == manifest
+        )
+        assert scan.call_count == 1
+        assert plugin_manifest.changed is False
+
+        # a modified plugin is scanned again
+        feature_file = os.path.join(
+            plugin_path, "model", "features", "test_plugin_feature.py"
+        )
+        with open(feature_file, "a") as f:
+            f.write("\n\nclass AnotherPluginFeature:\n    pass\n")
+        stat = os.stat(feature_file)
+        os.utime(feature_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        manifest = plugin_manifest.get_manifest(
+            plugin_file_manager, "test_plugin", plugin_path
+        )
+        assert scan.call_count == 2
+        assert manifest["features"]["model/features/test_plugin_feature.py"] == [
+            "TestPluginFeature",
+            "AnotherPluginFeature",
+        ]
+
+    # folders without plugin_config.yml are not plugins
+    assert (
+        plugin_manifest.get_manifest(plugin_file_manager, "plugins", plugins_path)
+        is None
+    )
+
+
+def test_plugins_are_imported_on_first_use(plugins_path, plugin_file_manager, tmp_path):
+    plugins_model = PluginsModel()
+    plugins_model.feature_lists_path = str(tmp_path)
+    plugin_manifest = PluginManifest(str(tmp_path / "plugins_manifest.yml"))
+
+    with patch.object(
+        plugin_manager,
+        "load_module_from_file",
+        wraps=plugin_manager.load_module_from_file,
+    ) as load_module:
+        plugins_model.load_plugins_through_manager(plugin_file_manager, plugin_manifest)
+        load_module.assert_not_called()
+
+        # feature lists are registered from the manifest
+        assert os.path.exists(tmp_path / "Test_Plugin_Feature_List.yml")
+
+        # devices
+        device = plugins_model.devices_dict["test_device"]
+        assert device["ref_list"] == ["type", "serial_number"]
+        load_module.assert_not_called()
+        assert device["load_device"]({}) == "test_connection"
+        assert device["start_device"]("scope", "test_connection", {}) == (
+            "test_device_object"
+        )
+        assert load_module.call_count == 1
+
+        # acquisition modes
+        acquisition_mode = plugins_model.plugin_acquisition_modes["Test Acquisition"]
+        assert acquisition_mode.acquisition_mode == "Test Acquisition"
+        assert acquisition_mode.feature_list == [{"name": "TestPluginFeature"}]
+        assert load_module.call_count == 2
+
+        # features
+        assert "TestPluginFeature" in dir(feature_related_functions)
+        assert load_module.call_count == 2
+        feature_list = feature_related_functions.convert_str_to_feature_list(
+            "[{'name': TestPluginFeature}]"
+        )
+        assert feature_list[0]["name"].__name__ == "TestPluginFeature"
+        assert feature_related_functions.TestPluginFeature is feature_list[0]["name"]
+        assert load_module.call_count == 3
+
+
+def test_package_plugin_path():
+    navigate_path = os.path.dirname(
+        os.path.dirname(os.path.dirname(feature_related_functions.__file__))
+    )
+    assert os.path.samefile(
+        PluginPackageManager.get_plugin_path("navigate"), navigate_path
+    )
+    assert PluginPackageManager.get_plugin_path("not_a_navigate_plugin") is None
+    assert (
+        PluginPackageManager.load_module(
+            "navigate", "model/features/feature_related_functions.py"
+        )
+        is feature_related_functions
+    )
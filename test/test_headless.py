@@ -0,0 +1,146 @@
+# Copyright (c) 2021-2024  The University of Texas Southwestern Medical Center.
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted for academic and research use only (subject to the
+# limitations in the disclaimer below)
+# provided that the following conditions are met:
+
+#      * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#      * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+
+#      * Neither the name of the copyright holders nor the names of its
+#      contributors may be used to endorse or promote products derived from this
+#      software without specific prior written permission.
+
+# NO EXPRESS OR IMPLIED LICENSES TO ANY PARTY'S PATENT RIGHTS ARE GRANTED BY
+# THIS LICENSE. THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+# PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+# Standard Library Imports
+import json
+from pathlib import Path
+
+# Third Party Imports
+import pytest
+
+# Local Imports
+from navigate.tools.main_functions import (
+    create_headless_parser,
+    evaluate_headless_parser_input_arguments,
+)
+
+CONFIG_PATH = Path(__file__).resolve().parent.parent.joinpath(
+    "src", "navigate", "config"
+)
+
+
+def test_headless_parser():
+    parser = create_headless_parser()
+    args = parser.parse_args(["-sh", "--mode", "z-stack", "--no-save", "-q"])
+    assert args.synthetic_hardware is True
+    assert args.mode == "z-stack"
+    assert args.save is False
+    assert args.quiet is True
+    assert args.repeat == 1
+
+    args = parser.parse_args(["--save", "--repeat", "3", "--timeout", "5"])
+    assert args.save is True
+    assert args.repeat == 3
+    assert args.timeout == 5
+
+    with pytest.raises(SystemExit):
+        parser.parse_args(["--mode", "live"])
+
+
+def test_evaluate_headless_parser_input_arguments():
+    parser = create_headless_parser()
+    args = parser.parse_args(
+        ["--experiment-file", str(CONFIG_PATH.joinpath("experiment.yml"))]
+    )
+    paths = evaluate_headless_parser_input_arguments(args)
+    assert len(paths) == 6
+    assert paths[1] == CONFIG_PATH.joinpath("experiment.yml")
+
+    args = parser.parse_args(["--config-file", "not_a_configuration.yaml"])
+    with pytest.raises(AssertionError):
+        evaluate_headless_parser_input_arguments(args)
+
+
+def test_expected_frame_count():
+    from navigate.headless import expected_frame_count
+
+    experiment = {
+        "MicroscopeState": {
+            "image_mode": "z-stack",
+            "channels": {
+                "channel_1": {"is_selected": True},
+                "channel_2": {"is_selected": False},
+                "channel_3": {"is_selected": True},
+            },
+            "is_multiposition": False,
+            "number_z_steps": 10,
+            "timepoints": 2,
+        },
+        "MultiPositions": [[0, 0, 0, 0, 0], [1, 1, 1, 1, 1], [2, 2, 2, 2, 2]],
+    }
+    assert expected_frame_count(experiment) == 40
+
+    experiment["MicroscopeState"]["is_multiposition"] = True
+    assert expected_frame_count(experiment) == 120
+
+    experiment["MicroscopeState"]["image_mode"] = "single"
+    assert expected_frame_count(experiment) == 12
+
+    experiment["MicroscopeState"]["image_mode"] = "customized"
+    assert expected_frame_count(experiment) is None
+
+
+def test_headless_runner_synthetic_zstack(tmp_path):
+    from navigate.headless import HeadlessRunner
+
+    log_file = tmp_path.joinpath("headless.jsonl")
+    runner = HeadlessRunner(
+        CONFIG_PATH.joinpath("configuration.yaml"),
+        CONFIG_PATH.joinpath("experiment.yml"),
+        CONFIG_PATH.joinpath("waveform_constants.yml"),
+        CONFIG_PATH.joinpath("rest_api_config.yml"),
+        CONFIG_PATH.joinpath("waveform_templates.yml"),
+        synthetic_hardware=True,
+        log_file=log_file,
+        verbose=False,
+    )
+    try:
+        microscope_state = runner.configuration["experiment"]["MicroscopeState"]
+        microscope_state["is_multiposition"] = False
+        microscope_state["timepoints"] = 1
+        microscope_state["number_z_steps"] = 5
+        summary = runner.run(
+            mode="z-stack", save=True, save_directory=tmp_path, timeout=30
+        )
+    finally:
+        runner.close()
+
+    assert summary["status"] == "completed"
+    assert summary["frames"] == summary["expected_frames"]
+    save_directory = Path(summary["save_directory"])
+    assert save_directory.joinpath("experiment.yml").exists()
+    assert save_directory.joinpath("waveform_constants.yml").exists()
+
+    records = [json.loads(line) for line in log_file.read_text().splitlines()]
+    assert records[0]["event"] == "start"
+    assert records[-1]["event"] == "finished"
+    assert records[-1]["frames"] == summary["frames"]
@@ -33,6 +33,7 @@
 # Standard library imports
 import os
 import unittest
+from unittest.mock import patch
 from multiprocessing import Manager
 from multiprocessing.managers import DictProxy, ListProxy
 
@@ -120,6 +121,26 @@ class CopyProxyObjectTestCase(unittest.TestCase):
         assert copied_list[0] == "item1"
         assert copied_list[1] == {"key": "value"}
 
+    def test_copy_proxy_object_with_nested_proxies(self):
+        manager = Manager()
+        positions = manager.list([[1.0, 2.0], [3.0, 4.0]])
+        channels = manager.list([manager.dict({"laser": "488nm"}), "channel_2"])
+        original_dict = manager.dict(
+            {"positions": positions, "state": manager.dict({"channels": channels})}
+        )
+        expected = {
+            "positions": [[1.0, 2.0], [3.0, 4.0]],
+            "state": {"channels": [{"laser": "488nm"}, "channel_2"]},
+        }
+        assert common_functions.snapshot_proxy_object(original_dict) == expected
+        assert common_functions.copy_proxy_object(original_dict) == expected
+
+        # values are copied one by one if the snapshot is not available
+        with patch.object(
+            common_functions, "snapshot_proxy_object", side_effect=EOFError
+        ):
+            assert common_functions.copy_proxy_object(original_dict) == expected
+
     def test_copy_proxy_object_with_non_proxy_object(self):
         non_proxy_object = {"key": "value"}
         copied_object = common_functions.copy_proxy_object(non_proxy_object)
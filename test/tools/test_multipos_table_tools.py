@@ -259,5 +259,150 @@ class UpdateTableTestCase(unittest.TestCase):
         )
 
 
+def test_get_axis_speeds():
+    from navigate.tools.multipos_table_tools import get_axis_speeds
+
+    speeds = get_axis_speeds({"x_speed": 2000, "theta_speed": "bad", "f_speed": 0})
+    np.testing.assert_array_equal(speeds, [2000, 1000, 1000, 10, 1000])
+
+
+def test_path_travel_time():
+    from navigate.tools.multipos_table_tools import path_travel_time
+
+    positions = [[0, 0, 0, 0, 0], [100, 50, 0, 0, 0], [100, 50, 0, 10, 0]]
+    speeds = [100, 100, 100, 10, 100]
+    assert path_travel_time(positions, speeds) == pytest.approx(2.0)
+    assert path_travel_time(positions[:1], speeds) == 0
+
+
+@pytest.mark.parametrize("n", [1, 2, 10, 50])
+def test_optimize_position_order(n):
+    from navigate.tools.multipos_table_tools import (
+        optimize_position_order,
+        path_travel_time,
+    )
+
+    # serpentine grid visited in a shuffled order
+    xs, ys = np.meshgrid(np.arange(10) * 500, np.arange(5) * 500)
+    positions = np.zeros((50, 5))
+    positions[:, 0], positions[:, 1] = xs.ravel(), ys.ravel()
+    positions = positions[np.random.permutation(50)[:n]]
+    speeds = np.array([1000, 1000, 1000, 10, 1000])
+    start = positions[0]
+
+    order, original_time, optimized_time = optimize_position_order(
+        positions, speeds, start_position=start
+    )
+
+    assert sorted(order) == list(range(n))
+    assert optimized_time <= original_time
+    assert optimized_time == pytest.approx(
+        path_travel_time(np.vstack([start, positions[order]]), speeds)
+    )
+    if n == 50:
+        # every move of the optimized path should be between neighbouring tiles
+        assert optimized_time <= 0.5 * (n + 5)
+
+
+def test_optimize_position_order_large_table():
+    from navigate.tools.multipos_table_tools import optimize_position_order
+
+    positions = np.random.rand(100, 5) * 1000
+    speeds = np.array([1000, 1000, 1000, 10, 1000])
+
+    # nearest neighbour only, without the full cost matrix
+    order, original_time, optimized_time = optimize_position_order(
+        positions, speeds, refine_limit=10
+    )
+    assert sorted(order) == list(range(100))
+    assert optimized_time <= original_time
+
+
+def test_optimize_position_order_weights():
+    from navigate.tools.multipos_table_tools import optimize_position_order
+
+    # two angles, visiting all tiles of an angle before rotating is cheaper
+    positions = np.array(
+        [
+            [0, 0, 0, 0, 0],
+            [0, 0, 0, 90, 0],
+            [1000, 0, 0, 0, 0],
+            [1000, 0, 0, 90, 0],
+        ],
+        dtype=float,
+    )
+    speeds = np.array([1000, 1000, 1000, 90, 1000])
+    order, _, _ = optimize_position_order(
+        positions, speeds, weights=[1, 1, 1, 10, 1]
+    )
+    thetas = positions[order, 3]
+    assert np.count_nonzero(np.diff(thetas)) == 1
+
+
 if __name__ == "__main__":
     unittest.main()
+
+
+def test_positions_to_array():
+    import pandas as pd
+    from navigate.tools.multipos_table_tools import positions_to_array
+
+    positions = [[1, 2, 3, 4, 5], [6, 7, 8, 9, 10]]
+    array = positions_to_array(positions)
+    assert array.dtype == float
+    np.testing.assert_array_equal(array, positions)
+
+    assert positions_to_array([]).shape == (0, 5)
+
+    # missing and non-numeric entries are NaN
+    array = positions_to_array([[1, 2, 3, 4, 5, 6], [1, "a", 3, None, "5"], [1, 2]])
+    assert array.shape == (3, 5)
+    np.testing.assert_array_equal(array[0], [1, 2, 3, 4, 5])
+    np.testing.assert_array_equal(np.isnan(array[1]), [0, 1, 0, 1, 0])
+    np.testing.assert_array_equal(np.isnan(array[2]), [0, 0, 1, 1, 1])
+
+    df = pd.DataFrame(
+        {"X": [1.0, 2.0], "Y": [3, 4], "Z": ["x", 5], "R": [0, 0], "F": [1, 1]}
+    )
+    array = positions_to_array(df)
+    np.testing.assert_array_equal(np.isnan(array).sum(axis=1), [1, 0])
+
+
+def test_validate_positions():
+    from navigate.tools.multipos_table_tools import validate_positions
+
+    positions = np.array(
+        [
+            [0, 0, 0, 0, 0],
+            [np.nan, 0, 0, 0, 0],
+            [200, 0, 0, 0, 0],
+            [0, 0, 0, 0, -20],
+        ]
+    )
+    np.testing.assert_array_equal(validate_positions(positions), [1, 0, 1, 1])
+
+    stage_config = {"x_min": -100, "x_max": 100, "f_min": -10, "f_max": "bad"}
+    np.testing.assert_array_equal(
+        validate_positions(positions, stage_config), [1, 0, 0, 1]
+    )
+
+
+def test_positions_csv(tmp_path):
+    from navigate.tools.multipos_table_tools import (
+        load_positions_from_csv,
+        save_positions_to_csv,
+    )
+
+    positions = np.random.uniform(-1000, 1000, (100, 5))
+    filename = str(tmp_path / "positions.csv")
+    save_positions_to_csv(filename, positions)
+    np.testing.assert_array_equal(load_positions_from_csv(filename), positions)
+
+    with open(filename, "w") as f:
+        f.write("x,y,z,r,f\n1,2,3,4,5\n")
+    np.testing.assert_array_equal(load_positions_from_csv(filename), [[1, 2, 3, 4, 5]])
+
+    with open(filename, "w") as f:
+        f.write("X,Y,Z\n1,2,3\n")
+    with pytest.raises(ValueError):
+        load_positions_from_csv(filename)
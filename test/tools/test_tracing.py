@@ -0,0 +1,150 @@
+# Copyright (c) 2021-2024  The University of Texas Southwestern Medical Center.
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted for academic and research use only
+# (subject to the limitations in the disclaimer below)
+# provided that the following conditions are met:
+
+#      * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#      * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+
+#      * Neither the name of the copyright holders nor the names of its
+#      contributors may be used to endorse or promote products derived from this
+#      software without specific prior written permission.
+
+# NO EXPRESS OR IMPLIED LICENSES TO ANY PARTY'S PATENT RIGHTS ARE GRANTED BY
+# THIS LICENSE. THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+# PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+# Standard library imports
+import json
+import queue
+import time
+from unittest.mock import patch
+
+# Third party imports
+
+# Local application imports
+from navigate.tools.tracing import Tracer
+
+
+def test_disabled_tracer_records_nothing():
+    tracer = Tracer(capacity=8)
+    start = tracer.begin()
+    assert start == 0
+    tracer.end("stage", start, 1)
+    with tracer.span("stage", 2):
+        pass
+    assert tracer.summary() == {}
+    assert tracer.events() == []
+
+
+def test_disabled_tracer_overhead():
+    tracer = Tracer()
+    number = 100000
+    start_time = time.perf_counter()
+    for i in range(number):
+        tracer.end("stage", tracer.begin(), i)
+    assert (time.perf_counter() - start_time) / number < 1e-6
+
+
+def test_tracer_spans():
+    tracer = Tracer(capacity=8, enabled=True)
+    for i in range(3):
+        tracer.end("camera", tracer.begin(), i)
+    with tracer.span("writer", 2):
+        pass
+
+    summary = tracer.summary()
+    assert summary["camera"]["count"] == 3
+    assert summary["writer"]["count"] == 1
+    for stage in summary.values():
+        assert 0 <= stage["p50_ms"] <= stage["p99_ms"] <= stage["max_ms"]
+
+    events = [e for e in tracer.events() if e["ph"] == "X"]
+    assert [e["name"] for e in events] == ["camera"] * 3 + ["writer"]
+    assert [e["args"]["frame"] for e in events] == [0, 1, 2, 2]
+    assert all(e["ts"] <= f["ts"] for e, f in zip(events, events[1:]))
+    assert any(
+        e["ph"] == "M" and e["args"]["name"] == "MainThread" for e in tracer.events()
+    )
+
+
+def test_tracer_ring_buffer_wraps():
+    tracer = Tracer(capacity=4, enabled=True)
+    for i in range(10):
+        tracer.end("camera", tracer.begin(), i)
+    events = [e for e in tracer.events() if e["ph"] == "X"]
+    # only the newest spans are kept, the summary covers all of them
+    assert [e["args"]["frame"] for e in events] == [6, 7, 8, 9]
+    assert tracer.summary()["camera"]["count"] == 10
+
+    tracer.reset()
+    assert tracer.events() == []
+
+
+def test_tracer_percentiles():
+    tracer = Tracer(enabled=True)
+    durations_ms = list(range(1, 101))
+    with patch("navigate.tools.tracing.perf_counter_ns") as perf_counter_ns:
+        for duration in durations_ms:
+            perf_counter_ns.side_effect = [1000, 1000 + duration * 1000000]
+            tracer.end("stage", tracer.begin())
+    summary = tracer.summary()["stage"]
+    assert summary["count"] == 100
+    assert summary["mean_ms"] == 50.5
+    assert summary["max_ms"] == 100
+    # histogram bins are 12% wide
+    for q in [50, 90, 99]:
+        assert abs(summary[f"p{q}_ms"] - q) / q < 0.12
+
+
+def test_tracer_publish():
+    tracer = Tracer(enabled=True)
+    event_queue = queue.Queue(1)
+    tracer.end("camera", tracer.begin())
+    tracer.publish(event_queue, interval=10)
+    event, summary = event_queue.get_nowait()
+    assert event == "tracing"
+    assert summary["camera"]["count"] == 1
+
+    # publishing is rate limited
+    tracer.publish(event_queue, interval=10)
+    assert event_queue.empty()
+
+    # never blocks the acquisition
+    event_queue.put("full")
+    tracer.publish(event_queue, interval=0)
+
+    tracer.configure(enabled=False)
+    event_queue.get_nowait()
+    tracer.publish(event_queue, interval=0)
+    assert event_queue.empty()
+
+
+def test_dump_chrome_trace(tmp_path):
+    tracer = Tracer(enabled=True)
+    with tracer.span("camera", 0):
+        pass
+    filename = tmp_path.joinpath("trace.json")
+    tracer.dump_chrome_trace(filename)
+
+    with open(filename) as f:
+        trace = json.load(f)
+    assert trace["traceEvents"][0]["name"] == "camera"
+    assert trace["traceEvents"][0]["ph"] == "X"
+    assert trace["otherData"]["summary"]["camera"]["count"] == 1
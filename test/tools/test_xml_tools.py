@@ -129,6 +129,22 @@ class TestDictToXml(unittest.TestCase):
         actual_xml = xml_tools.dict_to_xml(d, tag="root")
         self.assertEqual(actual_xml, expected_xml)
 
+    def test_iter_xml_matches_dict_to_xml(self):
+        # Test that streaming the XML yields the same text
+        d = {
+            "version": 0.2,
+            "BasePath": {"type": "relative", "text": "."},
+            "Empty": [],
+            "Views": {
+                "text": "views",
+                "View": [{"id": {"text": i}, "name": "view"} for i in range(3)],
+            },
+        }
+        expected_xml = xml_tools.dict_to_xml(d, tag="root")
+        actual_xml = "".join(xml_tools.iter_xml(d, tag="root"))
+        self.assertEqual(actual_xml, expected_xml)
+        self.assertIn("<Views>views\n", actual_xml)
+
 
 if __name__ == "__main__":
     unittest.main()